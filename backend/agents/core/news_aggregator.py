@@ -26,14 +26,12 @@ Created: November 2, 2025
 """
 
 import asyncio
-import hashlib
 import logging
 import os
-import re
 import time
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional
 
 import aiohttp
 
@@ -42,6 +40,7 @@ from geopolitical_news_agent import GeopoliticalNewsAgent
 
 # Import data layer for Redis Streams/TimeSeries
 from agents.core.data_layer import get_data_layer
+from services.text_engine import NearDuplicateIndex, SentimentLexicon
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +73,17 @@ class SentimentClassifier:
         "cut", "reduces", "disappoints", "fraud", "scandal",
     }
 
+    _lexicon: Optional[SentimentLexicon] = None
+
+    @classmethod
+    def _get_lexicon(cls) -> SentimentLexicon:
+        """Compile keyword sets once (Aho-Corasick, single pass per text)"""
+        if cls._lexicon is None:
+            cls._lexicon = SentimentLexicon(
+                sorted(cls.BULLISH_KEYWORDS), sorted(cls.BEARISH_KEYWORDS)
+            )
+        return cls._lexicon
+
     @classmethod
     def classify(cls, text: str) -> float:
         """
@@ -88,20 +98,8 @@ class SentimentClassifier:
         if not text:
             return 0.0
 
-        text_lower = text.lower()
-
-        # Count bullish/bearish keywords
-        bullish_count = sum(1 for word in cls.BULLISH_KEYWORDS if word in text_lower)
-        bearish_count = sum(1 for word in cls.BEARISH_KEYWORDS if word in text_lower)
-
-        # Normalize to -1.0 to +1.0 range
-        if bullish_count == 0 and bearish_count == 0:
-            return 0.0
-
-        total = bullish_count + bearish_count
-        sentiment = (bullish_count - bearish_count) / total
-
-        return round(sentiment, 2)
+        # Weighted bullish/bearish keyword hits, normalized to -1.0 to +1.0
+        return round(cls._get_lexicon().score(text), 2)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -112,24 +110,24 @@ class SentimentClassifier:
 class NewsDeduplicator:
     """
     Deduplicates news from multiple sources by headline similarity.
+
+    Exact repeats are caught by normalized-headline hash, rewordings of the
+    same story by MinHash-LSH (Jaccard >= similarity_threshold). Headlines
+    are kept in a ring buffer of max_headlines and expire after max_age_sec.
     """
 
-    def __init__(self, similarity_threshold: float = 0.8):
+    def __init__(
+        self,
+        similarity_threshold: float = 0.8,
+        max_headlines: int = 1000,
+        max_age_sec: float = 6 * 3600,
+    ):
         self.similarity_threshold = similarity_threshold
-        self.seen_hashes: Set[str] = set()
-        self.seen_headlines: List[Tuple[str, float]] = []  # (headline, timestamp)
-
-    def _normalize_headline(self, headline: str) -> str:
-        """Normalize headline for comparison"""
-        # Remove special chars, lowercase, remove extra spaces
-        normalized = re.sub(r'[^\w\s]', '', headline.lower())
-        normalized = ' '.join(normalized.split())
-        return normalized
-
-    def _headline_hash(self, headline: str) -> str:
-        """Generate hash for exact duplicate detection"""
-        normalized = self._normalize_headline(headline)
-        return hashlib.md5(normalized.encode()).hexdigest()
+        self.index = NearDuplicateIndex(
+            threshold=similarity_threshold,
+            capacity=max_headlines,
+            max_age_sec=max_age_sec,
+        )
 
     def is_duplicate(self, headline: str, timestamp: float) -> bool:
         """
@@ -142,24 +140,7 @@ class NewsDeduplicator:
         Returns:
             True if duplicate, False if new
         """
-        # Exact duplicate check
-        h = self._headline_hash(headline)
-        if h in self.seen_hashes:
-            return True
-
-        # Store and return False (new)
-        self.seen_hashes.add(h)
-        self.seen_headlines.append((headline, timestamp))
-
-        # Cleanup old headlines (keep last 1000)
-        if len(self.seen_headlines) > 1000:
-            self.seen_headlines = self.seen_headlines[-1000:]
-            # Rebuild hashes from kept headlines
-            self.seen_hashes = {
-                self._headline_hash(h) for h, _ in self.seen_headlines
-            }
-
-        return False
+        return self.index.check_and_add(headline)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -13,14 +13,16 @@ Architecture:
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
 import sys
+from abc import ABC, abstractmethod
 from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 # Add backend and parent to path for imports
 backend_path = Path(__file__).parent.parent.parent
@@ -28,6 +30,7 @@ sys.path.insert(0, str(backend_path))
 sys.path.insert(0, str(backend_path.parent))
 
 from agents.core.data_layer import get_data_layer
+from utils.cache import TTLCache  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +50,306 @@ except ImportError:
     logger.warning("openai package not installed - Master Director will use fallback logic")
 
 
+# Decision engine settings
+DIRECTOR_BATCH_WINDOW_MS = float(os.getenv("DIRECTOR_BATCH_WINDOW_MS", "50"))
+DIRECTOR_MAX_BATCH = int(os.getenv("DIRECTOR_MAX_BATCH", "16"))
+DIRECTOR_LATENCY_BUDGET_MS = float(os.getenv("DIRECTOR_LATENCY_BUDGET_MS", "3000"))
+DIRECTOR_DECISION_TTL = float(os.getenv("DIRECTOR_DECISION_TTL", "300"))
+DIRECTOR_DECISION_CACHE_SIZE = int(os.getenv("DIRECTOR_DECISION_CACHE_SIZE", "4096"))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DECISION BACKENDS
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class DecisionBackend(ABC):
+    """
+    Pluggable LLM backend: decides a batch of signals in one request
+
+    Each request is {"id", "signal", "context", "prompt"}; the result list is
+    aligned with the requests and holds {approved, confidence, reasoning}.
+    """
+
+    model = "unknown"
+
+    @abstractmethod
+    async def decide_batch(self, requests: List[Dict[str, Any]]) -> List[Dict]:
+        """Decide every request in one backend call"""
+        pass
+
+
+class OpenAIDecisionBackend(DecisionBackend):
+    """GPT-4o chat completion with all batched signals in one structured prompt"""
+
+    def __init__(self, model: str = "gpt-4o", temperature: float = 0.3):
+        self.model = model
+        self.temperature = temperature
+
+    async def decide_batch(self, requests: List[Dict[str, Any]]) -> List[Dict]:
+        user_content = "\n\n".join(
+            f"### DECISION id={req['id']}\n{req['prompt']}" for req in requests
+        )
+        response = await asyncio.to_thread(
+            openai.ChatCompletion.create,
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a professional trading director making final "
+                    "decisions on trade execution. Each DECISION block is an "
+                    "independent trade; analyze its context and decide whether to "
+                    "execute it. Respond in JSON format: "
+                    '{"decisions": [{"id": str, "approved": bool, '
+                    '"confidence": 0-100, "reasoning": str}]} '
+                    "with one entry per DECISION id.",
+                },
+                {"role": "user", "content": user_content},
+            ],
+            temperature=self.temperature,  # Lower temperature for consistent decisions
+            max_tokens=min(4096, 120 + 150 * len(requests)),
+        )
+
+        # Parse response
+        llm_text = response.choices[0].message.content.strip()
+
+        # Extract JSON from response
+        if llm_text.startswith("```json"):
+            llm_text = llm_text.split("```json")[1].split("```")[0].strip()
+        elif llm_text.startswith("```"):
+            llm_text = llm_text.split("```")[1].split("```")[0].strip()
+
+        payload = json.loads(llm_text)
+        rows = payload.get("decisions", []) if isinstance(payload, dict) else payload
+        by_id = {str(row.get("id")): row for row in rows}
+        return [by_id.get(req["id"]) for req in requests]
+
+
+class StubDecisionBackend(DecisionBackend):
+    """
+    Deterministic local backend for tests and benchmarks
+
+    Confidence is derived from the signal score, sector risk and portfolio
+    risk; an optional sleep simulates the round trip of a real LLM call.
+    """
+
+    model = "stub"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.batch_sizes: List[int] = []
+
+    async def decide_batch(self, requests: List[Dict[str, Any]]) -> List[Dict]:
+        self.batch_sizes.append(len(requests))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        results = []
+        for req in requests:
+            score = req["signal"].get("total_score", 0)
+            sector_risk = req["signal"].get("sector_risk_score", 0)
+            portfolio_risk = req["context"]["risk"]["portfolio_risk"]
+            confidence = max(
+                0.0, min(100.0, score * 1.1 - sector_risk * 0.1 - portfolio_risk * 0.1)
+            )
+            results.append(
+                {
+                    "approved": confidence >= 70,
+                    "confidence": round(confidence, 1),
+                    "reasoning": f"Stub decision for score {score:.0f}",
+                }
+            )
+        return results
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DECISION ENGINE (micro-batching, cache, latency budget)
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def decision_fingerprint(signal: Dict[str, Any], context: Dict[str, Any]) -> str:
+    """
+    Normalized signal/context key: signals that would get the same prompt up to
+    rounding noise share one decision
+    """
+    portfolio = context.get("portfolio", {})
+    key = {
+        "ticker": signal.get("ticker"),
+        "sector": signal.get("sector"),
+        "score": round(float(signal.get("total_score", 0) or 0)),
+        "sector_risk": round(float(signal.get("sector_risk_score", 0) or 0)),
+        "validation": round(float(signal.get("validation_confidence", 0) or 0), 2),
+        "positions": portfolio.get("positions_count"),
+        "exposure": round(float(portfolio.get("portfolio_exposure", 0) or 0), 2),
+        "sector_positions": len(portfolio.get("sector_positions", [])),
+        "regime": context.get("market", {}).get("regime"),
+        "volatility": round(float(context.get("market", {}).get("volatility", 0)), 2),
+        "risk": round(float(context.get("risk", {}).get("portfolio_risk", 0))),
+        "news": [
+            (n.get("title"), round(float(n.get("sentiment", 0)), 2))
+            for n in context.get("news", [])[:3]
+        ],
+    }
+    raw = json.dumps(key, sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+class DecisionEngine:
+    """
+    Micro-batches concurrent decisions into one backend request
+
+    - Signals arriving within `window_ms` (or until `max_batch`) share a call
+    - Decisions are cached by fingerprint; identical in-flight signals coalesce
+    - A caller waiting longer than `budget_ms` gets the fallback decision; the
+      batch keeps running and its result still lands in the cache
+    """
+
+    def __init__(
+        self,
+        backend: DecisionBackend,
+        fallback: Callable[[Dict, Dict], Awaitable[Dict[str, Any]]],
+        prompt_builder: Callable[[Dict, Dict], str],
+        window_ms: float = DIRECTOR_BATCH_WINDOW_MS,
+        max_batch: int = DIRECTOR_MAX_BATCH,
+        budget_ms: float = DIRECTOR_LATENCY_BUDGET_MS,
+        cache_ttl: float = DIRECTOR_DECISION_TTL,
+        cache_size: int = DIRECTOR_DECISION_CACHE_SIZE,
+    ):
+        self.backend = backend
+        self.fallback = fallback
+        self.prompt_builder = prompt_builder
+        self.window = window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.budget = budget_ms / 1000.0
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+
+        self._pending: List[tuple] = []  # (fingerprint, signal, context, future)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.stats = dict.fromkeys(
+            (
+                "requests",
+                "cache_hits",
+                "coalesced",
+                "batches",
+                "batched_signals",
+                "budget_exceeded",
+                "backend_errors",
+                "fallbacks",
+            ),
+            0,
+        )
+
+    async def decide(self, signal: Dict[str, Any], context: Dict[str, Any]) -> Dict:
+        self.stats["requests"] += 1
+        fp = decision_fingerprint(signal, context)
+
+        cached = self.cache.get(fp)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return {**cached, "cached": True}
+
+        future = self._inflight.get(fp)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[fp] = future
+            self._pending.append((fp, signal, context, future))
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(
+                    self.window, self._flush
+                )
+        else:
+            self.stats["coalesced"] += 1
+
+        try:
+            return dict(await asyncio.wait_for(asyncio.shield(future), self.budget))
+        except asyncio.TimeoutError:
+            self.stats["budget_exceeded"] += 1
+            reason = "latency_budget"
+        except Exception as e:
+            self.stats["backend_errors"] += 1
+            logger.error(f"[DecisionEngine] {self.backend.model} error: {e}")
+            reason = "backend_error"
+
+        self.stats["fallbacks"] += 1
+        decision = await self.fallback(signal, context)
+        return {**decision, "fallback_reason": reason}
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[tuple]):
+        requests = [
+            {
+                "id": f"s{i}",
+                "signal": signal,
+                "context": context,
+                "prompt": self.prompt_builder(signal, context),
+            }
+            for i, (_, signal, context, _) in enumerate(batch)
+        ]
+        self.stats["batches"] += 1
+        self.stats["batched_signals"] += len(batch)
+        try:
+            try:
+                results = await self.backend.decide_batch(requests)
+                if not isinstance(results, list) or len(results) != len(batch):
+                    count = len(results) if isinstance(results, list) else "no"
+                    raise ValueError(
+                        f"backend returned {count} decisions for {len(batch)} signals"
+                    )
+            except Exception as e:
+                results = [e] * len(batch)
+
+            for (fp, _, _, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception) or not isinstance(result, dict):
+                    future.set_exception(
+                        result
+                        if isinstance(result, Exception)
+                        else ValueError("missing decision in batch response")
+                    )
+                    future.exception()  # mark retrieved when every caller timed out
+                    continue
+                decision = {
+                    "approved": bool(result.get("approved", False)),
+                    "confidence": float(result.get("confidence", 0)),
+                    "reasoning": result.get("reasoning", "No reasoning provided"),
+                    "llm_model": self.backend.model,
+                }
+                self.cache.put(fp, decision)
+                future.set_result(decision)
+        finally:
+            # Never leave a dead future for later identical signals to join
+            for fp, _, _, future in batch:
+                if self._inflight.get(fp) is future:
+                    del self._inflight[fp]
+                if not future.done():
+                    future.set_exception(RuntimeError("decision batch aborted"))
+                    future.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "backend": self.backend.model,
+            "avg_batch_size": (
+                round(self.stats["batched_signals"] / batches, 2) if batches else 0.0
+            ),
+            "cache": self.cache.stats(),
+        }
+
+
 class MasterDirector:
     """
     Master Director - Final decision authority with GPT-4o reasoning
@@ -65,6 +368,7 @@ class MasterDirector:
         supervised_sector_heads: Optional[List[str]] = None,
         use_llm: bool = True,
         confidence_threshold: float = 70.0,
+        llm_backend: Optional[DecisionBackend] = None,
     ):
         """
         Initialize Master Director
@@ -74,6 +378,7 @@ class MasterDirector:
             supervised_sector_heads: List of sector head IDs (default: all 10)
             use_llm: Use GPT-4o for reasoning (default: True, fallback if unavailable)
             confidence_threshold: Minimum confidence to execute (default: 70.0)
+            llm_backend: Decision backend (default: GPT-4o when configured)
         """
         self.director_id = director_id
         self.supervised_sector_heads = supervised_sector_heads or [
@@ -91,9 +396,21 @@ class MasterDirector:
                 "communications",
             ]
         ]
-        self.use_llm = use_llm and GPT4O_AVAILABLE
+        self.use_llm = use_llm and (llm_backend is not None or GPT4O_AVAILABLE)
         self.confidence_threshold = confidence_threshold
 
+        # Micro-batched, cached LLM decisions
+        self.decision_engine: Optional[DecisionEngine] = None
+        if self.use_llm:
+            self.decision_engine = DecisionEngine(
+                backend=llm_backend or OpenAIDecisionBackend(),
+                fallback=self._fallback_decision,
+                prompt_builder=self._build_llm_prompt,
+            )
+        self.llm_model = (
+            self.decision_engine.backend.model if self.decision_engine else "fallback"
+        )
+
         # Initialize services
         self.streams_manager = None
         self.timeseries_manager = None
@@ -118,7 +435,7 @@ class MasterDirector:
         self.start_time: Optional[datetime] = None
 
         logger.info(
-            f"[{self.director_id}] Initialized with {'GPT-4o' if self.use_llm else 'fallback logic'} "
+            f"[{self.director_id}] Initialized with {self.llm_model if self.use_llm else 'fallback logic'} "
             f"supervising {len(self.supervised_sector_heads)} sector heads"
         )
 
@@ -261,7 +578,7 @@ class MasterDirector:
         self, signal: Dict[str, Any], context: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
-        Use GPT-4o for decision making
+        Use the LLM backend for decision making
         
         Prompt structure:
         - Signal details (ticker, score, sector, risk)
@@ -269,6 +586,10 @@ class MasterDirector:
         - Market regime (bull/bear/neutral, volatility)
         - Recent news (sentiment, impact)
         - Risk metrics (portfolio risk, position sizing)
+
+        Concurrent signals are micro-batched into one backend request and
+        decisions are cached by signal/context fingerprint; on backend errors
+        or when the latency budget runs out, the rule-based decision is used.
         
         Args:
             signal: Approved signal from Sector Head
@@ -277,53 +598,7 @@ class MasterDirector:
         Returns:
             Dict with approved (bool), confidence (0-100), reasoning (str)
         """
-        ticker = signal.get("ticker")
-        sector = signal.get("sector")
-        score = signal.get("total_score", 0)
-        sector_risk = signal.get("sector_risk_score", 0)
-
-        # Build LLM prompt
-        prompt = self._build_llm_prompt(signal, context)
-
-        try:
-            # Call GPT-4o
-            response = await asyncio.to_thread(
-                openai.ChatCompletion.create,
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional trading director making final decisions on trade execution. "
-                        "Analyze all provided context and decide whether to execute the trade. "
-                        "Respond in JSON format: {\"approved\": bool, \"confidence\": 0-100, \"reasoning\": str}"
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.3,  # Lower temperature for consistent decisions
-                max_tokens=300,
-            )
-
-            # Parse response
-            llm_text = response.choices[0].message.content.strip()
-            
-            # Extract JSON from response
-            if llm_text.startswith("```json"):
-                llm_text = llm_text.split("```json")[1].split("```")[0].strip()
-            elif llm_text.startswith("```"):
-                llm_text = llm_text.split("```")[1].split("```")[0].strip()
-
-            decision = json.loads(llm_text)
-
-            return {
-                "approved": decision.get("approved", False),
-                "confidence": float(decision.get("confidence", 0)),
-                "reasoning": decision.get("reasoning", "No reasoning provided"),
-                "llm_model": "gpt-4o",
-            }
-
-        except Exception as e:
-            logger.error(f"[{self.director_id}] GPT-4o error: {e}, falling back to rule-based")
-            return await self._fallback_decision(signal, context)
+        return await self.decision_engine.decide(signal, context)
 
     def _build_llm_prompt(self, signal: Dict[str, Any], context: Dict[str, Any]) -> str:
         """Build structured prompt for GPT-4o"""
@@ -623,10 +898,12 @@ Respond in JSON format:
                         block=1000,  # Block 1 second if no signals
                     )
 
-                    for signal in signals:
-                        # Make final decision
-                        execution_signal = await self.make_decision(signal)
+                    # Make final decisions concurrently (one micro-batch)
+                    execution_signals = await asyncio.gather(
+                        *(self.make_decision(signal) for signal in signals)
+                    )
 
+                    for execution_signal in execution_signals:
                         if execution_signal:
                             # Publish to execution engine
                             await self.publish_execution_signal(execution_signal)
@@ -667,7 +944,7 @@ Respond in JSON format:
         return {
             "director_id": self.director_id,
             "llm_enabled": self.use_llm,
-            "llm_model": "gpt-4o" if self.use_llm else "fallback",
+            "llm_model": self.llm_model,
             "supervised_sector_heads": len(self.supervised_sector_heads),
             "signals_processed": self.signals_processed,
             "signals_approved": self.signals_approved,
@@ -676,6 +953,9 @@ Respond in JSON format:
             "confidence_threshold": self.confidence_threshold,
             "rejection_reasons": dict(self.rejection_reasons),
             "recent_decisions": self.decisions[-10:],  # Last 10 decisions
+            "decision_engine": (
+                self.decision_engine.get_stats() if self.decision_engine else None
+            ),
             "uptime_seconds": round(uptime, 1),
             "uptime_hours": round(uptime / 3600, 2),
         }
@@ -710,3 +990,44 @@ async def get_master_director(
         await _global_master_director.initialize()
 
     return _global_master_director
+
+
+if __name__ == "__main__":
+    # Benchmark: bursty signals against a stub backend with LLM-like latency
+    import time
+
+    async def _bench(label: str, max_batch: int, n_signals: int = 300):
+        # max_batch=1 with one signal at a time mirrors the old per-signal loop
+        director = MasterDirector(
+            llm_backend=StubDecisionBackend(latency=0.25), confidence_threshold=70.0
+        )
+        director.decision_engine.max_batch = max_batch
+        signals = [
+            {
+                "ticker": f"SYM{i % 120:03d}",  # repeats hit the decision cache
+                "sector": "technology",
+                "total_score": 60 + i % 40,
+                "sector_risk_score": 40.0,
+            }
+            for i in range(n_signals)
+        ]
+        start = time.perf_counter()
+        if max_batch == 1:
+            for s in signals:
+                await director.make_decision(s)
+        else:
+            for burst in range(0, n_signals, 50):
+                await asyncio.gather(
+                    *(director.make_decision(s) for s in signals[burst : burst + 50])
+                )
+        elapsed = time.perf_counter() - start
+        stats = director.decision_engine.get_stats()
+        print(
+            f"{label:<12} {n_signals / elapsed:8.1f} decisions/s  "
+            f"batches={stats['batches']} cache_hits={stats['cache_hits']} "
+            f"fallbacks={stats['fallbacks']}"
+        )
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_bench("sequential", max_batch=1))
+    asyncio.run(_bench("batched", max_batch=DIRECTOR_MAX_BATCH))
@@ -13,11 +13,14 @@ Architecture:
 
 import asyncio
 import logging
+import os
 import sys
 from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
 
 # Add backend and parent to path for imports
 backend_path = Path(__file__).parent.parent.parent
@@ -25,6 +28,7 @@ sys.path.insert(0, str(backend_path))
 sys.path.insert(0, str(backend_path.parent))
 
 from agents.core.data_layer import get_data_layer
+from utils.cache import TTLCache  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -186,6 +190,174 @@ SECTORS = {
 }
 
 
+# Ticker → sector hash map (first listed sector wins, e.g. GOOGL → technology)
+TICKER_SECTOR: Dict[str, str] = {}
+for _sector_name, _config in SECTORS.items():
+    for _ticker in _config["tickers"]:
+        TICKER_SECTOR.setdefault(_ticker, _sector_name)
+
+# Correlation check settings
+CORRELATION_WINDOW = int(os.getenv("SECTOR_CORRELATION_WINDOW", "60"))
+CORRELATION_MIN_OBS = int(os.getenv("SECTOR_CORRELATION_MIN_OBS", "20"))
+CORRELATION_HISTORY_DAYS = int(os.getenv("SECTOR_CORRELATION_HISTORY_DAYS", "120"))
+CORRELATION_BARS_TTL = float(os.getenv("SECTOR_CORRELATION_BARS_TTL", "21600"))
+MAX_POSITION_CORRELATION = float(os.getenv("SECTOR_MAX_CORRELATION", "0.7"))
+MAX_SECTOR_POSITIONS = 3
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PORTFOLIO INDEX & ROLLING CORRELATION
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def fetch_daily_closes(ticker: str, days: int) -> Dict[str, float]:
+    """Daily closes keyed by date (Yahoo Finance daily bars)"""
+    from services.strategy_optimizer import fetch_daily_bars
+
+    return {bar["date"]: bar["close"] for bar in fetch_daily_bars(ticker, days)}
+
+
+class IndexedPortfolio(dict):
+    """
+    {ticker: position_value} dict that keeps per-sector aggregates current
+
+    Every write adjusts the running sector value, sector position count and
+    portfolio total, so exposure checks never rescan the holdings.
+    """
+
+    def __init__(self, positions: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.total = 0.0
+        self.sector_value: Dict[Optional[str], float] = defaultdict(float)
+        self.sector_count: Dict[Optional[str], int] = defaultdict(int)
+        if positions:
+            self.update(positions)
+
+    def _add(self, ticker: str, value: float, sign: int):
+        sector = TICKER_SECTOR.get(ticker)
+        self.total += sign * value
+        self.sector_value[sector] += sign * value
+        self.sector_count[sector] += sign
+
+    def __setitem__(self, ticker: str, value: float):
+        if ticker in self:
+            self._add(ticker, dict.__getitem__(self, ticker), -1)
+        super().__setitem__(ticker, value)
+        self._add(ticker, value, +1)
+
+    def __delitem__(self, ticker: str):
+        self._add(ticker, dict.__getitem__(self, ticker), -1)
+        super().__delitem__(ticker)
+
+    def pop(self, ticker: str, *default):
+        if ticker not in self:
+            return super().pop(ticker, *default)
+        value = dict.__getitem__(self, ticker)
+        del self[ticker]
+        return value
+
+    def popitem(self):
+        ticker, value = super().popitem()
+        self._add(ticker, value, -1)
+        return ticker, value
+
+    def setdefault(self, ticker: str, default: float = 0.0):
+        if ticker not in self:
+            self[ticker] = default
+        return dict.__getitem__(self, ticker)
+
+    def update(self, *args, **kwargs):
+        for ticker, value in dict(*args, **kwargs).items():
+            self[ticker] = value
+
+    def clear(self):
+        super().clear()
+        self.total = 0.0
+        self.sector_value.clear()
+        self.sector_count.clear()
+
+    def sector_tickers(self, sector: str) -> List[str]:
+        """Tickers held in a sector (at most MAX_SECTOR_POSITIONS when validated)"""
+        return [t for t in self if TICKER_SECTOR.get(t) == sector]
+
+
+class RollingCorrelation:
+    """
+    Rolling correlation of daily returns over the last `window` shared sessions
+
+    Each ticker keeps its daily closes as returns keyed by date. A pair is
+    correlated over the dates both tickers have a return for (intersected on
+    date, never on list position), using the most recent `window` of them.
+    Fewer than `min_obs` shared sessions, or a flat series, gives None. Pair
+    results are cached until either ticker's closes are replaced.
+    """
+
+    def __init__(
+        self, window: int = CORRELATION_WINDOW, min_obs: int = CORRELATION_MIN_OBS
+    ):
+        self.window = window
+        self.min_obs = min_obs
+        self._returns: Dict[str, Dict[str, float]] = {}  # ticker -> {date: return}
+        self._version: Dict[str, int] = defaultdict(int)
+        # (a, b) -> (version of a, version of b, correlation)
+        self._pairs: Dict[Tuple[str, str], Tuple[int, int, Optional[float]]] = {}
+
+    def set_closes(self, ticker: str, closes: Dict[str, float]):
+        """Replace a ticker's daily closes ({"YYYY-MM-DD": close})"""
+        dates = sorted(d for d, c in closes.items() if c and c > 0)
+        # a little more than the window so pairs with gaps still fill it
+        dates = dates[-(2 * self.window + 1) :]
+        self._returns[ticker] = {
+            d: closes[d] / closes[prev] - 1.0 for prev, d in zip(dates, dates[1:])
+        }
+        self._version[ticker] += 1
+
+    def _compute(self, a: str, b: str) -> Optional[float]:
+        ra, rb = self._returns.get(a), self._returns.get(b)
+        if not ra or not rb:
+            return None
+        common = sorted(ra.keys() & rb.keys())[-self.window :]
+        if len(common) < self.min_obs:
+            return None
+        x = np.fromiter((ra[d] for d in common), float, len(common))
+        y = np.fromiter((rb[d] for d in common), float, len(common))
+        x -= x.mean()
+        y -= y.mean()
+        denom = np.sqrt((x @ x) * (y @ y))
+        if not denom:
+            return None  # a flat series has no defined correlation
+        return float(np.clip((x @ y) / denom, -1.0, 1.0))
+
+    def correlation(self, a: str, b: str) -> Optional[float]:
+        """Correlation of two tickers' daily returns (None without enough data)"""
+        key = (a, b) if a <= b else (b, a)
+        versions = (self._version[key[0]], self._version[key[1]])
+        cached = self._pairs.get(key)
+        if cached is not None and cached[:2] == versions:
+            return cached[2]
+        corr = self._compute(*key)
+        self._pairs[key] = (*versions, corr)
+        return corr
+
+    def max_correlation(
+        self, ticker: str, others: Iterable[str]
+    ) -> Tuple[Optional[str], Optional[float]]:
+        """Most correlated of `others` with `ticker`"""
+        best, best_corr = None, None
+        for other in others:
+            if other == ticker:
+                continue
+            corr = self.correlation(ticker, other)
+            if corr is not None and (best_corr is None or corr > best_corr):
+                best, best_corr = other, corr
+        return best, best_corr
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SECTOR HEAD
+# ═══════════════════════════════════════════════════════════════════════════
+
+
 class SectorHead:
     """
     Sector Head Validator - Validates signals with sector-specific rules
@@ -203,6 +375,7 @@ class SectorHead:
         sector_name: str,
         supervised_team_leads: List[str],
         exposure_limit: float = 0.30,
+        bar_source: Optional[Callable[[str, int], Dict[str, float]]] = None,
     ):
         """
         Initialize Sector Head validator
@@ -212,6 +385,8 @@ class SectorHead:
             sector_name: Sector name (e.g., "technology")
             supervised_team_leads: List of team lead IDs to supervise
             exposure_limit: Max portfolio exposure for this sector (default: 0.30)
+            bar_source: (ticker, days) -> {date: close}; defaults to
+                fetch_daily_closes
         """
         self.sector_head_id = sector_head_id
         self.sector_name = sector_name
@@ -228,8 +403,12 @@ class SectorHead:
         self.timeseries_manager = None
 
         # Portfolio tracking (simulated - in production, fetch from Redis)
-        self.current_portfolio: Dict[str, float] = {}  # {ticker: position_value}
+        self.current_portfolio = {}  # {ticker: position_value}, indexed by sector
         self.sector_exposures: Dict[str, float] = {}  # {sector: exposure_pct}
+        self.correlations = RollingCorrelation()
+        self.bar_source = bar_source or fetch_daily_closes
+        self._closes = TTLCache(maxsize=1024, ttl=CORRELATION_BARS_TTL)
+        self._loaded_closes: Dict[str, Dict[str, float]] = {}
 
         # Validation statistics
         self.signals_processed = 0
@@ -245,6 +424,22 @@ class SectorHead:
             f"supervising {len(supervised_team_leads)} team leads"
         )
 
+    @property
+    def current_portfolio(self) -> IndexedPortfolio:
+        return self._portfolio
+
+    @current_portfolio.setter
+    def current_portfolio(self, positions: Dict[str, float]):
+        # Assigning a plain dict re-indexes it once; later writes are incremental
+        self._portfolio = IndexedPortfolio(positions)
+
+    def update_position(self, ticker: str, value: float):
+        """Set (or remove, when value is 0) a position and update the aggregates"""
+        if value:
+            self._portfolio[ticker] = value
+        else:
+            self._portfolio.pop(ticker, None)
+
     async def initialize(self):
         """Async initialization (services require async setup)"""
         self.streams_manager, self.timeseries_manager = await get_data_layer()
@@ -261,10 +456,7 @@ class SectorHead:
         Returns:
             Sector name or None if unknown
         """
-        for sector_name, config in SECTORS.items():
-            if ticker in config["tickers"]:
-                return sector_name
-        return None
+        return TICKER_SECTOR.get(ticker)
 
     async def validate_signal(self, signal: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -354,16 +546,12 @@ class SectorHead:
         position_size = 10000.0  # TODO: Get from signal or portfolio manager
 
         # Calculate total portfolio value (simulated)
-        total_portfolio = sum(self.current_portfolio.values()) or 100000.0
+        portfolio = self.current_portfolio
+        total_portfolio = portfolio.total or 100000.0
 
-        # Calculate new exposure
+        # Calculate new exposure (running sector aggregate, no rescan)
         new_exposure = (
-            sum(
-                v
-                for t, v in self.current_portfolio.items()
-                if self._get_ticker_sector(t) == ticker_sector
-            )
-            + position_size
+            portfolio.sector_value.get(ticker_sector, 0.0) + position_size
         ) / total_portfolio
 
         # Get sector limit
@@ -379,6 +567,27 @@ class SectorHead:
 
         return True
 
+    async def _load_closes(self, tickers: Iterable[str]):
+        """Feed each ticker's cached daily closes to the correlation matrix"""
+
+        async def load(ticker: str):
+            async def fetch():
+                try:
+                    return await asyncio.to_thread(
+                        self.bar_source, ticker, CORRELATION_HISTORY_DAYS
+                    )
+                except Exception as e:
+                    # cached empty until the TTL runs out; the check accepts
+                    logger.warning(f"[{self.sector_head_id}] {ticker} bars: {e}")
+                    return {}
+
+            closes = await self._closes.get_or_compute(ticker, fetch)
+            if self._loaded_closes.get(ticker) is not closes:
+                self._loaded_closes[ticker] = closes
+                self.correlations.set_closes(ticker, closes)
+
+        await asyncio.gather(*(load(t) for t in tickers))
+
     async def _check_correlation(self, ticker: str, ticker_sector: str) -> bool:
         """
         Check correlation with existing positions in same sector
@@ -394,23 +603,33 @@ class SectorHead:
         Returns:
             True if acceptable, False if rejected
         """
-        # Count positions in same sector
-        sector_positions = [
-            t
-            for t in self.current_portfolio.keys()
-            if self._get_ticker_sector(t) == ticker_sector
-        ]
+        # Count positions in same sector (running aggregate)
+        sector_count = self.current_portfolio.sector_count.get(ticker_sector, 0)
 
-        if len(sector_positions) >= 3:
+        if sector_count >= MAX_SECTOR_POSITIONS:
             self._reject_signal(
                 ticker,
                 "sector_concentration",
-                f"Already have {len(sector_positions)} positions in {ticker_sector}",
+                f"Already have {sector_count} positions in {ticker_sector}",
             )
             return False
 
-        # TODO: Add correlation calculation with historical prices
-        # For now, accept if below position limit
+        if not sector_count:
+            return True
+
+        # Rolling daily-return correlation with the (< 3) positions in the
+        # sector; accepted when there is not enough shared history
+        held = self.current_portfolio.sector_tickers(ticker_sector)
+        await self._load_closes([ticker, *held])
+        other, corr = self.correlations.max_correlation(ticker, held)
+        if corr is not None and corr > MAX_POSITION_CORRELATION:
+            self._reject_signal(
+                ticker,
+                "high_correlation",
+                f"Correlation {corr:.2f} with {other} exceeds "
+                f"{MAX_POSITION_CORRELATION:.2f}",
+            )
+            return False
 
         return True
 
@@ -812,3 +1031,48 @@ async def get_sector_head_pool(
         await _global_sector_head_pool.initialize()
 
     return _global_sector_head_pool
+
+
+if __name__ == "__main__":
+    # Benchmark: signals validated per second against a populated portfolio
+    import random
+    import time
+
+    async def _bench(n_signals: int = 50_000):
+        rng = random.Random(1)
+        tickers = list(TICKER_SECTOR)
+        days = [
+            (datetime(2025, 1, 1) + timedelta(days=i)).strftime("%Y-%m-%d")
+            for i in range(CORRELATION_HISTORY_DAYS)
+        ]
+
+        def bars(ticker: str, n: int) -> Dict[str, float]:
+            walk = random.Random(ticker)
+            price, closes = 100.0, {}
+            for day in days[-n:]:
+                price *= 1 + walk.gauss(0, 0.02)
+                closes[day] = price
+            return closes
+
+        head = SectorHead("sector_head_bench", "technology", [], bar_source=bars)
+        head.current_portfolio = {t: rng.uniform(1_000, 5_000) for t in tickers[::10]}
+        signals = [
+            {"ticker": rng.choice(tickers), "total_score": 70.0}
+            for _ in range(n_signals)
+        ]
+
+        start = time.perf_counter()
+        for i, signal in enumerate(signals):
+            await head.validate_signal(signal)
+            if i % 10 == 0:  # positions keep changing between signals
+                head.update_position(rng.choice(tickers), rng.choice([0, 0, 2_500.0]))
+        elapsed = time.perf_counter() - start
+        print(
+            f"{n_signals} signals in {elapsed * 1000:.0f} ms "
+            f"({n_signals / elapsed:,.0f} signals/s, "
+            f"{len(head.current_portfolio)} positions)"
+        )
+        print(f"rejections: {dict(head.rejection_reasons)}")
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_bench())
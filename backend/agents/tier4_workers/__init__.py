@@ -3,7 +3,14 @@ Tier 4 Workers - Universe Scanner Agents (167 instances)
 Each agent scans 3 tickers (500 total capacity)
 """
 
+from .scan_scheduler import ScanDataProvider, ScanScheduler
 from .scanner_agent import UniverseScannerAgent
 from .scanner_pool import UniverseScannerPool, get_scanner_pool
 
-__all__ = ["UniverseScannerAgent", "UniverseScannerPool", "get_scanner_pool"]
+__all__ = [
+    "ScanDataProvider",
+    "ScanScheduler",
+    "UniverseScannerAgent",
+    "UniverseScannerPool",
+    "get_scanner_pool",
+]
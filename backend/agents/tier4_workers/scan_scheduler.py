@@ -0,0 +1,519 @@
+"""
+Universe Scan Scheduler - Tier 4 shared scheduling
+Replaces the per-agent light/deep loops of the scanner pool
+
+Architecture:
+- One scheduler owns every ticker's hotness and last scan time
+- Waiting heap ordered by next due time (staleness); due tickers move to a
+  ready heap ordered by hotness, then by how long they have been due
+- Hot tickers (recent signal) rescan on the deep interval and get a deep
+  scan; the rest rescan on the light interval
+- Due tickers are dispatched in batches: one quotes call per batch, and one
+  technicals call for the tickers that pass the light filters or are hot
+- Global concurrency budget: scans in flight across all workers
+- Agents are stateless workers pulling (ticker, mode, data) jobs
+
+Usage:
+    scheduler = ScanScheduler(tickers, provider=LiveScanDataProvider())
+    workers = [asyncio.create_task(scheduler.run_worker(a)) for a in agents]
+    await scheduler.run()
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from agents.tier4_workers.scanner_agent import light_scan_filter
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Scheduler settings
+SCAN_BATCH_SIZE = int(os.getenv("SCAN_BATCH_SIZE", "50"))
+SCAN_CONCURRENCY = int(os.getenv("SCAN_CONCURRENCY", "16"))
+SCAN_FETCH_CONCURRENCY = int(os.getenv("SCAN_FETCH_CONCURRENCY", "10"))
+SCAN_TECHNICALS_TTL = float(os.getenv("SCAN_TECHNICALS_TTL", "300"))
+SCAN_IDLE_SECONDS = float(os.getenv("SCAN_IDLE_SECONDS", "1.0"))
+
+LIGHT, DEEP = "light", "deep"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DATA PROVIDERS
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class ScanDataProvider(ABC):
+    """
+    Batched market data for the scheduler
+
+    Each call covers many tickers and returns {ticker: data}; tickers without
+    data are simply missing from the result.
+    """
+
+    @abstractmethod
+    async def get_quotes(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Real-time quotes per ticker"""
+        pass
+
+    @abstractmethod
+    async def get_technicals(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Technical analysis per ticker"""
+        pass
+
+
+class LiveScanDataProvider(ScanDataProvider):
+    """
+    enhanced_ticker_manager quotes + technical_analyzer results
+
+    The upstream services are per-symbol, so a batch fans out with bounded
+    concurrency. Technicals come from daily bars and are cached for
+    SCAN_TECHNICALS_TTL seconds, shared by light and deep scans.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = SCAN_FETCH_CONCURRENCY,
+        technicals_ttl: float = SCAN_TECHNICALS_TTL,
+    ):
+        self._budget = asyncio.Semaphore(max(1, concurrency))
+        self._technicals = TTLCache(maxsize=2048, ttl=technicals_ttl)
+
+    async def _bounded(self, fetch: Callable, ticker: str) -> Any:
+        async with self._budget:
+            return await fetch(ticker)
+
+    async def _gather(self, fetch: Callable, tickers: List[str]) -> Dict[str, Any]:
+        results = await asyncio.gather(
+            *(self._bounded(fetch, t) for t in tickers), return_exceptions=True
+        )
+        data = {}
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, Exception):
+                logger.debug(f"[ScanScheduler] {ticker}: fetch failed - {result}")
+            elif result:
+                data[ticker] = result
+        return data
+
+    async def get_quotes(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        from enhanced_ticker_data import enhanced_ticker_manager
+
+        return await self._gather(enhanced_ticker_manager.get_real_time_quote, tickers)
+
+    async def get_technicals(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        from technical_analysis_enhanced import technical_analyzer
+
+        async def cached(ticker: str):
+            return await self._technicals.get_or_compute(
+                ticker, lambda: technical_analyzer.analyze_stock_technical(ticker)
+            )
+
+        return await self._gather(cached, tickers)
+
+
+class StubScanDataProvider(ScanDataProvider):
+    """
+    Deterministic local provider for tests and benchmarks
+
+    Counts upstream requests and symbols. Also exposes the per-symbol calls
+    (get_real_time_quote / analyze_stock_technical) so the old one-ticker-at-
+    a-time access pattern can be measured against the batched one. Each
+    request takes `latency` seconds and at most `capacity` run at once, like
+    a rate-limited data vendor.
+    """
+
+    def __init__(
+        self, latency: float = 0.0, movers: Iterable[str] = (), capacity: int = 10
+    ):
+        self.latency = latency
+        self.movers = set(movers)
+        self._capacity = asyncio.Semaphore(max(1, capacity))
+        self.calls = {"quotes": 0, "technicals": 0}
+        self.symbols = {"quotes": 0, "technicals": 0}
+
+    def _quote(self, ticker: str) -> Dict[str, Any]:
+        prev_close = 20.0 + sum(map(ord, ticker)) % 200
+        move = 1.05 if ticker in self.movers else 1.005
+        return {
+            "Symbol": ticker,
+            "Last": round(prev_close * move, 2),
+            "Volume": 1_500_000,
+            "PreviousClose": prev_close,
+        }
+
+    def _technical(self, ticker: str) -> Dict[str, Any]:
+        return {
+            "overall_trend": {"direction": "bullish", "score": 75},
+            "indicators": {"rsi": {"value": 65}, "macd": {"signal": "buy"}},
+        }
+
+    async def _request(self, kind: str, n: int):
+        self.calls[kind] += 1
+        self.symbols[kind] += n
+        if self.latency:
+            async with self._capacity:
+                await asyncio.sleep(self.latency)
+
+    async def get_quotes(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        await self._request("quotes", len(tickers))
+        return {t: self._quote(t) for t in tickers}
+
+    async def get_technicals(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        await self._request("technicals", len(tickers))
+        return {t: self._technical(t) for t in tickers}
+
+    async def get_real_time_quote(self, ticker: str) -> Dict[str, Any]:
+        await self._request("quotes", 1)
+        return self._quote(ticker)
+
+    async def analyze_stock_technical(self, ticker: str) -> Dict[str, Any]:
+        await self._request("technicals", 1)
+        return self._technical(ticker)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SCHEDULER
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+@dataclass
+class TickerState:
+    """Scheduling state for one ticker (owned by the scheduler, not agents)"""
+
+    ticker: str
+    hotness: float = 0.0  # confidence of the latest signal, 0 = cold
+    due: float = 0.0
+    last_scan: Optional[float] = None
+    scans: int = 0
+
+
+@dataclass
+class ScanJob:
+    ticker: str
+    mode: str  # LIGHT / DEEP
+    quote: Optional[Dict[str, Any]]
+    technical: Optional[Dict[str, Any]]
+
+
+class ScanScheduler:
+    """
+    Shared priority scheduler for the universe scanner
+
+    Features:
+    - Hotness/staleness priority queue (no duplicate scans in flight)
+    - Batched quote + technical fetches through a ScanDataProvider
+    - Global concurrency budget across all workers
+    - Throughput and upstream call statistics
+    """
+
+    def __init__(
+        self,
+        tickers: Iterable[str],
+        provider: Optional[ScanDataProvider] = None,
+        light_interval: float = 300,
+        deep_interval: float = 60,
+        batch_size: int = SCAN_BATCH_SIZE,
+        concurrency: int = SCAN_CONCURRENCY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize scan scheduler
+
+        Args:
+            tickers: Ticker universe (duplicates ignored)
+            provider: Batched data provider (default: LiveScanDataProvider)
+            light_interval: Seconds between scans of a cold ticker
+            deep_interval: Seconds between scans of a hot ticker
+            batch_size: Max tickers per dispatch (one quotes call each)
+            concurrency: Max scans in flight across all workers
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.provider = provider or LiveScanDataProvider()
+        self.light_interval = light_interval
+        self.deep_interval = deep_interval
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self._clock = clock
+
+        self.state: Dict[str, TickerState] = {
+            t: TickerState(t) for t in dict.fromkeys(tickers)
+        }
+        self._seq = itertools.count()
+        self._waiting: List[tuple] = []  # (due, seq, ticker)
+        self._ready: List[tuple] = []  # (-hotness, due, seq, ticker)
+        for ticker in self.state:
+            heapq.heappush(self._waiting, (0.0, next(self._seq), ticker))
+
+        # Bounded so quotes are not fetched far ahead of the workers
+        self.jobs: asyncio.Queue = asyncio.Queue(maxsize=self.batch_size * 2)
+        self._budget = asyncio.Semaphore(self.concurrency)
+        self.is_running = False
+        self.start_time: Optional[float] = None
+        self.stats = dict.fromkeys(
+            (
+                "batches",
+                "dispatched",
+                "scans",
+                "light_scans",
+                "deep_scans",
+                "signals",
+                "errors",
+                "in_flight",
+                "peak_in_flight",
+            ),
+            0,
+        )
+
+    # ——— Queue ———
+    def _promote_due(self, now: float):
+        while self._waiting and self._waiting[0][0] <= now:
+            due, seq, ticker = heapq.heappop(self._waiting)
+            hotness = self.state[ticker].hotness
+            heapq.heappush(self._ready, (-hotness, due, seq, ticker))
+
+    def take_due(self, now: Optional[float] = None) -> List[str]:
+        """Pop up to batch_size due tickers, hottest and stalest first"""
+        self._promote_due(self._clock() if now is None else now)
+        batch = []
+        while self._ready and len(batch) < self.batch_size:
+            batch.append(heapq.heappop(self._ready)[-1])
+        return batch
+
+    def _reschedule(self, state: TickerState):
+        interval = self.deep_interval if state.hotness > 0 else self.light_interval
+        state.due = state.last_scan + interval
+        heapq.heappush(self._waiting, (state.due, next(self._seq), state.ticker))
+
+    def next_due_in(self) -> Optional[float]:
+        if self._ready:
+            return 0.0
+        if not self._waiting:
+            return None  # everything in flight
+        return max(0.0, self._waiting[0][0] - self._clock())
+
+    @property
+    def hot_tickers(self) -> List[str]:
+        return [t for t, s in self.state.items() if s.hotness > 0]
+
+    # ——— Dispatch ———
+    async def prepare(self, tickers: List[str]) -> List[ScanJob]:
+        """Fetch quotes for the batch and technicals where they can matter"""
+        quotes = await self.provider.get_quotes(tickers)
+        modes = {t: DEEP if self.state[t].hotness > 0 else LIGHT for t in tickers}
+        need_technicals = [
+            t
+            for t in tickers
+            if t in quotes
+            and (modes[t] == DEEP or light_scan_filter(quotes[t]) is not None)
+        ]
+        technicals = (
+            await self.provider.get_technicals(need_technicals)
+            if need_technicals
+            else {}
+        )
+        self.stats["batches"] += 1
+        # {} marks "fetched, nothing returned" so workers don't refetch
+        return [
+            ScanJob(t, modes[t], quotes.get(t, {}), technicals.get(t, {}))
+            for t in tickers
+        ]
+
+    async def dispatch_due(self) -> int:
+        """Queue every ticker due now (in batches); returns the count"""
+        dispatched = 0
+        while True:
+            batch = self.take_due()
+            if not batch:
+                return dispatched
+            try:
+                jobs = await self.prepare(batch)
+            except Exception as e:
+                logger.error(f"[ScanScheduler] Batch fetch error: {e}")
+                jobs = [ScanJob(t, LIGHT, {}, {}) for t in batch]
+            for job in jobs:
+                await self.jobs.put(job)
+            dispatched += len(jobs)
+            self.stats["dispatched"] += len(jobs)
+
+    async def run_cycle(self) -> int:
+        """Dispatch everything due now and wait until it has been scanned"""
+        dispatched = await self.dispatch_due()
+        await self.jobs.join()
+        return dispatched
+
+    async def run(self):
+        """Background task: dispatch due tickers until stopped"""
+        self.is_running = True
+        self.start_time = self._clock()
+        logger.info(
+            f"[ScanScheduler] Started: {len(self.state)} tickers, "
+            f"batch {self.batch_size}, budget {self.concurrency}"
+        )
+        while self.is_running:
+            try:
+                if not await self.dispatch_due():
+                    wait = self.next_due_in()
+                    await asyncio.sleep(
+                        SCAN_IDLE_SECONDS
+                        if wait is None
+                        else min(wait, SCAN_IDLE_SECONDS)
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[ScanScheduler] Dispatch loop error: {e}")
+                await asyncio.sleep(SCAN_IDLE_SECONDS)
+
+    def stop(self):
+        self.is_running = False
+
+    # ——— Workers ———
+    async def run_worker(self, agent: Any):
+        """
+        Background task: stateless worker loop for one agent
+
+        The agent only needs scan_light / scan_deep (accepting prefetched
+        quote and technical) and publish_signal.
+        """
+        while True:
+            job = await self.jobs.get()
+            signal = None
+            try:
+                async with self._budget:
+                    self.stats["in_flight"] += 1
+                    self.stats["peak_in_flight"] = max(
+                        self.stats["peak_in_flight"], self.stats["in_flight"]
+                    )
+                    try:
+                        scan = agent.scan_deep if job.mode == DEEP else agent.scan_light
+                        signal = await scan(
+                            job.ticker, quote=job.quote, technical=job.technical
+                        )
+                    finally:
+                        self.stats["in_flight"] -= 1
+                if signal:
+                    await agent.publish_signal(signal)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(
+                    f"[ScanScheduler] {getattr(agent, 'agent_id', 'worker')} "
+                    f"scan error ({job.ticker}): {e}"
+                )
+            finally:
+                self.complete(job, signal)
+                self.jobs.task_done()
+
+    def complete(self, job: ScanJob, signal: Optional[Dict[str, Any]]):
+        """Record a scan result and requeue the ticker"""
+        state = self.state[job.ticker]
+        state.last_scan = self._clock()
+        state.scans += 1
+        # light signal -> hot (deep next); deep miss -> cold again
+        state.hotness = float(signal.get("confidence", 0.0)) if signal else 0.0
+        self._reschedule(state)
+
+        self.stats["scans"] += 1
+        self.stats[f"{job.mode}_scans"] += 1
+        if signal:
+            self.stats["signals"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Scheduler throughput and upstream call statistics"""
+        elapsed = self._clock() - self.start_time if self.start_time else 0
+        return {
+            **self.stats,
+            "tickers": len(self.state),
+            "hot_tickers_count": len(self.hot_tickers),
+            "queued": self.jobs.qsize(),
+            "ready": len(self._ready),
+            "scans_per_second": (
+                round(self.stats["scans"] / elapsed, 2) if elapsed > 0 else 0
+            ),
+            "upstream_calls": dict(getattr(self.provider, "calls", {})),
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════════════════
+
+if __name__ == "__main__":
+    from agents.tier4_workers.scanner_agent import UniverseScannerAgent
+
+    logging.basicConfig(level=logging.WARNING)
+    N_TICKERS, N_AGENTS, LATENCY = 500, 167, 0.02
+    universe = [f"T{i:03d}" for i in range(N_TICKERS)]
+    movers = universe[::10]
+
+    class Publisher:
+        async def publish_signal(self, *args):
+            pass
+
+        async def add_news_event(self, *args):
+            pass
+
+    def make_agents(provider):
+        agents = []
+        for i in range(N_AGENTS):
+            agent = UniverseScannerAgent(f"scanner_{i:03d}", universe[i::N_AGENTS])
+            agent.streams_manager = agent.timeseries_manager = Publisher()
+            agents.append(agent)
+        return agents
+
+    async def per_agent_pass():
+        """Old access pattern: every agent fetches its own tickers one by one"""
+        import agents.tier4_workers.scanner_agent as scanner_module
+
+        provider = StubScanDataProvider(LATENCY, movers)
+        scanner_module.enhanced_ticker_manager = provider
+        scanner_module.technical_analyzer = provider
+
+        async def agent_pass(agent):
+            for ticker in agent.tickers:
+                await agent.scan_light(ticker)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(agent_pass(a) for a in make_agents(provider)))
+        return time.perf_counter() - start, provider
+
+    async def scheduled_pass():
+        provider = StubScanDataProvider(LATENCY, movers)
+        scheduler = ScanScheduler(universe, provider, batch_size=100)
+        workers = [
+            asyncio.create_task(scheduler.run_worker(a)) for a in make_agents(provider)
+        ]
+        start = time.perf_counter()
+        await scheduler.run_cycle()
+        elapsed = time.perf_counter() - start
+        for w in workers:
+            w.cancel()
+        return elapsed, provider, scheduler
+
+    print(
+        f"Light pass over {N_TICKERS} tickers, {LATENCY * 1000:.0f}ms upstream, "
+        f"10 concurrent upstream requests"
+    )
+    elapsed, provider = asyncio.run(per_agent_pass())
+    print(
+        f"  per-agent fetches: {elapsed:.2f}s, "
+        f"upstream calls {provider.calls} "
+        f"(without the 0.5s sleep per ticker of the old loops)"
+    )
+    elapsed, provider, scheduler = asyncio.run(scheduled_pass())
+    print(
+        f"  shared scheduler:  {elapsed:.2f}s "
+        f"({scheduler.stats['scans'] / elapsed:.0f} scans/s), "
+        f"upstream calls {provider.calls}, "
+        f"hot tickers {len(scheduler.hot_tickers)}"
+    )
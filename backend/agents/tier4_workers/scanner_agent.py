@@ -33,11 +33,49 @@ from unusual_whales_service_clean import UnusualWhalesService
 
 logger = logging.getLogger(__name__)
 
+# Light scan filters
+LIGHT_MIN_PRICE = 5.0  # avoid penny stocks
+LIGHT_MIN_VOLUME = 100_000  # ensure liquidity
+LIGHT_MIN_MOVE_PCT = 2.0  # skip flat stocks
+
+
+def light_scan_filter(quote: Dict[str, Any]) -> Optional[tuple]:
+    """
+    Quote-only part of the light scan
+
+    Returns (price, volume, price_change_pct) if the ticker passes the price,
+    volume and movement filters, else None. The scan scheduler uses it to
+    fetch technicals only for tickers that can still produce a signal.
+    """
+    current_price = quote.get("Last", 0)
+    volume = quote.get("Volume", 0)
+    prev_close = quote.get("PreviousClose", current_price)
+
+    # Calculate price change percentage
+    price_change_pct = (
+        ((current_price - prev_close) / prev_close * 100) if prev_close else 0
+    )
+
+    if current_price < LIGHT_MIN_PRICE:
+        return None
+    if volume < LIGHT_MIN_VOLUME:
+        return None
+    if abs(price_change_pct) < LIGHT_MIN_MOVE_PCT:
+        return None
+    return current_price, volume, price_change_pct
+
+
+async def _resolved(value: Any) -> Any:
+    return value
+
 
 class UniverseScannerAgent:
     """
     Single scanner agent instance - scans 3 assigned tickers
     
+    Run standalone via start() (own light/deep loops), or as a stateless
+    worker of ScanScheduler, which owns hotness and passes prefetched data.
+
     Features:
     - Two-tier scanning (light 5min, deep 1min)
     - News integration (NewsAggregator)
@@ -94,45 +132,45 @@ class UniverseScannerAgent:
         self.start_time = datetime.utcnow()
         logger.info(f"[{self.agent_id}] Services initialized")
 
-    async def scan_light(self, ticker: str) -> Optional[Dict[str, Any]]:
+    async def scan_light(
+        self,
+        ticker: str,
+        quote: Optional[Dict[str, Any]] = None,
+        technical: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
         """
         Light scan (5-minute interval)
         Quick checks: price, volume, basic indicators
-        
+
+        Args:
+            ticker: Symbol to scan
+            quote: Prefetched quote (batched by the scan scheduler); fetched
+                here when None
+            technical: Prefetched technical analysis; fetched here when None
+
         Returns signal dict if opportunity found, else None
         """
         try:
             # Get real-time quote
-            quote = await enhanced_ticker_manager.get_real_time_quote(ticker)
+            if quote is None:
+                quote = await enhanced_ticker_manager.get_real_time_quote(ticker)
             if not quote:
                 logger.warning(f"[{self.agent_id}] {ticker}: No quote data")
                 return None
 
-            current_price = quote.get("Last", 0)
-            volume = quote.get("Volume", 0)
-            prev_close = quote.get("PreviousClose", current_price)
-
-            # Calculate price change percentage
-            price_change_pct = (
-                ((current_price - prev_close) / prev_close * 100) if prev_close else 0
-            )
-
             # LIGHT SCAN FILTERS (fast decision)
-            # 1. Minimum price: $5 (avoid penny stocks)
-            if current_price < 5.0:
-                return None
-
-            # 2. Minimum volume: 100k shares (ensure liquidity)
-            if volume < 100_000:
-                return None
-
-            # 3. Price movement threshold: ±2% (skip flat stocks)
-            if abs(price_change_pct) < 2.0:
+            move = light_scan_filter(quote)
+            if move is None:
                 return None
+            current_price, volume, price_change_pct = move
 
             # Quick technical indicators (no full analysis)
             # RSI check (basic momentum)
-            technical_data = await technical_analyzer.analyze_stock_technical(ticker)
+            technical_data = technical
+            if technical_data is None:
+                technical_data = await technical_analyzer.analyze_stock_technical(
+                    ticker
+                )
             if not technical_data:
                 return None
 
@@ -159,26 +197,41 @@ class UniverseScannerAgent:
                 f"{price_change_pct:+.2f}% move, RSI {rsi:.0f}"
             )
 
-            # Mark as hot ticker (upgrade to deep scan)
-            self.hot_tickers.add(ticker)
-
             return signal
 
         except Exception as e:
             logger.error(f"[{self.agent_id}] Light scan error ({ticker}): {e}")
             return None
 
-    async def scan_deep(self, ticker: str) -> Optional[Dict[str, Any]]:
+    async def scan_deep(
+        self,
+        ticker: str,
+        quote: Optional[Dict[str, Any]] = None,
+        technical: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
         """
         Deep scan (1-minute interval for hot tickers)
         Full analysis: technical, sentiment, news, options flow, dark pool
-        
+
+        Args:
+            ticker: Symbol to scan
+            quote: Prefetched quote; fetched here when None
+            technical: Prefetched technical analysis; fetched here when None
+
         Returns enriched signal dict if strong opportunity, else None
         """
         try:
             # Get all data sources concurrently
-            quote_task = enhanced_ticker_manager.get_real_time_quote(ticker)
-            technical_task = technical_analyzer.analyze_stock_technical(ticker)
+            quote_task = (
+                _resolved(quote)
+                if quote is not None
+                else enhanced_ticker_manager.get_real_time_quote(ticker)
+            )
+            technical_task = (
+                _resolved(technical)
+                if technical is not None
+                else technical_analyzer.analyze_stock_technical(ticker)
+            )
             sentiment_task = market_sentiment_analyzer.analyze_market_sentiment(ticker)
             news_task = self.news_aggregator.get_ticker_news(
                 ticker, sources=["alpha_vantage", "reddit"]
@@ -428,7 +481,7 @@ class UniverseScannerAgent:
                 f"signals:performance:{self.agent_id}",
                 {
                     "ticker": signal["ticker"],
-                    "score": signal["total_score"],
+                    "score": signal.get("total_score", 0),  # light: none
                     "confidence": signal["confidence"],
                 },
             )
@@ -457,6 +510,8 @@ class UniverseScannerAgent:
 
                     signal = await self.scan_light(ticker)
                     if signal:
+                        # Mark as hot ticker (upgrade to deep scan)
+                        self.hot_tickers.add(ticker)
                         await self.publish_signal(signal)
 
                     # Small delay between tickers
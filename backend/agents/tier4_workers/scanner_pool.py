@@ -4,6 +4,8 @@ Spawns and manages 167 UniverseScannerAgent instances (500 tickers total)
 
 Architecture:
 - 167 agents × 3 tickers = 501 capacity (500 used)
+- Shared ScanScheduler: hotness/staleness priority queue, batched data
+  fetches, global concurrency budget; agents are stateless workers
 - Load balancing: Distribute tickers evenly across agents
 - Health monitoring: Track agent status, auto-restart failures
 - Performance aggregation: Pool-level statistics
@@ -28,6 +30,7 @@ from typing import Any, Dict, List, Optional
 # Add backend to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from agents.tier4_workers.scan_scheduler import ScanDataProvider, ScanScheduler
 from agents.tier4_workers.scanner_agent import UniverseScannerAgent
 
 logger = logging.getLogger(__name__)
@@ -51,6 +54,7 @@ class UniverseScannerPool:
         tickers_per_agent: int = 3,
         light_interval: int = 300,  # 5 minutes
         deep_interval: int = 60,  # 1 minute
+        data_provider: Optional[ScanDataProvider] = None,
     ):
         """
         Initialize scanner pool
@@ -60,11 +64,17 @@ class UniverseScannerPool:
             tickers_per_agent: Tickers per agent (default: 3)
             light_interval: Light scan interval in seconds (default: 300)
             deep_interval: Deep scan interval in seconds (default: 60)
+            data_provider: Batched quotes/technicals source for the scheduler
+                (default: LiveScanDataProvider)
         """
         self.num_agents = num_agents
         self.tickers_per_agent = tickers_per_agent
         self.light_interval = light_interval
         self.deep_interval = deep_interval
+        self.data_provider = data_provider
+
+        # Shared scheduler (created on start_all)
+        self.scheduler: Optional[ScanScheduler] = None
 
         # Agent instances
         self.agents: List[UniverseScannerAgent] = []
@@ -248,7 +258,7 @@ class UniverseScannerPool:
         logger.info(f"[ScannerPool] Initialized {len(self.agents)} scanner agents")
 
     async def start_all(self):
-        """Start all scanner agents concurrently"""
+        """Start the shared scan scheduler and all agents as its workers"""
         if self.is_running:
             logger.warning("[ScannerPool] Already running")
             return
@@ -259,12 +269,20 @@ class UniverseScannerPool:
         self.is_running = True
         self.start_time = datetime.utcnow()
 
+        self.scheduler = ScanScheduler(
+            self.ticker_universe,
+            provider=self.data_provider,
+            light_interval=self.light_interval,
+            deep_interval=self.deep_interval,
+        )
+        self.agent_tasks["scan_scheduler"] = asyncio.create_task(self.scheduler.run())
+
         # Start all agents concurrently
         logger.info(f"[ScannerPool] Starting {len(self.agents)} agents...")
 
         for agent in self.agents:
-            # Create background task for each agent
-            task = asyncio.create_task(agent.start())
+            # Create background worker task for each agent
+            task = asyncio.create_task(self.scheduler.run_worker(agent))
             self.agent_tasks[agent.agent_id] = task
 
         logger.info(f"[ScannerPool] All {len(self.agents)} agents started")
@@ -305,9 +323,18 @@ class UniverseScannerPool:
 
                             # Restart agent
                             logger.info(f"[ScannerPool] Restarting agent {agent_id}...")
-                            new_task = asyncio.create_task(agent.start())
+                            new_task = asyncio.create_task(
+                                self.scheduler.run_worker(agent)
+                            )
                             self.agent_tasks[agent_id] = new_task
 
+                scheduler_task = self.agent_tasks.get("scan_scheduler")
+                if scheduler_task and scheduler_task.done():
+                    logger.error("[ScannerPool] Scan scheduler stopped, restarting")
+                    self.agent_tasks["scan_scheduler"] = asyncio.create_task(
+                        self.scheduler.run()
+                    )
+
                 # Sleep before next health check
                 await asyncio.sleep(60)  # Check every 60 seconds
 
@@ -320,6 +347,8 @@ class UniverseScannerPool:
         logger.info("[ScannerPool] Shutting down...")
 
         self.is_running = False
+        if self.scheduler:
+            self.scheduler.stop()
 
         # Cancel all agent tasks
         for agent_id, task in self.agent_tasks.items():
@@ -358,6 +387,9 @@ class UniverseScannerPool:
             total_false_positives += stats["false_positives"]
             hot_tickers.update(stats["hot_tickers"])
 
+        if self.scheduler:
+            hot_tickers.update(self.scheduler.hot_tickers)
+
         # Calculate pool metrics
         uptime = (
             (datetime.utcnow() - self.start_time).total_seconds()
@@ -384,6 +416,7 @@ class UniverseScannerPool:
             "win_rate": round(win_rate, 3),
             "uptime_seconds": round(uptime, 1),
             "uptime_hours": round(uptime / 3600, 2),
+            "scheduler": self.scheduler.get_stats() if self.scheduler else None,
         }
 
     def get_agent_stats(self, agent_id: str) -> Optional[Dict[str, Any]]:
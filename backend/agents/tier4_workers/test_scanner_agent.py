@@ -87,7 +87,7 @@ def test_light_scan_generates_signal():
             assert signal["ticker"] == "TSLA"
             assert signal["scan_type"] == "light"
             assert signal["confidence"] == 0.3
-            assert "TSLA" in scanner.hot_tickers
+            assert signal["upgrade_to_deep"]  # loops / scheduler mark it hot
 
     asyncio.run(run_test())
     print("✅ Test 2/6: Light scan generates signal")
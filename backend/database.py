@@ -1,40 +1,146 @@
 """
 FlowMind Mindfolios - Database Layer (SQLite)
 Production-ready SQLite database for mindfolios, transactions, and analytics
+
+Connections are pooled with thread affinity: each thread reuses one connection,
+opened once with the WAL/foreign-key pragmas applied. Hot queries use fixed SQL
+text so sqlite3's per-connection statement cache keeps them prepared. Async
+callers go through ``run_async``, which uses a bounded executor so the event
+loop never blocks on disk I/O.
 """
 
+import asyncio
 import os
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 # Database path
 DB_PATH = os.getenv("SQLITE_DB_PATH", "/app/data/flowmind.db")
+DB_EXECUTOR_WORKERS = int(os.getenv("SQLITE_EXECUTOR_WORKERS", "4"))
+DB_STATEMENT_CACHE = int(os.getenv("SQLITE_STATEMENT_CACHE", "256"))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
 
 # Ensure data directory exists
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
+# Hot statements (kept verbatim so the statement cache reuses them)
+SQL_MARK_ONE = "SELECT * FROM marks WHERE symbol = ?"
+SQL_MARKS_ALL = "SELECT * FROM marks"
+SQL_UPSERT_MARK = """
+    INSERT INTO marks (symbol, last, today_open, updated_at)
+    VALUES (?, ?, ?, datetime('now'))
+    ON CONFLICT(symbol) DO UPDATE SET
+    last = COALESCE(excluded.last, last),
+    today_open = COALESCE(excluded.today_open, today_open),
+    updated_at = datetime('now')
+"""
+SQL_INSERT_TRANSACTION = """
+    INSERT INTO transactions
+    (account_id, datetime, symbol, side, qty, price, fee, currency, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_TRANSACTION_BY_ID = "SELECT * FROM transactions WHERE id = ?"
+SQL_OAUTH_GET = "SELECT * FROM oauth_tokens WHERE provider = ?"
+SQL_OAUTH_UPSERT = """
+    INSERT INTO oauth_tokens (provider, access_token, refresh_token, expires_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(provider) DO UPDATE SET
+    access_token = excluded.access_token,
+    refresh_token = COALESCE(excluded.refresh_token, refresh_token),
+    expires_at = excluded.expires_at
+"""
+
+
+class ConnectionPool:
+    """One long-lived sqlite connection per thread."""
+
+    def __init__(self, db_path: str, statement_cache: int = DB_STATEMENT_CACHE):
+        self.db_path = db_path
+        self.statement_cache = statement_cache
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self.opened = 0
+
+    def _open(self) -> sqlite3.Connection:
+        # Affinity is enforced by the pool; the flag only lets close_all() run
+        conn = sqlite3.connect(
+            self.db_path,
+            cached_statements=self.statement_cache,
+            timeout=DB_BUSY_TIMEOUT_MS / 1000.0,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row  # Enable dict-like access
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+        with self._lock:
+            self._connections[threading.get_ident()] = conn
+            self.opened += 1
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+        return conn
+
+    def close_all(self):
+        """Close every pooled connection (threads reopen lazily)."""
+        with self._lock:
+            conns = list(self._connections.values())
+            self._connections.clear()
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+
+    def size(self) -> int:
+        return len(self._connections)
+
 
 class DatabaseManager:
-    def __init__(self, db_path: str = DB_PATH):
+    def __init__(
+        self, db_path: str = DB_PATH, executor_workers: int = DB_EXECUTOR_WORKERS
+    ):
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, executor_workers), thread_name_prefix="sqlite"
+        )
         self.init_database()
 
     @contextmanager
     def get_connection(self):
-        """Get database connection with proper cleanup"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable dict-like access
+        """Get this thread's pooled connection; rolls back on error"""
+        conn = self.pool.acquire()
         try:
             yield conn
-        finally:
-            conn.close()
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+    async def run_async(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking database call on the bounded sqlite executor.
+
+        Usage:
+            marks = await db.run_async(db.get_marks, "AAPL")
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.pool.close_all()
 
     def init_database(self):
         """Initialize database with complete schema"""
         with self.get_connection() as conn:
-            # Enable foreign keys and WAL mode
-            conn.execute("PRAGMA foreign_keys = ON")
+            # WAL is persistent in the file; foreign keys are set per connection
             conn.execute("PRAGMA journal_mode = WAL")
 
             # Execute complete DDL
@@ -226,41 +332,48 @@ class DatabaseManager:
         """Create new transaction"""
         with self.get_connection() as conn:
             cursor = conn.execute(
-                """
-                INSERT INTO transactions
-                (account_id, datetime, symbol, side, qty, price, fee, currency, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    transaction_data["account_id"],
-                    transaction_data["datetime"],
-                    transaction_data["symbol"],
-                    transaction_data["side"],
-                    transaction_data["qty"],
-                    transaction_data["price"],
-                    transaction_data.get("fee", 0),
-                    transaction_data.get("currency", "USD"),
-                    transaction_data.get("notes"),
-                ),
+                SQL_INSERT_TRANSACTION, self._transaction_params(transaction_data)
             )
             transaction_id = cursor.lastrowid
             conn.commit()
 
-            cursor = conn.execute(
-                "SELECT * FROM transactions WHERE id = ?", (transaction_id,)
-            )
+            cursor = conn.execute(SQL_TRANSACTION_BY_ID, (transaction_id,))
             return dict(cursor.fetchone())
 
+    def create_transactions(self, transactions: Iterable[Dict[str, Any]]) -> int:
+        """Insert many transactions in one executemany/commit; returns row count"""
+        rows = [self._transaction_params(t) for t in transactions]
+        if not rows:
+            return 0
+        with self.get_connection() as conn:
+            conn.executemany(SQL_INSERT_TRANSACTION, rows)
+            conn.commit()
+        return len(rows)
+
+    @staticmethod
+    def _transaction_params(transaction_data: Dict[str, Any]) -> tuple:
+        return (
+            transaction_data["account_id"],
+            transaction_data["datetime"],
+            transaction_data["symbol"],
+            transaction_data["side"],
+            transaction_data["qty"],
+            transaction_data["price"],
+            transaction_data.get("fee", 0),
+            transaction_data.get("currency", "USD"),
+            transaction_data.get("notes"),
+        )
+
     # Marks operations
     def get_marks(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get market prices"""
         with self.get_connection() as conn:
             if symbol:
-                cursor = conn.execute("SELECT * FROM marks WHERE symbol = ?", (symbol,))
+                cursor = conn.execute(SQL_MARK_ONE, (symbol,))
                 row = cursor.fetchone()
                 return [dict(row)] if row else []
             else:
-                cursor = conn.execute("SELECT * FROM marks")
+                cursor = conn.execute(SQL_MARKS_ALL)
                 return [dict(row) for row in cursor.fetchall()]
 
     def upsert_mark(
@@ -271,26 +384,24 @@ class DatabaseManager:
     ):
         """Insert or update market price"""
         with self.get_connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO marks (symbol, last, today_open, updated_at)
-                VALUES (?, ?, ?, datetime('now'))
-                ON CONFLICT(symbol) DO UPDATE SET
-                last = COALESCE(excluded.last, last),
-                today_open = COALESCE(excluded.today_open, today_open),
-                updated_at = datetime('now')
-                """,
-                (symbol, last, today_open),
-            )
+            conn.execute(SQL_UPSERT_MARK, (symbol, last, today_open))
             conn.commit()
 
+    def upsert_marks(self, marks: Iterable[Dict[str, Any]]) -> int:
+        """Batch upsert of {"symbol", "last", "today_open"} rows in one commit"""
+        rows = [(m["symbol"], m.get("last"), m.get("today_open")) for m in marks]
+        if not rows:
+            return 0
+        with self.get_connection() as conn:
+            conn.executemany(SQL_UPSERT_MARK, rows)
+            conn.commit()
+        return len(rows)
+
     # OAuth token operations
     def get_oauth_token(self, provider: str) -> Optional[Dict[str, Any]]:
         """Get OAuth token for provider"""
         with self.get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT * FROM oauth_tokens WHERE provider = ?", (provider,)
-            )
+            cursor = conn.execute(SQL_OAUTH_GET, (provider,))
             row = cursor.fetchone()
             return dict(row) if row else None
 
@@ -304,15 +415,7 @@ class DatabaseManager:
         """Insert or update OAuth token"""
         with self.get_connection() as conn:
             conn.execute(
-                """
-                INSERT INTO oauth_tokens (provider, access_token, refresh_token, expires_at)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(provider) DO UPDATE SET
-                access_token = excluded.access_token,
-                refresh_token = COALESCE(excluded.refresh_token, refresh_token),
-                expires_at = excluded.expires_at
-                """,
-                (provider, access_token, refresh_token, expires_at),
+                SQL_OAUTH_UPSERT, (provider, access_token, refresh_token, expires_at)
             )
             conn.commit()
 
@@ -351,3 +454,50 @@ class DatabaseManager:
 
 # Global instance
 db = DatabaseManager()
+
+
+if __name__ == "__main__":
+    # Microbenchmark: connection-per-call (previous behaviour) vs pooled
+    import sys
+    import tempfile
+    import time
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    bench = DatabaseManager(path)
+    bench.upsert_marks(
+        {"symbol": f"S{i}", "last": 100.0 + i, "today_open": 99.0} for i in range(500)
+    )
+
+    def per_call_connect(symbol):
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")
+            row = conn.execute(SQL_MARK_ONE, (symbol,)).fetchone()
+            return [dict(row)] if row else []
+        finally:
+            conn.close()
+
+    for label, fn in (
+        ("per-call connect", per_call_connect),
+        ("pooled", bench.get_marks),
+    ):
+        start = time.perf_counter()
+        for i in range(n):
+            fn(f"S{i % 500}")
+        elapsed = time.perf_counter() - start
+        print(f"{label:>16}: {n / elapsed:,.0f} queries/s")
+
+    rows = [{"symbol": f"B{i}", "last": float(i)} for i in range(n)]
+    start = time.perf_counter()
+    for r in rows[: n // 10]:
+        bench.upsert_mark(r["symbol"], r["last"])
+    single = (n // 10) / (time.perf_counter() - start)
+    start = time.perf_counter()
+    bench.upsert_marks(rows)
+    batched = n / (time.perf_counter() - start)
+    print(f"{'upsert single':>16}: {single:,.0f} rows/s")
+    print(f"{'upsert batched':>16}: {batched:,.0f} rows/s")
+    bench.close()
@@ -3,8 +3,10 @@ Expert Options Trading System with Machine Learning
 Implements 3 expert strategies with auto-optimization and learning capabilities
 """
 
+import asyncio
 import logging
 import statistics
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -12,6 +14,14 @@ from typing import Any, Dict, List, Optional
 
 import numpy as np
 
+from services.strategy_optimizer import (
+    PARAM_RANGES,
+    PriceIVHistory,
+    evaluate_population,
+    load_history,
+    optimize_strategy,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -75,6 +85,7 @@ class ExpertOptionsSystem:
         self.strategy_performance: Dict[StrategyType, Dict] = {}
         self.learning_parameters: Dict[StrategyType, Dict] = {}
         self.market_conditions: Dict[str, Any] = {}
+        self.last_optimization: Dict[StrategyType, Dict[str, Any]] = {}
 
         # Initialize learning parameters for each strategy
         self._initialize_learning_parameters()
@@ -506,9 +517,9 @@ class ExpertOptionsSystem:
             # Analyze performance metrics
             performance_data = self._analyze_strategy_performance(strategy_trades)
 
-            # Optimize parameters based on performance
-            optimized_params = self._genetic_algorithm_optimization(
-                strategy_type, strategy_trades
+            # Optimize parameters based on performance (CPU-bound, off the loop)
+            optimized_params = await asyncio.to_thread(
+                self._genetic_algorithm_optimization, strategy_type, strategy_trades
             )
 
             # Update learning parameters if improvement is significant
@@ -566,56 +577,59 @@ class ExpertOptionsSystem:
             "max_drawdown": min(pnls) if pnls else 0,
         }
 
+    def _history_for_trades(
+        self, trades: List[ExpertTrade]
+    ) -> Optional[PriceIVHistory]:
+        """Cached price/IV history for the most traded underlying"""
+        if not trades:
+            return None
+        symbol = Counter(t.underlying for t in trades).most_common(1)[0][0]
+        return load_history(symbol)
+
     def _genetic_algorithm_optimization(
-        self, strategy_type: StrategyType, trades: List[ExpertTrade]
+        self,
+        strategy_type: StrategyType,
+        trades: List[ExpertTrade],
+        history: Optional[PriceIVHistory] = None,
     ) -> Dict[str, Any]:
         """
         Use genetic algorithm to optimize strategy parameters
+
+        Each generation is backtested in one vectorized pass over price/IV
+        history; independent GA islands run in a process pool.
         """
-        # Simplified genetic algorithm for parameter optimization
         current_params = self.learning_parameters[strategy_type].copy()
 
-        # Define parameter ranges for optimization
-        if strategy_type == StrategyType.WHEEL:
-            param_ranges = {
-                "put_delta_target": (0.15, 0.40),
-                "profit_target_pct": (25, 75),
-                "max_dte": (21, 60),
-            }
-        elif strategy_type == StrategyType.IRON_CONDOR:
-            param_ranges = {
-                "target_delta": (0.10, 0.25),
-                "profit_target_pct": (15, 40),
-                "wing_width": (5, 20),
-            }
-        else:  # VOLATILITY_PLAY
-            param_ranges = {
-                "profit_target_pct": (50, 150),
-                "loss_limit_pct": (25, 75),
-                "max_dte": (7, 21),
-            }
-
-        # Simple optimization: try random variations and keep best performers
-        best_params = current_params.copy()
-        best_score = 0
-
-        for _ in range(50):  # 50 iterations
-            test_params = current_params.copy()
-
-            # Randomly modify parameters within ranges
-            for param, (min_val, max_val) in param_ranges.items():
-                if param in test_params:
-                    test_params[param] = np.random.uniform(min_val, max_val)
-
-            # Calculate score for these parameters (simplified)
-            score = self._evaluate_parameters(strategy_type, test_params, trades)
+        history = history or self._history_for_trades(trades)
+        if history is None:
+            logger.info(
+                f"No price history for {strategy_type.value} optimization, "
+                "keeping current parameters"
+            )
+            return current_params
 
-            if score > best_score:
-                best_score = score
-                best_params.update(
-                    {k: v for k, v in test_params.items() if k in param_ranges}
-                )
+        result = optimize_strategy(
+            strategy_type.value,
+            history,
+            current_params,
+            weights=current_params.get("learning_weights"),
+        )
+        self.last_optimization[strategy_type] = result.summary()
+        logger.info(
+            f"Optimized {strategy_type.value}: score {result.baseline_score:.3f} -> "
+            f"{result.best_score:.3f} ({result.evaluated} candidates, "
+            f"{result.candidates_per_sec:.0f}/s)"
+        )
 
+        best_params = current_params.copy()
+        if result.best_score > result.baseline_score:
+            ranges = PARAM_RANGES[strategy_type.value]
+            best_params.update(
+                {
+                    k: int(v) if ranges[k][2] else round(v, 4)
+                    for k, v in result.best_params.items()
+                }
+            )
         return best_params
 
     def _evaluate_parameters(
@@ -623,16 +637,25 @@ class ExpertOptionsSystem:
         strategy_type: StrategyType,
         params: Dict[str, Any],
         trades: List[ExpertTrade],
+        history: Optional[PriceIVHistory] = None,
     ) -> float:
         """
-        Evaluate parameter set based on historical performance
+        Evaluate parameter set by backtesting it over price/IV history
+
+        Falls back to scoring the realized trade history when no price
+        history is available.
         """
-        # Simplified evaluation - in production would backtest with new parameters
         weights = params.get(
             "learning_weights",
             {"win_rate": 0.5, "profit_factor": 0.3, "sharpe_ratio": 0.2},
         )
 
+        history = history or self._history_for_trades(trades)
+        if history is not None:
+            return float(
+                evaluate_population(strategy_type.value, history, [params], weights)[0]
+            )
+
         performance = self._analyze_strategy_performance(trades)
 
         score = 0
@@ -717,6 +740,11 @@ class ExpertOptionsSystem:
                 "last_optimization": datetime.now().isoformat(),
                 "parameter_version": "1.0",
             }
+            for optimized_type, summary in self.last_optimization.items():
+                insights["optimization_status"].setdefault(optimized_type.value, {})
+                insights["optimization_status"][optimized_type.value][
+                    "last_run"
+                ] = summary
 
             # Market insights
             insights["market_insights"] = {
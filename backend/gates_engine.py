@@ -2,7 +2,7 @@ import hashlib
 import json
 import time
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 from pydantic import BaseModel
 
@@ -126,6 +126,19 @@ class GateDecision(BaseModel):
     results: List[GateResult]
 
 
+class GateStats(BaseModel):
+    evaluated: int = 0
+    failed: int = 0
+    skipped: int = 0  # candidate already rejected by a blocking gate
+
+
+class GateBatchDecision(BaseModel):
+    decisions: List[GateDecision]
+    auditHashes: List[str]
+    frozenTs: int
+    stats: Dict[str, GateStats]  # by gate name
+
+
 DEFAULT_CONFIG = GateConfig()
 
 
@@ -140,9 +153,11 @@ def gate_tradeability(ctx: TradeContext, cfg: GateConfig) -> GateResult:
     )
 
 
-def gate_data_freshness(ctx: TradeContext, cfg: GateConfig) -> GateResult:
-    """Gate 2: Quote data must be fresh"""
-    now = int(time.time() * 1000)
+def gate_data_freshness(
+    ctx: TradeContext, cfg: GateConfig, now_ms: Optional[int] = None
+) -> GateResult:
+    """Gate 2: Quote data must be fresh (as of now_ms, default: now)"""
+    now = int(time.time() * 1000) if now_ms is None else now_ms
     max_age = cfg.maxQuoteAgeMs
 
     stale_quotes = []
@@ -366,3 +381,232 @@ def audit_hash(payload: Dict[str, Any]) -> str:
     """Generate stable audit hash"""
     json_str = json.dumps(payload, sort_keys=True, separators=(",", ":"))
     return hashlib.sha256(json_str.encode()).hexdigest()[:16]
+
+
+# ---------- Batch evaluation ----------
+
+# Batch order: blocking gates first, cheapest first. Once a candidate fails a
+# BLOCK gate its decision is REJECT, so the remaining gates are skipped.
+GATE_COST = {
+    gate_tradeability: 0,
+    gate_max_positions: 0,
+    gate_buying_power: 0,
+    gate_data_freshness: 1,
+}
+_GATE_NAMES: Dict[Callable, str] = {}
+
+
+def _gate_name(gate: Callable) -> str:
+    return _GATE_NAMES.get(gate) or gate.__name__.replace("gate_", "", 1)
+
+
+def _decide(results: List[GateResult]) -> str:
+    if any(r.severity == Severity.BLOCK and not r.passed for r in results):
+        return "REJECT"
+    if any(r.severity == Severity.WARN and not r.passed for r in results):
+        return "ALLOW_WITH_WARNINGS"
+    return "ALLOW"
+
+
+def evaluate_gates_batch(
+    contexts: Sequence[TradeContext],
+    cfg: GateConfig = DEFAULT_CONFIG,
+    frozen_ts: Optional[int] = None,
+) -> GateBatchDecision:
+    """
+    Evaluate ALL_GATES for many candidates, gate by gate
+    Decisions match evaluate_gates; a rejected candidate's results hold only
+    the gates run before (and including) its first blocking failure.
+    All candidates are judged as of one timestamp, which is also the frozenTs
+    of their audit hashes.
+    """
+    now = int(time.time() * 1000) if frozen_ts is None else frozen_ts
+    order = sorted(range(len(ALL_GATES)), key=lambda i: GATE_COST.get(ALL_GATES[i], 9))
+    slots: List[List[Optional[GateResult]]] = [
+        [None] * len(ALL_GATES) for _ in contexts
+    ]
+    alive = list(range(len(contexts)))
+    stats: Dict[str, GateStats] = {}
+
+    for g in order:
+        gate = ALL_GATES[g]
+        survivors = []
+        gate_stats = GateStats(skipped=len(contexts) - len(alive))
+        for i in alive:
+            if gate is gate_data_freshness:
+                r = gate(contexts[i], cfg, now_ms=now)
+            else:
+                r = gate(contexts[i], cfg)
+            slots[i][g] = r
+            gate_stats.evaluated += 1
+            if not r.passed:
+                gate_stats.failed += 1
+                if r.severity == Severity.BLOCK:
+                    continue
+            survivors.append(i)
+        if alive:
+            _GATE_NAMES.setdefault(gate, slots[alive[0]][g].gateName)
+        name = _gate_name(gate)
+        if name in stats:  # two gates share a name
+            prev = stats[name]
+            gate_stats = GateStats(
+                evaluated=prev.evaluated + gate_stats.evaluated,
+                failed=prev.failed + gate_stats.failed,
+                skipped=prev.skipped + gate_stats.skipped,
+            )
+        stats[name] = gate_stats
+        alive = survivors
+
+    decisions = []
+    for row in slots:
+        results = [r for r in row if r is not None]
+        decisions.append(GateDecision(decision=_decide(results), results=results))
+
+    hasher = AuditHasher(now)
+    return GateBatchDecision(
+        decisions=decisions,
+        auditHashes=[hasher.hash(ctx) for ctx in contexts],
+        frozenTs=now,
+        stats=stats,
+    )
+
+
+def audit_payload(ctx: TradeContext, frozen_ts: int) -> Dict[str, Any]:
+    """Canonical audit fields of a trade context (preview audit layout)"""
+    u = ctx.underlyingQuote
+    return {
+        "mode": ctx.mode.value,
+        "strategy": ctx.strategy,
+        "underlying": ctx.underlying,
+        "legs": [
+            {
+                "side": leg.side.value,
+                "type": leg.type.value,
+                "expiry": leg.expiry,
+                "strike": leg.strike,
+                "qty": leg.qty,
+            }
+            for leg in ctx.legs
+        ],
+        "u": {"bid": u.bid, "ask": u.ask, "last": u.last, "tsMs": u.tsMs},
+        "frozenTs": frozen_ts,
+    }
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+class AuditHasher:
+    """
+    Incremental audit hashes for a batch frozen at one timestamp
+    Same digest as audit_hash(audit_payload(ctx, frozen_ts)): the canonical
+    JSON is fed to sha256 field by field in sorted-key order. The shared
+    '{"frozenTs":..' prefix is hashed once, and leg / underlying-quote
+    fragments are serialized once per distinct (typed) value.
+    """
+
+    def __init__(self, frozen_ts: int):
+        self._prefix = hashlib.sha256(
+            ('{"frozenTs":' + _canonical(frozen_ts) + ',"legs":[').encode()
+        )
+        self._legs: Dict[tuple, str] = {}
+        self._quotes: Dict[tuple, str] = {}
+
+    def _leg(self, leg: Leg) -> str:
+        key = (leg.side, leg.type, leg.expiry, leg.strike, leg.qty)
+        frag = self._legs.get(key)
+        if frag is None:
+            frag = self._legs[key] = _canonical(
+                {
+                    "side": leg.side.value,
+                    "type": leg.type.value,
+                    "expiry": leg.expiry,
+                    "strike": leg.strike,
+                    "qty": leg.qty,
+                }
+            )
+        return frag
+
+    def _quote(self, u: Quote) -> str:
+        key = (u.bid, u.ask, u.last, u.tsMs)
+        frag = self._quotes.get(key)
+        if frag is None:
+            frag = self._quotes[key] = _canonical(
+                {"bid": u.bid, "ask": u.ask, "last": u.last, "tsMs": u.tsMs}
+            )
+        return frag
+
+    def hash(self, ctx: TradeContext) -> str:
+        h = self._prefix.copy()
+        h.update(
+            (
+                ",".join(self._leg(leg) for leg in ctx.legs)
+                + '],"mode":'
+                + _canonical(ctx.mode.value)
+                + ',"strategy":'
+                + _canonical(ctx.strategy)
+                + ',"u":'
+                + self._quote(ctx.underlyingQuote)
+                + ',"underlying":'
+                + _canonical(ctx.underlying)
+                + "}"
+            ).encode()
+        )
+        return h.hexdigest()[:16]
+
+
+if __name__ == "__main__":
+    import random
+
+    rng = random.Random(4)
+    now_ms = int(time.time() * 1000)
+
+    def candidate(i: int) -> TradeContext:
+        ts = now_ms - (120_000 if rng.random() < 0.1 else 1_000)
+        strikes = rng.sample(range(200, 300, 5), 2)
+        return TradeContext(
+            mode=Mode.SIM,
+            strategy="BULL_CALL_SPREAD",
+            underlying=rng.choice(["TSLA", "AAPL", "NVDA"]),
+            underlyingQuote=Quote(bid=250.0, ask=250.2, last=250.1, tsMs=now_ms),
+            legs=[
+                Leg(
+                    side=side,
+                    type=OptionType.CALL,
+                    expiry="2025-12-19",
+                    strike=k,
+                    qty=1,
+                    quote=Quote(bid=2.5, ask=rng.choice([2.7, 3.5]), tsMs=ts),
+                )
+                for side, k in zip((Side.BUY, Side.SELL), strikes)
+            ],
+            mindfolio=MindfolioGreeks(delta=rng.uniform(-1, 1)),
+            account=AccountState(tradeable=rng.random() < 0.9),
+            market=MarketMetrics(ivRank=rng.uniform(0, 100)),
+            session=SessionInfo(),
+            events=Events(),
+            openPositionsBySymbol={"TSLA": rng.randint(0, 6)},
+            estMaxLoss=rng.uniform(100, 800_000),
+        )
+
+    contexts = [candidate(i) for i in range(1000)]
+
+    start = time.perf_counter()
+    single = [evaluate_gates(ctx) for ctx in contexts]
+    hashes = [audit_hash(audit_payload(ctx, now_ms)) for ctx in contexts]
+    t_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = evaluate_gates_batch(contexts, frozen_ts=now_ms)
+    t_batch = time.perf_counter() - start
+
+    assert [d.decision for d in batch.decisions] == [d.decision for d in single]
+    assert batch.auditHashes == hashes
+    print(f"{len(contexts)} candidates")
+    print(f"  evaluate_gates + audit_hash: {t_single * 1000:7.1f}ms")
+    print(f"  evaluate_gates_batch:        {t_batch * 1000:7.1f}ms")
+    for name, s in batch.stats.items():
+        print(
+            f"    {name:<18} {s.evaluated:>5} run {s.failed:>4} failed {s.skipped:>4} skipped"
+        )
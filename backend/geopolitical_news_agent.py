@@ -13,12 +13,98 @@ Three-level analysis:
 3. INTEGRATION: Stocks + Options + News combined insights
 """
 
+import asyncio
 import logging
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.text_engine import SentimentLexicon
 
 logger = logging.getLogger(__name__)
 
+# Headline keywords, compiled once into a single Aho-Corasick matcher
+HEADLINE_LEXICON = SentimentLexicon(
+    ["beat", "surge", "gain", "up", "profit", "growth", "strong", "upgrade"],
+    ["miss", "fall", "down", "loss", "weak", "concern", "probe", "downgrade"],
+)
+
+# Digest fan-out and per-stage budgets (seconds)
+GEO_DIGEST_CONCURRENCY = int(os.getenv("GEO_DIGEST_CONCURRENCY", "8"))
+GEO_INTEL_CACHE_TTL = float(os.getenv("GEO_INTEL_CACHE_TTL", "300"))
+GEO_NEWS_TIMEOUT = float(os.getenv("GEO_NEWS_TIMEOUT", "2.0"))
+GEO_STAGE_TIMEOUT = float(os.getenv("GEO_STAGE_TIMEOUT", "1.0"))
+
+
+class TickerIntelCache:
+    """
+    Per-symbol intelligence cache shared across mindfolios and the API
+
+    Entries expire after ttl seconds. Concurrent misses for the same key
+    share one computation.
+    """
+
+    def __init__(self, ttl: float = GEO_INTEL_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[Tuple, Tuple[float, Dict]] = {}
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    async def get_or_compute(
+        self, key: Tuple, compute: Callable[[], Awaitable[Dict]]
+    ) -> Dict:
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.stats["hits"] += 1
+            return entry[1]
+
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is loop:
+            self.stats["hits"] += 1
+            return await asyncio.shield(inflight)
+
+        self.stats["misses"] += 1
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else waits
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        # Partial results (a stage timed out) are served but not cached
+        if not value.get("partial"):
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, symbol: Optional[str] = None):
+        if symbol is None:
+            self._entries.clear()
+        else:
+            for key in [k for k in self._entries if k[0] == symbol.upper()]:
+                del self._entries[key]
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, "entries": len(self._entries), "ttl": self.ttl}
+
+
+_intel_cache = TickerIntelCache()
+
+
+def get_intel_cache() -> TickerIntelCache:
+    """Shared per-symbol intelligence cache"""
+    return _intel_cache
+
 
 class GeopoliticalNewsAgent:
     """
@@ -26,11 +112,22 @@ class GeopoliticalNewsAgent:
     Provides mindfolio-level and ticker-level intelligence
     """
 
-    def __init__(self, uw_client=None):
+    def __init__(
+        self,
+        uw_client=None,
+        intel_cache: Optional[TickerIntelCache] = None,
+        digest_concurrency: int = GEO_DIGEST_CONCURRENCY,
+        news_timeout: float = GEO_NEWS_TIMEOUT,
+        stage_timeout: float = GEO_STAGE_TIMEOUT,
+    ):
         """
         Initialize with Unusual Whales client for news data
         """
         self.uw_client = uw_client
+        self.intel_cache = intel_cache or get_intel_cache()
+        self.digest_concurrency = digest_concurrency
+        self.news_timeout = news_timeout
+        self.stage_timeout = stage_timeout
 
     async def get_macro_news(self) -> Dict:
         """
@@ -88,16 +185,25 @@ class GeopoliticalNewsAgent:
             return self._get_fallback_macro_news()
 
     async def get_ticker_news_with_sentiment(
-        self, symbol: str, include_fis: bool = True, include_options: bool = True
+        self,
+        symbol: str,
+        include_fis: bool = True,
+        include_options: bool = True,
+        use_cache: bool = True,
     ) -> Dict:
         """
         Get ticker-specific news with AI sentiment analysis
         Optionally include Investment Scoring and Options suggestions
 
+        Results come from the shared per-symbol cache when fresh. Each stage
+        (news, FIS, options) has its own timeout; a stage that times out is
+        left empty and the result is flagged "partial" (and not cached).
+
         Args:
         symbol: Stock ticker (e.g., "TSLA")
         include_fis: Include FIS score
         include_options: Include options strategy suggestions
+        use_cache: Serve from / store in the shared intelligence cache
 
         Returns:
         {
@@ -111,13 +217,43 @@ class GeopoliticalNewsAgent:
         "trading_recommendation": str
         }
         """
+        if not use_cache:
+            return await self._build_ticker_intel(symbol, include_fis, include_options)
+
+        # Without a UW client the result is demo news; keep it apart from real
+        # intel so a client-less prewarm is never served to a caller with one
+        key = (symbol.upper(), include_fis, include_options, self.uw_client is not None)
+        return await self.intel_cache.get_or_compute(
+            key,
+            lambda: self._build_ticker_intel(symbol, include_fis, include_options),
+        )
+
+    async def _with_timeout(self, stage: str, coro, default, timed_out: List[str]):
+        """Await one stage within stage_timeout; default on timeout"""
+        try:
+            return await asyncio.wait_for(coro, timeout=self.stage_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{stage} timed out after {self.stage_timeout}s")
+            timed_out.append(stage)
+            return default
+
+    async def _build_ticker_intel(
+        self, symbol: str, include_fis: bool, include_options: bool
+    ) -> Dict:
         try:
+            timed_out: List[str] = []
+
             # Fetch news from Unusual Whales
             news_items = []
             if self.uw_client:
                 try:
-                    uw_news = await self.uw_client.get_news(symbol)
+                    uw_news = await asyncio.wait_for(
+                        self.uw_client.get_news(symbol), timeout=self.news_timeout
+                    )
                     news_items = uw_news.get("items", [])
+                except asyncio.TimeoutError:
+                    logger.warning(f"UW news fetch timed out for {symbol}")
+                    timed_out.append("news")
                 except Exception as e:
                     logger.warning(f"UW news fetch failed for {symbol}: {e}")
 
@@ -141,27 +277,62 @@ class GeopoliticalNewsAgent:
                 "last_updated": datetime.now().isoformat(),
             }
 
-            # Add Investment Scoring if requested
+            # Investment Scoring and options suggestions run concurrently
+            stages = {}
             if include_fis:
-                result["fis_score"] = await self._get_fis_score(symbol)
-
-            # Add options suggestions if requested
+                stages["fis_score"] = self._with_timeout(
+                    "fis", self._get_fis_score(symbol), None, timed_out
+                )
             if include_options:
-                result["options_suggestions"] = await self._get_options_suggestions(
-                    symbol, sentiment_score
+                stages["options_suggestions"] = self._with_timeout(
+                    "options",
+                    self._get_options_suggestions(symbol, sentiment_score),
+                    [],
+                    timed_out,
                 )
+            if stages:
+                values = await asyncio.gather(*stages.values())
+                result.update(zip(stages.keys(), values))
 
             # Generate trading recommendation
             result["trading_recommendation"] = self._generate_recommendation(
                 sentiment_score, result.get("fis_score"), impact_level
             )
 
+            if timed_out:
+                result["partial"] = True
+                result["timed_out"] = timed_out
+
             return result
 
         except Exception as e:
             logger.error(f"Failed to get ticker news for {symbol}: {e}")
             return self._get_fallback_ticker_news(symbol)
 
+    async def _gather_ticker_intel(self, symbols: Iterable[str]) -> Dict[str, Dict]:
+        """Fan out ticker intelligence with bounded parallelism"""
+        semaphore = asyncio.Semaphore(self.digest_concurrency)
+
+        async def one(symbol: str) -> Dict:
+            async with semaphore:
+                return await self.get_ticker_news_with_sentiment(
+                    symbol, include_fis=True, include_options=True
+                )
+
+        unique = list(dict.fromkeys(s for s in symbols if s))
+        results = await asyncio.gather(*(one(s) for s in unique))
+        return dict(zip(unique, results))
+
+    async def prewarm(self, symbols: Iterable[str]) -> int:
+        """
+        Fill the intelligence cache for symbols (e.g. all held positions)
+
+        Returns:
+            Number of symbols with complete (non-partial) intelligence
+        """
+        intel = await self._gather_ticker_intel(symbols)
+        return sum(1 for t in intel.values() if not t.get("partial"))
+
     async def get_mindfolio_news_digest(
         self, mindfolio_id: str, positions: List[Dict]
     ) -> Dict:
@@ -183,26 +354,16 @@ class GeopoliticalNewsAgent:
         }
         """
         try:
-            # Get macro events
-            macro_events = await self.get_macro_news()
+            # Macro events and per-ticker intelligence fetched concurrently
+            macro_events, ticker_news = await asyncio.gather(
+                self.get_macro_news(),
+                self._gather_ticker_intel(p.get("symbol") for p in positions),
+            )
 
-            # Get news for each ticker in mindfolio
-            ticker_news = {}
             risk_alerts = []
             opportunities = []
 
-            for position in positions:
-                symbol = position.get("symbol")
-                if not symbol:
-                    continue
-
-                # Get ticker news with full integration
-                ticker_intel = await self.get_ticker_news_with_sentiment(
-                    symbol, include_fis=True, include_options=True
-                )
-
-                ticker_news[symbol] = ticker_intel
-
+            for symbol, ticker_intel in ticker_news.items():
                 # Generate risk alerts for significant negative news
                 if ticker_intel["aggregate_sentiment"] < -0.5:
                     risk_alerts.append(
@@ -253,6 +414,7 @@ class GeopoliticalNewsAgent:
                 "total_news_items": sum(
                     len(t.get("news_items", [])) for t in ticker_news.values()
                 ),
+                "partial": any(t.get("partial") for t in ticker_news.values()),
                 "last_updated": datetime.now().isoformat(),
             }
 
@@ -269,35 +431,10 @@ class GeopoliticalNewsAgent:
 
         # Simple sentiment scoring based on keywords
         # In production, use NLP/LLM for better accuracy
-        positive_keywords = [
-            "beat",
-            "surge",
-            "gain",
-            "up",
-            "profit",
-            "growth",
-            "strong",
-            "upgrade",
-        ]
-        negative_keywords = [
-            "miss",
-            "fall",
-            "down",
-            "loss",
-            "weak",
-            "concern",
-            "probe",
-            "downgrade",
-        ]
-
         total_score = 0
         for item in news_items:
-            headline = item.get("headline", "").lower()
-
-            pos_count = sum(1 for kw in positive_keywords if kw in headline)
-            neg_count = sum(1 for kw in negative_keywords if kw in headline)
-
-            total_score += pos_count - neg_count
+            match = HEADLINE_LEXICON.match(item.get("headline", ""))
+            total_score += match.bullish_weight - match.bearish_weight
 
         # Normalize to -1 to +1
         max_score = len(news_items) * 3  # Max 3 keywords per headline
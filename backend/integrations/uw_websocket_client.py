@@ -57,6 +57,10 @@ class UWWebSocketClient:
         self.running = False
         self.reconnect_attempt = 0
         self.message_handlers: Dict[str, Callable] = {}
+        # Listeners receive every message, independent of channel handlers
+        self.listeners: List[Callable] = []
+        # Channels kept joined even when their handler is removed
+        self.persistent_channels: set = set()
         self.last_message_time = datetime.now()
 
     async def connect(self) -> bool:
@@ -112,16 +116,54 @@ class UWWebSocketClient:
         await self.ws.send(json.dumps(subscribe_msg))
         logger.info(f"📡 Subscribed to channel: {channel}")
 
+    async def subscribe_persistent(self, channel: str):
+        """
+        Join a channel that stays subscribed for background consumers
+        (e.g. the flow event store) regardless of frontend handlers.
+
+        Args:
+            channel: Channel name
+
+        Raises:
+            RuntimeError: If not connected to WebSocket
+        """
+        if not self.ws:
+            raise RuntimeError("Not connected to WebSocket")
+
+        if channel not in self.persistent_channels:
+            self.persistent_channels.add(channel)
+            if channel not in self.message_handlers:
+                await self.ws.send(json.dumps({"channel": channel, "msg_type": "join"}))
+            logger.info(f"📡 Persistent subscription: {channel}")
+
+    def add_listener(self, callback: Callable[[str, Any], Any]):
+        """
+        Register a callback invoked with (channel, payload) for every message.
+
+        Args:
+            callback: Sync or async function
+        """
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+
     async def unsubscribe(self, channel: str):
         """
         Unsubscribe from a channel.
 
+        Persistent channels keep their UW subscription; only the handler
+        is removed.
+
         Args:
             channel: Channel name to unsubscribe from
         """
         if not self.ws:
             return
 
+        if channel in self.persistent_channels:
+            self.message_handlers.pop(channel, None)
+            logger.info(f"📡 Handler removed, keeping persistent channel: {channel}")
+            return
+
         # Send unsubscribe message
         unsubscribe_msg = {"channel": channel, "msg_type": "leave"}
 
@@ -159,6 +201,15 @@ class UWWebSocketClient:
                             f"📬 Received on {channel}: {str(payload)[:100]}..."
                         )
 
+                    for listener in self.listeners:
+                        try:
+                            if asyncio.iscoroutinefunction(listener):
+                                await listener(channel, payload)
+                            else:
+                                listener(channel, payload)
+                        except Exception as e:
+                            logger.error(f"Error in listener for {channel}: {e}")
+
                     # Dispatch to registered handler
                     if channel in self.message_handlers:
                         try:
@@ -170,7 +221,7 @@ class UWWebSocketClient:
                                 callback(channel, payload)
                         except Exception as e:
                             logger.error(f"Error in callback for {channel}: {e}")
-                    else:
+                    elif channel not in self.persistent_channels:
                         logger.debug(f"No handler registered for channel: {channel}")
                 else:
                     logger.warning(f"Unexpected message format: {data}")
@@ -237,7 +288,7 @@ class UWWebSocketClient:
 
         if success:
             # Resubscribe to all channels
-            channels = list(self.message_handlers.keys())
+            channels = list(set(self.message_handlers) | self.persistent_channels)
             logger.info(f"Resubscribing to {len(channels)} channels...")
 
             for channel in channels:
@@ -273,6 +324,7 @@ class UWWebSocketClient:
 
         self.ws = None
         self.message_handlers.clear()
+        self.persistent_channels.clear()
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -288,6 +340,8 @@ class UWWebSocketClient:
             "running": self.running,
             "reconnect_attempts": self.reconnect_attempt,
             "subscribed_channels": list(self.message_handlers.keys()),
+            "persistent_channels": sorted(self.persistent_channels),
+            "listener_count": len(self.listeners),
             "channel_count": len(self.message_handlers),
             "last_message_seconds_ago": round(time_since_message, 1),
             "connection_uri": "wss://api.unusualwhales.com/socket",
@@ -5,10 +5,17 @@ Uses Unusual Whales data to generate comprehensive investment scores with ML-enh
 
 import asyncio
 import logging
+import math
 import statistics
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from services.flow_store import (
+    FlowAggregates,
+    FlowEventStore,
+    get_flow_store,
+    normalize_darkpool_event,
+)
 from unusual_whales_service_clean import UnusualWhalesService
 
 # Configure logging
@@ -61,6 +68,9 @@ class InvestmentScoringAgent:
         # Confidence thresholds
         self.confidence_thresholds = {"high": 0.75, "medium": 0.50, "low": 0.25}
 
+        # Raw events pulled from the flow store for list-based analyses
+        self.flow_store_event_limit = 500
+
     async def generate_investment_score(
         self, symbol: str, user_context: Optional[Dict] = None
     ) -> Dict[str, Any]:
@@ -136,7 +146,14 @@ class InvestmentScoringAgent:
             }
 
     async def _fetch_uw_data(self, symbol: str) -> Dict[str, Any]:
-        """Fetch all relevant data from Unusual Whales API concurrently."""
+        """Fetch all relevant data, preferring the local flow store over REST."""
+        store = get_flow_store()
+        flow_aggregates = (
+            store.get_aggregates(symbol) if store.is_live() else None
+        )
+        if flow_aggregates is not None:
+            return await self._fetch_from_flow_store(symbol, store, flow_aggregates)
+
         try:
             # Fetch all UW data sources in parallel for efficiency
             tasks = [
@@ -155,6 +172,7 @@ class InvestmentScoringAgent:
                 "dark_pool": dark_pool.get("data", []) if isinstance(dark_pool, dict) else [],
                 "congressional": congressional.get("data", []) if isinstance(congressional, dict) else [],
                 "strategies": [],
+                "flow_aggregates": None,
             }
 
             logger.info(
@@ -172,8 +190,38 @@ class InvestmentScoringAgent:
                 "dark_pool": [],
                 "congressional": [],
                 "strategies": [],
+                "flow_aggregates": None,
             }
 
+    async def _fetch_from_flow_store(
+        self, symbol: str, store: FlowEventStore, flow_aggregates: FlowAggregates
+    ) -> Dict[str, Any]:
+        """Build uw_data from the streamed flow store; only insider data uses REST."""
+        try:
+            congressional = await self.uw_service.get_insider_ticker(symbol)
+        except Exception as e:
+            logger.error(f"Error fetching insider data for {symbol}: {str(e)}")
+            congressional = {}
+
+        data = {
+            "options_flow": store.get_events(
+                symbol, kind="flow", limit=self.flow_store_event_limit
+            ),
+            "dark_pool": store.get_events(
+                symbol, kind="darkpool", limit=self.flow_store_event_limit
+            ),
+            "congressional": congressional.get("data", []) if isinstance(congressional, dict) else [],
+            "strategies": [],
+            "flow_aggregates": flow_aggregates,
+        }
+
+        logger.info(
+            f"Flow store data for {symbol}: Flow={flow_aggregates.flow_count}, "
+            f"DarkPool={flow_aggregates.darkpool_count}, "
+            f"Congressional={len(data['congressional'])}"
+        )
+        return data
+
     def _filter_options_for_symbol(
         self, options_data: List[Dict], symbol: str
     ) -> List[Dict]:
@@ -239,12 +287,12 @@ class InvestmentScoringAgent:
         ] = await self._analyze_discount_opportunity(uw_data, symbol)
 
         signal_scores["options_flow_bullish"] = self._analyze_options_flow(
-            uw_data["options_flow"]
+            uw_data["options_flow"], uw_data.get("flow_aggregates")
         )
 
         # 3. Dark Pool Activity
         signal_scores["dark_pool_strength"] = self._analyze_dark_pool(
-            uw_data["dark_pool"]
+            uw_data["dark_pool"], uw_data.get("flow_aggregates")
         )
 
         # 4. Congressional Activity
@@ -337,8 +385,16 @@ class InvestmentScoringAgent:
             logger.error(f"Error analyzing discount opportunity for {symbol}: {str(e)}")
             return 50.0
 
-    def _analyze_options_flow(self, options_flow: List[Dict]) -> float:
+    def _analyze_options_flow(
+        self,
+        options_flow: List[Dict],
+        aggregates: Optional[FlowAggregates] = None,
+    ) -> float:
         """Analyze options flow sentiment and magnitude."""
+        if aggregates is not None:
+            # Rolling totals from the flow store (O(1))
+            return aggregates.bullish_pct
+
         if not options_flow:
             return 50.0  # Neutral
 
@@ -377,29 +433,34 @@ class InvestmentScoringAgent:
             logger.error(f"Error analyzing options flow: {str(e)}")
             return 50.0
 
-    def _analyze_dark_pool(self, dark_pool: List[Dict]) -> float:
-        """Analyze dark pool activity strength."""
-        if not dark_pool:
+    def _analyze_dark_pool(
+        self,
+        dark_pool: List[Dict],
+        aggregates: Optional[FlowAggregates] = None,
+    ) -> float:
+        """Analyze dark pool activity strength from print size and notional."""
+        if aggregates is None:
+            # Same normalization the flow store applies to off-lit prints
+            aggregates = FlowAggregates()
+            for dp in dark_pool or []:
+                event = normalize_darkpool_event(dp, 0.0)
+                if event is not None:
+                    aggregates.add_event(event)
+
+        if aggregates.darkpool_count == 0 or aggregates.darkpool_notional <= 0:
             return 50.0
 
         try:
-            # Analyze dark pool volume and price impact
-            total_volume = sum(dp.get("volume", 0) for dp in dark_pool)
-            dark_volume = sum(dp.get("dark_pool_volume", 0) for dp in dark_pool)
+            # Higher off-lit notional and larger prints indicate institutional
+            # interest. Scale: $1M total → 50, every 10x adds 20 points;
+            # $250K average print → 50, every 10x adds 20 points.
+            notional = aggregates.darkpool_notional
+            avg_print = notional / aggregates.darkpool_count
+            notional_score = 50 + 20 * math.log10(notional / 1_000_000)
+            block_score = 50 + 20 * math.log10(avg_print / 250_000)
 
-            if total_volume == 0:
-                return 50.0
-
-            dark_pool_pct = (dark_volume / total_volume) * 100
-
-            # Higher dark pool percentage indicates institutional interest
-            # Scale: 0-20% dark pool → 30-70 score, >20% → 70-100 score
-            if dark_pool_pct < 20:
-                score = 30 + (dark_pool_pct / 20) * 40
-            else:
-                score = 70 + min((dark_pool_pct - 20) / 30 * 30, 30)
-
-            return min(100.0, score)
+            score = 0.6 * notional_score + 0.4 * block_score
+            return max(0.0, min(100.0, score))
 
         except Exception as e:
             logger.error(f"Error analyzing dark pool: {str(e)}")
@@ -1294,7 +1355,9 @@ class InvestmentScoringAgent:
         options_data = uw_data["options_flow"]
         if options_data:
             # Look for contrarian opportunities
-            put_call_ratio = self._calculate_put_call_ratio(options_data)
+            put_call_ratio = self._calculate_put_call_ratio(
+                options_data, uw_data.get("flow_aggregates")
+            )
             if put_call_ratio > 1.5:  # High fear = discount opportunity
                 fear_score = min(100, 60 + put_call_ratio * 15)
                 discount_factors.append(("fear_discount", fear_score, 0.2))
@@ -1468,8 +1531,15 @@ class InvestmentScoringAgent:
             },
         )
 
-    def _calculate_put_call_ratio(self, options_data: List[Dict]) -> float:
+    def _calculate_put_call_ratio(
+        self,
+        options_data: List[Dict],
+        aggregates: Optional[FlowAggregates] = None,
+    ) -> float:
         """Calculate put/call ratio from options flow data."""
+        if aggregates is not None:
+            return aggregates.put_call_ratio
+
         if not options_data:
             return 1.0  # Neutral
 
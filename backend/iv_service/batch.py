@@ -1,9 +1,18 @@
+import asyncio
 import time
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from fastapi import APIRouter, Query
 
-from .service import pick_calendar, pick_condor, strikes, summary, terms
+from .config import BATCH_CONCURRENCY, BATCH_MAX_SYMBOLS
+from .service import (
+    cache_stats,
+    pick_calendar,
+    pick_condor,
+    strikes,
+    summary,
+    terms,
+)
 
 router = APIRouter(prefix="/api/iv", tags=["iv"])
 
@@ -13,6 +22,11 @@ async def health():
     return {"ok": True}
 
 
+@router.get("/cache")
+async def get_cache_stats():
+    return cache_stats()
+
+
 @router.get("/summary")
 async def get_summary(symbol: str, front_dte: int = 3, back_dte: int = 35):
     return await summary(symbol, front_dte, back_dte)
@@ -44,7 +58,8 @@ async def batch_endpoint(
 ):
     # Handle POST request
     if body is not None:
-        symbols = body.get("symbols", ["NVDA", "AAPL", "MSFT"])[: body.get("limit", 50)]
+        limit = min(int(body.get("limit", BATCH_MAX_SYMBOLS)), BATCH_MAX_SYMBOLS)
+        symbols = body.get("symbols", ["NVDA", "AAPL", "MSFT"])[:limit]
         rule = body.get("rule", "calendar")
         mult = float(body.get("mult", 0.5))
         return await batch_calc(symbols, rule, mult)
@@ -107,36 +122,48 @@ async def batch_endpoint(
     }
 
 
-async def batch_calc(symbols: List[str], rule: str, mult: float):
-    rows = []
-    ok = fail = 0
-    for sym in symbols:
-        try:
-            s = await summary(sym)
-            spot, em_usd = s["spot"], s["em_usd"]
-            row = {
-                "symbol": s["symbol"],
-                "spot": spot,
-                "iv": s["iv"],
-                "em_usd": em_usd,
-                "em_pct": s["em_pct"],
-                "front_dte": s["front_dte"],
-                "back_dte": s["back_dte"],
-                "error": None,
-            }
-
-            if rule == "calendar":
-                dc_low, dc_high = pick_calendar(spot, em_usd, mult)
-                row.update({"dc_low": dc_low, "dc_high": dc_high})
-            else:  # condor
-                shorts, wings = pick_condor(spot, em_usd)
-                row.update({"ic_shorts": shorts, "ic_wings": wings})
-
-            rows.append(row)
-            ok += 1
-        except Exception as e:
-            rows.append(
-                {
+async def _batch_row(sym: str, rule: str, mult: float, summary_fn) -> Dict[str, Any]:
+    s = await summary_fn(sym)
+    spot, em_usd = s["spot"], s["em_usd"]
+    row = {
+        "symbol": s["symbol"],
+        "spot": spot,
+        "iv": s["iv"],
+        "em_usd": em_usd,
+        "em_pct": s["em_pct"],
+        "front_dte": s["front_dte"],
+        "back_dte": s["back_dte"],
+        "error": None,
+    }
+
+    if rule == "calendar":
+        dc_low, dc_high = pick_calendar(spot, em_usd, mult)
+        row.update({"dc_low": dc_low, "dc_high": dc_high})
+    else:  # condor
+        shorts, wings = pick_condor(spot, em_usd)
+        row.update({"ic_shorts": shorts, "ic_wings": wings})
+    return row
+
+
+async def batch_calc(
+    symbols: List[str],
+    rule: str,
+    mult: float,
+    summary_fn: Callable[[str], Awaitable[Dict[str, Any]]] = summary,
+    concurrency: int = BATCH_CONCURRENCY,
+):
+    """Compute batch rows with bounded concurrency, preserving input order.
+
+    Repeated symbols share one provider call through the summary cache.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(sym: str) -> Dict[str, Any]:
+        async with sem:
+            try:
+                return await _batch_row(sym, rule, mult, summary_fn)
+            except Exception as e:
+                return {
                     "symbol": sym,
                     "error": str(e),
                     "spot": 0,
@@ -146,7 +173,10 @@ async def batch_calc(symbols: List[str], rule: str, mult: float):
                     "front_dte": 0,
                     "back_dte": 0,
                 }
-            )
-            fail += 1
 
-    return {"meta": {"count": len(symbols), "ok": ok, "fail": fail}, "rows": rows}
+    rows = await asyncio.gather(*(one(sym) for sym in symbols))
+    fail = sum(1 for r in rows if r["error"] is not None)
+    return {
+        "meta": {"count": len(symbols), "ok": len(rows) - fail, "fail": fail},
+        "rows": list(rows),
+    }
@@ -8,3 +8,8 @@ CACHE_TTL_SECONDS = int(os.getenv("IV_CACHE_TTL", "30"))
 # TradeStation adapter (schelet — completezi endpoint-urile reale)
 TS_BASE_URL = os.getenv("TS_BASE_URL", "").rstrip("/")
 TS_TOKEN = os.getenv("TS_TOKEN", "")
+
+# Cache / batch sizing
+CACHE_MAX_ENTRIES = int(os.getenv("IV_CACHE_MAX_ENTRIES", "4096"))
+BATCH_CONCURRENCY = int(os.getenv("IV_BATCH_CONCURRENCY", "8"))
+BATCH_MAX_SYMBOLS = int(os.getenv("IV_BATCH_MAX_SYMBOLS", "50"))
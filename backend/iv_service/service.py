@@ -1,8 +1,15 @@
 import math
-import time
 from typing import Any, Dict
 
-from .config import CACHE_TTL_SECONDS, DEFAULT_BACK_DTE, DEFAULT_FRONT_DTE, IV_PROVIDER
+from utils.cache import TTLCache
+
+from .config import (
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL_SECONDS,
+    DEFAULT_BACK_DTE,
+    DEFAULT_FRONT_DTE,
+    IV_PROVIDER,
+)
 from .provider_base import round_to_tick
 from .provider_stub import StubProvider
 
@@ -17,21 +24,20 @@ if IV_PROVIDER == "TS" and TradeStationProvider:
 else:
     _provider = StubProvider()
 
-# TTL cache
-_cache: Dict[str, Any] = {}
+# Bounded LRU + TTL cache (shared by summary/terms, single-flight per key)
+_cache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
 
 
 def cache_get(key: str):
-    v = _cache.get(key)
-    if not v:
-        return None
-    if time.time() - v["ts"] > CACHE_TTL_SECONDS:
-        return None
-    return v["data"]
+    return _cache.get(key)
 
 
 def cache_put(key: str, data: Any):
-    _cache[key] = {"ts": time.time(), "data": data}
+    _cache.put(key, data)
+
+
+def cache_stats() -> Dict[str, Any]:
+    return _cache.stats()
 
 
 def expected_move_usd(spot: float, iv: float, dte: int) -> float:
@@ -41,34 +47,31 @@ def expected_move_usd(spot: float, iv: float, dte: int) -> float:
 async def summary(
     symbol: str, front_dte: int = DEFAULT_FRONT_DTE, back_dte: int = DEFAULT_BACK_DTE
 ):
-    key = f"sum:{symbol}:{front_dte}"
-    c = cache_get(key)
-    if c:
-        return c
-    spot = await _provider.get_spot(symbol)
-    iv = await _provider.get_atm_iv(symbol, front_dte)
-    em = expected_move_usd(spot, iv, front_dte)
-    out = {
-        "symbol": symbol.upper(),
-        "spot": round(spot, 2),
-        "iv": round(iv, 4),
-        "em_usd": round(em, 2),
-        "em_pct": round(em / spot if spot else 0.0, 4),
-        "front_dte": int(front_dte),
-        "back_dte": int(back_dte),
-    }
-    cache_put(key, out)
-    return out
+    sym = symbol.upper()
+
+    async def load():
+        spot = await _provider.get_spot(sym)
+        iv = await _provider.get_atm_iv(sym, front_dte)
+        em = expected_move_usd(spot, iv, front_dte)
+        return {
+            "symbol": sym,
+            "spot": round(spot, 2),
+            "iv": round(iv, 4),
+            "em_usd": round(em, 2),
+            "em_pct": round(em / spot if spot else 0.0, 4),
+            "front_dte": int(front_dte),
+        }
+
+    # Only the front expiry feeds the calculation; back_dte is echoed back
+    out = await _cache.get_or_compute(f"sum:{sym}:{int(front_dte)}", load)
+    return {**out, "back_dte": int(back_dte)}
 
 
 async def terms(symbol: str):
-    key = f"terms:{symbol}"
-    c = cache_get(key)
-    if c:
-        return c
-    data = await _provider.list_terms(symbol)
-    cache_put(key, data)
-    return data
+    sym = symbol.upper()
+    return await _cache.get_or_compute(
+        f"terms:{sym}", lambda: _provider.list_terms(sym)
+    )
 
 
 async def strikes(symbol: str, front_dte: int, back_dte: int):
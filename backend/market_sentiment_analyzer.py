@@ -13,6 +13,8 @@ import aiohttp
 import numpy as np
 import yfinance as yf
 
+from services.text_engine import SentimentLexicon
+
 logger = logging.getLogger(__name__)
 
 
@@ -101,6 +103,8 @@ class MarketSentimentAnalyzer:
             "tanking",
             "dead cat bounce",
         ]
+        # Both lists compiled into one Aho-Corasick pass per text
+        self._lexicon = SentimentLexicon(self.bullish_keywords, self.bearish_keywords)
 
     async def get_session(self):
         """Get or create aiohttp session"""
@@ -442,22 +446,8 @@ class MarketSentimentAnalyzer:
         if not text:
             return 0.0
 
-        text_lower = text.lower()
-
-        # Count bullish and bearish keywords
-        bullish_count = sum(
-            1 for keyword in self.bullish_keywords if keyword in text_lower
-        )
-        bearish_count = sum(
-            1 for keyword in self.bearish_keywords if keyword in text_lower
-        )
-
-        total_keywords = bullish_count + bearish_count
-        if total_keywords == 0:
-            return 0.0
-
-        # Calculate sentiment score (-1 to +1)
-        sentiment = (bullish_count - bearish_count) / total_keywords
+        # Calculate sentiment score (-1 to +1) from bullish/bearish keyword hits
+        sentiment = self._lexicon.score(text)
 
         # Apply length scaling (longer texts have more reliable sentiment)
         text_length_factor = min(1.0, len(text) / 500.0)  # Scale by text length
@@ -466,17 +456,9 @@ class MarketSentimentAnalyzer:
 
     def _extract_key_phrases(self, text: str) -> List[str]:
         """Extract key phrases from text"""
-        phrases = []
-
-        # Find bullish keywords
-        for keyword in self.bullish_keywords:
-            if keyword in text.lower():
-                phrases.append(f"bullish_{keyword.replace(' ', '_')}")
-
-        # Find bearish keywords
-        for keyword in self.bearish_keywords:
-            if keyword in text.lower():
-                phrases.append(f"bearish_{keyword.replace(' ', '_')}")
+        match = self._lexicon.match(text)
+        phrases = [f"bullish_{k.replace(' ', '_')}" for k in match.bullish]
+        phrases += [f"bearish_{k.replace(' ', '_')}" for k in match.bearish]
 
         return phrases[:3]  # Return top 3 phrases
 
@@ -1,54 +1,342 @@
+"""
+Non-blocking HTTP rate limiter (GCRA).
+
+Each (route, client) pair gets a sustained rate of ``limit`` requests per
+``window`` seconds with a burst of up to ``burst`` requests. With Redis the
+check is a single atomic EVALSHA on the async client; without Redis (or while
+it is unreachable) an in-process token bucket with the same semantics is used,
+so the hot path never blocks the event loop.
+
+Configuration (env):
+    RL_WINDOW_SECONDS, RL_LIMIT_DEFAULT, RL_LIMIT_PRICES, RL_LIMIT_TS
+    RL_ROUTE_LIMITS   "/api/prices=60,/api/options/selling=20/10"
+                      (prefix=limit[/window]; longest prefix wins)
+    RL_KEY_LIMITS     "<api-key>=1000/60" (per-client overrides)
+    RL_API_KEYS       "<api-key>,<api-key>" (known keys on the default limits)
+    RL_KEY_HEADER     header carrying the client key (default X-API-Key)
+    RL_BURST_RATIO    burst size as a fraction of the limit (default 0.5)
+
+Any window of ``window`` seconds admits at most ``limit + burst`` requests.
+
+Only known keys (RL_KEY_LIMITS or RL_API_KEYS) are used as the client
+identity; any other key header is ignored and the client IP is used. Keys
+are stored hashed in the Redis key names.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
 import os
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
 
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
-from utils.redis_client import get_redis
-
-
-def _redis():
-    # lazy, cu fallback in-memory
-    return get_redis()
-
+logger = logging.getLogger(__name__)
 
 WINDOW = int(os.getenv("RL_WINDOW_SECONDS", "5"))  # secunde
 LIMIT_DEFAULT = int(os.getenv("RL_LIMIT_DEFAULT", "120"))
 LIMIT_PRICES = int(os.getenv("RL_LIMIT_PRICES", "60"))
 LIMIT_TS = int(os.getenv("RL_LIMIT_TS", "30"))
+BURST_RATIO = float(os.getenv("RL_BURST_RATIO", "0.5"))
+KEY_HEADER = os.getenv("RL_KEY_HEADER", "X-API-Key")
+LOCAL_MAX_KEYS = int(os.getenv("RL_LOCAL_MAX_KEYS", "100000"))
+REDIS_RETRY_SECONDS = float(os.getenv("RL_REDIS_RETRY_SECONDS", "30"))
 
 SAFE_PREFIXES = {"/health", "/readyz", "/healthz"}
 
 
+@dataclass(frozen=True)
+class Rule:
+    limit: int
+    window: float = WINDOW
+
+    @property
+    def interval(self) -> float:
+        """Seconds between requests at the sustained rate."""
+        return self.window / max(1, self.limit)
+
+    @property
+    def burst(self) -> int:
+        return max(1, int(math.ceil(self.limit * BURST_RATIO)))
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+
+
+def _parse_rule(spec: str) -> Rule:
+    limit, _, window = spec.strip().partition("/")
+    return Rule(int(limit), float(window) if window else WINDOW)
+
+
+def _parse_rules(raw: str) -> Dict[str, Rule]:
+    rules: Dict[str, Rule] = {}
+    for item in (raw or "").split(","):
+        if "=" not in item:
+            continue
+        name, spec = item.split("=", 1)
+        try:
+            rules[name.strip()] = _parse_rule(spec)
+        except ValueError:
+            logger.warning(f"Ignoring malformed rate limit rule: {item!r}")
+    return rules
+
+
+ROUTE_RULES: Dict[str, Rule] = {
+    "/api/prices": Rule(LIMIT_PRICES),
+    "/api/ts/": Rule(LIMIT_TS),
+    **_parse_rules(os.getenv("RL_ROUTE_LIMITS", "")),
+}
+KEY_RULES: Dict[str, Rule] = _parse_rules(os.getenv("RL_KEY_LIMITS", ""))
+API_KEYS = {k.strip() for k in os.getenv("RL_API_KEYS", "").split(",") if k.strip()}
+_ROUTE_PREFIXES: List[str] = sorted(ROUTE_RULES, key=len, reverse=True)
+
+
 def _limit_for(path: str) -> int:
-    if (
-        path.startswith("/api/ts/")
-        or path.startswith("/api/mindfolios")
-        and "/ts/" in path
+    return _rule_for(path, None).limit
+
+
+def _rule_for(path: str, client_key: Optional[str]) -> Rule:
+    if client_key and client_key in KEY_RULES:
+        return KEY_RULES[client_key]
+    if path.startswith("/api/mindfolios") and "/ts/" in path:
+        return ROUTE_RULES["/api/ts/"]
+    for prefix in _ROUTE_PREFIXES:
+        if path.startswith(prefix):
+            return ROUTE_RULES[prefix]
+    return Rule(LIMIT_DEFAULT)
+
+
+# =============================================================================
+# Local token bucket (no Redis)
+# =============================================================================
+
+
+class LocalTokenBucket:
+    """In-process GCRA/token bucket keyed by string, LRU-bounded."""
+
+    def __init__(
+        self,
+        max_keys: int = LOCAL_MAX_KEYS,
+        clock: Callable[[], float] = time.monotonic,
     ):
-        return LIMIT_TS
-    if path.startswith("/api/prices"):
-        return LIMIT_PRICES
-    return LIMIT_DEFAULT
+        self.max_keys = max_keys
+        self._clock = clock
+        self._tat: "OrderedDict[str, float]" = OrderedDict()
+
+    def acquire(self, key: str, rule: Rule) -> Decision:
+        now = self._clock()
+        interval = rule.interval
+        tolerance = (rule.burst - 1) * interval
+        tat = max(self._tat.get(key, now), now)
+        if tat - tolerance > now:
+            return Decision(False, rule.limit, 0, tat - tolerance - now)
+        new_tat = tat + interval
+        self._tat[key] = new_tat
+        self._tat.move_to_end(key)
+        if len(self._tat) > self.max_keys:
+            self._tat.popitem(last=False)
+        remaining = math.floor((tolerance - (new_tat - now)) / interval + 1e-9) + 1
+        return Decision(True, rule.limit, max(0, remaining))
+
+    def clear(self):
+        self._tat.clear()
+
+
+# =============================================================================
+# Redis GCRA (one atomic round trip)
+# =============================================================================
+
+_GCRA_LUA = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+if tat - tolerance > now then
+  return {0, 0, tat - tolerance - now}
+end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], new_tat, 'PX', math.max(1, new_tat - now))
+return {1, math.floor((tolerance - (new_tat - now)) / interval) + 1, 0}
+"""
+
+
+class RedisGCRA:
+    def __init__(self, client):
+        self._client = client
+        self._script = client.register_script(_GCRA_LUA)
+
+    async def acquire(self, key: str, rule: Rule) -> Decision:
+        interval_ms = max(1, math.ceil(rule.interval * 1000))
+        tolerance_ms = (rule.burst - 1) * interval_ms
+        allowed, remaining, retry_ms = await self._script(
+            keys=[key], args=[interval_ms, tolerance_ms]
+        )
+        return Decision(
+            bool(allowed), rule.limit, max(0, int(remaining)), int(retry_ms) / 1000.0
+        )
+
+
+# =============================================================================
+# Limiter
+# =============================================================================
+
+
+class RateLimiter:
+    """Picks Redis when reachable, otherwise the local bucket; never fails closed."""
+
+    def __init__(self, redis_url: Optional[str] = None, local=None):
+        self.redis_url = redis_url
+        self.local = local or LocalTokenBucket()
+        self._redis: Optional[RedisGCRA] = None
+        self._redis_down_until = 0.0
+        self._connect_lock = asyncio.Lock()
+        self.stats = {"allowed": 0, "limited": 0, "redis_errors": 0}
+
+    async def _backend(self):
+        if not self.redis_url or time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is not None:
+            return self._redis
+        async with self._connect_lock:
+            if self._redis is None and time.monotonic() >= self._redis_down_until:
+                try:
+                    from redis.asyncio import from_url
+
+                    client = from_url(self.redis_url, decode_responses=True)
+                    await client.ping()
+                    self._redis = RedisGCRA(client)
+                except Exception as e:
+                    logger.warning(f"Rate limiter using local buckets: {e}")
+                    self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        return self._redis
+
+    async def check(self, key: str, rule: Rule) -> Decision:
+        backend = await self._backend()
+        decision = None
+        if backend is not None:
+            try:
+                decision = await backend.acquire(key, rule)
+            except Exception as e:
+                self.stats["redis_errors"] += 1
+                logger.debug(f"Redis rate limit check failed: {e}")
+                self._redis = None
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        if decision is None:
+            decision = self.local.acquire(key, rule)
+        self.stats["allowed" if decision.allowed else "limited"] += 1
+        return decision
+
+
+def _default_redis_url() -> Optional[str]:
+    if os.getenv("TEST_MODE") == "1" or os.getenv("FM_FORCE_FALLBACK") == "1":
+        return None
+    return os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(_default_redis_url())
+    return _limiter
+
+
+def _known_key(api_key: Optional[str]) -> bool:
+    return bool(api_key) and (api_key in KEY_RULES or api_key in API_KEYS)
+
+
+def _client_identity(request: Request) -> Tuple[str, Optional[str]]:
+    """Hashed key for known API keys, otherwise the client IP."""
+    api_key = request.headers.get(KEY_HEADER)
+    if _known_key(api_key):
+        digest = hashlib.sha256(api_key.encode()).hexdigest()[:32]
+        return f"k:{digest}", api_key
+    ip = request.client.host if request.client else "unknown"
+    return ip, None
 
 
 async def rate_limit(request: Request, call_next):
     path = request.url.path
     if any(path.startswith(p) for p in SAFE_PREFIXES):
         return await call_next(request)
+    decision = None
     try:
-        ip = request.client.host if request.client else "unknown"
-        now = int(time.time())
-        bucket = now // WINDOW
-        limit = _limit_for(path)
-        key = f"rl:{path}:{ip}:{bucket}"
-        r = _redis()
-        cur = r.incr(key)
-        if cur == 1:
-            r.expire(key, WINDOW + 1)
-        if cur > limit:
-            return JSONResponse({"detail": "Rate limit exceeded"}, status_code=429)
+        ident, api_key = _client_identity(request)
+        rule = _rule_for(path, api_key)
+        decision = await get_rate_limiter().check(f"rl:{path}:{ident}", rule)
+        if not decision.allowed:
+            return JSONResponse(
+                {"detail": "Rate limit exceeded"},
+                status_code=429,
+                headers={
+                    "Retry-After": str(max(1, math.ceil(decision.retry_after))),
+                    "X-RateLimit-Limit": str(decision.limit),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
     except Exception:
-        # fail-open dacă Redis nu răspunde
-        pass
-    return await call_next(request)
+        # fail-open dacă limiterul nu răspunde
+        decision = None
+    response = await call_next(request)
+    if decision is not None:
+        response.headers["X-RateLimit-Limit"] = str(decision.limit)
+        response.headers["X-RateLimit-Remaining"] = str(decision.remaining)
+    return response
+
+
+if __name__ == "__main__":
+    # Middleware overhead under N concurrent requests (local buckets)
+    import statistics
+    import sys
+
+    from starlette.responses import Response
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    def _request(i: int) -> Request:
+        return Request(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": f"/api/prices/{i % 50}",
+                "headers": [],
+                "client": (f"10.0.{i % 200}.1", 1234),
+                "query_string": b"",
+            }
+        )
+
+    async def call_next(request):
+        return Response("ok")
+
+    async def one(i: int) -> float:
+        req = _request(i)
+        start = time.perf_counter()
+        await rate_limit(req, call_next)
+        return time.perf_counter() - start
+
+    async def main():
+        limiter = get_rate_limiter()
+        limiter.redis_url = None
+        samples = await asyncio.gather(*(one(i) for i in range(n)))
+        samples = sorted(s * 1e6 for s in samples)
+        print(
+            f"{n} concurrent requests: mean={statistics.mean(samples):.1f}us "
+            f"p95={samples[int(0.95 * (n - 1))]:.1f}us "
+            f"limited={limiter.stats['limited']}"
+        )
+
+    asyncio.run(main())
@@ -14,6 +14,8 @@ from fastapi import APIRouter, HTTPException, Header, Request
 from pydantic import BaseModel, validator
 
 from redis_fallback import get_kv
+from services.lot_ledger import record_transactions
+from services.mindfolio_analytics import MindfolioAnalytics, mindfolio_analytics
 
 # Import TradeStation helpers
 from app.services.tradestation import get_valid_token
@@ -275,131 +277,54 @@ def round2(n: float) -> float:
     return round(n * 100) / 100
 
 
+async def _load_transactions(cli, tx_ids: List[str]) -> List[Transaction]:
+    """Fetch transactions in one round trip and sort them by datetime"""
+    keys = [key_transaction(tx_id) for tx_id in tx_ids]
+    if hasattr(cli, "mget"):
+        raws = await cli.mget(keys) if keys else []
+    else:
+        raws = [await cli.get(k) for k in keys]
+
+    transactions = [Transaction(**json.loads(raw)) for raw in raws if raw]
+    transactions.sort(key=lambda x: x.datetime)
+    return transactions
+
+
 async def get_mindfolio_transactions(mindfolio_id: str) -> List[Transaction]:
     """Get all transactions for a mindfolio, sorted by datetime"""
     cli = await get_kv()
     tx_list_raw = await cli.get(key_mindfolio_transactions(mindfolio_id)) or "[]"
-    tx_ids = json.loads(tx_list_raw)
+    return await _load_transactions(cli, json.loads(tx_list_raw))
 
-    transactions = []
-    for tx_id in tx_ids:
-        tx_raw = await cli.get(key_transaction(tx_id))
-        if tx_raw:
-            tx_data = json.loads(tx_raw)
-            transactions.append(Transaction(**tx_data))
 
-    # Sort by datetime
-    transactions.sort(key=lambda x: x.datetime)
-    return transactions
+async def get_mindfolio_analytics(
+    mindfolio_id: str, curve: bool = True
+) -> MindfolioAnalytics:
+    """FIFO positions, realized P&L, trade stats and equity curve (cached)
+
+    All of it comes from the mindfolio's lot ledger, which is caught up with
+    the transaction list on read; `curve=False` skips the equity curve.
+    """
+    cli = await get_kv()
+    return await mindfolio_analytics(
+        cli,
+        mindfolio_id,
+        key_mindfolio_transactions(mindfolio_id),
+        lambda ids: _load_transactions(cli, ids),
+        curve=curve,
+    )
 
 
 async def calculate_positions_fifo(mindfolio_id: str) -> List[Position]:
     """Calculate current positions using FIFO method"""
-    transactions = await get_mindfolio_transactions(mindfolio_id)
-
-    # FIFO lots tracking: {symbol: [{"qty": float, "price": float}, ...]}
-    lots: "dict[str, list[dict[str, float]]]" = {}
-
-    for tx in transactions:
-        symbol = tx.symbol
-        if symbol not in lots:
-            lots[symbol] = []
-
-        if tx.side == "BUY":
-            # Add to lots
-            cost_per_share = tx.price + (tx.fee / tx.qty if tx.qty > 0 else 0)
-            lots[symbol].append({"qty": tx.qty, "price": cost_per_share})
-
-        elif tx.side == "SELL":
-            # Consume lots FIFO
-            qty_to_sell = tx.qty
-            while qty_to_sell > 0 and lots[symbol]:
-                lot = lots[symbol][0]
-                if lot["qty"] <= qty_to_sell:
-                    # Consume entire lot
-                    qty_to_sell -= lot["qty"]
-                    lots[symbol].pop(0)
-                else:
-                    # Partial consumption
-                    lot["qty"] -= qty_to_sell
-                    qty_to_sell = 0
-
-    # Calculate current positions
-    positions = []
-    for symbol, symbol_lots in lots.items():
-        if symbol_lots:  # If there are remaining lots
-            total_qty = sum(lot["qty"] for lot in symbol_lots)
-            total_cost = sum(lot["qty"] * lot["price"] for lot in symbol_lots)
-
-            if total_qty > 0:
-                avg_cost = total_cost / total_qty
-                positions.append(
-                    Position(
-                        symbol=symbol,
-                        qty=round2(total_qty),
-                        cost_basis=round2(total_cost),
-                        avg_cost=round2(avg_cost),
-                    )
-                )
-
-    return sorted(positions, key=lambda x: x.symbol)
+    analytics = await get_mindfolio_analytics(mindfolio_id, curve=False)
+    return [Position(**p) for p in analytics.positions]
 
 
 async def calculate_realized_pnl(mindfolio_id: str) -> List[RealizedPnL]:
     """Calculate realized P&L for each symbol using FIFO"""
-    transactions = await get_mindfolio_transactions(mindfolio_id)
-
-    # Track FIFO lots and realized P&L
-    fifo_lots: "dict[str, list[dict[str, float]]]" = {}
-    realized_pnl: "dict[str, dict[str, float]]" = {}
-
-    for tx in transactions:
-        symbol = tx.symbol
-
-        if symbol not in fifo_lots:
-            fifo_lots[symbol] = []
-        if symbol not in realized_pnl:
-            realized_pnl[symbol] = {"realized": 0.0, "trades": 0}
-
-        if tx.side == "BUY":
-            cost_per_share = tx.price + (tx.fee / tx.qty if tx.qty > 0 else 0)
-            fifo_lots[symbol].append({"qty": tx.qty, "price": cost_per_share})
-
-        elif tx.side == "SELL":
-            qty_to_sell = tx.qty
-            sell_proceeds_per_share = tx.price - (tx.fee / tx.qty if tx.qty > 0 else 0)
-
-            while qty_to_sell > 0 and fifo_lots[symbol]:
-                lot = fifo_lots[symbol][0]
-
-                if lot["qty"] <= qty_to_sell:
-                    # Sell entire lot
-                    realized = (sell_proceeds_per_share - lot["price"]) * lot["qty"]
-                    realized_pnl[symbol]["realized"] += realized
-                    qty_to_sell -= lot["qty"]
-                    fifo_lots[symbol].pop(0)
-                else:
-                    # Partial sale
-                    realized = (sell_proceeds_per_share - lot["price"]) * qty_to_sell
-                    realized_pnl[symbol]["realized"] += realized
-                    lot["qty"] -= qty_to_sell
-                    qty_to_sell = 0
-
-            realized_pnl[symbol]["trades"] += 1
-
-    # Convert to list
-    result = []
-    for symbol, pnl_data in realized_pnl.items():
-        if pnl_data["trades"] > 0:  # Only include symbols with actual trades
-            result.append(
-                RealizedPnL(
-                    symbol=symbol,
-                    realized=round2(pnl_data["realized"]),
-                    trades=int(pnl_data["trades"]),
-                )
-            )
-
-    return sorted(result, key=lambda x: x.symbol)
+    analytics = await get_mindfolio_analytics(mindfolio_id, curve=False)
+    return [RealizedPnL(**r) for r in analytics.realized]
 
 
 # ——— CRUD Operations ———
@@ -1717,13 +1642,9 @@ async def sync_master_mindfolio(master_id: str, user_id: str = Header("default")
 async def stats(pid: str):
     """Get mindfolio statistics with real P&L data"""
     try:
-        # Calculate real statistics from transactions
-        positions = await calculate_positions_fifo(pid)
-        realized_pnl_data = await calculate_realized_pnl(pid)
-
-        # Calculate totals
-        total_realized = sum(pnl.realized for pnl in realized_pnl_data)
-        total_trades = sum(pnl.trades for pnl in realized_pnl_data)
+        # Positions, realized P&L and trade stats from the lot ledger
+        analytics = await get_mindfolio_analytics(pid)
+        summary = analytics.summary
 
         # Mindfolio NAV
         mindfolio = await pf_get(pid)
@@ -1731,14 +1652,14 @@ async def stats(pid: str):
         return {
             "mindfolio_id": pid,
             "nav": mindfolio.cash_balance,
-            "pnl_realized": round2(total_realized),
+            "pnl_realized": round2(summary["total_realized_pnl"]),
             "pnl_unrealized": 0,  # Will be calculated with live market data integration
-            "positions_count": len(positions),
-            "total_trades": total_trades,
-            "win_rate": None,  # Calculated when sufficient trade history available
-            "expectancy": None,  # Calculated when sufficient trade history available
-            "max_dd": None,  # Calculated when sufficient trade history available
-            "realized_pnl_by_symbol": [pnl.dict() for pnl in realized_pnl_data],
+            "positions_count": summary["positions_count"],
+            "total_trades": summary["total_trades"],
+            "win_rate": summary["win_rate"],
+            "expectancy": summary["expectancy"],
+            "max_dd": summary["max_drawdown"],
+            "realized_pnl_by_symbol": analytics.realized,
         }
     except Exception as e:
         # Fallback to basic stats
@@ -1818,11 +1739,8 @@ async def import_transactions_csv(pid: str, body: ImportCSV):
     # Parse and validate CSV
     transactions = await parse_csv_transactions(body.csv_data, pid)
 
-    # Save all transactions
-    imported_count = 0
-    for tx in transactions:
-        await tx_create(tx)
-        imported_count += 1
+    # Save all transactions (one id-list write and one ledger update)
+    imported_count = len(await tx_create_many(pid, transactions))
 
     return {
         "imported": imported_count,
@@ -1834,17 +1752,29 @@ async def import_transactions_csv(pid: str, body: ImportCSV):
 # ——— Transaction CRUD Functions ———
 async def tx_create(tx: Transaction) -> Transaction:
     """Save transaction"""
-    cli = await get_kv()
-    await cli.set(key_transaction(tx.id), json.dumps(tx.dict()))
+    await tx_create_many(tx.mindfolio_id, [tx])
+    return tx
 
-    # Update mindfolio transaction list
-    current_list = await cli.get(key_mindfolio_transactions(tx.mindfolio_id)) or "[]"
-    tx_list = json.loads(current_list)
-    if tx.id not in tx_list:
-        tx_list.append(tx.id)
-        await cli.set(key_mindfolio_transactions(tx.mindfolio_id), json.dumps(tx_list))
 
-    return tx
+async def tx_create_many(pid: str, txs: List[Transaction]) -> List[Transaction]:
+    """Save transactions and apply the new ones to the mindfolio's lot ledger"""
+    cli = await get_kv()
+    records = {key_transaction(tx.id): json.dumps(tx.dict()) for tx in txs}
+    if hasattr(cli, "mset"):
+        if records:
+            await cli.mset(records)
+    else:
+        for key, value in records.items():
+            await cli.set(key, value)
+
+    await record_transactions(
+        cli,
+        pid,
+        key_mindfolio_transactions(pid),
+        txs,
+        lambda ids: _load_transactions(cli, ids),
+    )
+    return txs
 
 
 async def tx_get(tid: str) -> Transaction:
@@ -2061,61 +1991,20 @@ async def create_mindfolio_bucket(
 async def get_mindfolio_equity_chart(pid: str, timeframe: str = "1M"):
     """Get equity curve data for mindfolio analytics"""
     try:
-        # Get mindfolio transactions
-        transactions = await get_mindfolio_transactions(pid)
-        realized_pnl = await calculate_realized_pnl(pid)
-        positions = await calculate_positions_fifo(pid)
-
-        # Calculate equity curve data points
-        equity_data = []
-        running_balance = 10000.0  # Starting balance
-
-        # Process transactions chronologically
-        for i, tx in enumerate(transactions):
-            if tx.side == "BUY":
-                running_balance -= tx.qty * tx.price + tx.fee
-            elif tx.side == "SELL":
-                running_balance += tx.qty * tx.price - tx.fee
-
-            equity_data.append(
-                {
-                    "date": tx.datetime,
-                    "equity": round(running_balance, 2),
-                    "transaction_id": tx.id,
-                    "symbol": tx.symbol,
-                    "side": tx.side,
-                }
-            )
+        analytics = await get_mindfolio_analytics(pid)
 
-        # Add current unrealized P&L (would need market prices)
-        current_equity = running_balance
-        for pos in positions:
-            current_equity += pos.cost_basis  # Simplified, needs current market value
-
-        # Analytics metrics
-        total_realized = sum(pnl.realized for pnl in realized_pnl)
-        total_trades = sum(pnl.trades for pnl in realized_pnl)
-
-        analytics = {
-            "equity_curve": (
-                equity_data[-50:] if len(equity_data) > 50 else equity_data
-            ),  # Last 50 points
-            "summary": {
-                "current_equity": round(current_equity, 2),
-                "total_realized_pnl": round(total_realized, 2),
-                "total_trades": total_trades,
-                "win_rate": None,  # TODO[OPS-004]: Calculate from profitable trades
-                "sharpe_ratio": None,  # TODO[OPS-005]: Calculate from equity curve
-                "max_drawdown": None,  # TODO[OPS-006]: Calculate from equity curve
-                "positions_count": len(positions),
+        return {
+            "status": "success",
+            "mindfolio_id": pid,
+            "analytics": {
+                "equity_curve": analytics.equity_curve[-50:],  # Last 50 points
+                "summary": analytics.summary,
+                "buckets": analytics.buckets,  # per-symbol trade stats
+                "timeframe": timeframe,
+                "generated_at": datetime.utcnow().isoformat(),
             },
-            "buckets": [],  # TODO[OPS-007]: Implement bucket-level analytics
-            "timeframe": timeframe,
-            "generated_at": datetime.utcnow().isoformat(),
         }
 
-        return {"status": "success", "mindfolio_id": pid, "analytics": analytics}
-
     except Exception as e:
         raise HTTPException(500, f"Failed to generate equity analytics: {str(e)}")
 
@@ -2124,27 +2013,17 @@ async def get_mindfolio_equity_chart(pid: str, timeframe: str = "1M"):
 async def export_mindfolio_equity_csv(pid: str, timeframe: str = "1M"):
     """Export equity curve data as CSV file"""
     try:
-        # Get equity data using existing endpoint
-        equity_response = await get_mindfolio_equity_chart(pid, timeframe)
-        equity_data = equity_response["analytics"]["equity_curve"]
+        # Same cached analytics as the equity endpoint, full curve
+        equity_data = (await get_mindfolio_analytics(pid)).equity_curve
 
         if not equity_data:
             raise HTTPException(404, "No equity data available for export")
 
-        # Generate CSV content
         csv_lines = ["Date,Equity,Transaction_ID,Symbol,Side,Realized_Cum"]
-
-        running_realized = 0.0
         for point in equity_data:
-            # Calculate cumulative realized (simplified)
-            if point.get("side") == "SELL":
-                running_realized += (
-                    point.get("equity", 0) * 0.01
-                )  # Simplified calculation
-
             csv_lines.append(
-                f"{point.get('date', '')},{point.get('equity', 0)},{point.get('transaction_id', '')},"
-                f"{point.get('symbol', '')},{point.get('side', '')},{round(running_realized, 2)}"
+                f"{point['date']},{point['equity']},{point['transaction_id']},"
+                f"{point['symbol']},{point['side']},{point['realized_cum']}"
             )
 
         csv_content = "\n".join(csv_lines)
@@ -2159,6 +2038,8 @@ async def export_mindfolio_equity_csv(pid: str, timeframe: str = "1M"):
             },
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Failed to export equity CSV: {str(e)}")
 
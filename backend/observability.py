@@ -1,7 +1,9 @@
 import logging
+import os
 import sys
 import time
 import uuid
+from typing import Optional
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,10 +12,47 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 from starlette.responses import Response
 
+from utils.tracing import finish_trace, get_trace_buffer, start_trace
+
+
+def _parse_buckets(raw: Optional[str]) -> tuple:
+    if not raw:
+        return Histogram.DEFAULT_BUCKETS
+    return tuple(sorted(float(b) for b in raw.split(",") if b.strip()))
+
+
+LATENCY_BUCKETS = _parse_buckets(os.getenv("HTTP_LATENCY_BUCKETS"))
+STAGE_BUCKETS = _parse_buckets(
+    os.getenv("HTTP_STAGE_BUCKETS", "0.001,0.005,0.01,0.05,0.1,0.5,1,5")
+)
+UNMATCHED_ROUTE = "__unmatched__"
+
+# Labels use the matched route template ("/api/mindfolios/{pf_id}"), never the
+# raw path, so the series count is bounded by the number of routes.
 REQS = Counter("http_requests_total", "HTTP requests", ["path", "method", "status"])
 LAT = Histogram(
-    "http_request_duration_seconds", "HTTP request duration", ["path", "method"]
+    "http_request_duration_seconds",
+    "HTTP request duration",
+    ["path", "method"],
+    buckets=LATENCY_BUCKETS,
 )
+STAGE_LAT = Histogram(
+    "http_request_stage_seconds",
+    "Time spent per request stage (cache, upstream, compute)",
+    ["path", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+access_log = logging.getLogger("app")
+
+
+def route_template(request: Request) -> str:
+    """Matched route path template for the request, or a fixed placeholder."""
+    route = request.scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not path:
+        return UNMATCHED_ROUTE
+    return request.scope.get("root_path", "") + path
 
 
 def setup_logging():
@@ -55,7 +94,9 @@ def wire(app: FastAPI):
 
     @app.middleware("http")
     async def metrics_mw(request: Request, call_next):
-        rid = request.headers.get("x-request-id", str(uuid.uuid4()))
+        rid = request.headers.get("x-request-id") or uuid.uuid4().hex
+        method = request.method
+        token = start_trace(rid=rid, method=method)
         start = time.perf_counter()
         response = None
         try:
@@ -63,14 +104,25 @@ def wire(app: FastAPI):
             return response
         finally:
             dur = time.perf_counter() - start
-            path = request.url.path
-            method = request.method
+            route = route_template(request)
             status = response.status_code if response else 500
-            REQS.labels(path, method, status).inc()
-            LAT.labels(path, method).observe(dur)
-            logging.getLogger("app").info(
-                f'{{"msg":"req","rid":"{rid}","path":"{path}","method":"{method}","status":{status},"duration":{round(dur, 3)}}}'
-            )
+            trace = finish_trace(token, route=route, status=status)
+            REQS.labels(route, method, status).inc()
+            LAT.labels(route, method).observe(dur)
+            if trace is not None:
+                for stage, seconds in trace.stage_totals().items():
+                    STAGE_LAT.labels(route, stage).observe(seconds)
+            if access_log.isEnabledFor(logging.INFO):
+                access_log.info(
+                    '{"msg":"req","rid":"%s","route":"%s","path":"%s","method":"%s",'
+                    '"status":%d,"duration":%.3f}',
+                    rid,
+                    route,
+                    request.url.path,
+                    method,
+                    status,
+                    dur,
+                )
 
     @app.get("/healthz")
     def healthz():
@@ -83,3 +135,12 @@ def wire(app: FastAPI):
     @app.get("/metrics")
     def metrics():
         return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+    @app.get("/debug/traces")
+    def traces(limit: int = 50, route: Optional[str] = None, min_ms: float = 0.0):
+        def keep(t):
+            if route and t.attrs.get("route") != route:
+                return False
+            return (t.duration or 0.0) * 1000.0 >= min_ms
+
+        return {"traces": get_trace_buffer().recent(limit=limit, predicate=keep)}
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import logging
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -34,6 +38,8 @@ if AsyncIOMotorClient and _MONGO_URL and _DB_NAME:
     except Exception:
         _db = None
 
+logger = logging.getLogger(__name__)
+
 
 # -----------------------------
 # Core compute request/response
@@ -124,29 +130,118 @@ class ComputeResponse(BaseModel):
     cc_signals: Optional[List[Dict[str, Any]]] = None
 
 
+def _to_position(p: PositionIn) -> Position:
+    return Position(
+        ticker=p.ticker.upper(),
+        price=p.price,
+        strike=p.strike,
+        delta=p.delta,
+        dte=p.dte,
+        premium=p.premium,
+        iv_rank=p.iv_rank,
+        vix=p.vix,
+        selected=p.selected if p.selected is not None else True,
+        assigned=p.assigned if p.assigned is not None else False,
+        status=p.status or "Active",
+        contracts=p.contracts or 0,
+        notes=p.notes or "",
+    )
+
+
+def _evaluate_cc_item(
+    item: CCInput, cc_cfg: CCConfigIn
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int, int, List[float]]:
+    """Covered-call signals for one holding.
+
+    Returns:
+        (signals, rows, lots_total, lots_used, monthly_yields)
+    """
+    cc_signals: List[Dict[str, Any]] = []
+    cc_rows: List[Dict[str, Any]] = []
+    lots_used = 0
+    yields: List[float] = []
+
+    sym = (item.ticker or "").upper()
+    lots_avail = max(0, (item.shares_owned // 100) - int(item.open_cc_contracts or 0))
+    lots_total = item.shares_owned // 100
+
+    # SELL CALL candidate
+    if item.candidate_call and lots_avail > 0:
+        c = item.candidate_call
+        if (cc_cfg.cc_delta_min <= c.delta <= cc_cfg.cc_delta_max) and (
+            cc_cfg.cc_dte_min <= c.dte <= cc_cfg.cc_dte_max
+        ):
+            monthly_y = 0.0
+            if c.dte > 0 and c.strike > 0:
+                monthly_y = (c.premium / (c.strike * 100.0)) * (30.0 / c.dte) * 100.0
+            contracts = lots_avail
+            lots_used += contracts
+            yields.append(monthly_y)
+            sig = {
+                "ticker": sym,
+                "signal": "SELL CALL",
+                "contracts": contracts,
+                "strike": c.strike,
+                "dte": c.dte,
+                "delta": c.delta,
+                "premium": c.premium,
+                "notes": f"lots_avail={lots_avail}",
+            }
+            cc_signals.append(sig)
+            cc_rows.append({**sig, "monthly_yield_pct": monthly_y})
+
+    # ROLL CC / TAKE PROFIT on existing
+    if item.open_cc_state and (item.open_cc_contracts or 0) > 0:
+        s = item.open_cc_state
+        # ROLL CC condition
+        if (s.delta > cc_cfg.cc_roll_delta_threshold) or (
+            s.dte < cc_cfg.cc_roll_dte_threshold
+        ):
+            sig = {
+                "ticker": sym,
+                "signal": "ROLL CC",
+                "contracts": int(item.open_cc_contracts or 0),
+                "strike": None,
+                "dte": s.dte,
+                "delta": s.delta,
+                "premium": s.premium_mark,
+                "notes": "roll conditions met",
+            }
+            cc_signals.append(sig)
+            cc_rows.append({**sig, "monthly_yield_pct": None})
+        # TAKE PROFIT condition
+        if s.premium_sold > 0:
+            rem_ratio = (s.premium_mark or 0.0) / float(s.premium_sold)
+            if rem_ratio <= cc_cfg.cc_take_profit_remaining_threshold:
+                sig = {
+                    "ticker": sym,
+                    "signal": "TAKE PROFIT",
+                    "contracts": int(item.open_cc_contracts or 0),
+                    "strike": None,
+                    "dte": s.dte,
+                    "delta": s.delta,
+                    "premium": s.premium_mark,
+                    "notes": f"remaining={rem_ratio:.2f}",
+                }
+                cc_signals.append(sig)
+                cc_rows.append({**sig, "monthly_yield_pct": None})
+
+    return cc_signals, cc_rows, lots_total, lots_used, yields
+
+
+def _cc_signal_counts(cc_signals: List[Dict[str, Any]]) -> Dict[str, int]:
+    return {
+        "SELL CALL": sum(1 for s in cc_signals if s["signal"] == "SELL CALL"),
+        "ROLL CC": sum(1 for s in cc_signals if s["signal"] == "ROLL CC"),
+        "TAKE PROFIT": sum(1 for s in cc_signals if s["signal"] == "TAKE PROFIT"),
+    }
+
+
 async def compute_selling(req: ComputeRequest) -> ComputeResponse:
     cfg = Config(**(req.config.dict() if req.config else {}))
 
     # Build Position list
-    pos_list: List[Position] = []
-    for p in req.positions:
-        pos_list.append(
-            Position(
-                ticker=p.ticker.upper(),
-                price=p.price,
-                strike=p.strike,
-                delta=p.delta,
-                dte=p.dte,
-                premium=p.premium,
-                iv_rank=p.iv_rank,
-                vix=p.vix,
-                selected=p.selected if p.selected is not None else True,
-                assigned=p.assigned if p.assigned is not None else False,
-                status=p.status or "Active",
-                contracts=p.contracts or 0,
-                notes=p.notes or "",
-            )
-        )
+    pos_list: List[Position] = [_to_position(p) for p in req.positions]
 
     # Optional watchlist filter
     if req.watchlist:
@@ -178,87 +273,19 @@ async def compute_selling(req: ComputeRequest) -> ComputeResponse:
         yields: List[float] = []
 
         for item in cc_inputs:
-            sym = (item.ticker or "").upper()
-            lots_avail = max(
-                0, (item.shares_owned // 100) - int(item.open_cc_contracts or 0)
-            )
-            lots_total += item.shares_owned // 100
-
-            # SELL CALL candidate
-            if item.candidate_call and lots_avail > 0:
-                c = item.candidate_call
-                if (cc_cfg.cc_delta_min <= c.delta <= cc_cfg.cc_delta_max) and (
-                    cc_cfg.cc_dte_min <= c.dte <= cc_cfg.cc_dte_max
-                ):
-                    monthly_y = 0.0
-                    if c.dte > 0 and c.strike > 0:
-                        monthly_y = (
-                            (c.premium / (c.strike * 100.0)) * (30.0 / c.dte) * 100.0
-                        )
-                    contracts = lots_avail
-                    lots_used += contracts
-                    yields.append(monthly_y)
-                    sig = {
-                        "ticker": sym,
-                        "signal": "SELL CALL",
-                        "contracts": contracts,
-                        "strike": c.strike,
-                        "dte": c.dte,
-                        "delta": c.delta,
-                        "premium": c.premium,
-                        "notes": f"lots_avail={lots_avail}",
-                    }
-                    cc_signals.append(sig)
-                    cc_rows.append({**sig, "monthly_yield_pct": monthly_y})
-
-            # ROLL CC / TAKE PROFIT on existing
-            if item.open_cc_state and (item.open_cc_contracts or 0) > 0:
-                s = item.open_cc_state
-                # ROLL CC condition
-                if (s.delta > cc_cfg.cc_roll_delta_threshold) or (
-                    s.dte < cc_cfg.cc_roll_dte_threshold
-                ):
-                    sig = {
-                        "ticker": sym,
-                        "signal": "ROLL CC",
-                        "contracts": int(item.open_cc_contracts or 0),
-                        "strike": None,
-                        "dte": s.dte,
-                        "delta": s.delta,
-                        "premium": s.premium_mark,
-                        "notes": "roll conditions met",
-                    }
-                    cc_signals.append(sig)
-                    cc_rows.append({**sig, "monthly_yield_pct": None})
-                # TAKE PROFIT condition
-                if s.premium_sold > 0:
-                    rem_ratio = (s.premium_mark or 0.0) / float(s.premium_sold)
-                    if rem_ratio <= cc_cfg.cc_take_profit_remaining_threshold:
-                        sig = {
-                            "ticker": sym,
-                            "signal": "TAKE PROFIT",
-                            "contracts": int(item.open_cc_contracts or 0),
-                            "strike": None,
-                            "dte": s.dte,
-                            "delta": s.delta,
-                            "premium": s.premium_mark,
-                            "notes": f"remaining={rem_ratio:.2f}",
-                        }
-                        cc_signals.append(sig)
-                        cc_rows.append({**sig, "monthly_yield_pct": None})
+            sigs, rows, total, used, ys = _evaluate_cc_item(item, cc_cfg)
+            cc_signals.extend(sigs)
+            cc_rows.extend(rows)
+            lots_total += total
+            lots_used += used
+            yields.extend(ys)
 
         cc_summary = {
             "lots_total": lots_total,
             "lots_used": lots_used,
             "lots_free": max(0, lots_total - lots_used),
             "monthly_yield_avg": (sum(yields) / len(yields)) if yields else 0.0,
-            "signals_count": {
-                "SELL CALL": sum(1 for s in cc_signals if s["signal"] == "SELL CALL"),
-                "ROLL CC": sum(1 for s in cc_signals if s["signal"] == "ROLL CC"),
-                "TAKE PROFIT": sum(
-                    1 for s in cc_signals if s["signal"] == "TAKE PROFIT"
-                ),
-            },
+            "signals_count": _cc_signal_counts(cc_signals),
         }
         resp.cc_summary = cc_summary
         resp.cc_table = cc_rows
@@ -270,6 +297,11 @@ async def compute_selling(req: ComputeRequest) -> ComputeResponse:
 # -----------------------------
 # Monitor service (in-memory)
 # -----------------------------
+MONITOR_WRITE_BATCH = int(os.getenv("MONITOR_WRITE_BATCH", "50"))
+MONITOR_FLUSH_SECONDS = float(os.getenv("MONITOR_FLUSH_SECONDS", "30"))
+MONITOR_LISTENER_QUEUE = int(os.getenv("MONITOR_LISTENER_QUEUE", "100"))
+
+
 class MonitorStartRequest(BaseModel):
     positions: List[PositionIn]
     config: Optional[ConfigIn] = None
@@ -279,6 +311,21 @@ class MonitorStartRequest(BaseModel):
     # Covered Calls
     cc_config: Optional[CCConfigIn] = None
     cc_inputs: Optional[List[CCInput]] = None
+    # Optional per-ticker option chain version (e.g. quote timestamp / etag)
+    chain_versions: Optional[Dict[str, str]] = None
+
+
+class MonitorUpdateRequest(BaseModel):
+    """Incremental input update for a running monitor.
+
+    Positions and CC inputs replace the current inputs of every ticker they
+    mention; tickers not mentioned keep their inputs and are not recomputed.
+    """
+
+    positions: Optional[List[PositionIn]] = None
+    cc_inputs: Optional[List[CCInput]] = None
+    chain_versions: Optional[Dict[str, str]] = None
+    remove: Optional[List[str]] = None
 
 
 class MonitorDiffs(BaseModel):
@@ -297,50 +344,182 @@ class MonitorSnapshot(BaseModel):
     signals_previous: List[Dict[str, Any]] = []
     diffs: MonitorDiffs = MonitorDiffs()
     cycles: int = 0
+    symbols: int = 0
+    recomputed: int = 0
+    cycle_ms: float = 0.0
 
 
-async def _log_snapshot_to_mongo(snap: MonitorSnapshot, cfg: Optional[ConfigIn]):
-    if _db is None:
-        return
-    try:
-        doc = {
-            "ts": datetime.utcnow().isoformat() + "Z",
-            "mode": snap.mode,
-            "interval_seconds": snap.interval_seconds,
-            "summary": snap.summary or {},
-            "signals": snap.signals_current or [],
-            "diffs": {
-                "added": snap.diffs.added if snap.diffs else [],
-                "removed": snap.diffs.removed if snap.diffs else [],
-                "changed": snap.diffs.changed if snap.diffs else [],
-            },
-            "cycles": snap.cycles,
-            "config": cfg.dict() if cfg else {},
-        }
-        await _db["options_monitor_snapshots"].insert_one(doc)
-    except Exception:
-        # Best effort logging; do not break monitor
-        pass
+def _fingerprint(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _signal_key(s: Dict[str, Any]) -> Tuple:
+    # Key fields to identify a unique signal across runs
+    return (
+        (s.get("ticker") or "").upper(),
+        s.get("signal") or "",
+        float(s.get("strike") or 0.0),
+        int(s.get("dte") or 0),
+    )
+
+
+# Additive fields of sell_puts_engine.summarize(); the rest derive from them
+_PUT_SUMMARY_SUMS = (
+    "capital_active_blocked",
+    "capital_released",
+    "capital_in_equity",
+    "risk_economic_active",
+    "count_active",
+    "count_closed",
+    "count_assigned",
+    "signals_SELL PUT",
+    "signals_ROLL",
+    "signals_COVERED CALL",
+)
+
+
+class _SymbolState:
+    """Inputs and last computed outputs of one monitored ticker."""
+
+    __slots__ = (
+        "positions",
+        "cc_input",
+        "chain_version",
+        "fingerprint",
+        "base",
+        "equal_signals",
+        "greedy_signals",
+        "cc_signals",
+        "equal_part",
+        "cc_part",
+    )
+
+    def __init__(self):
+        self.positions: List[PositionIn] = []
+        self.cc_input: Optional[CCInput] = None
+        self.chain_version: Optional[str] = None
+        self.fingerprint: str = ""
+        self.base: List[Position] = []
+        self.equal_signals: List[Dict[str, Any]] = []
+        self.greedy_signals: List[Dict[str, Any]] = []
+        self.cc_signals: List[Dict[str, Any]] = []
+        self.equal_part: Dict[str, float] = {}
+        self.cc_part: Dict[str, float] = {}
+
+    def input_fingerprint(self) -> str:
+        return _fingerprint(
+            [p.dict() for p in self.positions],
+            self.cc_input.dict() if self.cc_input else None,
+            self.chain_version,
+        )
+
+    def is_empty(self) -> bool:
+        return not self.positions and self.cc_input is None
+
+
+class _RunningTotals:
+    """Per-symbol contributions to a sum, updated by replacing one symbol."""
+
+    def __init__(self):
+        self.parts: Dict[str, Dict[str, float]] = {}
+        self.totals: Dict[str, float] = {}
+
+    def replace(self, sym: str, part: Dict[str, float]):
+        old = self.parts.pop(sym, None) or {}
+        for k, v in old.items():
+            self.totals[k] = self.totals.get(k, 0) - v
+        for k, v in part.items():
+            self.totals[k] = self.totals.get(k, 0) + v
+        if part:
+            self.parts[sym] = part
+
+    def get(self, key: str) -> float:
+        return self.totals.get(key, 0)
+
+
+class _DiffLog:
+    """Buffers non-empty monitor diffs and writes them with ``insert_many``."""
+
+    def __init__(
+        self,
+        batch_size: int = MONITOR_WRITE_BATCH,
+        flush_seconds: float = MONITOR_FLUSH_SECONDS,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self._buffer: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+        self.docs_written = 0
+        self.write_calls = 0
+
+    def add(self, doc: Dict[str, Any]):
+        self._buffer.append(doc)
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    async def flush(self, force: bool = False):
+        if not self._buffer:
+            self._last_flush = time.monotonic()
+            return
+        due = (
+            force
+            or len(self._buffer) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.flush_seconds
+        )
+        if not due:
+            return
+        docs, self._buffer = self._buffer, []
+        self._last_flush = time.monotonic()
+        if _db is None:
+            return
+        try:
+            await _db["options_monitor_snapshots"].insert_many(docs, ordered=False)
+            self.docs_written += len(docs)
+            self.write_calls += 1
+        except Exception as e:
+            # Best effort logging; do not break monitor
+            logger.debug(f"Monitor diff log write failed: {e}")
 
 
 class _MonitorService:
+    """Options-selling monitor with per-symbol incremental recompute.
+
+    Each ticker's inputs (positions/spot, CC inputs, chain version) are
+    fingerprinted; a cycle recomputes only tickers whose fingerprint changed
+    since the last cycle, or every ticker when the settings change. Equal
+    allocation is per-symbol given the symbol count, so it is recomputed
+    per ticker; greedy allocation shares one budget and is rerun over the
+    whole book whenever any position changes. Only signal diffs are
+    persisted (batched) and pushed to subscribers.
+    """
+
     def __init__(self):
         self._task: Optional[asyncio.Task] = None
         self._lock = asyncio.Lock()
         self._running: bool = False
         self._req: Optional[MonitorStartRequest] = None
         self._snapshot: MonitorSnapshot = MonitorSnapshot(running=False)
-        self._prev_signals: List[Dict[str, Any]] = []
         self._cycles: int = 0
+        self._listeners: List[asyncio.Queue] = []
+        self._log = _DiffLog()
+        self._reset_state()
+
+    def _reset_state(self):
+        self._symbols: Dict[str, _SymbolState] = {}
+        self._dirty: set = set()
+        self._n_positions: int = 0
+        self._settings_fp: str = ""
+        self._watch: Optional[set] = None
+        self._equal_totals = _RunningTotals()
+        self._cc_totals = _RunningTotals()
+        self._greedy_summary: Dict[str, Any] = {}
+        self._last_diffs = MonitorDiffs()
+        self._recomputed = 0
 
     def _key(self, s: Dict[str, Any]) -> Tuple:
-        # Key fields to identify a unique signal across runs
-        return (
-            (s.get("ticker") or "").upper(),
-            s.get("signal") or "",
-            float(s.get("strike") or 0.0),
-            int(s.get("dte") or 0),
-        )
+        return _signal_key(s)
 
     def _diff(
         self, prev: List[Dict[str, Any]], cur: List[Dict[str, Any]]
@@ -369,76 +548,315 @@ class _MonitorService:
                 removed.append(v)
         return MonitorDiffs(added=added, removed=removed, changed=changed)
 
+    # ------------------------------------------------------------------
+    # Inputs
+    # ------------------------------------------------------------------
+    def _mode(self) -> str:
+        return ((self._req.mode if self._req else None) or "equal").lower()
+
+    def _state(self, sym: str) -> _SymbolState:
+        st = self._symbols.get(sym)
+        if st is None:
+            st = self._symbols[sym] = _SymbolState()
+        return st
+
+    def _apply_inputs(
+        self,
+        positions: Optional[List[PositionIn]] = None,
+        cc_inputs: Optional[List[CCInput]] = None,
+        chain_versions: Optional[Dict[str, str]] = None,
+        remove: Optional[List[str]] = None,
+    ) -> int:
+        """Replace inputs for the tickers mentioned and mark changed ones dirty.
+
+        Returns:
+            Number of tickers whose input fingerprint changed.
+        """
+        touched: set = set()
+
+        grouped: Dict[str, List[PositionIn]] = {}
+        for p in positions or []:
+            grouped.setdefault(p.ticker.upper(), []).append(p)
+        for sym, plist in grouped.items():
+            if self._watch is not None and sym not in self._watch:
+                continue
+            st = self._state(sym)
+            self._n_positions += len(plist) - len(st.positions)
+            st.positions = plist
+            touched.add(sym)
+
+        for item in cc_inputs or []:
+            sym = (item.ticker or "").upper()
+            self._state(sym).cc_input = item
+            touched.add(sym)
+
+        for sym, version in (chain_versions or {}).items():
+            sym = sym.upper()
+            if sym in self._symbols:
+                self._symbols[sym].chain_version = version
+                touched.add(sym)
+
+        for sym in remove or []:
+            st = self._symbols.get(sym.upper())
+            if st is not None:
+                self._n_positions -= len(st.positions)
+                st.positions, st.cc_input = [], None
+                touched.add(sym.upper())
+
+        changed = 0
+        for sym in touched:
+            st = self._symbols[sym]
+            if st.input_fingerprint() != st.fingerprint:
+                self._dirty.add(sym)
+                changed += 1
+        return changed
+
+    def _settings_fingerprint(self) -> str:
+        req = self._req
+        mode = self._mode()
+        return _fingerprint(
+            req.config.dict() if req and req.config else None,
+            req.cc_config.dict() if req and req.cc_config else None,
+            mode,
+            # Equal allocation splits capital_base by the number of positions
+            self._n_positions if mode in ("equal", "both") else None,
+        )
+
+    # ------------------------------------------------------------------
+    # Cycle
+    # ------------------------------------------------------------------
+    def _put_summary(self, cfg: Config) -> Dict[str, Any]:
+        t = self._equal_totals
+        capital_active = t.get("capital_active_blocked")
+        risk_economic = t.get("risk_economic_active")
+        return {
+            "capital_base": cfg.capital_base,
+            "capital_active_blocked": capital_active,
+            "capital_released": t.get("capital_released"),
+            "capital_in_equity": t.get("capital_in_equity"),
+            "capital_available_cash_secured": max(
+                0.0, cfg.capital_base - capital_active
+            ),
+            "risk_economic_active": risk_economic,
+            "risk_budget": cfg.capital_base,
+            "risk_headroom": max(0.0, cfg.capital_base - risk_economic),
+            "count_active": int(t.get("count_active")),
+            "count_closed": int(t.get("count_closed")),
+            "count_assigned": int(t.get("count_assigned")),
+            "signals_SELL PUT": int(t.get("signals_SELL PUT")),
+            "signals_ROLL": int(t.get("signals_ROLL")),
+            "signals_COVERED CALL": int(t.get("signals_COVERED CALL")),
+        }
+
+    def _cc_summary(self) -> Dict[str, Any]:
+        t = self._cc_totals
+        if not t.parts:
+            return {}
+        lots_total = int(t.get("lots_total"))
+        lots_used = int(t.get("lots_used"))
+        n_yields = t.get("yield_count")
+        return {
+            "lots_total": lots_total,
+            "lots_used": lots_used,
+            "lots_free": max(0, lots_total - lots_used),
+            "monthly_yield_avg": (t.get("yield_sum") / n_yields) if n_yields else 0.0,
+            "signals_count": {
+                k: int(t.get(f"signals_{k}"))
+                for k in ("SELL CALL", "ROLL CC", "TAKE PROFIT")
+            },
+        }
+
+    def _symbol_signals(self, st: _SymbolState, mode: str) -> List[Dict[str, Any]]:
+        if mode == "greedy":
+            puts = st.greedy_signals
+        elif mode == "both":
+            # Same merge as the full-book path, restricted to one ticker
+            uniq: Dict[Tuple, Dict[str, Any]] = {}
+            for s in st.greedy_signals + st.equal_signals:
+                uniq[self._key(s)] = s
+            puts = list(uniq.values())
+        else:
+            puts = st.equal_signals
+        return list(puts) + list(st.cc_signals)
+
+    def _recompute(self) -> Tuple[MonitorDiffs, List[str]]:
+        """Recompute dirty tickers and return the signal diffs they produced."""
+        req = self._req
+        assert req is not None
+        cfg = Config(**(req.config.dict() if req.config else {}))
+        cc_cfg = req.cc_config or CCConfigIn()
+        mode = self._mode()
+
+        settings_fp = self._settings_fingerprint()
+        if settings_fp != self._settings_fp:
+            self._settings_fp = settings_fp
+            self._equal_totals = _RunningTotals()
+            self._dirty.update(self._symbols)
+
+        dirty, self._dirty = self._dirty, set()
+        self._recomputed = len(dirty)
+        if not dirty:
+            return MonitorDiffs(), []
+        try:
+            return self._recompute_symbols(dirty, cfg, cc_cfg, mode)
+        except Exception:
+            # Retry the whole book next cycle rather than keep partial state
+            self._dirty |= dirty
+            self._settings_fp = ""
+            raise
+
+    def _recompute_symbols(
+        self, dirty: set, cfg: Config, cc_cfg: CCConfigIn, mode: str
+    ) -> Tuple[MonitorDiffs, List[str]]:
+        previous = {
+            sym: self._symbol_signals(self._symbols[sym], mode) for sym in dirty
+        }
+
+        per_cap = cfg.capital_base / self._n_positions if self._n_positions else 0.0
+        positions_changed = False
+        for sym in dirty:
+            st = self._symbols[sym]
+            base = [_to_position(p) for p in st.positions]
+            positions_changed = positions_changed or bool(base or st.base)
+            st.base = base
+            if mode in ("equal", "both"):
+                eq = allocate_contracts_equal(base, cfg, per_symbol_cap=per_cap)
+                st.equal_signals = collect_signals(eq, cfg)
+                part = summarize(eq, cfg) if eq else {}
+                self._equal_totals.replace(
+                    sym, {k: part[k] for k in _PUT_SUMMARY_SUMS if k in part}
+                )
+            if st.cc_input is not None:
+                sigs, _, lots_total, lots_used, ys = _evaluate_cc_item(
+                    st.cc_input, cc_cfg
+                )
+                counts = _cc_signal_counts(sigs)
+                st.cc_signals = sigs
+                self._cc_totals.replace(
+                    sym,
+                    {
+                        "lots_total": lots_total,
+                        "lots_used": lots_used,
+                        "yield_sum": sum(ys),
+                        "yield_count": len(ys),
+                        **{f"signals_{k}": v for k, v in counts.items()},
+                    },
+                )
+            else:
+                st.cc_signals = []
+                self._cc_totals.replace(sym, {})
+            st.fingerprint = st.input_fingerprint()
+
+        affected = set(dirty)
+        if mode in ("greedy", "both") and positions_changed:
+            # Greedy fill shares one budget across the book: rerun it whole
+            book = [p for st in self._symbols.values() for p in st.base]
+            gr = greedy_fill_by_risk(book, cfg)
+            self._greedy_summary = summarize(gr, cfg)
+            by_sym: Dict[str, List[Dict[str, Any]]] = {}
+            for s in collect_signals(gr, cfg):
+                by_sym.setdefault(s["ticker"], []).append(s)
+            for sym, st in self._symbols.items():
+                new = by_sym.get(sym, [])
+                if new != st.greedy_signals:
+                    if sym not in previous:
+                        previous[sym] = self._symbol_signals(st, mode)
+                    st.greedy_signals = new
+                    affected.add(sym)
+
+        added, removed, changed = [], [], []
+        changed_syms: List[str] = []
+        for sym in affected:
+            st = self._symbols[sym]
+            d = self._diff(previous.get(sym, []), self._symbol_signals(st, mode))
+            if d.added or d.removed or d.changed:
+                changed_syms.append(sym)
+                added.extend(d.added)
+                removed.extend(d.removed)
+                changed.extend(d.changed)
+            if st.is_empty():
+                del self._symbols[sym]
+        return (
+            MonitorDiffs(added=added, removed=removed, changed=changed),
+            sorted(changed_syms),
+        )
+
+    def _summary(self) -> Dict[str, Any]:
+        cfg = Config(
+            **(self._req.config.dict() if self._req and self._req.config else {})
+        )
+        if self._mode() in ("greedy", "both"):
+            summary = dict(self._greedy_summary) or summarize([], cfg)
+        else:
+            summary = self._put_summary(cfg)
+        return {**summary, "cc_summary": self._cc_summary()}
+
+    async def _run_cycle(self, interval: int) -> MonitorDiffs:
+        started = time.perf_counter()
+        diffs, changed_syms = self._recompute()
+        self._cycles += 1
+        ts = datetime.utcnow().isoformat() + "Z"
+
+        summary = self._summary()
+        snap = MonitorSnapshot(
+            running=True,
+            last_run_at=ts,
+            interval_seconds=interval,
+            mode=self._mode(),
+            summary=summary,
+            diffs=diffs,
+            cycles=self._cycles,
+            symbols=len(self._symbols),
+            recomputed=self._recomputed,
+            cycle_ms=round((time.perf_counter() - started) * 1000.0, 3),
+        )
+        async with self._lock:
+            self._snapshot = snap
+            if changed_syms:
+                self._last_diffs = diffs
+
+        if changed_syms:
+            diff_doc = diffs.dict()
+            self._log.add(
+                {
+                    "ts": ts,
+                    "mode": snap.mode,
+                    "interval_seconds": interval,
+                    "summary": summary,
+                    "symbols": changed_syms,
+                    "diffs": diff_doc,
+                    "cycles": self._cycles,
+                    "config": self._req.config.dict() if self._req.config else {},
+                }
+            )
+            self._publish(
+                {
+                    "type": "diff",
+                    "ts": ts,
+                    "cycles": self._cycles,
+                    "symbols": changed_syms,
+                    "diffs": diff_doc,
+                    "summary": summary,
+                }
+            )
+        await self._log.flush()
+        return diffs
+
     async def _loop(self):
         assert self._req is not None
         interval = max(5, int(self._req.interval_seconds or 15))
         while self._running:
             try:
-                # Build compute payload from start request
-                comp_req = ComputeRequest(
-                    positions=self._req.positions,
-                    config=self._req.config,
-                    mode=self._req.mode,
-                    watchlist=self._req.watchlist,
-                    cc_config=self._req.cc_config,
-                    cc_inputs=self._req.cc_inputs,
-                )
-                res = await compute_selling(comp_req)
-                # Pick signals + summary by mode preference
-                mode = (self._req.mode or "equal").lower()
-                if mode == "greedy":
-                    signals = res.signals_greedy or []
-                    summary = res.summary_greedy
-                elif mode == "both":
-                    # Merge both lists, remove duplicates by key (prefer greedy values)
-                    signals = (res.signals_greedy or []) + (res.signals_equal or [])
-                    uniq = {}
-                    for s in signals:
-                        uniq[self._key(s)] = s
-                    signals = list(uniq.values())
-                    summary = res.summary_greedy or res.summary_equal
-                else:
-                    signals = res.signals_equal or []
-                    summary = res.summary_equal
-
-                # Merge CC signals into signal stream
-                if res.cc_signals:
-                    signals = list(signals) + list(res.cc_signals)
-
-                diffs = self._diff(self._prev_signals, signals)
-                self._prev_signals = signals
-                self._cycles += 1
-
-                snap = MonitorSnapshot(
-                    running=True,
-                    last_run_at=datetime.utcnow().isoformat() + "Z",
-                    interval_seconds=interval,
-                    mode=mode,
-                    summary={**(summary or {}), "cc_summary": res.cc_summary or {}},
-                    signals_current=signals,
-                    signals_previous=(
-                        self._snapshot.signals_current
-                        if self._snapshot.signals_current
-                        else []
-                    ),
-                    diffs=diffs,
-                    cycles=self._cycles,
-                )
-                async with self._lock:
-                    self._snapshot = snap
-
-                # Async log to Mongo (best effort)
-                await _log_snapshot_to_mongo(snap, self._req.config)
+                await self._run_cycle(interval)
             except Exception as e:
                 # Store error details in snapshot while keeping loop alive
                 err_snap = MonitorSnapshot(
                     running=self._running,
                     last_run_at=datetime.utcnow().isoformat() + "Z",
                     interval_seconds=interval,
-                    mode=(self._req.mode or "equal") if self._req else "equal",
+                    mode=self._mode(),
                     summary={"error": str(e)},
                     signals_current=[],
-                    signals_previous=self._prev_signals or [],
                     diffs=MonitorDiffs(),
                     cycles=self._cycles,
                 )
@@ -447,14 +865,49 @@ class _MonitorService:
             # Sleep until next cycle
             await asyncio.sleep(interval)
 
+    # ------------------------------------------------------------------
+    # Listeners
+    # ------------------------------------------------------------------
+    def subscribe(self, maxsize: int = MONITOR_LISTENER_QUEUE) -> asyncio.Queue:
+        """Register a listener; each cycle with signal changes is pushed to it.
+
+        Slow listeners lose their oldest events rather than blocking the loop.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._listeners.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._listeners:
+            self._listeners.remove(queue)
+
+    def _publish(self, event: Dict[str, Any]):
+        for queue in list(self._listeners):
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(event)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
     async def start(self, req: MonitorStartRequest) -> Dict[str, Any]:
         # Stop existing
         await self.stop()
         # Set state and launch
         self._req = req
         self._running = True
-        self._prev_signals = []
         self._cycles = 0
+        self._reset_state()
+        if req.watchlist:
+            self._watch = {s.upper() for s in req.watchlist}
+        self._apply_inputs(
+            positions=req.positions,
+            cc_inputs=req.cc_inputs,
+            chain_versions=req.chain_versions,
+        )
         self._snapshot = MonitorSnapshot(
             running=True,
             interval_seconds=req.interval_seconds,
@@ -467,6 +920,18 @@ class _MonitorService:
             "mode": req.mode or "equal",
         }
 
+    async def update(self, req: MonitorUpdateRequest) -> Dict[str, Any]:
+        """Feed new inputs; changed tickers are recomputed on the next cycle."""
+        if self._req is None:
+            return {"status": "idle", "changed": 0}
+        changed = self._apply_inputs(
+            positions=req.positions,
+            cc_inputs=req.cc_inputs,
+            chain_versions=req.chain_versions,
+            remove=req.remove,
+        )
+        return {"status": "queued", "changed": changed, "pending": len(self._dirty)}
+
     async def stop(self) -> Dict[str, Any]:
         if self._task and not self._task.done():
             self._running = False
@@ -480,14 +945,46 @@ class _MonitorService:
                 pass
             self._task = None
         self._running = False
+        await self._log.flush(force=True)
         async with self._lock:
             self._snapshot.running = False
         return {"status": "stopped"}
 
+    def _current_signals(self) -> List[Dict[str, Any]]:
+        mode = self._mode()
+        puts: List[Dict[str, Any]] = []
+        calls: List[Dict[str, Any]] = []
+        for st in self._symbols.values():
+            sigs = self._symbol_signals(st, mode)
+            n_cc = len(st.cc_signals)
+            puts.extend(sigs[: len(sigs) - n_cc])
+            calls.extend(sigs[len(sigs) - n_cc :])
+        return puts + calls
+
     async def status(self) -> Dict[str, Any]:
         async with self._lock:
-            snap = self._snapshot
-        return {"status": "success", "data": snap.dict()}
+            snap = self._snapshot.copy()
+            last = self._last_diffs
+        if "error" not in (snap.summary or {}):
+            # Full signal lists are materialized on read, not every cycle
+            current = self._current_signals()
+            prev_map = {self._key(s): s for s in current}
+            for s in last.added:
+                prev_map.pop(self._key(s), None)
+            for c in last.changed:
+                prev_map[self._key(c["from"])] = c["from"]
+            for s in last.removed:
+                prev_map[self._key(s)] = s
+            snap.signals_current = current
+            snap.signals_previous = list(prev_map.values())
+        data = snap.dict()
+        data["diff_log"] = {
+            "pending": self._log.pending(),
+            "docs_written": self._log.docs_written,
+            "write_calls": self._log.write_calls,
+        }
+        data["listeners"] = len(self._listeners)
+        return {"status": "success", "data": data}
 
 
 # Singleton instance
@@ -685,3 +1182,7 @@ async def monitor_stop() -> Dict[str, Any]:
 
 async def monitor_status() -> Dict[str, Any]:
     return await monitor_service.status()
+
+
+async def monitor_update(req: MonitorUpdateRequest) -> Dict[str, Any]:
+    return await monitor_service.update(req)
@@ -1,634 +1,809 @@
-import matplotlib
-import numpy as np
-
-matplotlib.use("Agg")  # Non-interactive backend
-from typing import Any, Dict
-
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-
-
-class OptionsStrategyChartGenerator:
-    def __init__(self):
-        # Set matplotlib style for professional charts
-        plt.style.use("seaborn-v0_8-darkgrid")
-        self.colors = {
-            "profit": "#22C55E",  # Green
-            "loss": "#EF4444",  # Red
-            "breakeven": "#F59E0B",  # Orange
-            "current": "#3B82F6",  # Blue
-            "background": "#1F2937",  # Dark gray
-        }
-
-    def generate_strategy_chart(self, strategy: Dict[str, Any]) -> Dict[str, str]:
-        """Generate both matplotlib and plotly charts for a strategy"""
-        strategy_name = strategy.get("strategy_name", "").lower().replace(" ", "_")
-
-        if strategy_name in ["bull_call_spread", "bear_put_spread"]:
-            return self._generate_vertical_spread_chart(strategy)
-        elif strategy_name in ["long_call", "long_put"]:
-            return self._generate_directional_chart(strategy)
-        elif strategy_name in ["long_straddle", "long_strangle"]:
-            return self._generate_volatility_chart(strategy)
-        elif strategy_name == "iron_condor":
-            return self._generate_iron_condor_chart(strategy)
-        elif strategy_name in ["cash_secured_put", "covered_call"]:
-            return self._generate_income_chart(strategy)
-        else:
-            return self._generate_generic_chart(strategy)
-
-    def _generate_vertical_spread_chart(
-        self, strategy: Dict[str, Any]
-    ) -> Dict[str, str]:
-        """Generate chart for Bull Call Spread / Bear Put Spread"""
-        ticker = strategy.get("ticker", "STOCK")
-        strategy_name = strategy.get("strategy_name", "Vertical Spread")
-        underlying_price = strategy.get("entry_logic", {}).get("underlying_price", 100)
-
-        # Calculate strikes for spread
-        is_call_spread = "call" in strategy_name.lower()
-        is_bull = "bull" in strategy_name.lower()
-
-        if is_bull:
-            lower_strike = underlying_price * 0.98
-            upper_strike = underlying_price * 1.05
-        else:
-            lower_strike = underlying_price * 0.95
-            upper_strike = underlying_price * 1.02
-
-        # Generate price range
-        price_range = np.linspace(underlying_price * 0.85, underlying_price * 1.15, 100)
-
-        # Calculate P&L for vertical spread
-        if is_call_spread:
-            if is_bull:  # Bull Call Spread
-                long_call_pl = (
-                    np.maximum(price_range - lower_strike, 0) - 2
-                )  # Premium paid
-                short_call_pl = -(
-                    np.maximum(price_range - upper_strike, 0) - 2
-                )  # Premium received
-                total_pl = long_call_pl + short_call_pl
-            else:  # Bear Call Spread (short)
-                long_call_pl = np.maximum(price_range - upper_strike, 0) - 1
-                short_call_pl = -(np.maximum(price_range - lower_strike, 0) - 3)
-                total_pl = long_call_pl + short_call_pl
-        else:  # Put spread
-            if not is_bull:  # Bear Put Spread
-                long_put_pl = np.maximum(upper_strike - price_range, 0) - 2
-                short_put_pl = -(np.maximum(lower_strike - price_range, 0) - 1)
-                total_pl = long_put_pl + short_put_pl
-            else:  # Bull Put Spread (short)
-                long_put_pl = np.maximum(lower_strike - price_range, 0) - 1
-                short_put_pl = -(np.maximum(upper_strike - price_range, 0) - 3)
-                total_pl = long_put_pl + short_put_pl
-
-        # Create Plotly chart
-        fig = go.Figure()
-
-        # Add P&L line
-        fig.add_trace(
-            go.Scatter(
-                x=price_range.tolist(),
-                y=(total_pl * 100).tolist(),  # Convert to dollars
-                mode="lines",
-                name="P&L",
-                line=dict(color="#3B82F6", width=3),
-                hovertemplate="<b>Price: $%{x:.2f}</b><br>P&L: $%{y:.0f}<extra></extra>",
-            )
-        )
-
-        # Add breakeven lines
-        breakeven_points = []
-        for i, pl in enumerate(total_pl):
-            if abs(pl) < 0.1:  # Close to breakeven
-                breakeven_points.append(float(price_range[i]))
-
-        # Limit to 2 breakeven points and ensure they're floats
-        breakeven_points = breakeven_points[:2]
-        for be in breakeven_points:
-            fig.add_vline(
-                x=be,
-                line_dash="dash",
-                line_color="#F59E0B",
-                annotation_text=f"BE: ${be:.2f}",
-            )
-
-        # Add profit/loss zones
-        fig.add_hline(y=0, line_dash="solid", line_color="white", line_width=1)
-
-        # Style the chart
-        fig.update_layout(
-            title=f"{strategy_name} - {ticker}<br><sub>Max Risk vs Max Reward Analysis</sub>",
-            xaxis_title="Stock Price at Expiration ($)",
-            yaxis_title="Profit/Loss ($)",
-            template="plotly_dark",
-            height=400,
-            showlegend=False,
-            margin=dict(l=50, r=50, t=80, b=50),
-        )
-
-        # Add annotations for key levels
-        max_profit = np.max(total_pl) * 100
-        max_loss = np.min(total_pl) * 100
-
-        fig.add_annotation(
-            x=underlying_price * 1.1,
-            y=max_profit * 0.8,
-            text=f"Max Profit: ${max_profit:.0f}",
-            showarrow=False,
-            bgcolor="rgba(34, 197, 94, 0.8)",
-            bordercolor="#22C55E",
-            font=dict(color="white"),
-        )
-
-        fig.add_annotation(
-            x=underlying_price * 0.9,
-            y=max_loss * 0.8,
-            text=f"Max Loss: ${abs(max_loss):.0f}",
-            showarrow=False,
-            bgcolor="rgba(239, 68, 68, 0.8)",
-            bordercolor="#EF4444",
-            font=dict(color="white"),
-        )
+"""
+Options strategy payoff charts.
+
+The payoff maths for each strategy is pure numpy (``payoff_spec``); from it we
+build, in increasing order of cost:
+
+- ``payoff_data``: compact payoff-curve data (kink-preserving downsampled
+  arrays plus key levels) for the frontend to draw - the default
+- ``generate_strategy_chart``: the Plotly figure JSON used so far
+- ``render_png``: a server-side raster, only when explicitly requested; it runs
+  in a process pool so matplotlib never blocks the event loop
+
+Every output is cached under a content hash of the strategy legs, spot and
+price range, so the same strategy is never drawn twice.
+
+Benchmark (repeated vs new strategies):
+    python options_strategy_charts.py
+"""
+
+import asyncio
+import copy
+import hashlib
+import io
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
-        # Convert to JSON for frontend
-        plotly_json = fig.to_json()
+import numpy as np
 
-        return {
-            "plotly_chart": plotly_json,
-            "chart_type": "vertical_spread",
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+CHART_CACHE_ENTRIES = int(os.getenv("CHART_CACHE_ENTRIES", "1024"))
+CHART_PNG_CACHE_ENTRIES = int(os.getenv("CHART_PNG_CACHE_ENTRIES", "256"))
+CHART_CACHE_TTL = float(os.getenv("CHART_CACHE_TTL", "3600"))
+CHART_DATA_POINTS = int(os.getenv("CHART_DATA_POINTS", "60"))
+CHART_RENDER_PROCESSES = int(os.getenv("CHART_RENDER_PROCESSES", "2"))
+
+GRID_POINTS = 100  # resolution of the payoff grid the metrics are computed on
+
+COLORS = {
+    "profit": "#22C55E",  # Green
+    "loss": "#EF4444",  # Red
+    "breakeven": "#F59E0B",  # Orange
+    "current": "#3B82F6",  # Blue
+    "background": "#1F2937",  # Dark gray
+}
+_ANNOTATION_STYLE = {
+    "profit": ("rgba(34, 197, 94, 0.8)", COLORS["profit"]),
+    "loss": ("rgba(239, 68, 68, 0.8)", COLORS["loss"]),
+}
+
+# =============================================================================
+# Payoff maths (numpy only)
+# =============================================================================
+
+
+def _strategy_key(strategy: Dict[str, Any]) -> str:
+    return strategy.get("strategy_name", "").lower().replace(" ", "_")
+
+
+def _spot(strategy: Dict[str, Any]) -> float:
+    return float(strategy.get("entry_logic", {}).get("underlying_price", 100))
+
+
+def _price_grid(strategy: Dict[str, Any], lo: float, hi: float) -> np.ndarray:
+    """Price axis; ``strategy["price_range"] = [low, high]`` overrides the default."""
+    spot = _spot(strategy)
+    bounds = strategy.get("price_range") or (spot * lo, spot * hi)
+    return np.linspace(float(bounds[0]), float(bounds[1]), GRID_POINTS)
+
+
+def _spec(
+    chart_type: str,
+    title: str,
+    subtitle: str,
+    x: np.ndarray,
+    pl: np.ndarray,
+    color: str,
+    breakevens: List[Tuple[float, str]],
+    annotations: List[Tuple[float, float, str, str]],
+    metrics: Dict[str, Any],
+    zones: Optional[List[Tuple[float, float]]] = None,
+    fill: bool = False,
+    zones_first: bool = True,
+) -> Dict[str, Any]:
+    return {
+        "chart_type": chart_type,
+        "title": title,
+        "subtitle": subtitle,
+        "x": x,
+        "y": pl * 100,  # per contract, in dollars
+        "color": color,
+        "fill": fill,
+        "breakevens": breakevens,
+        "zones": zones or [],
+        # profit zones drawn before the breakeven lines (False: after them)
+        "zones_first": zones_first,
+        "annotations": annotations,
+        "metrics": metrics,
+    }
+
+
+def _vertical_spread_spec(strategy: Dict[str, Any]) -> Dict[str, Any]:
+    """Bull Call Spread / Bear Put Spread"""
+    ticker = strategy.get("ticker", "STOCK")
+    strategy_name = strategy.get("strategy_name", "Vertical Spread")
+    underlying_price = _spot(strategy)
+
+    # Calculate strikes for spread
+    is_call_spread = "call" in strategy_name.lower()
+    is_bull = "bull" in strategy_name.lower()
+
+    if is_bull:
+        lower_strike = underlying_price * 0.98
+        upper_strike = underlying_price * 1.05
+    else:
+        lower_strike = underlying_price * 0.95
+        upper_strike = underlying_price * 1.02
+
+    price_range = _price_grid(strategy, 0.85, 1.15)
+
+    if is_call_spread:
+        if is_bull:  # Bull Call Spread
+            long_call_pl = np.maximum(price_range - lower_strike, 0) - 2  # paid
+            short_call_pl = -(np.maximum(price_range - upper_strike, 0) - 2)  # rcvd
+            total_pl = long_call_pl + short_call_pl
+        else:  # Bear Call Spread (short)
+            long_call_pl = np.maximum(price_range - upper_strike, 0) - 1
+            short_call_pl = -(np.maximum(price_range - lower_strike, 0) - 3)
+            total_pl = long_call_pl + short_call_pl
+    else:  # Put spread
+        if not is_bull:  # Bear Put Spread
+            long_put_pl = np.maximum(upper_strike - price_range, 0) - 2
+            short_put_pl = -(np.maximum(lower_strike - price_range, 0) - 1)
+            total_pl = long_put_pl + short_put_pl
+        else:  # Bull Put Spread (short)
+            long_put_pl = np.maximum(lower_strike - price_range, 0) - 1
+            short_put_pl = -(np.maximum(upper_strike - price_range, 0) - 3)
+            total_pl = long_put_pl + short_put_pl
+
+    # Grid points close to breakeven, at most 2
+    breakeven_points = [float(p) for p in price_range[np.abs(total_pl) < 0.1][:2]]
+
+    max_profit = np.max(total_pl) * 100
+    max_loss = np.min(total_pl) * 100
+
+    return _spec(
+        "vertical_spread",
+        f"{strategy_name} - {ticker}",
+        "Max Risk vs Max Reward Analysis",
+        price_range,
+        total_pl,
+        COLORS["current"],
+        [(be, f"BE: ${be:.2f}") for be in breakeven_points],
+        [
+            (
+                underlying_price * 1.1,
+                max_profit * 0.8,
+                f"Max Profit: ${max_profit:.0f}",
+                "profit",
+            ),
+            (
+                underlying_price * 0.9,
+                max_loss * 0.8,
+                f"Max Loss: ${abs(max_loss):.0f}",
+                "loss",
+            ),
+        ],
+        {
             "max_profit": float(max_profit),
             "max_loss": float(abs(max_loss)),
             "breakeven_points": breakeven_points,
-        }
-
-    def _generate_directional_chart(self, strategy: Dict[str, Any]) -> Dict[str, str]:
-        """Generate chart for Long Call / Long Put"""
-        ticker = strategy.get("ticker", "STOCK")
-        strategy_name = strategy.get("strategy_name", "Directional Play")
-        underlying_price = strategy.get("entry_logic", {}).get("underlying_price", 100)
-
-        is_call = "call" in strategy_name.lower()
-        strike = underlying_price * (1.02 if is_call else 0.98)
-        premium = 3  # Assumed premium
-
-        # Generate price range
-        price_range = np.linspace(underlying_price * 0.8, underlying_price * 1.2, 100)
-
-        # Calculate P&L
-        if is_call:
-            total_pl = np.maximum(price_range - strike, 0) - premium
-        else:
-            total_pl = np.maximum(strike - price_range, 0) - premium
-
-        # Create Plotly chart
-        fig = go.Figure()
-
-        # Add P&L line with color coding
-        ["#EF4444" if pl < 0 else "#22C55E" for pl in total_pl]
-
-        fig.add_trace(
-            go.Scatter(
-                x=price_range.tolist(),
-                y=(total_pl * 100).tolist(),
-                mode="lines",
-                name="P&L",
-                line=dict(color="#3B82F6", width=3),
-                fill="tozeroy",
-                fillcolor="rgba(59, 130, 246, 0.1)",
-                hovertemplate="<b>Price: $%{x:.2f}</b><br>P&L: $%{y:.0f}<extra></extra>",
-            )
-        )
-
-        # Add breakeven line
-        breakeven = strike + premium if is_call else strike - premium
-        fig.add_vline(
-            x=breakeven,
-            line_dash="dash",
-            line_color="#F59E0B",
-            annotation_text=f"Breakeven: ${breakeven:.2f}",
-        )
-
-        # Add zero line
-        fig.add_hline(y=0, line_dash="solid", line_color="white", line_width=1)
-
-        # Style the chart
-        fig.update_layout(
-            title=f"{strategy_name} - {ticker}<br><sub>Unlimited {'Upside' if is_call else 'Downside'} Potential</sub>",
-            xaxis_title="Stock Price at Expiration ($)",
-            yaxis_title="Profit/Loss ($)",
-            template="plotly_dark",
-            height=400,
-            showlegend=False,
-            margin=dict(l=50, r=50, t=80, b=50),
-        )
-
-        # Add annotations
-        max_loss = premium * 100
-
-        fig.add_annotation(
-            x=underlying_price * 0.85,
-            y=-max_loss * 0.5,
-            text=f"Max Loss: ${max_loss:.0f}<br>(Premium Paid)",
-            showarrow=False,
-            bgcolor="rgba(239, 68, 68, 0.8)",
-            bordercolor="#EF4444",
-            font=dict(color="white"),
-        )
-
-        fig.add_annotation(
-            x=underlying_price * (1.15 if is_call else 0.85),
-            y=max_loss * 2,
-            text="Unlimited Profit Potential",
-            showarrow=False,
-            bgcolor="rgba(34, 197, 94, 0.8)",
-            bordercolor="#22C55E",
-            font=dict(color="white"),
-        )
-
-        plotly_json = fig.to_json()
-
-        return {
-            "plotly_chart": plotly_json,
-            "chart_type": "directional",
+        },
+    )
+
+
+def _directional_spec(strategy: Dict[str, Any]) -> Dict[str, Any]:
+    """Long Call / Long Put"""
+    ticker = strategy.get("ticker", "STOCK")
+    strategy_name = strategy.get("strategy_name", "Directional Play")
+    underlying_price = _spot(strategy)
+
+    is_call = "call" in strategy_name.lower()
+    strike = underlying_price * (1.02 if is_call else 0.98)
+    premium = 3  # Assumed premium
+
+    price_range = _price_grid(strategy, 0.8, 1.2)
+    if is_call:
+        total_pl = np.maximum(price_range - strike, 0) - premium
+    else:
+        total_pl = np.maximum(strike - price_range, 0) - premium
+
+    breakeven = strike + premium if is_call else strike - premium
+    max_loss = premium * 100
+
+    return _spec(
+        "directional",
+        f"{strategy_name} - {ticker}",
+        f"Unlimited {'Upside' if is_call else 'Downside'} Potential",
+        price_range,
+        total_pl,
+        COLORS["current"],
+        [(breakeven, f"Breakeven: ${breakeven:.2f}")],
+        [
+            (
+                underlying_price * 0.85,
+                -max_loss * 0.5,
+                f"Max Loss: ${max_loss:.0f}<br>(Premium Paid)",
+                "loss",
+            ),
+            (
+                underlying_price * (1.15 if is_call else 0.85),
+                max_loss * 2,
+                "Unlimited Profit Potential",
+                "profit",
+            ),
+        ],
+        {"max_loss": float(max_loss), "breakeven": float(breakeven)},
+        fill=True,
+    )
+
+
+def _volatility_spec(strategy: Dict[str, Any]) -> Dict[str, Any]:
+    """Long Straddle / Long Strangle"""
+    ticker = strategy.get("ticker", "STOCK")
+    strategy_name = strategy.get("strategy_name", "Volatility Play")
+    underlying_price = _spot(strategy)
+
+    if "straddle" in strategy_name.lower():
+        call_strike = put_strike = underlying_price
+        total_premium = 6  # Both ATM options
+    else:  # Strangle
+        call_strike = underlying_price * 1.05
+        put_strike = underlying_price * 0.95
+        total_premium = 4  # OTM options cheaper
+
+    price_range = _price_grid(strategy, 0.7, 1.3)
+    call_pl = np.maximum(price_range - call_strike, 0)
+    put_pl = np.maximum(put_strike - price_range, 0)
+    total_pl = call_pl + put_pl - total_premium
+
+    upper_breakeven = call_strike + total_premium
+    lower_breakeven = put_strike - total_premium
+    max_loss = total_premium * 100
+
+    return _spec(
+        "volatility",
+        f"{strategy_name} - {ticker}",
+        "Profit from Large Price Moves in Either Direction",
+        price_range,
+        total_pl,
+        "#8B5CF6",
+        [
+            (upper_breakeven, f"Upper BE: ${upper_breakeven:.2f}"),
+            (lower_breakeven, f"Lower BE: ${lower_breakeven:.2f}"),
+        ],
+        [
+            (
+                underlying_price,
+                -max_loss * 0.8,
+                f"Max Loss: ${max_loss:.0f}<br>(No Movement)",
+                "loss",
+            ),
+            (
+                underlying_price * 1.2,
+                max_loss * 1.5,
+                "Unlimited Profit<br>on Large Moves",
+                "profit",
+            ),
+        ],
+        {
             "max_loss": float(max_loss),
-            "breakeven": float(breakeven),
-        }
-
-    def _generate_volatility_chart(self, strategy: Dict[str, Any]) -> Dict[str, str]:
-        """Generate chart for Long Straddle / Long Strangle"""
-        ticker = strategy.get("ticker", "STOCK")
-        strategy_name = strategy.get("strategy_name", "Volatility Play")
-        underlying_price = strategy.get("entry_logic", {}).get("underlying_price", 100)
-
-        is_straddle = "straddle" in strategy_name.lower()
-
-        # Set strikes
-        if is_straddle:
-            call_strike = put_strike = underlying_price
-            total_premium = 6  # Both ATM options
-        else:  # Strangle
-            call_strike = underlying_price * 1.05
-            put_strike = underlying_price * 0.95
-            total_premium = 4  # OTM options cheaper
-
-        # Generate price range
-        price_range = np.linspace(underlying_price * 0.7, underlying_price * 1.3, 100)
-
-        # Calculate P&L
-        call_pl = np.maximum(price_range - call_strike, 0)
-        put_pl = np.maximum(put_strike - price_range, 0)
-        total_pl = call_pl + put_pl - total_premium
-
-        # Create Plotly chart
-        fig = go.Figure()
-
-        # Add P&L line
-        fig.add_trace(
-            go.Scatter(
-                x=price_range.tolist(),
-                y=(total_pl * 100).tolist(),
-                mode="lines",
-                name="P&L",
-                line=dict(color="#8B5CF6", width=3),
-                hovertemplate="<b>Price: $%{x:.2f}</b><br>P&L: $%{y:.0f}<extra></extra>",
-            )
-        )
-
-        # Add breakeven lines
-        upper_breakeven = call_strike + total_premium
-        lower_breakeven = put_strike - total_premium
-
-        fig.add_vline(
-            x=upper_breakeven,
-            line_dash="dash",
-            line_color="#F59E0B",
-            annotation_text=f"Upper BE: ${upper_breakeven:.2f}",
-        )
-        fig.add_vline(
-            x=lower_breakeven,
-            line_dash="dash",
-            line_color="#F59E0B",
-            annotation_text=f"Lower BE: ${lower_breakeven:.2f}",
-        )
-
-        # Add zero line
-        fig.add_hline(y=0, line_dash="solid", line_color="white", line_width=1)
-
-        # Add profit zones with shading
-        fig.add_vrect(
-            x0=underlying_price * 0.7,
-            x1=lower_breakeven,
-            fillcolor="rgba(34, 197, 94, 0.2)",
-            opacity=0.3,
-            layer="below",
-            line_width=0,
-        )
-        fig.add_vrect(
-            x0=upper_breakeven,
-            x1=underlying_price * 1.3,
-            fillcolor="rgba(34, 197, 94, 0.2)",
-            opacity=0.3,
-            layer="below",
-            line_width=0,
-        )
-
-        # Style the chart
-        fig.update_layout(
-            title=f"{strategy_name} - {ticker}<br><sub>Profit from Large Price Moves in Either Direction</sub>",
-            xaxis_title="Stock Price at Expiration ($)",
-            yaxis_title="Profit/Loss ($)",
-            template="plotly_dark",
-            height=400,
-            showlegend=False,
-            margin=dict(l=50, r=50, t=80, b=50),
+            "breakeven_upper": float(upper_breakeven),
+            "breakeven_lower": float(lower_breakeven),
+        },
+        zones=[
+            (float(price_range[0]), lower_breakeven),
+            (upper_breakeven, float(price_range[-1])),
+        ],
+        zones_first=False,
+    )
+
+
+def _iron_condor_spec(strategy: Dict[str, Any]) -> Dict[str, Any]:
+    """Iron Condor"""
+    ticker = strategy.get("ticker", "STOCK")
+    underlying_price = _spot(strategy)
+
+    put_short_strike = underlying_price * 0.95
+    put_long_strike = underlying_price * 0.85
+    call_short_strike = underlying_price * 1.05
+    call_long_strike = underlying_price * 1.15
+    net_credit = 2  # Net credit received
+
+    price_range = _price_grid(strategy, 0.75, 1.25)
+    put_spread_pl = np.minimum(0, put_short_strike - price_range) - np.minimum(
+        0, put_long_strike - price_range
+    )
+    call_spread_pl = np.minimum(0, price_range - call_short_strike) - np.minimum(
+        0, price_range - call_long_strike
+    )
+    total_pl = put_spread_pl + call_spread_pl + net_credit
+
+    upper_breakeven = call_short_strike + net_credit
+    lower_breakeven = put_short_strike - net_credit
+    max_profit = net_credit * 100
+    max_loss = (call_short_strike - put_short_strike - net_credit) * 100
+
+    return _spec(
+        "iron_condor",
+        f"Iron Condor - {ticker}",
+        "Profit from Sideways Movement",
+        price_range,
+        total_pl,
+        COLORS["breakeven"],
+        [
+            (upper_breakeven, f"Upper BE: ${upper_breakeven:.2f}"),
+            (lower_breakeven, f"Lower BE: ${lower_breakeven:.2f}"),
+        ],
+        [
+            (
+                underlying_price,
+                max_profit * 0.8,
+                f"Max Profit: ${max_profit:.0f}<br>(Keep Premium)",
+                "profit",
+            ),
+            (
+                underlying_price * 1.2,
+                -max_loss * 0.8,
+                f"Max Loss: ${max_loss:.0f}<br>(Big Moves)",
+                "loss",
+            ),
+        ],
+        {
+            "max_profit": float(max_profit),
+            "max_loss": float(max_loss),
+            "profit_range": (float(put_short_strike), float(call_short_strike)),
+        },
+        zones=[(put_short_strike, call_short_strike)],
+    )
+
+
+def _income_spec(strategy: Dict[str, Any]) -> Dict[str, Any]:
+    """Cash-Secured Put / Covered Call"""
+    ticker = strategy.get("ticker", "STOCK")
+    strategy_name = strategy.get("strategy_name", "Income Strategy")
+    underlying_price = _spot(strategy)
+
+    is_put = "put" in strategy_name.lower()
+    strike = underlying_price * (0.95 if is_put else 1.05)
+    premium = 2
+
+    price_range = _price_grid(strategy, 0.8, 1.2)
+    if is_put:
+        # Short put P&L
+        total_pl = premium - np.maximum(strike - price_range, 0)
+        breakeven = strike - premium
+        max_profit = premium * 100
+        annotation = (
+            underlying_price * 1.1,
+            max_profit * 0.8,
+            f"Max Profit: ${max_profit:.0f}<br>(Keep Premium)",
+            "profit",
         )
-
-        # Add annotations
-        max_loss = total_premium * 100
-
-        fig.add_annotation(
-            x=underlying_price,
-            y=-max_loss * 0.8,
-            text=f"Max Loss: ${max_loss:.0f}<br>(No Movement)",
-            showarrow=False,
-            bgcolor="rgba(239, 68, 68, 0.8)",
-            bordercolor="#EF4444",
-            font=dict(color="white"),
+    else:
+        # Covered call (assuming we own stock)
+        stock_pl = price_range - underlying_price
+        total_pl = stock_pl + premium - np.maximum(price_range - strike, 0)
+        breakeven = underlying_price - premium
+        max_profit = (strike - underlying_price + premium) * 100
+        annotation = (
+            strike * 1.05,
+            max_profit * 0.8,
+            f"Max Profit: ${max_profit:.0f}<br>(Stock Called Away)",
+            "profit",
         )
 
+    return _spec(
+        "income",
+        f"{strategy_name} - {ticker}",
+        f"Generate Income from {'Put Sales' if is_put else 'Covered Calls'}",
+        price_range,
+        total_pl,
+        "#10B981",
+        [(breakeven, f"Breakeven: ${breakeven:.2f}")],
+        [annotation],
+        {"breakeven": float(breakeven)},
+    )
+
+
+def _generic_spec(strategy: Dict[str, Any]) -> Dict[str, Any]:
+    """Placeholder for unknown strategy types"""
+    ticker = strategy.get("ticker", "STOCK")
+    strategy_name = strategy.get("strategy_name", "Options Strategy")
+    return {
+        "chart_type": "generic",
+        "title": f"{strategy_name} - {ticker}",
+        "subtitle": "",
+        "placeholder": f"{strategy_name}<br>Chart Coming Soon",
+        "x": np.empty(0),
+        "y": np.empty(0),
+        "color": COLORS["current"],
+        "fill": False,
+        "breakevens": [],
+        "zones": [],
+        "zones_first": True,
+        "annotations": [],
+        "metrics": {},
+    }
+
+
+def payoff_spec(strategy: Dict[str, Any]) -> Dict[str, Any]:
+    """Full-resolution payoff curve, key levels and metrics for a strategy."""
+    name = _strategy_key(strategy)
+    if name in ["bull_call_spread", "bear_put_spread"]:
+        return _vertical_spread_spec(strategy)
+    elif name in ["long_call", "long_put"]:
+        return _directional_spec(strategy)
+    elif name in ["long_straddle", "long_strangle"]:
+        return _volatility_spec(strategy)
+    elif name == "iron_condor":
+        return _iron_condor_spec(strategy)
+    elif name in ["cash_secured_put", "covered_call"]:
+        return _income_spec(strategy)
+    return _generic_spec(strategy)
+
+
+def _downsample(
+    x: np.ndarray, y: np.ndarray, max_points: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Drop collinear points (payoffs are piecewise linear), then thin evenly.
+
+    Endpoints and kinks are always kept, so the curve drawn from the compact
+    arrays matches the full-resolution one wherever it is linear.
+    """
+    n = len(x)
+    if n <= 2:
+        return x, y
+    slope = np.diff(y) / np.where(np.diff(x) == 0, 1, np.diff(x))
+    kink = np.abs(np.diff(slope)) > 1e-9 * max(1.0, float(np.max(np.abs(y))))
+    keep = np.concatenate(([True], kink, [True]))
+    idx = np.flatnonzero(keep)
+    if len(idx) > max_points > 2:
+        idx = np.unique(np.linspace(0, n - 1, max_points).round().astype(int))
+    return x[idx], y[idx]
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+_data_cache = TTLCache(maxsize=CHART_CACHE_ENTRIES, ttl=CHART_CACHE_TTL)
+_plotly_cache = TTLCache(maxsize=CHART_CACHE_ENTRIES, ttl=CHART_CACHE_TTL)
+_png_cache = TTLCache(maxsize=CHART_PNG_CACHE_ENTRIES, ttl=CHART_CACHE_TTL)
+
+
+def chart_key(strategy: Dict[str, Any], kind: str = "data", **options: Any) -> str:
+    """Content hash of everything that determines a chart's output."""
+    spot = _spot(strategy)
+    payload = {
+        "kind": kind,
+        "strategy": strategy.get("strategy_name", ""),
+        "ticker": strategy.get("ticker", "STOCK"),
+        "spot": round(spot, 6),
+        "legs": strategy.get("legs") or [],
+        "range": strategy.get("price_range") or [],
+        "options": options,
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def cache_stats() -> Dict[str, Any]:
+    return {
+        "data": _data_cache.stats(),
+        "plotly": _plotly_cache.stats(),
+        "png": _png_cache.stats(),
+    }
+
+
+def clear_caches():
+    for cache in (_data_cache, _plotly_cache, _png_cache):
+        cache.invalidate()
+
+
+# =============================================================================
+# Outputs
+# =============================================================================
+
+
+def payoff_data(
+    strategy: Dict[str, Any], max_points: int = CHART_DATA_POINTS
+) -> Dict[str, Any]:
+    """Compact payoff-curve data for client-side drawing (cached)."""
+    key = chart_key(strategy, "data", points=max_points)
+    cached = _data_cache.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    spec = payoff_spec(strategy)
+    x, y = _downsample(spec["x"], spec["y"], max_points)
+    data = {
+        "key": key,
+        "chart_type": spec["chart_type"],
+        "title": spec["title"],
+        "subtitle": spec["subtitle"],
+        "x": np.round(x, 4).tolist(),
+        "y": np.round(y, 2).tolist(),
+        "color": spec["color"],
+        "fill": spec["fill"],
+        "breakevens": [
+            {"x": float(bx), "label": label} for bx, label in spec["breakevens"]
+        ],
+        "zones": [[float(x0), float(x1)] for x0, x1 in spec["zones"]],
+        "annotations": [
+            {"x": float(ax), "y": float(ay), "text": text, "kind": kind}
+            for ax, ay, text, kind in spec["annotations"]
+        ],
+        **spec["metrics"],
+    }
+    if "placeholder" in spec:
+        data["placeholder"] = spec["placeholder"]
+    _data_cache.put(key, data)
+    return copy.deepcopy(data)
+
+
+def _plotly_figure_json(spec: Dict[str, Any]) -> str:
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    title = spec["title"]
+    if spec["subtitle"]:
+        title = f"{title}<br><sub>{spec['subtitle']}</sub>"
+
+    if spec["chart_type"] == "generic":
         fig.add_annotation(
-            x=underlying_price * 1.2,
-            y=max_loss * 1.5,
-            text="Unlimited Profit<br>on Large Moves",
+            x=0.5,
+            y=0.5,
+            text=spec["placeholder"],
             showarrow=False,
-            bgcolor="rgba(34, 197, 94, 0.8)",
-            bordercolor="#22C55E",
-            font=dict(color="white"),
-        )
-
-        plotly_json = fig.to_json()
-
-        return {
-            "plotly_chart": plotly_json,
-            "chart_type": "volatility",
-            "max_loss": float(max_loss),
-            "breakeven_upper": float(upper_breakeven),
-            "breakeven_lower": float(lower_breakeven),
-        }
-
-    def _generate_iron_condor_chart(self, strategy: Dict[str, Any]) -> Dict[str, str]:
-        """Generate chart for Iron Condor"""
-        ticker = strategy.get("ticker", "STOCK")
-        underlying_price = strategy.get("entry_logic", {}).get("underlying_price", 100)
-
-        # Iron Condor strikes
-        put_short_strike = underlying_price * 0.95
-        put_long_strike = underlying_price * 0.85
-        call_short_strike = underlying_price * 1.05
-        call_long_strike = underlying_price * 1.15
-
-        net_credit = 2  # Net credit received
-
-        # Generate price range
-        price_range = np.linspace(underlying_price * 0.75, underlying_price * 1.25, 100)
-
-        # Calculate P&L for Iron Condor
-        put_spread_pl = np.minimum(0, put_short_strike - price_range) - np.minimum(
-            0, put_long_strike - price_range
+            font=dict(size=24, color="white"),
+            xref="paper",
+            yref="paper",
         )
-        call_spread_pl = np.minimum(0, price_range - call_short_strike) - np.minimum(
-            0, price_range - call_long_strike
+        fig.update_layout(
+            title=title, template="plotly_dark", height=400, showlegend=False
         )
-        total_pl = put_spread_pl + call_spread_pl + net_credit
-
-        # Create Plotly chart
-        fig = go.Figure()
-
-        # Add P&L line
-        fig.add_trace(
-            go.Scatter(
-                x=price_range.tolist(),
-                y=(total_pl * 100).tolist(),
-                mode="lines",
-                name="P&L",
-                line=dict(color="#F59E0B", width=3),
-                hovertemplate="<b>Price: $%{x:.2f}</b><br>P&L: $%{y:.0f}<extra></extra>",
+        return fig.to_json()
+
+    trace = dict(
+        x=spec["x"].tolist(),
+        y=spec["y"].tolist(),
+        mode="lines",
+        name="P&L",
+        line=dict(color=spec["color"], width=3),
+        hovertemplate="<b>Price: $%{x:.2f}</b><br>P&L: $%{y:.0f}<extra></extra>",
+    )
+    if spec["fill"]:
+        trace.update(fill="tozeroy", fillcolor="rgba(59, 130, 246, 0.1)")
+    fig.add_trace(go.Scatter(**trace))
+
+    def add_zones():
+        for x0, x1 in spec["zones"]:
+            fig.add_vrect(
+                x0=x0,
+                x1=x1,
+                fillcolor="rgba(34, 197, 94, 0.2)",
+                opacity=0.3,
+                layer="below",
+                line_width=0,
             )
-        )
-
-        # Add profit zone shading
-        fig.add_vrect(
-            x0=put_short_strike,
-            x1=call_short_strike,
-            fillcolor="rgba(34, 197, 94, 0.2)",
-            opacity=0.3,
-            layer="below",
-            line_width=0,
-        )
-
-        # Add breakeven lines
-        upper_breakeven = call_short_strike + net_credit
-        lower_breakeven = put_short_strike - net_credit
 
+    if spec["zones_first"]:
+        add_zones()
+    for bx, label in spec["breakevens"]:
         fig.add_vline(
-            x=upper_breakeven,
+            x=bx,
             line_dash="dash",
-            line_color="#F59E0B",
-            annotation_text=f"Upper BE: ${upper_breakeven:.2f}",
+            line_color=COLORS["breakeven"],
+            annotation_text=label,
         )
-        fig.add_vline(
-            x=lower_breakeven,
-            line_dash="dash",
-            line_color="#F59E0B",
-            annotation_text=f"Lower BE: ${lower_breakeven:.2f}",
-        )
-
-        # Add zero line
-        fig.add_hline(y=0, line_dash="solid", line_color="white", line_width=1)
-
-        # Style the chart
-        fig.update_layout(
-            title=f"Iron Condor - {ticker}<br><sub>Profit from Sideways Movement</sub>",
-            xaxis_title="Stock Price at Expiration ($)",
-            yaxis_title="Profit/Loss ($)",
-            template="plotly_dark",
-            height=400,
-            showlegend=False,
-            margin=dict(l=50, r=50, t=80, b=50),
-        )
-
-        # Add annotations
-        max_profit = net_credit * 100
-        max_loss = (call_short_strike - put_short_strike - net_credit) * 100
-
+    fig.add_hline(y=0, line_dash="solid", line_color="white", line_width=1)
+    if not spec["zones_first"]:
+        add_zones()
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="Stock Price at Expiration ($)",
+        yaxis_title="Profit/Loss ($)",
+        template="plotly_dark",
+        height=400,
+        showlegend=False,
+        margin=dict(l=50, r=50, t=80, b=50),
+    )
+    for ax, ay, text, kind in spec["annotations"]:
+        bgcolor, border = _ANNOTATION_STYLE[kind]
         fig.add_annotation(
-            x=underlying_price,
-            y=max_profit * 0.8,
-            text=f"Max Profit: ${max_profit:.0f}<br>(Keep Premium)",
+            x=ax,
+            y=ay,
+            text=text,
             showarrow=False,
-            bgcolor="rgba(34, 197, 94, 0.8)",
-            bordercolor="#22C55E",
+            bgcolor=bgcolor,
+            bordercolor=border,
             font=dict(color="white"),
         )
+    return fig.to_json()
 
-        fig.add_annotation(
-            x=underlying_price * 1.2,
-            y=-max_loss * 0.8,
-            text=f"Max Loss: ${max_loss:.0f}<br>(Big Moves)",
-            showarrow=False,
-            bgcolor="rgba(239, 68, 68, 0.8)",
-            bordercolor="#EF4444",
-            font=dict(color="white"),
-        )
 
-        plotly_json = fig.to_json()
-
-        return {
-            "plotly_chart": plotly_json,
-            "chart_type": "iron_condor",
-            "max_profit": float(max_profit),
-            "max_loss": float(max_loss),
-            "profit_range": (float(put_short_strike), float(call_short_strike)),
-        }
-
-    def _generate_income_chart(self, strategy: Dict[str, Any]) -> Dict[str, str]:
-        """Generate chart for Cash-Secured Put / Covered Call"""
-        ticker = strategy.get("ticker", "STOCK")
-        strategy_name = strategy.get("strategy_name", "Income Strategy")
-        underlying_price = strategy.get("entry_logic", {}).get("underlying_price", 100)
-
-        is_put = "put" in strategy_name.lower()
-
-        if is_put:  # Cash-Secured Put
-            strike = underlying_price * 0.95
-            premium = 2
-        else:  # Covered Call
-            strike = underlying_price * 1.05
-            premium = 2
-
-        # Generate price range
-        price_range = np.linspace(underlying_price * 0.8, underlying_price * 1.2, 100)
-
-        # Calculate P&L
-        if is_put:
-            # Short put P&L
-            option_pl = premium - np.maximum(strike - price_range, 0)
-            total_pl = option_pl
-        else:
-            # Covered call (assuming we own stock)
-            stock_pl = price_range - underlying_price  # Stock position
-            option_pl = premium - np.maximum(price_range - strike, 0)
-            total_pl = stock_pl + option_pl
-
-        # Create Plotly chart
-        fig = go.Figure()
-
-        # Add P&L line
-        fig.add_trace(
-            go.Scatter(
-                x=price_range.tolist(),
-                y=(total_pl * 100).tolist(),
-                mode="lines",
-                name="P&L",
-                line=dict(color="#10B981", width=3),
-                hovertemplate="<b>Price: $%{x:.2f}</b><br>P&L: $%{y:.0f}<extra></extra>",
-            )
-        )
-
-        # Add breakeven line
-        if is_put:
-            breakeven = strike - premium
-        else:
-            breakeven = underlying_price - premium
-
-        fig.add_vline(
-            x=breakeven,
-            line_dash="dash",
-            line_color="#F59E0B",
-            annotation_text=f"Breakeven: ${breakeven:.2f}",
-        )
-
-        # Add zero line
-        fig.add_hline(y=0, line_dash="solid", line_color="white", line_width=1)
-
-        # Style the chart
-        fig.update_layout(
-            title=f"{strategy_name} - {ticker}<br><sub>Generate Income from {'Put Sales' if is_put else 'Covered Calls'}</sub>",
-            xaxis_title="Stock Price at Expiration ($)",
-            yaxis_title="Profit/Loss ($)",
-            template="plotly_dark",
-            height=400,
-            showlegend=False,
-            margin=dict(l=50, r=50, t=80, b=50),
+class OptionsStrategyChartGenerator:
+    def __init__(self):
+        self.colors = COLORS
+
+    def generate_strategy_chart(self, strategy: Dict[str, Any]) -> Dict[str, Any]:
+        """Plotly chart JSON plus key metrics for a strategy (cached)"""
+        key = chart_key(strategy, "plotly")
+        cached = _plotly_cache.get(key)
+        if cached is None:
+            spec = payoff_spec(strategy)
+            cached = {
+                "plotly_chart": _plotly_figure_json(spec),
+                "chart_type": spec["chart_type"],
+                **spec["metrics"],
+            }
+            _plotly_cache.put(key, cached)
+        return dict(cached)
+
+    def payoff_data(
+        self, strategy: Dict[str, Any], max_points: int = CHART_DATA_POINTS
+    ) -> Dict[str, Any]:
+        return payoff_data(strategy, max_points)
+
+
+# =============================================================================
+# Rasterization (process pool)
+# =============================================================================
+
+
+def _rasterize(data: Dict[str, Any], width: int, height: int, dpi: int) -> bytes:
+    """Draw compact payoff data to PNG; runs in a worker process."""
+    import matplotlib
+
+    matplotlib.use("Agg")  # Non-interactive backend
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(width / dpi, height / dpi), dpi=dpi)
+    try:
+        fig.patch.set_facecolor(COLORS["background"])
+        ax.set_facecolor(COLORS["background"])
+        ax.tick_params(colors="white")
+        for side in ax.spines.values():
+            side.set_color("#4B5563")
+
+        subtitle = data.get("subtitle")
+        ax.set_title(
+            data["title"] + (f"\n{subtitle}" if subtitle else ""),
+            color="white",
+            fontsize=11,
         )
-
-        # Add annotations
-        if is_put:
-            max_profit = premium * 100
-            max_loss_price = underlying_price * 0.8
-            (strike - max_loss_price - premium) * 100
-
-            fig.add_annotation(
-                x=underlying_price * 1.1,
-                y=max_profit * 0.8,
-                text=f"Max Profit: ${max_profit:.0f}<br>(Keep Premium)",
-                showarrow=False,
-                bgcolor="rgba(34, 197, 94, 0.8)",
-                bordercolor="#22C55E",
-                font=dict(color="white"),
+        if data["chart_type"] == "generic":
+            ax.text(
+                0.5,
+                0.5,
+                data.get("placeholder", "").replace("<br>", "\n"),
+                color="white",
+                ha="center",
+                va="center",
+                fontsize=16,
+                transform=ax.transAxes,
             )
+            ax.set_axis_off()
         else:
-            max_profit = (strike - underlying_price + premium) * 100
-
-            fig.add_annotation(
-                x=strike * 1.05,
-                y=max_profit * 0.8,
-                text=f"Max Profit: ${max_profit:.0f}<br>(Stock Called Away)",
-                showarrow=False,
-                bgcolor="rgba(34, 197, 94, 0.8)",
-                bordercolor="#22C55E",
-                font=dict(color="white"),
-            )
-
-        plotly_json = fig.to_json()
+            x, y = data["x"], data["y"]
+            for x0, x1 in data["zones"]:
+                ax.axvspan(x0, x1, color=COLORS["profit"], alpha=0.12, lw=0)
+            ax.plot(x, y, color=data["color"], lw=2.5)
+            if data["fill"]:
+                ax.fill_between(x, y, 0, color=data["color"], alpha=0.1)
+            ax.axhline(0, color="white", lw=1)
+            for be in data["breakevens"]:
+                ax.axvline(be["x"], color=COLORS["breakeven"], ls="--", lw=1)
+            for note in data["annotations"]:
+                ax.annotate(
+                    note["text"].replace("<br>", "\n"),
+                    (note["x"], note["y"]),
+                    color="white",
+                    ha="center",
+                    fontsize=8,
+                    bbox=dict(
+                        boxstyle="round",
+                        fc=COLORS[note["kind"]],
+                        ec=COLORS[note["kind"]],
+                        alpha=0.8,
+                    ),
+                )
+            ax.set_xlabel("Stock Price at Expiration ($)", color="white")
+            ax.set_ylabel("Profit/Loss ($)", color="white")
+            ax.grid(alpha=0.2)
+
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", facecolor=fig.get_facecolor())
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        import multiprocessing
+
+        # spawn: never fork a process that is running an event loop and threads
+        _pool = ProcessPoolExecutor(
+            max_workers=max(1, CHART_RENDER_PROCESSES),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
 
-        return {
-            "plotly_chart": plotly_json,
-            "chart_type": "income",
-            "breakeven": float(breakeven),
-        }
 
-    def _generate_generic_chart(self, strategy: Dict[str, Any]) -> Dict[str, str]:
-        """Generate a generic chart for unknown strategy types"""
-        ticker = strategy.get("ticker", "STOCK")
-        strategy_name = strategy.get("strategy_name", "Options Strategy")
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
 
-        # Create a simple placeholder chart
-        fig = go.Figure()
 
-        fig.add_annotation(
-            x=0.5,
-            y=0.5,
-            text=f"{strategy_name}<br>Chart Coming Soon",
-            showarrow=False,
-            font=dict(size=24, color="white"),
-            xref="paper",
-            yref="paper",
-        )
+async def render_png(
+    strategy: Dict[str, Any], width: int = 800, height: int = 400, dpi: int = 100
+) -> bytes:
+    """PNG of the payoff chart, rasterized off the event loop (cached)."""
+    data = payoff_data(strategy)
+    key = chart_key(strategy, "png", width=width, height=height, dpi=dpi)
 
-        fig.update_layout(
-            title=f"{strategy_name} - {ticker}",
-            template="plotly_dark",
-            height=400,
-            showlegend=False,
+    async def rasterize():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_pool(), _rasterize, data, width, height, dpi
         )
 
-        plotly_json = fig.to_json()
-
-        return {"plotly_chart": plotly_json, "chart_type": "generic"}
+    return await _png_cache.get_or_compute(key, rasterize)
 
 
 # Global chart generator instance
 chart_generator = OptionsStrategyChartGenerator()
+
+
+# Benchmark: requests/sec for repeated vs new strategies
+if __name__ == "__main__":
+    import time
+
+    names = [
+        "Bull Call Spread",
+        "Long Put",
+        "Long Straddle",
+        "Iron Condor",
+        "Covered Call",
+    ]
+
+    def strategies(n: int, unique: bool) -> List[Dict[str, Any]]:
+        return [
+            {
+                "strategy_name": names[i % len(names)],
+                "ticker": "SPY",
+                "entry_logic": {
+                    "underlying_price": 400.0 + (i * 0.01 if unique else 0)
+                },
+            }
+            for i in range(n)
+        ]
+
+    def bench(label: str, fn, items) -> None:
+        start = time.perf_counter()
+        for s in items:
+            fn(s)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {len(items) / elapsed:10.0f} req/s")
+
+    async def bench_png(label: str, items) -> None:
+        start = time.perf_counter()
+        await asyncio.gather(*(render_png(s) for s in items))
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {len(items) / elapsed:10.0f} req/s")
+
+    n = 200
+    repeated = strategies(n, False)
+    clear_caches()
+    for label, fn in (
+        ("data", payoff_data),
+        ("plotly", chart_generator.generate_strategy_chart),
+    ):
+        bench(f"{label}, new strategies", fn, strategies(n, True))
+        for s in repeated[: len(names)]:
+            fn(s)
+        bench(f"{label}, repeated (warm)", fn, repeated)
+
+    async def main():
+        await asyncio.gather(*(render_png(s) for s in repeated[: len(names)]))
+        await bench_png("png, new strategies", strategies(40, True))
+        await bench_png("png, repeated (warm)", repeated)
+        shutdown_pool()
+
+    asyncio.run(main())
+    print(json.dumps(cache_stats()))
@@ -1,6 +1,6 @@
 import os
 import time
-from typing import Any, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
 try:
     from redis.asyncio import from_url as redis_from_url
@@ -26,11 +26,30 @@ class AsyncTTLDict:
         rec = self._store.get(key)
         return rec[1] if rec else None
 
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        self._purge()
+        return [rec[1] if rec else None for rec in map(self._store.get, keys)]
+
+    async def mset(self, mapping: dict) -> bool:
+        for key, value in mapping.items():
+            self._store[key] = (None, value)
+        return True
+
     async def set(
-        self, key: str, value: str, ex: Optional[int] = None, ttl: Optional[int] = None
-    ) -> bool:
+        self,
+        key: str,
+        value: str,
+        ex: Optional[int] = None,
+        ttl: Optional[int] = None,
+        px: Optional[int] = None,
+        nx: bool = False,
+    ) -> Optional[bool]:
         # Support both ex and ttl parameters (ttl is alias for ex)
-        expiry_seconds = ex or ttl
+        expiry_seconds = ex or ttl or (px / 1000 if px else None)
+        if nx:
+            self._purge()
+            if key in self._store:
+                return None  # like Redis SET NX on an existing key
         exp = (time.time() + expiry_seconds) if expiry_seconds else None
         self._store[key] = (exp, value)
         return True
@@ -10,13 +10,14 @@ from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query
 
-from geopolitical_news_agent import GeopoliticalNewsAgent
+from geopolitical_news_agent import GeopoliticalNewsAgent, get_intel_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/geopolitical", tags=["geopolitical"])
 
 # Initialize agent (will be injected with proper dependencies in production)
+# Per-symbol intelligence is cached in the shared cache (see get_intel_cache)
 news_agent = GeopoliticalNewsAgent()
 
 
@@ -46,6 +47,7 @@ async def get_ticker_intelligence(
     include_options: bool = Query(
         True, description="Include options strategy suggestions"
     ),
+    refresh: bool = Query(False, description="Bypass the intelligence cache"),
 ):
     """
     Get comprehensive intelligence for a specific ticker
@@ -54,6 +56,7 @@ async def get_ticker_intelligence(
     symbol: Stock ticker (e.g., TSLA, AAPL)
     include_fis: Include FIS fundamental score
     include_options: Include options strategy recommendations
+    refresh: Recompute instead of serving cached intelligence
 
     Returns:
     - News items with timestamps
@@ -68,6 +71,7 @@ async def get_ticker_intelligence(
             symbol=symbol.upper(),
             include_fis=include_fis,
             include_options=include_options,
+            use_cache=not refresh,
         )
 
         return {"status": "success", "data": ticker_intel}
@@ -206,6 +210,17 @@ async def get_trading_opportunities(mindfolio_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/cache")
+async def get_intel_cache_stats():
+    """
+    Shared per-symbol intelligence cache statistics
+
+    Returns:
+    Hits, misses, live entries and TTL
+    """
+    return {"status": "success", "data": get_intel_cache().get_stats()}
+
+
 @router.get("/calendar")
 async def get_economic_calendar(
     days_ahead: int = Query(7, description="Number of days to look ahead"),
@@ -1,8 +1,11 @@
+import asyncio
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Body, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 
+import options_strategy_charts as charts
 from services.options_gex import compute_gex, fetch_chain
 
 logger = logging.getLogger(__name__)
@@ -231,3 +234,45 @@ def get_provider_status():
     except Exception as e:
         logger.error(f"Provider status check failed: {e}")
         return {"provider_name": "unknown", "status": "error", "error": str(e)}
+
+
+@router.post("/strategy-chart")
+async def get_strategy_chart(
+    strategy: Dict[str, Any] = Body(..., description="Strategy (name, ticker, spot)"),
+    format: str = Query("data", pattern="^(data|plotly|png)$"),
+    points: int = Query(charts.CHART_DATA_POINTS, ge=2, le=500),
+    width: int = Query(800, ge=200, le=2000),
+    height: int = Query(400, ge=150, le=1500),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Payoff chart for a strategy.
+
+    ``data`` (default) returns compact payoff-curve arrays for client-side
+    drawing, ``plotly`` the full figure JSON and ``png`` a server-rendered
+    image. Responses carry a content-hash ETag.
+    """
+    if format == "data":
+        etag = charts.chart_key(strategy, "data", points=points)
+    elif format == "plotly":
+        etag = charts.chart_key(strategy, "plotly")
+    else:
+        etag = charts.chart_key(strategy, "png", width=width, height=height, dpi=100)
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "private, max-age=300"}
+    if if_none_match and if_none_match.strip('"') == etag:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        if format == "data":
+            body = charts.payoff_data(strategy, points)
+        elif format == "plotly":
+            body = await asyncio.to_thread(
+                charts.chart_generator.generate_strategy_chart, strategy
+            )
+        else:
+            png = await charts.render_png(strategy, width, height)
+            return Response(png, media_type="image/png", headers=headers)
+    except Exception as e:
+        logger.error(f"Strategy chart failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Chart failed: {str(e)}")
+
+    return JSONResponse(body, headers=headers)
@@ -17,6 +17,7 @@ from datetime import datetime
 from typing import Optional
 
 from integrations.uw_websocket_client import UWWebSocketClient
+from services.flow_store import attach_flow_store, get_flow_store
 from services.ws_connection_manager import ws_manager
 
 logger = logging.getLogger(__name__)
@@ -69,6 +70,9 @@ async def initialize_websocket():
     if success:
         logger.info(" Connected to Unusual Whales WebSocket")
 
+        # Feed flow alerts / dark pool prints into the local flow store
+        await attach_flow_store(uw_client)
+
         # Start listening in background
         uw_listen_task = asyncio.create_task(uw_client.listen())
         logger.info(" WebSocket listen task started")
@@ -541,6 +545,25 @@ async def websocket_status():
     }
 
 
+@router.get("/flow-store")
+async def flow_store_status(ticker: Optional[str] = None, top: int = 20):
+    """
+    Local flow event store status and rolling aggregates.
+
+    **Query:**
+    - ticker: return aggregates for one ticker
+    - top: otherwise, number of most active tickers to return
+    """
+    store = get_flow_store()
+    if ticker:
+        aggs = store.get_aggregates(ticker)
+        if aggs is None:
+            raise HTTPException(status_code=404, detail=f"No flow events for {ticker}")
+        return {"ticker": ticker.upper(), "aggregates": aggs.to_dict()}
+
+    return {"stats": store.get_stats(), "top_tickers": store.top_tickers(n=top)}
+
+
 @router.get("/channels")
 async def list_channels():
     """
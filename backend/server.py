@@ -5,7 +5,14 @@ from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
-from fastapi import APIRouter, FastAPI, HTTPException, Query
+from fastapi import (
+    APIRouter,
+    FastAPI,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 
@@ -28,27 +35,23 @@ except ImportError:
 # from mindfolio_service import MindfolioService
 # from trading_service import TradingService
 
-# AI Agents
-from investment_scoring_agent import InvestmentScoringAgent
-
-# Options Calculator
-# Mindfolio Charts and Smart Rebalancing
-from mindfolio_charts_service import MindfolioChartsService
-
 # Mindfolio Management
 # NEW: Option Selling compute + monitor service + analysis
 from options_selling_service import (
     AnalysisQuery,
     ComputeRequest,
     MonitorStartRequest,
+    MonitorUpdateRequest,
     compute_selling,
+    monitor_service,
     monitor_start,
     monitor_status,
     monitor_stop,
+    monitor_update,
     options_analysis,
 )
-from smart_rebalancing_service import SmartRebalancingService
-from technical_analysis_agent import TechnicalAnalysisAgent
+from utils.lazy import LazyObject, LazyRouterRegistry
+from utils.tracing import span
 
 # Logger setup
 logger = logging.getLogger("server")
@@ -109,13 +112,15 @@ db = client[os.environ["DB_NAME"]]
 # trading_service = TradingService(ts_client)
 # mindfolio_management_service = MindfolioManagementService(ts_auth)
 
-# Initialize AI Agents
-investment_scoring_agent = InvestmentScoringAgent()
-technical_analysis_agent = TechnicalAnalysisAgent()
+# AI Agents (pandas/matplotlib-heavy; imported on first use)
+investment_scoring_agent = LazyObject("investment_scoring_agent:InvestmentScoringAgent")
+technical_analysis_agent = LazyObject("technical_analysis_agent:TechnicalAnalysisAgent")
 
-# Initialize new services
-mindfolio_charts_service = MindfolioChartsService()
-smart_rebalancing_service = SmartRebalancingService()
+# Mindfolio Charts and Smart Rebalancing
+mindfolio_charts_service = LazyObject("mindfolio_charts_service:MindfolioChartsService")
+smart_rebalancing_service = LazyObject(
+    "smart_rebalancing_service:SmartRebalancingService"
+)
 
 # Placeholder services for disabled functionality
 uw_service = None
@@ -299,7 +304,7 @@ async def startup():
             # Run warmup in background (don't block startup)
             import asyncio
 
-            asyncio.create_task(
+            app.state.warmup_task = asyncio.create_task(
                 warmup_cache(
                     symbols=config["symbols"],
                     include_flow=config["include_flow"],
@@ -374,7 +379,8 @@ api_router = APIRouter(prefix="/api")
 @api_router.post("/options/selling/compute")
 async def options_selling_compute(req: ComputeRequest):
     try:
-        result = await compute_selling(req)
+        with span("compute", op="options_selling"):
+            result = await compute_selling(req)
         return {"status": "success", "data": result.dict()}
     except Exception as e:
         raise HTTPException(
@@ -410,6 +416,35 @@ async def options_selling_monitor_status():
         raise HTTPException(status_code=400, detail=f"Monitor status failed: {str(e)}")
 
 
+@api_router.post("/options/selling/monitor/update")
+async def options_selling_monitor_update(req: MonitorUpdateRequest):
+    try:
+        res = await monitor_update(req)
+        return {"status": "success", "data": res}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Monitor update failed: {str(e)}")
+
+
+@api_router.websocket("/options/selling/monitor/ws")
+async def options_selling_monitor_ws(websocket: WebSocket):
+    """Push monitor signal diffs as they happen instead of polling status."""
+    await websocket.accept()
+    queue = monitor_service.subscribe()
+    try:
+        await websocket.send_json(
+            {"type": "status", **(await monitor_status())["data"]}
+        )
+        while True:
+            event = await queue.get()
+            await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Monitor stream error: {e}")
+    finally:
+        monitor_service.unsubscribe(queue)
+
+
 # NEW: Options Selling Analysis endpoint (simulated from monitor logs)
 @api_router.get("/options/selling/analysis")
 async def options_selling_analysis(
@@ -838,15 +873,17 @@ from routers.dashboard import router as dashboard_router
 
 app.include_router(dashboard_router, prefix="/api")
 
-# Geopolitical & News Intelligence router
-from routers.geopolitical import router as geopolitical_router
+# Heavy routers are imported and mounted on the first request under their
+# prefix (LAZY_ROUTERS=0 mounts them at import time instead)
+lazy_routers = LazyRouterRegistry(app)
+app.state.lazy_routers = lazy_routers
+app.middleware("http")(lazy_routers.middleware)
 
-app.include_router(geopolitical_router)  # Already has /api/geopolitical prefix
+# Geopolitical & News Intelligence router (already has /api/geopolitical prefix)
+lazy_routers.register("/api/geopolitical", "routers.geopolitical:router")
 
-# Term Structure Volatility Arbitrage router
-from routers.term_structure import router as term_structure_router
-
-app.include_router(term_structure_router)  # Already has /api/term-structure prefix
+# Term Structure Volatility Arbitrage router (already has /api/term-structure prefix)
+lazy_routers.register("/api/term-structure", "routers.term_structure:router")
 
 # WebSocket Streaming router
 from routers.stream import router as stream_router
@@ -859,9 +896,7 @@ app.include_router(stream_router)  # Already has /api/stream prefix
 # app.include_router(automation_router, prefix="/api")
 
 # CORE ENGINE router (198-agent hierarchical system)
-from routers.core_engine import router as core_engine_router
-
-app.include_router(core_engine_router)  # Already has /api/core-engine prefix
+lazy_routers.register("/api/core-engine", "routers.core_engine:router")
 
 # Wire observability (metrics, structured logging, request correlation)
 try:
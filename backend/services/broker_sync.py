@@ -4,16 +4,22 @@ Broker Sync Service for Master Mindfolios (NEW - Nov 2, 2025)
 Auto-sync master mindfolios with broker APIs:
 - Periodic sync (every 5 minutes) or manual trigger
 - Fetch positions + balances from broker
-- Compare with current mindfolio state
-- Create transactions for differences
+- Compare with the last broker snapshot (versioned, content-hashed per account)
+- Create transactions for differences (one batched write)
 - Recalculate positions
+
+An unchanged broker snapshot (same hash) skips the diff, the transaction
+writes and the FIFO recalculation entirely.
 """
 
+import hashlib
+import json
 import logging
 import os
+import secrets
 import requests
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from redis_fallback import get_kv
 
@@ -26,14 +32,175 @@ if TS_MODE == "LIVE":
 else:
     TS_API_BASE = "https://sim-api.tradestation.com/v3"
 
+# Quantities closer than this are treated as equal (broker floats)
+QTY_EPSILON = 1e-6
+
+# {symbol: (quantity, average price)}
+Holdings = Dict[str, Tuple[float, float]]
+
+DIFF_NOTES = {
+    "new_buy": "Auto-sync from broker",
+    "add": "Auto-sync from broker (position increased)",
+    "partial_sell": "Auto-sync from broker",
+    "full_sell": "Auto-sync from broker (position closed)",
+}
+
+
+def key_broker_snapshot(broker: str, account_id: str) -> str:
+    return f"broker:{broker}:{account_id}:snapshot"
+
+
+def holdings_from_broker(live: List[Dict[str, Any]]) -> Holdings:
+    """
+    Normalize broker position rows into {symbol: (qty, avg_price)}
+
+    Flat rows are dropped; a symbol reported more than once is merged at its
+    quantity-weighted average price.
+    """
+    holdings: Holdings = {}
+    for p in live:
+        qty = float(p["Quantity"])
+        if abs(qty) < QTY_EPSILON:
+            continue
+        price = float(p["AveragePrice"])
+        symbol = p["Symbol"]
+        if symbol in holdings:
+            prev_qty, prev_price = holdings[symbol]
+            total = prev_qty + qty
+            price = (prev_qty * prev_price + qty * price) / total if total else price
+            qty = total
+        holdings[symbol] = (qty, price)
+    return holdings
+
+
+def snapshot_hash(holdings: Holdings, cash: float) -> str:
+    """Content hash of a broker snapshot (order independent)"""
+    canonical = json.dumps(
+        [cash, sorted([s, q, p] for s, (q, p) in holdings.items())],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def diff_holdings(previous: Holdings, live: Holdings) -> List[Dict[str, Any]]:
+    """
+    Complete position diff between two snapshots, sorted by symbol.
+
+    Returns list of diffs:
+    - new_buy: New position appeared in broker
+    - add: Position increased in broker (priced at the marginal cost implied
+      by the broker's new average price)
+    - partial_sell: Position reduced in broker
+    - full_sell: Position closed in broker
+    """
+    diffs = []
+    for symbol in sorted(previous.keys() | live.keys()):
+        if symbol not in live:
+            qty, avg_price = previous[symbol]
+            diffs.append(
+                {
+                    "type": "full_sell",
+                    "symbol": symbol,
+                    "quantity": qty,
+                    "avg_price": avg_price,
+                }
+            )
+            continue
+
+        live_qty, live_price = live[symbol]
+        if symbol not in previous:
+            diffs.append(
+                {
+                    "type": "new_buy",
+                    "symbol": symbol,
+                    "quantity": live_qty,
+                    "avg_price": live_price,
+                }
+            )
+            continue
+
+        prev_qty, prev_price = previous[symbol]
+        delta = live_qty - prev_qty
+        if delta > QTY_EPSILON:
+            price = (live_qty * live_price - prev_qty * prev_price) / delta
+            diffs.append(
+                {
+                    "type": "add",
+                    "symbol": symbol,
+                    "quantity": delta,
+                    "avg_price": price if price > 0 else live_price,
+                }
+            )
+        elif delta < -QTY_EPSILON:
+            diffs.append(
+                {
+                    "type": "partial_sell",
+                    "symbol": symbol,
+                    "quantity": -delta,
+                    "avg_price": live_price,
+                }
+            )
+    return diffs
+
+
+class FakeBroker:
+    """
+    Local in-memory broker for tests and benchmarks
+
+    Serves TradeStation-shaped Positions rows and a cash balance per account
+    and counts the calls made to it.
+    """
+
+    def __init__(self):
+        self.accounts: Dict[str, Dict[str, Any]] = {}
+        self.calls = {"positions": 0, "balance": 0}
+
+    def set_position(
+        self, account_id: str, symbol: str, qty: float, avg_price: float
+    ) -> None:
+        account = self.accounts.setdefault(account_id, {"cash": 0.0, "positions": {}})
+        if abs(qty) < QTY_EPSILON:
+            account["positions"].pop(symbol, None)
+        else:
+            account["positions"][symbol] = (qty, avg_price)
+
+    def set_cash(self, account_id: str, cash: float) -> None:
+        self.accounts.setdefault(account_id, {"cash": 0.0, "positions": {}})
+        self.accounts[account_id]["cash"] = cash
+
+    async def get_positions(self, account_id: str) -> List[Dict[str, Any]]:
+        self.calls["positions"] += 1
+        account = self.accounts.get(account_id, {"positions": {}})
+        return [
+            {"Symbol": symbol, "Quantity": str(qty), "AveragePrice": str(price)}
+            for symbol, (qty, price) in account["positions"].items()
+        ]
+
+    async def get_balance(self, account_id: str) -> float:
+        self.calls["balance"] += 1
+        return float(self.accounts.get(account_id, {}).get("cash", 0.0))
+
 
 class BrokerSyncService:
     """
     Auto-sync master mindfolios with broker APIs.
+
+    Args:
+        broker_client: Optional client with async get_positions(account_id) /
+            get_balance(account_id) (e.g. FakeBroker); defaults to the broker
+            REST APIs using the token passed to sync_master_mindfolio.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, broker_client: Optional[Any] = None):
+        self.broker_client = broker_client
+
+    async def load_snapshot(
+        self, broker: str, account_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Last stored broker snapshot for an account (None before first sync)"""
+        cli = await get_kv()
+        raw = await cli.get(key_broker_snapshot(broker, account_id))
+        return json.loads(raw) if raw else None
 
     async def sync_master_mindfolio(
         self, master_id: str, token: str
@@ -41,6 +208,10 @@ class BrokerSyncService:
         """
         Sync a single master mindfolio with its broker.
 
+        Broker-side changes are found by diffing against the previous broker
+        snapshot, so positions transferred out of the master are not bought
+        back. The first sync diffs against the mindfolio's current positions.
+
         Args:
             master_id: Master mindfolio ID
             token: Broker API access token
@@ -53,175 +224,95 @@ class BrokerSyncService:
             pf_put,
             get_mindfolio_positions,
             calculate_positions_fifo,
-            key_transaction,
-            key_mindfolio_transactions,
             key_mindfolio_positions,
-            Transaction,
         )
-        import json
-        import secrets
 
+        master = None
         try:
             # Get master mindfolio
             master = await pf_get(master_id)
             if not master or not master.is_master:
                 raise ValueError(f"Not a master mindfolio: {master_id}")
 
+            # Fetch live data from broker
+            live_positions, live_cash = await self._fetch_snapshot(master, token)
+            live = holdings_from_broker(live_positions)
+            digest = snapshot_hash(live, live_cash)
+
+            previous = await self.load_snapshot(master.broker, master.account_id)
+            if previous and previous["hash"] == digest:
+                master.last_sync = datetime.now(timezone.utc).isoformat()
+                master.sync_status = "idle"
+                await pf_put(master)
+                logger.info(f"Master mindfolio {master_id} unchanged at broker")
+                return {
+                    "status": "unchanged",
+                    "synced_at": master.last_sync,
+                    "snapshot_version": previous["version"],
+                    "transactions_created": 0,
+                    "diffs": {},
+                    "cash_balance": live_cash,
+                }
+
             # Update sync status
             master.sync_status = "syncing"
             await pf_put(master)
 
-            # Fetch live data from broker
-            live_positions = await self._fetch_broker_positions(
-                master.broker, master.account_id, token
-            )
-            live_cash = await self._fetch_broker_balance(
-                master.broker, master.account_id, token
-            )
-
-            # Get current mindfolio positions
-            current_positions = await get_mindfolio_positions(master_id)
-
-            # Calculate differences
-            position_diffs = self._calculate_position_diffs(
-                current_positions, live_positions
-            )
-
-            # Create transactions for differences
-            cli = await get_kv()
-            transactions_created = []
+            if previous:
+                baseline = {s: (q, p) for s, q, p in previous["positions"]}
+            else:
+                baseline = {
+                    p.symbol: (p.qty, p.avg_cost)
+                    for p in await get_mindfolio_positions(master_id)
+                }
+            position_diffs = diff_holdings(baseline, live)
 
-            for diff in position_diffs:
-                now = datetime.now(timezone.utc).isoformat()
-
-                if diff["type"] == "new_buy":
-                    # New position appeared in broker
-                    tx = Transaction(
-                        id=f"tx_{secrets.token_hex(6)}",
-                        mindfolio_id=master_id,
-                        account_id=master.account_id,
-                        datetime=now,
-                        symbol=diff["symbol"],
-                        side="BUY",
-                        qty=diff["quantity"],
-                        price=diff["avg_price"],
-                        fee=0.0,
-                        notes="Auto-sync from broker",
-                        created_at=now,
-                    )
-                    await cli.set(key_transaction(tx.id), tx.json())
-
-                    # Update transaction list
-                    tx_list_raw = (
-                        await cli.get(key_mindfolio_transactions(master_id)) or "[]"
-                    )
-                    tx_ids = json.loads(tx_list_raw)
-                    tx_ids.append(tx.id)
-                    await cli.set(
-                        key_mindfolio_transactions(master_id), json.dumps(tx_ids)
-                    )
-
-                    transactions_created.append(
-                        {
-                            "symbol": diff["symbol"],
-                            "side": "BUY",
-                            "qty": diff["quantity"],
-                        }
-                    )
-
-                elif diff["type"] == "partial_sell":
-                    # Position reduced in broker
-                    tx = Transaction(
-                        id=f"tx_{secrets.token_hex(6)}",
-                        mindfolio_id=master_id,
-                        account_id=master.account_id,
-                        datetime=now,
-                        symbol=diff["symbol"],
-                        side="SELL",
-                        qty=diff["quantity"],
-                        price=diff["avg_price"],
-                        fee=0.0,
-                        notes="Auto-sync from broker",
-                        created_at=now,
-                    )
-                    await cli.set(key_transaction(tx.id), tx.json())
-
-                    # Update transaction list
-                    tx_list_raw = (
-                        await cli.get(key_mindfolio_transactions(master_id)) or "[]"
-                    )
-                    tx_ids = json.loads(tx_list_raw)
-                    tx_ids.append(tx.id)
-                    await cli.set(
-                        key_mindfolio_transactions(master_id), json.dumps(tx_ids)
-                    )
-
-                    transactions_created.append(
-                        {
-                            "symbol": diff["symbol"],
-                            "side": "SELL",
-                            "qty": diff["quantity"],
-                        }
-                    )
-
-                elif diff["type"] == "full_sell":
-                    # Position closed in broker
-                    tx = Transaction(
-                        id=f"tx_{secrets.token_hex(6)}",
-                        mindfolio_id=master_id,
-                        account_id=master.account_id,
-                        datetime=now,
-                        symbol=diff["symbol"],
-                        side="SELL",
-                        qty=diff["quantity"],
-                        price=diff["avg_price"],
-                        fee=0.0,
-                        notes="Auto-sync from broker (position closed)",
-                        created_at=now,
-                    )
-                    await cli.set(key_transaction(tx.id), tx.json())
-
-                    # Update transaction list
-                    tx_list_raw = (
-                        await cli.get(key_mindfolio_transactions(master_id)) or "[]"
-                    )
-                    tx_ids = json.loads(tx_list_raw)
-                    tx_ids.append(tx.id)
-                    await cli.set(
-                        key_mindfolio_transactions(master_id), json.dumps(tx_ids)
-                    )
-
-                    transactions_created.append(
-                        {
-                            "symbol": diff["symbol"],
-                            "side": "SELL",
-                            "qty": diff["quantity"],
-                        }
-                    )
+            transactions = self._diff_transactions(master, position_diffs)
+            await self._write_transactions(master_id, transactions)
 
             # Update cash balance
             master.cash_balance = live_cash
 
             # Recalculate positions
+            cli = await get_kv()
             calculated_positions = await calculate_positions_fifo(master_id)
-
-            # Save positions
             positions_json = json.dumps([pos.dict() for pos in calculated_positions])
             await cli.set(key_mindfolio_positions(master_id), positions_json)
 
-            # Update sync status
+            # Store the snapshot last so a failed sync is diffed again
+            version = (previous["version"] if previous else 0) + 1
             master.last_sync = datetime.now(timezone.utc).isoformat()
+            await cli.set(
+                key_broker_snapshot(master.broker, master.account_id),
+                json.dumps(
+                    {
+                        "version": version,
+                        "hash": digest,
+                        "synced_at": master.last_sync,
+                        "cash": live_cash,
+                        "positions": [[s, q, p] for s, (q, p) in live.items()],
+                    }
+                ),
+            )
+
+            # Update sync status
             master.sync_status = "idle"
             await pf_put(master)
 
+            counts: Dict[str, int] = {}
+            for diff in position_diffs:
+                counts[diff["type"]] = counts.get(diff["type"], 0) + 1
             logger.info(
-                f"Synced master mindfolio {master_id}: {len(transactions_created)} transactions created"
+                f"Synced master mindfolio {master_id} (snapshot v{version}): "
+                f"{len(transactions)} transactions created"
             )
 
             return {
                 "status": "success",
                 "synced_at": master.last_sync,
-                "transactions_created": len(transactions_created),
+                "snapshot_version": version,
+                "transactions_created": len(transactions),
+                "diffs": counts,
                 "positions_updated": len(calculated_positions),
                 "cash_balance": live_cash,
             }
@@ -229,13 +320,57 @@ class BrokerSyncService:
         except Exception as e:
             logger.error(f"Sync failed for {master_id}: {e}")
             # Update sync status to error
-            try:
-                master.sync_status = "error"
-                await pf_put(master)
-            except:
-                pass
+            if master is not None:
+                try:
+                    master.sync_status = "error"
+                    await pf_put(master)
+                except Exception:
+                    pass
             raise e
 
+    def _diff_transactions(self, master: Any, diffs: List[Dict[str, Any]]) -> List:
+        """One Transaction per position diff, all stamped with the sync time"""
+        from mindfolio import Transaction
+
+        now = datetime.now(timezone.utc).isoformat()
+        return [
+            Transaction(
+                id=f"tx_{secrets.token_hex(6)}",
+                mindfolio_id=master.id,
+                account_id=master.account_id,
+                datetime=now,
+                symbol=diff["symbol"],
+                side="BUY" if diff["type"] in ("new_buy", "add") else "SELL",
+                qty=diff["quantity"],
+                price=diff["avg_price"],
+                fee=0.0,
+                notes=DIFF_NOTES[diff["type"]],
+                created_at=now,
+            )
+            for diff in diffs
+        ]
+
+    async def _write_transactions(self, master_id: str, transactions: List):
+        """Write all transactions in one batch and apply them to the lot ledger"""
+        from mindfolio import tx_create_many
+
+        if transactions:
+            await tx_create_many(master_id, transactions)
+
+    async def _fetch_snapshot(
+        self, master: Any, token: str
+    ) -> Tuple[List[Dict[str, Any]], float]:
+        """Positions and cash balance for the master's broker account"""
+        if self.broker_client is not None:
+            positions = await self.broker_client.get_positions(master.account_id)
+            cash = await self.broker_client.get_balance(master.account_id)
+            return positions, cash
+        positions = await self._fetch_broker_positions(
+            master.broker, master.account_id, token
+        )
+        cash = await self._fetch_broker_balance(master.broker, master.account_id, token)
+        return positions, cash
+
     async def _fetch_broker_positions(
         self, broker: str, account_id: str, token: str
     ) -> List[Dict[str, Any]]:
@@ -285,51 +420,8 @@ class BrokerSyncService:
         """
         Calculate differences between current and live positions.
 
-        Returns list of diffs:
-        - new_buy: New position appeared in broker
-        - partial_sell: Position reduced in broker
-        - full_sell: Position closed in broker
+        See diff_holdings for the diff types (new_buy, add, partial_sell,
+        full_sell).
         """
-        diffs = []
-        current_symbols = {p.symbol: p for p in current}
-        live_symbols = {p["Symbol"]: p for p in live}
-
-        # New positions
-        for symbol in live_symbols:
-            if symbol not in current_symbols:
-                diffs.append(
-                    {
-                        "type": "new_buy",
-                        "symbol": symbol,
-                        "quantity": float(live_symbols[symbol]["Quantity"]),
-                        "avg_price": float(live_symbols[symbol]["AveragePrice"]),
-                    }
-                )
-
-        # Reduced or closed positions
-        for symbol in current_symbols:
-            if symbol in live_symbols:
-                current_qty = current_symbols[symbol].qty
-                live_qty = float(live_symbols[symbol]["Quantity"])
-                if live_qty < current_qty:
-                    # Position reduced
-                    diffs.append(
-                        {
-                            "type": "partial_sell",
-                            "symbol": symbol,
-                            "quantity": current_qty - live_qty,
-                            "avg_price": float(live_symbols[symbol]["AveragePrice"]),
-                        }
-                    )
-            else:
-                # Position closed
-                diffs.append(
-                    {
-                        "type": "full_sell",
-                        "symbol": symbol,
-                        "quantity": current_symbols[symbol].qty,
-                        "avg_price": current_symbols[symbol].avg_cost,
-                    }
-                )
-
-        return diffs
+        previous = {p.symbol: (p.qty, p.avg_cost) for p in current}
+        return diff_holdings(previous, holdings_from_broker(live))
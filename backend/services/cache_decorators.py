@@ -11,6 +11,7 @@ from functools import wraps
 from typing import Any, Callable, Optional
 
 from redis_fallback import get_kv
+from utils.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -102,7 +103,8 @@ def cached_response(
                     kv = await get_kv()
 
                     # Try to get from cache
-                    cached_value = await kv.get(cache_key)
+                    with span("cache", op="get", prefix=key_prefix):
+                        cached_value = await kv.get(cache_key)
 
                     if cached_value:
                         logger.debug(f" Cache HIT: {cache_key}")
@@ -121,7 +123,8 @@ def cached_response(
                     # Store in cache
                     try:
                         serialized = json.dumps(result)
-                        await kv.set(cache_key, serialized, ex=ttl)
+                        with span("cache", op="set", prefix=key_prefix):
+                            await kv.set(cache_key, serialized, ex=ttl)
                         logger.debug(f"💾 Cached: {cache_key} (TTL: {ttl}s)")
                     except (TypeError, json.JSONEncodeError) as e:
                         logger.warning(f" Cannot cache result for {cache_key}: {e}")
@@ -0,0 +1,625 @@
+"""
+Flow Event Store for FlowMind
+
+Local, append-only store for Unusual Whales options flow and dark pool events
+received over the websocket (integrations/uw_websocket_client):
+- Columnar storage (array.array per field) split into time partitions
+- Per-ticker row index inside each partition
+- Rolling-window aggregates per ticker (bullish/bearish premium, put/call
+  ratio, sweeps, dark pool notional) kept as running totals, so reads are O(1)
+
+InvestmentScoringAgent reads from here instead of calling REST when the
+stream is live.
+"""
+
+import logging
+import os
+import threading
+import time
+from array import array
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FLOW_STORE_PARTITION_SEC = int(os.getenv("FLOW_STORE_PARTITION_SEC", "300"))
+FLOW_STORE_WINDOW_SEC = int(os.getenv("FLOW_STORE_WINDOW_SEC", "86400"))
+FLOW_STORE_RETENTION_SEC = int(os.getenv("FLOW_STORE_RETENTION_SEC", "172800"))
+FLOW_STORE_LIVE_SEC = int(os.getenv("FLOW_STORE_LIVE_SEC", "300"))
+FLOW_STORE_CHANNELS = [
+    c.strip()
+    for c in os.getenv("FLOW_STORE_CHANNELS", "flow-alerts,off_lit_trades").split(",")
+    if c.strip()
+]
+
+KIND_FLOW = 0
+KIND_DARKPOOL = 1
+
+_KIND_NAMES = {"flow": KIND_FLOW, "darkpool": KIND_DARKPOOL}
+
+
+# ============================================================================
+# Normalization
+# ============================================================================
+
+
+def _to_float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value) if value not in (None, "") else default
+    except (TypeError, ValueError):
+        return default
+
+
+def _parse_ts(value: Any, default: float) -> float:
+    """Parse epoch seconds/ms or ISO timestamp to epoch seconds"""
+    if value in (None, ""):
+        return default
+    if isinstance(value, (int, float)):
+        return value / 1000.0 if value > 1e12 else float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return _to_float(value, default) or default
+
+
+def flow_direction(option_type: str, sentiment: str) -> int:
+    """
+    Direction of a flow print (+1 bullish, -1 bearish, 0 unknown)
+
+    Same rule as InvestmentScoringAgent._analyze_options_flow: bullish calls
+    and bearish puts count as bullish exposure, the reverse as bearish.
+    """
+    if (option_type == "call" and sentiment == "bullish") or (
+        option_type == "put" and sentiment == "bearish"
+    ):
+        return 1
+    if (option_type == "call" and sentiment == "bearish") or (
+        option_type == "put" and sentiment == "bullish"
+    ):
+        return -1
+    return 0
+
+
+def normalize_flow_event(
+    payload: Dict[str, Any], now: float
+) -> Optional[Dict[str, Any]]:
+    """
+    Normalize a flow alert / option trade (websocket or REST shape)
+
+    Returns None when the payload has no ticker.
+    """
+    ticker = (
+        payload.get("ticker_symbol")
+        or payload.get("ticker")
+        or payload.get("underlying_symbol")
+        or payload.get("symbol")
+        or ""
+    ).upper()
+    if not ticker:
+        return None
+
+    option_type = str(
+        payload.get("option_type")
+        or payload.get("put_call")
+        or payload.get("type")
+        or ""
+    ).lower()
+    if option_type not in ("call", "put"):
+        option_type = ""
+
+    premium = _to_float(payload.get("total_premium", payload.get("premium")))
+
+    sentiment = str(payload.get("sentiment") or "").lower()
+    if not sentiment:
+        # Websocket alerts carry side premiums instead of a sentiment label:
+        # ask side = bought, bid side = sold
+        ask = _to_float(
+            payload.get("ask_side_premium") or payload.get("total_ask_side_prem")
+        )
+        bid = _to_float(
+            payload.get("bid_side_premium") or payload.get("total_bid_side_prem")
+        )
+        if ask > bid:
+            sentiment = "bullish"
+        elif bid > ask:
+            sentiment = "bearish"
+
+    rule = str(payload.get("alert_rule") or payload.get("trade_type") or "").lower()
+    is_sweep = bool(
+        payload.get("has_sweep") or payload.get("is_sweep") or "sweep" in rule
+    )
+
+    return {
+        "ticker": ticker,
+        "ts": _parse_ts(
+            payload.get("executed_at")
+            or payload.get("created_at")
+            or payload.get("start_time")
+            or payload.get("timestamp"),
+            now,
+        ),
+        "kind": KIND_FLOW,
+        "option_type": option_type,
+        "direction": flow_direction(option_type, sentiment),
+        "sweep": is_sweep,
+        "premium": premium,
+        "size": _to_float(
+            payload.get("total_size", payload.get("size", payload.get("volume")))
+        ),
+        "price": _to_float(payload.get("underlying_price", payload.get("stock_price"))),
+        "strike": _to_float(payload.get("strike")),
+        "iv": _to_float(payload.get("iv_start", payload.get("iv"))),
+    }
+
+
+def normalize_darkpool_event(
+    payload: Dict[str, Any], now: float
+) -> Optional[Dict[str, Any]]:
+    """Normalize an off-lit / dark pool print"""
+    ticker = (payload.get("ticker") or payload.get("symbol") or "").upper()
+    if not ticker:
+        return None
+
+    price = _to_float(payload.get("price"))
+    size = _to_float(payload.get("size", payload.get("volume")))
+    notional = _to_float(payload.get("premium", payload.get("value")), price * size)
+
+    return {
+        "ticker": ticker,
+        "ts": _parse_ts(payload.get("executed_at") or payload.get("timestamp"), now),
+        "kind": KIND_DARKPOOL,
+        "option_type": "",
+        "direction": 0,
+        "sweep": False,
+        "premium": notional,
+        "size": size,
+        "price": price,
+        "strike": 0.0,
+        "iv": 0.0,
+    }
+
+
+# ============================================================================
+# Aggregates
+# ============================================================================
+
+
+@dataclass
+class FlowAggregates:
+    """Rolling-window flow aggregates for one ticker"""
+
+    flow_count: int = 0
+    call_count: int = 0
+    put_count: int = 0
+    call_premium: float = 0.0
+    put_premium: float = 0.0
+    bullish_premium: float = 0.0
+    bearish_premium: float = 0.0
+    sweep_count: int = 0
+    sweep_premium: float = 0.0
+    darkpool_count: int = 0
+    darkpool_volume: float = 0.0
+    darkpool_notional: float = 0.0
+
+    def add(self, other: "FlowAggregates", sign: int = 1):
+        for field, value in other.__dict__.items():
+            setattr(self, field, getattr(self, field) + sign * value)
+
+    def add_event(self, ev: Dict[str, Any]):
+        if ev["kind"] == KIND_DARKPOOL:
+            self.darkpool_count += 1
+            self.darkpool_volume += ev["size"]
+            self.darkpool_notional += ev["premium"]
+            return
+
+        premium = ev["premium"]
+        self.flow_count += 1
+        if ev["option_type"] == "call":
+            self.call_count += 1
+            self.call_premium += premium
+        elif ev["option_type"] == "put":
+            self.put_count += 1
+            self.put_premium += premium
+        if ev["direction"] > 0:
+            self.bullish_premium += premium
+        elif ev["direction"] < 0:
+            self.bearish_premium += premium
+        if ev["sweep"]:
+            self.sweep_count += 1
+            self.sweep_premium += premium
+
+    @property
+    def put_call_ratio(self) -> float:
+        """Count-based ratio, same convention as _calculate_put_call_ratio"""
+        if self.flow_count == 0:
+            return 1.0
+        if self.call_count == 0:
+            return 2.0
+        return self.put_count / self.call_count
+
+    @property
+    def bullish_pct(self) -> float:
+        """Bullish share of directional premium (0-100, 50 = neutral)"""
+        total = self.bullish_premium + self.bearish_premium
+        if total <= 0:
+            return 50.0
+        return self.bullish_premium / total * 100
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        out["put_call_ratio"] = round(self.put_call_ratio, 4)
+        out["bullish_pct"] = round(self.bullish_pct, 2)
+        return out
+
+
+# ============================================================================
+# Storage
+# ============================================================================
+
+
+class _Partition:
+    """Append-only columnar block covering [start, start + partition_sec)"""
+
+    __slots__ = (
+        "pid",
+        "ts",
+        "ticker",
+        "kind",
+        "opt",
+        "direction",
+        "sweep",
+        "premium",
+        "size",
+        "price",
+        "strike",
+        "iv",
+        "index",
+    )
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.ts = array("d")
+        self.ticker = array("l")
+        self.kind = array("b")
+        self.opt = array("b")  # 1 call, 0 put, -1 n/a
+        self.direction = array("b")
+        self.sweep = array("b")
+        self.premium = array("d")
+        self.size = array("d")
+        self.price = array("d")
+        self.strike = array("d")
+        self.iv = array("d")
+        self.index: Dict[int, array] = {}  # ticker_id -> row numbers
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def append(self, tid: int, ev: Dict[str, Any]):
+        row = len(self.ts)
+        self.ts.append(ev["ts"])
+        self.ticker.append(tid)
+        self.kind.append(ev["kind"])
+        self.opt.append({"call": 1, "put": 0}.get(ev["option_type"], -1))
+        self.direction.append(ev["direction"])
+        self.sweep.append(1 if ev["sweep"] else 0)
+        self.premium.append(ev["premium"])
+        self.size.append(ev["size"])
+        self.price.append(ev["price"])
+        self.strike.append(ev["strike"])
+        self.iv.append(ev["iv"])
+        rows = self.index.get(tid)
+        if rows is None:
+            rows = self.index[tid] = array("l")
+        rows.append(row)
+
+    def row_dict(self, row: int, ticker: str) -> Dict[str, Any]:
+        ts = self.ts[row]
+        iso = datetime.fromtimestamp(ts).isoformat()
+        if self.kind[row] == KIND_DARKPOOL:
+            return {
+                "ticker": ticker,
+                "price": self.price[row],
+                "size": self.size[row],
+                "premium": self.premium[row],
+                "timestamp": iso,
+            }
+        opt = self.opt[row]
+        direction = self.direction[row]
+        option_type = "call" if opt == 1 else "put" if opt == 0 else ""
+        # Inverse of flow_direction for the stored option type
+        if direction == 0:
+            sentiment = ""
+        elif (direction > 0) == (option_type == "call"):
+            sentiment = "bullish"
+        else:
+            sentiment = "bearish"
+        return {
+            "symbol": ticker,
+            "ticker": ticker,
+            "option_type": option_type,
+            "sentiment": sentiment,
+            "premium": self.premium[row],
+            "size": self.size[row],
+            "stock_price": self.price[row],
+            "strike": self.strike[row],
+            "iv": self.iv[row],
+            "is_sweep": bool(self.sweep[row]),
+            "timestamp": iso,
+        }
+
+
+class _TickerState:
+    """Running window totals plus per-partition buckets for one ticker"""
+
+    __slots__ = ("totals", "buckets", "last_ts")
+
+    def __init__(self):
+        self.totals = FlowAggregates()
+        self.buckets: Deque[Tuple[int, FlowAggregates]] = deque()
+        self.last_ts = 0.0
+
+
+class FlowEventStore:
+    """
+    Time-partitioned flow event store with per-ticker rolling aggregates
+
+    Usage:
+        store = get_flow_store()
+        store.ingest("flow-alerts", payload)        # websocket listener
+        aggs = store.get_aggregates("TSLA")         # O(1) read
+        rows = store.get_events("TSLA", kind="flow", limit=200)
+
+    Args:
+        partition_sec: Width of a storage partition
+        window_sec: Rolling window for aggregates
+        retention_sec: How long raw events are kept
+        clock: Time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        partition_sec: int = FLOW_STORE_PARTITION_SEC,
+        window_sec: int = FLOW_STORE_WINDOW_SEC,
+        retention_sec: int = FLOW_STORE_RETENTION_SEC,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.partition_sec = max(int(partition_sec), 1)
+        self.window_sec = window_sec
+        self.retention_sec = max(retention_sec, window_sec)
+        self.clock = clock
+
+        self._partitions: Dict[int, _Partition] = {}
+        self._ticker_ids: Dict[str, int] = {}
+        self._ticker_names: List[str] = []
+        self._tickers: Dict[int, _TickerState] = {}
+        self._lock = threading.Lock()
+
+        self.last_ingest = 0.0
+        self.stats = {"ingested": 0, "rejected": 0, "dropped_partitions": 0}
+
+    # === INGEST ===
+
+    def _pid(self, ts: float) -> int:
+        return int(ts // self.partition_sec)
+
+    def _ticker_id(self, ticker: str) -> int:
+        tid = self._ticker_ids.get(ticker)
+        if tid is None:
+            tid = len(self._ticker_names)
+            self._ticker_ids[ticker] = tid
+            self._ticker_names.append(ticker)
+        return tid
+
+    def _expire(self, state: _TickerState, now: float):
+        """Subtract buckets that left the rolling window"""
+        cutoff = self._pid(now - self.window_sec)
+        while state.buckets and state.buckets[0][0] < cutoff:
+            _, bucket = state.buckets.popleft()
+            state.totals.add(bucket, -1)
+
+    def _drop_old_partitions(self, now: float):
+        cutoff = self._pid(now - self.retention_sec)
+        for pid in [p for p in self._partitions if p < cutoff]:
+            del self._partitions[pid]
+            self.stats["dropped_partitions"] += 1
+
+    def add_event(self, ev: Dict[str, Any]) -> bool:
+        """Append one normalized event; returns False if outside retention"""
+        now = self.clock()
+        ts = ev["ts"]
+        if ts < now - self.retention_sec:
+            self.stats["rejected"] += 1
+            return False
+
+        pid = self._pid(ts)
+        with self._lock:
+            partition = self._partitions.get(pid)
+            if partition is None:
+                self._drop_old_partitions(now)
+                partition = self._partitions[pid] = _Partition(pid)
+
+            tid = self._ticker_id(ev["ticker"])
+            partition.append(tid, ev)
+
+            state = self._tickers.get(tid)
+            if state is None:
+                state = self._tickers[tid] = _TickerState()
+            state.last_ts = max(state.last_ts, ts)
+
+            if ts >= now - self.window_sec:
+                # Buckets are ordered by partition; late events walk back
+                bucket = None
+                for bpid, b in reversed(state.buckets):
+                    if bpid == pid:
+                        bucket = b
+                        break
+                    if bpid < pid:
+                        break
+                if bucket is None:
+                    bucket = FlowAggregates()
+                    pos = len(state.buckets)
+                    while pos > 0 and state.buckets[pos - 1][0] > pid:
+                        pos -= 1
+                    state.buckets.insert(pos, (pid, bucket))
+                bucket.add_event(ev)
+                state.totals.add_event(ev)
+                self._expire(state, now)
+
+            self.last_ingest = now
+            self.stats["ingested"] += 1
+        return True
+
+    def ingest(self, channel: str, payload: Any) -> int:
+        """
+        Ingest a websocket message (single event or list of events)
+
+        Returns:
+            Number of events stored
+        """
+        is_darkpool = channel.startswith(("off_lit_trades", "dark_pool", "darkpool"))
+        if not is_darkpool and not channel.startswith(("flow-alerts", "option_trades")):
+            return 0
+
+        items = payload if isinstance(payload, list) else [payload]
+        now = self.clock()
+        stored = 0
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            ev = (
+                normalize_darkpool_event(item, now)
+                if is_darkpool
+                else normalize_flow_event(item, now)
+            )
+            if ev is None:
+                self.stats["rejected"] += 1
+                continue
+            if self.add_event(ev):
+                stored += 1
+        return stored
+
+    async def on_message(self, channel: str, payload: Any):
+        """Websocket listener callback"""
+        try:
+            self.ingest(channel, payload)
+        except Exception as e:
+            logger.error(f"Flow store ingest error on {channel}: {e}")
+
+    # === READ ===
+
+    def is_live(self, max_age_sec: float = FLOW_STORE_LIVE_SEC) -> bool:
+        """True when the stream delivered events recently"""
+        return self.last_ingest > 0 and self.clock() - self.last_ingest <= max_age_sec
+
+    def has_ticker(self, ticker: str) -> bool:
+        return ticker.upper() in self._ticker_ids
+
+    def get_aggregates(self, ticker: str) -> Optional[FlowAggregates]:
+        """Rolling-window aggregates for ticker (None if never seen)"""
+        tid = self._ticker_ids.get(ticker.upper())
+        if tid is None:
+            return None
+        with self._lock:
+            state = self._tickers[tid]
+            self._expire(state, self.clock())
+            snapshot = FlowAggregates()
+            snapshot.add(state.totals)
+        return snapshot
+
+    def get_events(
+        self,
+        ticker: str,
+        kind: Optional[str] = None,
+        since_sec: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Raw events for ticker, newest first
+
+        Args:
+            ticker: Ticker symbol
+            kind: "flow", "darkpool" or None for both
+            since_sec: Only events newer than now - since_sec
+            limit: Max rows returned
+        """
+        sym = ticker.upper()
+        tid = self._ticker_ids.get(sym)
+        if tid is None:
+            return []
+        kind_id = _KIND_NAMES.get(kind) if kind else None
+        cutoff = self.clock() - since_sec if since_sec else None
+
+        out: List[Dict[str, Any]] = []
+        with self._lock:
+            for pid in sorted(self._partitions, reverse=True):
+                partition = self._partitions[pid]
+                rows = partition.index.get(tid)
+                if not rows:
+                    continue
+                picked = []
+                for row in rows:
+                    if kind_id is not None and partition.kind[row] != kind_id:
+                        continue
+                    if cutoff is not None and partition.ts[row] < cutoff:
+                        continue
+                    picked.append(row)
+                picked.sort(key=lambda r: partition.ts[r], reverse=True)
+                for row in picked:
+                    out.append(partition.row_dict(row, sym))
+                    if limit and len(out) >= limit:
+                        return out
+        return out
+
+    def top_tickers(self, by: str = "flow_count", n: int = 20) -> List[Dict[str, Any]]:
+        """Tickers ranked by an aggregate field"""
+        ranked = []
+        for ticker in self._ticker_names:
+            aggs = self.get_aggregates(ticker)
+            if aggs is not None:
+                ranked.append({"ticker": ticker, **aggs.to_dict()})
+        ranked.sort(key=lambda r: r.get(by, 0), reverse=True)
+        return ranked[:n]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "partitions": len(self._partitions),
+            "rows": sum(len(p) for p in self._partitions.values()),
+            "tickers": len(self._ticker_names),
+            "live": self.is_live(),
+            "last_ingest_seconds_ago": (
+                round(self.clock() - self.last_ingest, 1) if self.last_ingest else None
+            ),
+            "window_sec": self.window_sec,
+            "partition_sec": self.partition_sec,
+        }
+
+
+_flow_store: Optional[FlowEventStore] = None
+
+
+def get_flow_store() -> FlowEventStore:
+    """Get process-wide flow event store"""
+    global _flow_store
+    if _flow_store is None:
+        _flow_store = FlowEventStore()
+    return _flow_store
+
+
+async def attach_flow_store(uw_client, channels: Optional[List[str]] = None):
+    """
+    Feed a connected UWWebSocketClient into the flow store
+
+    Channels are joined as persistent subscriptions so frontend clients
+    disconnecting does not stop ingestion.
+    """
+    store = get_flow_store()
+    uw_client.add_listener(store.on_message)
+    for channel in channels or FLOW_STORE_CHANNELS:
+        try:
+            await uw_client.subscribe_persistent(channel)
+        except Exception as e:
+            logger.warning(f"Flow store could not join {channel}: {e}")
+    return store
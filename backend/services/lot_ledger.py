@@ -0,0 +1,545 @@
+"""
+Incremental FIFO Lot Ledger for FlowMind mindfolios
+
+Keeps open lots and realized P&L per (mindfolio, symbol) up to date as trades
+arrive, instead of replaying the whole transaction history on every read:
+- Position / realized P&L reads load one summary key: O(symbols)
+- In-order trades are applied to the symbol's lot queue and appended to the
+  current journal segment
+- Every LEDGER_CHECKPOINT_EVERY trades the symbol state is checkpointed and a
+  new segment starts; a back-dated trade restores the last checkpoint before
+  it and replays only the segments after that point
+
+Journal rows also record each sell's realized P&L and matched quantity, and
+the per-symbol summary keeps closed-trade counts, so the analytics engine
+(services.mindfolio_analytics) builds positions, trade stats and the equity
+curve from the ledger instead of running its own FIFO pass.
+
+The summary records how many entries of the mindfolio's transaction-id list
+it covers and a fingerprint of them. A reader that finds the list has moved
+on (e.g. a write from a worker that crashed mid-update) applies the missing
+ids through the normal append path; a list that no longer extends the
+covered prefix triggers a full rebuild. Writes hold ledger_lock, which is a
+kv lock (SET NX PX) shared by every worker on the same Redis.
+
+Storage (kv, JSON):
+    pf:{pid}:ledger                      {version, tx_count, tx_fingerprint,
+                                          symbols: {symbol: summary}}
+    pf:{pid}:ledger:lock                 lock token (expires)
+    pf:{pid}:ledger:{sym}:lots           [[qty, cost_per_share], ...]
+    pf:{pid}:ledger:{sym}:index          [checkpoint datetimes]
+    pf:{pid}:ledger:{sym}:ckpt:{k}       state before segment k (k >= 1)
+    pf:{pid}:ledger:{sym}:seg:{k}        [[datetime, id, side, qty, price, fee,
+                                           realized, matched]]
+"""
+
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+import os
+import secrets
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+LEDGER_CHECKPOINT_EVERY = int(os.getenv("LEDGER_CHECKPOINT_EVERY", "1000"))
+# Cross-worker ledger lock; waiting longer than the TTL outlives a dead holder
+LEDGER_LOCK_TTL = float(os.getenv("LEDGER_LOCK_TTL", "60"))
+LEDGER_LOCK_WAIT = float(os.getenv("LEDGER_LOCK_WAIT", "65"))
+# Bumped when the stored layout changes; older ledgers are rebuilt on use
+LEDGER_VERSION = 2
+QTY_EPSILON = 1e-9
+
+# Journal row layout (realized and matched are filled in when applied)
+DT, TX_ID, SIDE, QTY, PRICE, FEE, REALIZED, MATCHED = range(8)
+
+Loader = Callable[[Sequence[str]], Awaitable[List[Any]]]
+
+
+def key_ledger(pid: str) -> str:
+    return f"pf:{pid}:ledger"
+
+
+def key_ledger_symbol(pid: str, symbol: str, part: str) -> str:
+    return f"pf:{pid}:ledger:{symbol}:{part}"
+
+
+def ids_fingerprint(tx_ids: Sequence[str]) -> str:
+    """Identify a prefix of a transaction-id list."""
+    raw = json.dumps(list(tx_ids), separators=(",", ":"))
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def tx_row(tx: Any) -> list:
+    return [
+        tx.datetime,
+        tx.id,
+        tx.side,
+        float(tx.qty),
+        float(tx.price),
+        float(tx.fee),
+        0.0,
+        0.0,
+    ]
+
+
+@dataclass
+class SymbolBook:
+    """FIFO lot queue and running totals for one symbol."""
+
+    lots: deque = field(default_factory=deque)
+    open_qty: float = 0.0
+    open_cost: float = 0.0
+    realized: float = 0.0
+    trades: int = 0
+    closed: int = 0  # sells that matched open shares
+    wins: int = 0
+    win_sum: float = 0.0
+    loss_sum: float = 0.0
+    count: int = 0  # journal rows applied
+    last_dt: str = ""
+
+    def apply(self, row: List[Any]):
+        """Apply one journal row and record its realized P&L and matched qty."""
+        side, qty, price, fee = row[SIDE], row[QTY], row[PRICE], row[FEE]
+        fee_per_share = fee / qty if qty > 0 else 0
+        pnl = matched = 0.0
+        if side == "BUY":
+            cost_per_share = price + fee_per_share
+            self.lots.append([qty, cost_per_share])
+            self.open_qty += qty
+            self.open_cost += qty * cost_per_share
+        elif side == "SELL":
+            proceeds_per_share = price - fee_per_share
+            left = qty
+            while left > 0 and self.lots:
+                lot = self.lots[0]
+                take = lot[0] if lot[0] <= left else left
+                pnl += (proceeds_per_share - lot[1]) * take
+                self.open_qty -= take
+                self.open_cost -= take * lot[1]
+                left -= take
+                if lot[0] <= take:
+                    self.lots.popleft()
+                else:
+                    lot[0] -= take
+            matched = qty - left
+            self.realized += pnl
+            self.trades += 1
+            if matched > QTY_EPSILON:
+                self.closed += 1
+                if pnl > 0:
+                    self.wins += 1
+                    self.win_sum += pnl
+                else:
+                    self.loss_sum += pnl
+            if not self.lots:
+                # drop float residue once the queue is empty
+                self.open_qty = self.open_cost = 0.0
+        row[REALIZED:] = [pnl, matched]
+        self.count += 1
+        self.last_dt = max(self.last_dt, row[DT])
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "open_qty": self.open_qty,
+            "open_cost": self.open_cost,
+            "realized": self.realized,
+            "trades": self.trades,
+            "closed": self.closed,
+            "wins": self.wins,
+            "win_sum": self.win_sum,
+            "loss_sum": self.loss_sum,
+            "count": self.count,
+            "last_dt": self.last_dt,
+        }
+
+    def checkpoint(self) -> Dict[str, Any]:
+        return {**self.state(), "lots": [list(lot) for lot in self.lots]}
+
+    @classmethod
+    def restore(
+        cls, state: Optional[Dict[str, Any]], lots: Optional[list] = None
+    ) -> "SymbolBook":
+        if not state:
+            return cls()
+        return cls(
+            lots=deque([list(lot) for lot in (lots or state.get("lots") or [])]),
+            open_qty=state["open_qty"],
+            open_cost=state["open_cost"],
+            realized=state["realized"],
+            trades=state["trades"],
+            closed=state["closed"],
+            wins=state["wins"],
+            win_sum=state["win_sum"],
+            loss_sum=state["loss_sum"],
+            count=state["count"],
+            last_dt=state["last_dt"],
+        )
+
+
+class LotLedger:
+    """Persisted FIFO ledger for one mindfolio."""
+
+    def __init__(self, kv, pid: str, checkpoint_every: int = LEDGER_CHECKPOINT_EVERY):
+        self.kv = kv
+        self.pid = pid
+        self.every = max(1, checkpoint_every)
+        self.stats = {"appended": 0, "replayed": 0, "replays": 0}
+
+    # ——— kv helpers ———
+    async def _get_json(self, key: str, default: Any = None) -> Any:
+        raw = await self.kv.get(key)
+        return json.loads(raw) if raw else default
+
+    async def _set_json(self, key: str, value: Any):
+        await self.kv.set(key, json.dumps(value, separators=(",", ":")))
+
+    def _key(self, symbol: str, part: str) -> str:
+        return key_ledger_symbol(self.pid, symbol, part)
+
+    # ——— Reads: O(symbols) ———
+    async def load(self) -> Optional[Dict[str, Any]]:
+        """The summary document, or None if missing or in an older layout."""
+        doc = await self._get_json(key_ledger(self.pid))
+        if doc is None or doc.get("version") != LEDGER_VERSION:
+            return None
+        return doc
+
+    async def summary(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        doc = await self.load()
+        return doc["symbols"] if doc is not None else None
+
+    async def exists(self) -> bool:
+        return await self.load() is not None
+
+    async def journal(
+        self, summary: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, List[list]]:
+        """Every symbol's journal rows, in time order: O(transactions)."""
+        rows: Dict[str, List[list]] = {}
+        for symbol, meta in summary.items():
+            rows[symbol] = []
+            for k in range(meta["segments"]):
+                rows[symbol].extend(
+                    await self._get_json(self._key(symbol, f"seg:{k}"), [])
+                )
+        return rows
+
+    @staticmethod
+    def covers(doc: Optional[Dict[str, Any]], tx_ids: Sequence[str]) -> bool:
+        """True if the summary reflects exactly this transaction-id list."""
+        return (
+            doc is not None
+            and doc.get("tx_count") == len(tx_ids)
+            and doc.get("tx_fingerprint") == ids_fingerprint(tx_ids)
+        )
+
+    # ——— Writes ———
+    async def reconcile(
+        self, tx_ids: Sequence[str], load: Loader
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Bring the ledger in line with the mindfolio's transaction-id list.
+
+        Ids appended after the covered prefix are loaded and applied (a
+        back-dated one replays from its checkpoint); any other mismatch
+        rebuilds from the full history. Call under ledger_lock.
+
+        Args:
+            tx_ids: The mindfolio's current transaction-id list
+            load: Loads transactions for a list of ids
+
+        Returns:
+            The per-symbol summary
+        """
+        doc = await self.load()
+        if self.covers(doc, tx_ids):
+            return doc["symbols"]
+        n = doc.get("tx_count") if doc else None
+        if n is not None and n <= len(tx_ids):
+            if doc.get("tx_fingerprint") == ids_fingerprint(tx_ids[:n]):
+                await self.append(await load(tx_ids[n:]), tx_ids=tx_ids)
+                return await self.summary()
+        logger.info(f"Ledger {self.pid}: out of sync with transactions, rebuilding")
+        await self.rebuild(await load(tx_ids), tx_ids=tx_ids)
+        return await self.summary()
+
+    async def append(
+        self, transactions: Iterable[Any], tx_ids: Optional[Sequence[str]] = None
+    ):
+        """
+        Apply new transactions (any order, any datetime) to the ledger.
+
+        Args:
+            transactions: Transactions not yet in the ledger
+            tx_ids: The full transaction-id list once they are included; the
+                summary records it for reconcile (unchecked when omitted)
+        """
+        by_symbol: Dict[str, List[list]] = {}
+        for tx in transactions:
+            by_symbol.setdefault(tx.symbol, []).append(tx_row(tx))
+
+        summary = await self.summary() or {}
+        for symbol, rows in by_symbol.items():
+            rows.sort(key=lambda r: r[DT])  # stable: ties keep arrival order
+            meta = summary.get(symbol)
+            if meta is None or rows[0][DT] >= meta["last_dt"]:
+                summary[symbol] = await self._extend(symbol, meta, rows)
+            else:
+                summary[symbol] = await self._replay(symbol, meta, rows)
+            self.stats["appended"] += len(rows)
+        await self._set_json(
+            key_ledger(self.pid),
+            {
+                "version": LEDGER_VERSION,
+                "tx_count": len(tx_ids) if tx_ids is not None else None,
+                "tx_fingerprint": (
+                    ids_fingerprint(tx_ids) if tx_ids is not None else None
+                ),
+                "symbols": summary,
+            },
+        )
+
+    async def rebuild(
+        self, transactions: Sequence[Any], tx_ids: Optional[Sequence[str]] = None
+    ):
+        """Drop the ledger and rebuild it from the full (sorted) history."""
+        doc = await self._get_json(key_ledger(self.pid)) or {}
+        symbols = doc["symbols"] if "symbols" in doc else doc  # oldest layout
+        for symbol, meta in symbols.items():
+            await self._delete_symbol(symbol, meta)
+        await self.kv.delete(key_ledger(self.pid))
+        await self.append(transactions, tx_ids=tx_ids)
+
+    async def _extend(
+        self, symbol: str, meta: Optional[Dict[str, Any]], rows: List[list]
+    ) -> Dict[str, Any]:
+        """Fast path: every row sorts after the symbol's last trade."""
+        segments = meta["segments"] if meta else 1
+        book = SymbolBook.restore(meta, await self._get_json(self._key(symbol, "lots")))
+        seg_key = self._key(symbol, f"seg:{segments - 1}")
+        segment = await self._get_json(seg_key, []) if meta else []
+        index = None
+
+        for row in rows:
+            book.apply(row)
+            segment.append(row)
+            if len(segment) >= self.every:
+                index = index if index is not None else await self._index(symbol)
+                segments = await self._seal(symbol, book, segment, segments, index)
+                segment = []
+        await self._set_json(self._key(symbol, f"seg:{segments - 1}"), segment)
+        if index is not None:
+            await self._set_json(self._key(symbol, "index"), index)
+        await self._set_json(self._key(symbol, "lots"), [list(x) for x in book.lots])
+        return {**book.state(), "segments": segments}
+
+    async def _replay(
+        self, symbol: str, meta: Dict[str, Any], rows: List[list]
+    ) -> Dict[str, Any]:
+        """Back-dated rows: restore the checkpoint before them and replay."""
+        index = await self._index(symbol)
+        # checkpoint k holds every row up to index[k-1]; rows dated after it
+        # (strictly) are unaffected before that point
+        k = bisect.bisect_left(index, rows[0][DT])
+        if k:
+            ckpt = await self._get_json(self._key(symbol, f"ckpt:{k}"))
+            book = SymbolBook.restore(ckpt)
+        else:
+            book = SymbolBook()
+
+        tail: List[list] = []
+        for s in range(k, meta["segments"]):
+            tail.extend(await self._get_json(self._key(symbol, f"seg:{s}"), []))
+        merged = sorted(tail + rows, key=lambda r: r[DT])  # existing rows first
+        self.stats["replays"] += 1
+        self.stats["replayed"] += len(merged)
+
+        old_segments = meta["segments"]
+        index = index[:k]
+        segments = k + 1
+        segment: List[list] = []
+        for row in merged:
+            book.apply(row)
+            segment.append(row)
+            if len(segment) >= self.every:
+                segments = await self._seal(symbol, book, segment, segments, index)
+                segment = []
+        await self._set_json(self._key(symbol, f"seg:{segments - 1}"), segment)
+        for s in range(segments, old_segments):
+            await self.kv.delete(self._key(symbol, f"seg:{s}"))
+            await self.kv.delete(self._key(symbol, f"ckpt:{s}"))
+        await self._set_json(self._key(symbol, "index"), index)
+        await self._set_json(self._key(symbol, "lots"), [list(x) for x in book.lots])
+        logger.debug(
+            f"Ledger {self.pid}/{symbol}: replayed {len(merged)} rows from ckpt {k}"
+        )
+        return {**book.state(), "segments": segments}
+
+    async def _seal(
+        self,
+        symbol: str,
+        book: SymbolBook,
+        segment: List[list],
+        segments: int,
+        index: List[str],
+    ) -> int:
+        """Close the current segment and checkpoint the state after it."""
+        await self._set_json(self._key(symbol, f"seg:{segments - 1}"), segment)
+        await self._set_json(self._key(symbol, f"ckpt:{segments}"), book.checkpoint())
+        del index[segments - 1 :]
+        index.append(book.last_dt)
+        return segments + 1
+
+    async def _index(self, symbol: str) -> List[str]:
+        return await self._get_json(self._key(symbol, "index"), [])
+
+    async def _delete_symbol(self, symbol: str, meta: Dict[str, Any]):
+        for s in range(meta.get("segments", 1)):
+            await self.kv.delete(self._key(symbol, f"seg:{s}"))
+            await self.kv.delete(self._key(symbol, f"ckpt:{s + 1}"))
+        for part in ("lots", "index"):
+            await self.kv.delete(self._key(symbol, part))
+
+
+# Delete the lock only if it still holds our token
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_locks: Dict[str, asyncio.Lock] = {}
+
+
+class LedgerLock:
+    """
+    Serializes ledger (and transaction-list) updates for a mindfolio.
+
+    An asyncio.Lock orders callers within this process; a kv lock
+    (SET NX PX with a random token) orders them across workers sharing
+    Redis. The kv lock expires after `ttl` seconds so a crashed holder
+    cannot wedge the mindfolio; waiting longer than `wait` raises
+    TimeoutError.
+    """
+
+    def __init__(
+        self,
+        kv,
+        pid: str,
+        ttl: float = LEDGER_LOCK_TTL,
+        wait: float = LEDGER_LOCK_WAIT,
+    ):
+        self.kv = kv
+        self.key = f"{key_ledger(pid)}:lock"
+        self.ttl_ms = max(1, int(ttl * 1000))
+        self.wait = wait
+        self.token = secrets.token_hex(16)
+        local = _locks.get(pid)
+        if local is None:
+            local = _locks[pid] = asyncio.Lock()
+        self._local = local
+
+    async def __aenter__(self) -> "LedgerLock":
+        await self._local.acquire()
+        try:
+            deadline = time.monotonic() + self.wait
+            delay = 0.01
+            while not await self.kv.set(self.key, self.token, nx=True, px=self.ttl_ms):
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Ledger lock busy: {self.key}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.2)
+        except BaseException:
+            self._local.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        try:
+            if hasattr(self.kv, "eval"):
+                await self.kv.eval(_RELEASE_LUA, 1, self.key, self.token)
+            elif await self.kv.get(self.key) == self.token:
+                await self.kv.delete(self.key)
+        finally:
+            self._local.release()
+
+
+def ledger_lock(kv, pid: str) -> LedgerLock:
+    """Lock for ledger updates of one mindfolio (all workers on the same kv)."""
+    return LedgerLock(kv, pid)
+
+
+async def current_ledger(
+    kv, pid: str, tx_list_key: str, load: Loader
+) -> Tuple[LotLedger, Dict[str, Any]]:
+    """
+    A mindfolio's ledger and its summary document, caught up with the
+    transaction-id list stored at `tx_list_key` (built on first use).
+
+    Writers that only extend the id list are picked up here through the
+    append path, so they need not touch the ledger themselves.
+    """
+    ledger = LotLedger(kv, pid)
+    doc = await ledger.load()
+    if ledger.covers(doc, json.loads(await kv.get(tx_list_key) or "[]")):
+        return ledger, doc
+
+    async with ledger_lock(kv, pid):
+        tx_ids = json.loads(await kv.get(tx_list_key) or "[]")
+        await ledger.reconcile(tx_ids, load)
+        return ledger, await ledger.load()
+
+
+async def record_transactions(
+    kv, pid: str, tx_list_key: str, transactions: Sequence[Any], load: Loader
+) -> List[Any]:
+    """
+    Append stored transactions to a mindfolio's id list and its ledger.
+
+    Args:
+        kv: Key-value client
+        pid: Mindfolio ID
+        tx_list_key: Key of the mindfolio's transaction-id list
+        transactions: Transactions already saved under their own keys
+        load: Loads transactions for a list of ids (for catching up)
+
+    Returns:
+        The transactions whose ids were not in the list yet
+    """
+    async with ledger_lock(kv, pid):
+        tx_list = json.loads(await kv.get(tx_list_key) or "[]")
+        known = set(tx_list)
+        added = [
+            tx for tx in transactions if tx.id not in known and not known.add(tx.id)
+        ]
+        tx_list.extend(tx.id for tx in added)
+        await kv.set(tx_list_key, json.dumps(tx_list))
+
+        # Normally just the new ids; reconcile also catches up a stale ledger
+        fresh = {tx.id: tx for tx in added}
+
+        async def load_fresh(ids):
+            if all(i in fresh for i in ids):
+                return [fresh[i] for i in ids]
+            return await load(ids)
+
+        await LotLedger(kv, pid).reconcile(tx_list, load_fresh)
+    return added
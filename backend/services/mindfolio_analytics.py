@@ -0,0 +1,333 @@
+"""
+Mindfolio Analytics Engine
+
+Builds everything the positions, P&L, equity and export endpoints need from
+the mindfolio's lot ledger (services.lot_ledger), the one FIFO engine:
+- Positions, realized P&L, win rate, expectancy and per-symbol buckets come
+  straight from the per-symbol ledger summary: O(symbols)
+- The book equity curve (cash + open cost basis) with running realized P&L,
+  max drawdown and daily Sharpe are vectorized over the ledger journal, whose
+  rows already carry each sell's realized P&L and matched quantity
+
+Results are cached per mindfolio under the fingerprint of its transaction-id
+list, so a new transaction (from any worker) invalidates them. Summary-only
+reads skip the journal; a later curve read on the same list fills it in.
+"""
+
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.lot_ledger import (
+    DT,
+    FEE,
+    MATCHED,
+    PRICE,
+    QTY,
+    QTY_EPSILON,
+    REALIZED,
+    SIDE,
+    TX_ID,
+    Loader,
+    SymbolBook,
+    current_ledger,
+    ids_fingerprint,
+    tx_row,
+)
+
+STARTING_EQUITY = float(os.getenv("MINDFOLIO_STARTING_EQUITY", "10000"))
+ANALYTICS_CACHE_SIZE = int(os.getenv("MINDFOLIO_ANALYTICS_CACHE_SIZE", "256"))
+TRADING_DAYS = 252
+
+
+def round2(n: float) -> float:
+    return round(n * 100) / 100
+
+
+@dataclass
+class MindfolioAnalytics:
+    positions: List[Dict[str, Any]] = field(default_factory=list)
+    realized: List[Dict[str, Any]] = field(default_factory=list)
+    equity_curve: Optional[List[Dict[str, Any]]] = None  # None: not built
+    buckets: List[Dict[str, Any]] = field(default_factory=list)
+    summary: Dict[str, Any] = field(default_factory=dict)
+
+
+def _max_drawdown(equity: np.ndarray) -> Tuple[float, float]:
+    peak = np.maximum.accumulate(equity)
+    drawdown = peak - equity
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(peak > 0, drawdown / peak, 0.0)
+    return float(drawdown.max()), float(pct.max())
+
+
+def _sharpe(dates: Sequence[str], equity: np.ndarray, start: float) -> Optional[float]:
+    """Annualized Sharpe of daily book-equity returns (None if too few days)."""
+    days = np.array([d[:10] for d in dates])
+    last_of_day = np.flatnonzero(np.append(days[1:] != days[:-1], True))
+    daily = np.concatenate(([start], equity[last_of_day]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(daily) / daily[:-1]
+    returns = returns[np.isfinite(returns)]
+    if len(returns) < 2:
+        return None
+    std = returns.std(ddof=1)
+    if std <= 0:
+        return None
+    return float(returns.mean() / std * math.sqrt(TRADING_DAYS))
+
+
+def _equity_curve(
+    journal: Dict[str, List[list]], starting_equity: float
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Book equity curve and its drawdown / Sharpe from the ledger journal."""
+    rows = sorted(
+        ((row, symbol) for symbol, rs in journal.items() for row in rs),
+        key=lambda x: x[0][DT],
+    )
+    if not rows:
+        return [], {"sharpe_ratio": None, "max_drawdown": 0.0, "max_drawdown_usd": 0.0}
+
+    side = np.array([r[SIDE] for r, _ in rows])
+    qty = np.array([r[QTY] for r, _ in rows], dtype=float)
+    price = np.array([r[PRICE] for r, _ in rows], dtype=float)
+    fee = np.array([r[FEE] for r, _ in rows], dtype=float)
+    realized = np.array([r[REALIZED] for r, _ in rows], dtype=float)
+    matched = np.array([r[MATCHED] for r, _ in rows], dtype=float)
+
+    is_buy = side == "BUY"
+    is_sell = side == "SELL"
+    fee_per_share = np.divide(fee, qty, out=np.zeros(len(rows)), where=qty > 0)
+    buy_cost = np.where(is_buy, np.maximum(qty, 0.0) * (price + fee_per_share), 0.0)
+    # cost basis the sell took off the lot queue
+    sold_cost = np.where(is_sell, matched * (price - fee_per_share) - realized, 0.0)
+    cash_flow = np.where(
+        is_buy, -(qty * price + fee), np.where(is_sell, qty * price - fee, 0.0)
+    )
+    cash = starting_equity + np.cumsum(cash_flow)
+    equity = cash + np.cumsum(buy_cost - sold_cost)
+    realized_cum = np.cumsum(realized)
+
+    curve = [
+        {
+            "date": r[DT],
+            "equity": eq,
+            "cash": ca,
+            "realized_cum": rc,
+            "transaction_id": r[TX_ID],
+            "symbol": symbol,
+            "side": r[SIDE],
+        }
+        for (r, symbol), eq, ca, rc in zip(
+            rows,
+            np.round(equity, 2).tolist(),
+            np.round(cash, 2).tolist(),
+            np.round(realized_cum, 2).tolist(),
+        )
+    ]
+    max_dd_usd, max_dd_pct = _max_drawdown(np.concatenate(([starting_equity], equity)))
+    sharpe = _sharpe([r[DT] for r, _ in rows], equity, starting_equity)
+    return curve, {
+        "sharpe_ratio": round(sharpe, 4) if sharpe is not None else None,
+        "max_drawdown": round(max_dd_pct, 4),
+        "max_drawdown_usd": round(max_dd_usd, 2),
+    }
+
+
+def build_analytics(
+    books: Dict[str, Dict[str, Any]],
+    journal: Optional[Dict[str, List[list]]] = None,
+    starting_equity: float = STARTING_EQUITY,
+) -> MindfolioAnalytics:
+    """Positions, trade stats and (with a journal) the equity curve.
+
+    Args:
+        books: Per-symbol ledger summary (LotLedger.summary)
+        journal: Per-symbol journal rows (LotLedger.journal); without it the
+            curve, drawdown and Sharpe are left unset
+        starting_equity: Book equity before the first transaction
+
+    Returns:
+        MindfolioAnalytics with positions, realized P&L by symbol, per-symbol
+        buckets, summary metrics and, given a journal, the equity curve
+    """
+    positions = []
+    realized_rows = []
+    buckets = []
+    for sym in sorted(books):
+        book = books[sym]
+        open_qty, open_cost = book["open_qty"], book["open_cost"]
+        if open_qty > QTY_EPSILON:
+            positions.append(
+                {
+                    "symbol": sym,
+                    "qty": round2(open_qty),
+                    "cost_basis": round2(open_cost),
+                    "avg_cost": round2(open_cost / open_qty),
+                }
+            )
+        if book["trades"] > 0:
+            realized_rows.append(
+                {
+                    "symbol": sym,
+                    "realized": round2(book["realized"]),
+                    "trades": book["trades"],
+                }
+            )
+        n_closed, n_wins = book["closed"], book["wins"]
+        n_losses = n_closed - n_wins
+        buckets.append(
+            {
+                "bucket": sym,
+                "trades": book["trades"],
+                "closed": n_closed,
+                "wins": n_wins,
+                "losses": n_losses,
+                "win_rate": round(n_wins / n_closed, 4) if n_closed else None,
+                "realized": round2(book["realized"]),
+                "avg_win": round2(book["win_sum"] / n_wins) if n_wins else None,
+                "avg_loss": round2(book["loss_sum"] / n_losses) if n_losses else None,
+                "open_qty": round2(max(open_qty, 0.0)),
+                "open_cost": round2(open_cost if open_qty > QTY_EPSILON else 0.0),
+            }
+        )
+
+    total_realized = sum(b["realized"] for b in books.values())
+    n_closed = sum(b["closed"] for b in books.values())
+    n_wins = sum(b["wins"] for b in books.values())
+    gross_win = sum(b["win_sum"] for b in books.values())
+    gross_loss = -sum(b["loss_sum"] for b in books.values())
+    summary = {
+        "current_equity": None,
+        "total_realized_pnl": round(total_realized, 2),
+        "total_trades": sum(b["trades"] for b in books.values()),
+        "closed_trades": n_closed,
+        "win_rate": round(n_wins / n_closed, 4) if n_closed else None,
+        "expectancy": round(total_realized / n_closed, 2) if n_closed else None,
+        "profit_factor": (
+            round(gross_win / gross_loss, 4) if gross_loss > 0 and n_closed else None
+        ),
+        "sharpe_ratio": None,
+        "max_drawdown": None,
+        "max_drawdown_usd": None,
+        "positions_count": len(positions),
+    }
+
+    curve = None
+    if journal is not None:
+        curve, risk = _equity_curve(journal, starting_equity)
+        summary.update(risk)
+        summary["current_equity"] = curve[-1]["equity"] if curve else starting_equity
+    return MindfolioAnalytics(
+        positions=positions,
+        realized=realized_rows,
+        equity_curve=curve,
+        buckets=buckets,
+        summary=summary,
+    )
+
+
+def compute_analytics(
+    transactions: Sequence[Any], starting_equity: float = STARTING_EQUITY
+) -> MindfolioAnalytics:
+    """Apply transactions to in-memory ledger books and build the analytics.
+
+    Args:
+        transactions: Transaction-like objects (symbol, side, qty, price, fee,
+            datetime, id), already sorted by datetime
+        starting_equity: Book equity before the first transaction
+
+    Returns:
+        MindfolioAnalytics including the equity curve
+    """
+    books: Dict[str, SymbolBook] = {}
+    journal: Dict[str, List[list]] = {}
+    for tx in transactions:
+        row = tx_row(tx)
+        books.setdefault(tx.symbol, SymbolBook()).apply(row)
+        journal.setdefault(tx.symbol, []).append(row)
+    return build_analytics(
+        {s: b.state() for s, b in books.items()}, journal, starting_equity
+    )
+
+
+# =============================================================================
+# Per-mindfolio cache
+# =============================================================================
+
+
+class AnalyticsCache:
+    """LRU of analytics results keyed by mindfolio, validated by fingerprint."""
+
+    def __init__(self, maxsize: int = ANALYTICS_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[str, MindfolioAnalytics]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, pid: str, fp: str) -> Optional[MindfolioAnalytics]:
+        with self._lock:
+            entry = self._data.get(pid)
+            if entry is None or entry[0] != fp:
+                self.misses += 1
+                return None
+            self._data.move_to_end(pid)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, pid: str, fp: str, result: MindfolioAnalytics):
+        with self._lock:
+            self._data[pid] = (fp, result)
+            self._data.move_to_end(pid)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, pid: Optional[str] = None):
+        with self._lock:
+            if pid is None:
+                self._data.clear()
+            else:
+                self._data.pop(pid, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+analytics_cache = AnalyticsCache()
+
+
+async def mindfolio_analytics(
+    kv, pid: str, tx_list_key: str, load: Loader, curve: bool = True
+) -> MindfolioAnalytics:
+    """
+    Cached analytics for a mindfolio, built from its lot ledger.
+
+    Args:
+        kv: Key-value client
+        pid: Mindfolio ID
+        tx_list_key: Key of the mindfolio's transaction-id list
+        load: Loads transactions for a list of ids (for catching the ledger up)
+        curve: Also build the equity curve, drawdown and Sharpe (reads the
+            journal); positions and trade stats only need the summary
+
+    Returns:
+        MindfolioAnalytics for the current transaction list
+    """
+    tx_ids = json.loads(await kv.get(tx_list_key) or "[]")
+    cached = analytics_cache.get(pid, ids_fingerprint(tx_ids))
+    if cached is not None and (cached.equity_curve is not None or not curve):
+        return cached
+
+    ledger, doc = await current_ledger(kv, pid, tx_list_key, load)
+    books = doc["symbols"]
+    journal = await ledger.journal(books) if curve else None
+    result = build_analytics(books, journal)
+    analytics_cache.put(pid, doc["tx_fingerprint"], result)
+    return result
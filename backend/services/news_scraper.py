@@ -2,208 +2,567 @@
 News Scraper Service - Yahoo Finance & Benzinga
 Folosește Playwright pentru extragere știri financiare (LEGAL)
 
+Un singur Chromium headless rămâne pornit (BrowserPool) pe un event loop
+dedicat; contextele sunt refolosite, imaginile/fonturile/reclamele sunt
+blocate, iar rezultatele sunt cache-uite per simbol cu TTL.
+
 Created: November 3, 2025
 """
+
+import asyncio
 import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from services.text_engine import dedupe_texts
 
 logger = logging.getLogger(__name__)
 
+NEWS_SCRAPER_MAX_CONTEXTS = int(os.getenv("NEWS_SCRAPER_MAX_CONTEXTS", "4"))
+NEWS_SCRAPER_CACHE_TTL = float(os.getenv("NEWS_SCRAPER_CACHE_TTL", "600"))
+NEWS_SCRAPER_CONTEXT_MAX_USES = int(os.getenv("NEWS_SCRAPER_CONTEXT_MAX_USES", "50"))
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Resurse care nu contează pentru extragerea textului
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+BLOCKED_HOSTS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "taboola.com",
+    "outbrain.com",
+    "scorecardresearch.com",
+    "criteo.com",
+    "moatads.com",
+    "adsrvr.org",
+)
+
+
+def _is_blocked_host(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(host == h or host.endswith("." + h) for h in BLOCKED_HOSTS)
+
+
+async def _route_filter(route):
+    """Interceptează request-urile: abort pentru imagini, fonturi, reclame"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_blocked_host(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _launch_chromium(headless: bool):
+    """Pornește Playwright + Chromium (import leneș, dependență grea)"""
+    from playwright.async_api import async_playwright
+
+    playwright = await async_playwright().start()
+    browser = await playwright.chromium.launch(headless=headless)
+    return playwright, browser
+
+
+# =============================================================================
+# BROWSER POOL
+# =============================================================================
+
+
+class BrowserPool:
+    """
+    Browser Chromium persistent cu un număr limitat de contexte refolosibile.
+
+    Usage:
+        async with pool.page() as page:
+            await page.goto(url)
+    """
+
+    def __init__(
+        self,
+        max_contexts: int = NEWS_SCRAPER_MAX_CONTEXTS,
+        headless: bool = True,
+        user_agent: str = USER_AGENT,
+        block_resources: bool = True,
+        context_max_uses: int = NEWS_SCRAPER_CONTEXT_MAX_USES,
+        launcher: Optional[Callable[[bool], Awaitable[Tuple[Any, Any]]]] = None,
+    ):
+        self.max_contexts = max_contexts
+        self.headless = headless
+        self.user_agent = user_agent
+        self.block_resources = block_resources
+        self.context_max_uses = context_max_uses
+        self._launcher = launcher or _launch_chromium
+
+        self._playwright = None
+        self._browser = None
+        self._idle: List[Tuple[Any, int]] = []  # (context, uses)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+
+        self.stats = {"launches": 0, "contexts_created": 0, "pages": 0}
+
+    async def start(self):
+        """Pornește browserul o singură dată"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.max_contexts)
+        async with self._start_lock:
+            if self._browser is None:
+                self._playwright, self._browser = await self._launcher(self.headless)
+                self.stats["launches"] += 1
+                logger.info(
+                    f"News scraper browser started (max {self.max_contexts} contexts)"
+                )
+
+    async def _new_context(self):
+        context = await self._browser.new_context(user_agent=self.user_agent)
+        if self.block_resources:
+            await context.route("**/*", _route_filter)
+        self.stats["contexts_created"] += 1
+        return context
+
+    @asynccontextmanager
+    async def page(self):
+        """Pagină nouă într-un context din pool; contextul revine în pool"""
+        await self.start()
+        async with self._semaphore:
+            if self._idle:
+                context, uses = self._idle.pop()
+            else:
+                context, uses = await self._new_context(), 0
+            page = await context.new_page()
+            self.stats["pages"] += 1
+            healthy = True
+            try:
+                yield page
+            except Exception:
+                healthy = False
+                raise
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    healthy = False
+                uses += 1
+                if healthy and uses < self.context_max_uses:
+                    self._idle.append((context, uses))
+                else:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+
+    async def close(self):
+        """Închide contextele, browserul și Playwright"""
+        for context, _ in self._idle:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self._idle.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "running": self._browser is not None,
+            "idle_contexts": len(self._idle),
+            "max_contexts": self.max_contexts,
+        }
+
+
+# =============================================================================
+# NEWS SCRAPER
+# =============================================================================
+
 
 class NewsScraperService:
     """
     Scraper pentru știri financiare din surse publice.
     Respectă robots.txt și rate limits.
+
+    Tot lucrul cu browserul rulează pe un event loop propriu (thread daemon),
+    deci metodele sync și cele async împart același BrowserPool.
     """
-    
-    def __init__(self, headless: bool = True):
+
+    def __init__(
+        self,
+        headless: bool = True,
+        max_contexts: int = NEWS_SCRAPER_MAX_CONTEXTS,
+        cache_ttl: float = NEWS_SCRAPER_CACHE_TTL,
+        pool: Optional[BrowserPool] = None,
+    ):
         self.headless = headless
-        self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    
-    def scrape_yahoo_finance(self, symbol: str, limit: int = 10) -> List[Dict]:
-        """
-        Extrage știri pentru un simbol din Yahoo Finance.
-        
-        Args:
-            symbol: Ticker symbol (ex: "AAPL", "TSLA")
-            limit: Număr maxim de știri
-            
-        Returns:
-            List of news articles with title, url, source, published_at
-        """
+        self.user_agent = USER_AGENT
+        self.cache_ttl = cache_ttl
+        self.pool = pool or BrowserPool(max_contexts=max_contexts, headless=headless)
+
+        self.sources: Dict[str, Callable[[str, int], Awaitable[List[Dict]]]] = {
+            "yahoo_finance": self._scrape_yahoo,
+            "benzinga": self._scrape_benzinga,
+        }
+
+        # Accesate doar din loop-ul browserului
+        self._cache: Dict[Tuple[str, str], Tuple[float, int, List[Dict]]] = {}
+        self._inflight: Dict[Tuple[str, str, int], asyncio.Future] = {}
+        self.stats = {"cache_hits": 0, "cache_misses": 0}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Browser event loop
+    # ------------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="news-scraper-browser", daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _run(self, coro):
+        """Rulează coroutine pe loop-ul browserului și așteaptă (sync)"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    async def _run_async(self, coro):
+        """Rulează coroutine pe loop-ul browserului din alt event loop"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        return await asyncio.wrap_future(future)
+
+    # ------------------------------------------------------------------
+    # Cache + dispatch (rulează pe loop-ul browserului)
+    # ------------------------------------------------------------------
+
+    async def _scrape_source(self, source: str, symbol: str, limit: int) -> List[Dict]:
+        symbol = symbol.upper()
+        cached = self._cache.get((source, symbol))
+        if cached and time.monotonic() - cached[0] < self.cache_ttl:
+            if cached[1] >= limit or len(cached[2]) < cached[1]:
+                self.stats["cache_hits"] += 1
+                return cached[2][:limit]
+
+        key = (source, symbol, limit)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        self.stats["cache_misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        news: List[Dict] = []
+        try:
+            news = await self.sources[source](symbol, limit)
+            if news:
+                self._cache[(source, symbol)] = (time.monotonic(), limit, news)
+        except Exception as e:
+            logger.error(f"Error scraping {source} for {symbol}: {e}")
+        finally:
+            del self._inflight[key]
+            if not future.done():
+                future.set_result(news)
+        return news
+
+    async def _aggregate(self, symbol: str, limit_per_source: int) -> Dict:
+        names = list(self.sources)
+        results = await asyncio.gather(
+            *(self._scrape_source(name, symbol, limit_per_source) for name in names)
+        )
+        by_source = dict(zip(names, results))
+
+        # Combine and sort by published_at
+        all_news = [article for news in results for article in news]
+        all_news.sort(key=lambda x: x.get("published_at") or "2000-01-01", reverse=True)
+
+        # The same story syndicated on several sources: keep the newest copy
+        keep = dedupe_texts([article.get("title") or "" for article in all_news])
+        all_news = [all_news[i] for i in keep]
+
+        return {
+            "symbol": symbol.upper(),
+            "total_articles": len(all_news),
+            "sources": {name: len(news) for name, news in by_source.items()},
+            "news": all_news,
+            "scraped_at": datetime.utcnow().isoformat(),
+        }
+
+    async def _aggregate_many(
+        self, symbols: List[str], limit_per_source: int
+    ) -> Dict[str, Dict]:
+        unique = list(dict.fromkeys(s.upper() for s in symbols))
+        results = await asyncio.gather(
+            *(self._aggregate(s, limit_per_source) for s in unique)
+        )
+        return dict(zip(unique, results))
+
+    # ------------------------------------------------------------------
+    # Source scrapers
+    # ------------------------------------------------------------------
+
+    async def _scrape_yahoo(self, symbol: str, limit: int) -> List[Dict]:
         news = []
-        
+        from playwright.async_api import TimeoutError as PlaywrightTimeout
+
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=self.headless)
-                context = browser.new_context(user_agent=self.user_agent)
-                page = context.new_page()
-                
+            async with self.pool.page() as page:
                 # Navigate to Yahoo Finance news page
                 url = f"https://finance.yahoo.com/quote/{symbol}/news"
                 logger.info(f"Scraping Yahoo Finance news for {symbol}")
-                page.goto(url, wait_until="networkidle", timeout=30000)
-                
-                # Wait a bit for dynamic content
-                page.wait_for_timeout(2000)
-                
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+
                 # Try multiple selectors (Yahoo changes them frequently)
-                articles = (
-                    page.query_selector_all('li[data-test-locator="stream-item"]') or
-                    page.query_selector_all('article') or
-                    page.query_selector_all('div[data-test="news-stream"] li') or
-                    []
+                selectors = (
+                    'li[data-test-locator="stream-item"]',
+                    "article",
+                    'div[data-test="news-stream"] li',
                 )
-                
+                try:
+                    await page.wait_for_selector(", ".join(selectors), timeout=10000)
+                except PlaywrightTimeout:
+                    pass
+
+                articles = []
+                for selector in selectors:
+                    articles = await page.query_selector_all(selector)
+                    if articles:
+                        break
+
                 for article in articles[:limit]:
                     try:
                         # Title & URL (multiple selector strategies)
-                        title_elem = (
-                            article.query_selector('h3 a') or
-                            article.query_selector('h2 a') or
-                            article.query_selector('a[data-test="item-title"]') or
-                            article.query_selector('a')
-                        )
+                        title_elem = None
+                        for selector in (
+                            "h3 a",
+                            "h2 a",
+                            'a[data-test="item-title"]',
+                            "a",
+                        ):
+                            title_elem = await article.query_selector(selector)
+                            if title_elem:
+                                break
                         if not title_elem:
                             continue
-                        
-                        title = title_elem.text_content().strip()
-                        href = title_elem.get_attribute('href')
-                        full_url = f"https://finance.yahoo.com{href}" if href.startswith('/') else href
-                        
+
+                        title = (await title_elem.text_content()).strip()
+                        href = await title_elem.get_attribute("href")
+                        full_url = (
+                            f"https://finance.yahoo.com{href}"
+                            if href.startswith("/")
+                            else href
+                        )
+
                         # Source
-                        source_elem = article.query_selector('div[data-test-locator="stream-item-publisher"]')
-                        source = source_elem.text_content().strip() if source_elem else "Yahoo Finance"
-                        
+                        source_elem = await article.query_selector(
+                            'div[data-test-locator="stream-item-publisher"]'
+                        )
+                        source = (
+                            (await source_elem.text_content()).strip()
+                            if source_elem
+                            else "Yahoo Finance"
+                        )
+
                         # Time
-                        time_elem = article.query_selector('time')
-                        published_at = time_elem.get_attribute('datetime') if time_elem else None
-                        
-                        news.append({
-                            "title": title,
-                            "url": full_url,
-                            "source": source,
-                            "published_at": published_at,
-                            "symbol": symbol.upper(),
-                            "scraped_at": datetime.utcnow().isoformat()
-                        })
-                        
+                        time_elem = await article.query_selector("time")
+                        published_at = (
+                            await time_elem.get_attribute("datetime")
+                            if time_elem
+                            else None
+                        )
+
+                        news.append(
+                            {
+                                "title": title,
+                                "url": full_url,
+                                "source": source,
+                                "published_at": published_at,
+                                "symbol": symbol.upper(),
+                                "scraped_at": datetime.utcnow().isoformat(),
+                            }
+                        )
+
                     except Exception as e:
                         logger.warning(f"Failed to parse article: {e}")
                         continue
-                
-                browser.close()
+
                 logger.info(f"Scraped {len(news)} articles for {symbol}")
-                
+
         except PlaywrightTimeout:
             logger.error(f"Timeout scraping Yahoo Finance for {symbol}")
         except Exception as e:
             logger.error(f"Error scraping Yahoo Finance: {e}")
-        
+
         return news
-    
-    def scrape_benzinga(self, symbol: str, limit: int = 10) -> List[Dict]:
-        """
-        Extrage știri pentru un simbol din Benzinga.
-        
-        Args:
-            symbol: Ticker symbol
-            limit: Număr maxim de știri
-            
-        Returns:
-            List of news articles
-        """
+
+    async def _scrape_benzinga(self, symbol: str, limit: int) -> List[Dict]:
         news = []
-        
+        from playwright.async_api import TimeoutError as PlaywrightTimeout
+
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=self.headless)
-                context = browser.new_context(user_agent=self.user_agent)
-                page = context.new_page()
-                
+            async with self.pool.page() as page:
                 # Navigate to Benzinga stock page
                 url = f"https://www.benzinga.com/quote/{symbol}/news"
                 logger.info(f"Scraping Benzinga news for {symbol}")
-                page.goto(url, wait_until="domcontentloaded", timeout=15000)
-                
+                await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+
                 # Wait for articles
-                page.wait_for_selector('article.article-preview', timeout=10000)
-                
+                await page.wait_for_selector("article.article-preview", timeout=10000)
+
                 # Extract articles
-                articles = page.query_selector_all('article.article-preview')
-                
+                articles = await page.query_selector_all("article.article-preview")
+
                 for article in articles[:limit]:
                     try:
                         # Title & URL
-                        title_elem = article.query_selector('h2 a, h3 a')
+                        title_elem = await article.query_selector("h2 a, h3 a")
                         if not title_elem:
                             continue
-                        
-                        title = title_elem.text_content().strip()
-                        href = title_elem.get_attribute('href')
-                        full_url = f"https://www.benzinga.com{href}" if href.startswith('/') else href
-                        
+
+                        title = (await title_elem.text_content()).strip()
+                        href = await title_elem.get_attribute("href")
+                        full_url = (
+                            f"https://www.benzinga.com{href}"
+                            if href.startswith("/")
+                            else href
+                        )
+
                         # Time
-                        time_elem = article.query_selector('time')
-                        published_at = time_elem.get_attribute('datetime') if time_elem else None
-                        
-                        news.append({
-                            "title": title,
-                            "url": full_url,
-                            "source": "Benzinga",
-                            "published_at": published_at,
-                            "symbol": symbol.upper(),
-                            "scraped_at": datetime.utcnow().isoformat()
-                        })
-                        
+                        time_elem = await article.query_selector("time")
+                        published_at = (
+                            await time_elem.get_attribute("datetime")
+                            if time_elem
+                            else None
+                        )
+
+                        news.append(
+                            {
+                                "title": title,
+                                "url": full_url,
+                                "source": "Benzinga",
+                                "published_at": published_at,
+                                "symbol": symbol.upper(),
+                                "scraped_at": datetime.utcnow().isoformat(),
+                            }
+                        )
+
                     except Exception as e:
                         logger.warning(f"Failed to parse Benzinga article: {e}")
                         continue
-                
-                browser.close()
+
                 logger.info(f"Scraped {len(news)} Benzinga articles for {symbol}")
-                
+
         except PlaywrightTimeout:
             logger.error(f"Timeout scraping Benzinga for {symbol}")
         except Exception as e:
             logger.error(f"Error scraping Benzinga: {e}")
-        
+
         return news
-    
+
+    # ------------------------------------------------------------------
+    # Public API (sync)
+    # ------------------------------------------------------------------
+
+    def scrape_yahoo_finance(self, symbol: str, limit: int = 10) -> List[Dict]:
+        """
+        Extrage știri pentru un simbol din Yahoo Finance.
+
+        Args:
+            symbol: Ticker symbol (ex: "AAPL", "TSLA")
+            limit: Număr maxim de știri
+
+        Returns:
+            List of news articles with title, url, source, published_at
+        """
+        return self._run(self._scrape_source("yahoo_finance", symbol, limit))
+
+    def scrape_benzinga(self, symbol: str, limit: int = 10) -> List[Dict]:
+        """
+        Extrage știri pentru un simbol din Benzinga.
+
+        Args:
+            symbol: Ticker symbol
+            limit: Număr maxim de știri
+
+        Returns:
+            List of news articles
+        """
+        return self._run(self._scrape_source("benzinga", symbol, limit))
+
     def aggregate_news(self, symbol: str, limit_per_source: int = 10) -> Dict:
         """
-        Agregă știri din toate sursele pentru un simbol.
-        
+        Agregă știri din toate sursele pentru un simbol (surse în paralel).
+
         Args:
             symbol: Ticker symbol
             limit_per_source: Max articole per sursă
-            
+
         Returns:
             Dict with news from all sources + combined list
         """
-        yahoo_news = self.scrape_yahoo_finance(symbol, limit_per_source)
-        benzinga_news = self.scrape_benzinga(symbol, limit_per_source)
-        
-        # Combine and sort by published_at
-        all_news = yahoo_news + benzinga_news
-        all_news.sort(
-            key=lambda x: x.get("published_at") or "2000-01-01",
-            reverse=True
-        )
-        
+        return self._run(self._aggregate(symbol, limit_per_source))
+
+    def aggregate_news_many(
+        self, symbols: List[str], limit_per_source: int = 10
+    ) -> Dict[str, Dict]:
+        """
+        Agregă știri pentru mai multe simboluri concurent (limitat de pool).
+
+        Returns:
+            Dict symbol -> rezultat aggregate_news
+        """
+        return self._run(self._aggregate_many(symbols, limit_per_source))
+
+    # ------------------------------------------------------------------
+    # Public API (async)
+    # ------------------------------------------------------------------
+
+    async def aggregate_news_async(
+        self, symbol: str, limit_per_source: int = 10
+    ) -> Dict:
+        """Varianta async a aggregate_news"""
+        return await self._run_async(self._aggregate(symbol, limit_per_source))
+
+    async def aggregate_news_many_async(
+        self, symbols: List[str], limit_per_source: int = 10
+    ) -> Dict[str, Dict]:
+        """Varianta async a aggregate_news_many"""
+        return await self._run_async(self._aggregate_many(symbols, limit_per_source))
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
         return {
-            "symbol": symbol.upper(),
-            "total_articles": len(all_news),
-            "sources": {
-                "yahoo_finance": len(yahoo_news),
-                "benzinga": len(benzinga_news)
-            },
-            "news": all_news,
-            "scraped_at": datetime.utcnow().isoformat()
+            **self.stats,
+            "cached_entries": len(self._cache),
+            "pool": self.pool.get_stats(),
         }
 
+    def close(self):
+        """Oprește browserul și loop-ul dedicat"""
+        if self._loop is None:
+            return
+        self._run(self.pool.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = self._thread = None
+
 
 # Singleton instance
 _scraper_instance = None
@@ -217,28 +576,33 @@ def get_news_scraper(headless: bool = True) -> NewsScraperService:
     return _scraper_instance
 
 
-# Quick test
+# Benchmark: cold (browser nou per simbol) vs pool persistent
 if __name__ == "__main__":
+    import sys
+
     logging.basicConfig(level=logging.INFO)
-    
+    symbols = sys.argv[1:] or ["TSLA", "NVDA", "AAPL", "MSFT", "AMZN"]
+
+    print(f"\n🥶 Cold: new browser per symbol, sequential ({len(symbols)} symbols)")
+    start = time.perf_counter()
+    for sym in symbols:
+        cold = NewsScraperService(headless=True, max_contexts=1, cache_ttl=0)
+        cold.aggregate_news(sym, limit_per_source=5)
+        cold.close()
+    cold_sec = time.perf_counter() - start
+    print(f"  {cold_sec:.1f}s")
+
+    print("\n🔥 Pooled: one browser, concurrent symbols")
     scraper = NewsScraperService(headless=True)
-    
-    # Test Yahoo Finance
-    print("\n📰 Testing Yahoo Finance scraper...")
-    yahoo_news = scraper.scrape_yahoo_finance("TSLA", limit=5)
-    print(f"Found {len(yahoo_news)} articles")
-    for article in yahoo_news[:3]:
-        print(f"  - {article['title'][:60]}...")
-    
-    # Test Benzinga
-    print("\n📰 Testing Benzinga scraper...")
-    benzinga_news = scraper.scrape_benzinga("TSLA", limit=5)
-    print(f"Found {len(benzinga_news)} articles")
-    for article in benzinga_news[:3]:
-        print(f"  - {article['title'][:60]}...")
-    
-    # Test aggregation
-    print("\n📊 Testing aggregation...")
-    result = scraper.aggregate_news("NVDA", limit_per_source=5)
-    print(f"Total: {result['total_articles']} articles")
-    print(f"Sources: {result['sources']}")
+    start = time.perf_counter()
+    results = scraper.aggregate_news_many(symbols, limit_per_source=5)
+    pooled_sec = time.perf_counter() - start
+    print(f"  {pooled_sec:.1f}s ({cold_sec / max(pooled_sec, 1e-9):.1f}x)")
+    for sym, result in results.items():
+        print(f"  {sym}: {result['total_articles']} articles {result['sources']}")
+
+    start = time.perf_counter()
+    scraper.aggregate_news_many(symbols, limit_per_source=5)
+    print(f"\n♻️  Cached repeat: {time.perf_counter() - start:.3f}s")
+    print(f"Stats: {scraper.get_stats()}")
+    scraper.close()
@@ -12,44 +12,29 @@ class TSProvider(OptionsProvider):
         self.base = os.getenv("TS_BASE_URL", "https://api.tradestation.com")
 
     def get_spot(self, symbol: str) -> float:
-        """Get current spot price from TradeStation"""
+        """Get current spot price from TradeStation
+
+        Goes through the shared quote gateway, which coalesces concurrent
+        lookups into one multi-symbol request, caches last quotes briefly and
+        falls back to the `marks` table.
+        """
         try:
             # Import here to avoid circular imports
-            from database import DatabaseManager
-            from services.ts_oauth import authorized_get
+            from services.quote_gateway import get_quote_gateway
 
-            # Try to get from database first (fallback to existing system)
-            try:
-                db_manager = DatabaseManager()
-                with db_manager.get_connection() as conn:
-                    row = conn.execute(
-                        "SELECT last FROM marks WHERE symbol = ?", (symbol,)
-                    ).fetchone()
-                    if row and row["last"]:
-                        return float(row["last"])
-            except Exception:
-                pass  # Fallback to TS API
-
-            # Get from TradeStation API
-            r = authorized_get(
-                None, f"{self.base}/v3/marketdata/quotes", params={"symbols": symbol}
-            )
-            r.raise_for_status()
-            j = r.json()
-
-            # Handle different TS response formats
-            quotes = j.get("Quotes", j.get("quotes", []))
-            if quotes:
-                last_price = quotes[0].get("Last") or quotes[0].get("last")
-                if last_price:
-                    return float(last_price)
-
-            raise ValueError(f"No spot price found in TS response for {symbol}")
+            return get_quote_gateway().get_spot(symbol)
 
         except Exception as e:
             logger.error(f"Failed to get spot price for {symbol} from TS: {e}")
             raise
 
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get raw TradeStation quote dict (batched through the quote gateway)"""
+        from services.quote_gateway import get_quote_gateway
+
+        sym = symbol.upper()
+        return get_quote_gateway().get_quotes_sync([sym]).get(sym)
+
     def get_chain(
         self, symbol: str, expiry: Optional[str] = None, dte: Optional[int] = None
     ) -> Dict[str, Any]:
@@ -1,4 +1,5 @@
 # backend/services/quality.py
+import numpy as np
 
 
 def clamp(x, a=0, b=1):
@@ -151,3 +152,216 @@ def compute_quality(payload, chain_snapshot, context):
         },
         "flags": flags,
     }
+
+
+# ---------- Batch scoring ----------
+
+
+def _clamp(x, a=0.0, b=1.0):
+    return np.maximum(a, np.minimum(b, x))
+
+
+class IndexedChain:
+    """
+    Chain snapshot indexed once for batch scoring
+    chain_snapshot: {strike: {bid, ask, oi, volume, oi_pct}} as for compute_quality
+    Per-strike spread, clamped OI percentile and volume/OI are precomputed;
+    legs are resolved to row positions by the same str(strike) lookup.
+    """
+
+    def __init__(self, chain_snapshot):
+        self.rows = {}
+        spreads, oi_pcts, vol_ois = [], [], []
+        for key, row in chain_snapshot.items():
+            if not row:
+                continue
+            self.rows[key] = len(spreads)
+            spreads.append(norm_spread(row.get("bid", 0), row.get("ask", 0)))
+            oi_pcts.append(clamp(row.get("oi_pct", 0)))
+            volume = row.get("volume", 0)
+            oi = row.get("oi", 1)
+            vol_ois.append(volume / oi if oi > 0 else 0)
+        # trailing 0 row: padding for missing legs
+        self.spread = np.array(spreads + [0.0], dtype=float)
+        self.oi_pct = np.array(oi_pcts + [0.0], dtype=float)
+        self.vol_oi = np.array(vol_ois + [0.0], dtype=float)
+
+    def leg_rows(self, payloads):
+        """(candidates x max_legs) row positions; missing legs -> padding row"""
+        pad = len(self.spread) - 1
+        legs = [
+            [self.rows.get(str(leg.get("strike", 0)), pad) for leg in p.get("legs", [])]
+            for p in payloads
+        ]
+        width = max((len(x) for x in legs), default=0)
+        out = np.full((len(payloads), width), pad, dtype=np.int64)
+        for i, rows in enumerate(legs):
+            out[i, : len(rows)] = rows
+        return out, out != pad
+
+
+def _leg_mean(values, rows, found):
+    # sequential sum over leg slots, as sum() over the found legs
+    total = np.zeros(rows.shape[0])
+    for j in range(rows.shape[1]):
+        total = total + values[rows[:, j]]
+    return total / np.maximum(found.sum(axis=1), 1)
+
+
+def compute_quality_batch(payloads, chain, contexts):
+    """
+    Score many candidates against one chain (same results as compute_quality)
+    payloads: list of compute_quality payloads
+    chain: IndexedChain, or a chain snapshot dict (indexed here)
+    contexts: list of compute_quality contexts, aligned with payloads
+    """
+    if not isinstance(chain, IndexedChain):
+        chain = IndexedChain(chain)
+    n = len(payloads)
+    if n == 0:
+        return []
+
+    def col(items, key, default):
+        return np.array([x.get(key, default) for x in items], dtype=float)
+
+    # Liquidity (per leg average)
+    rows, found = chain.leg_rows(payloads)
+    avg_spread = _leg_mean(chain.spread, rows, found)
+    oi_pct = _leg_mean(chain.oi_pct, rows, found)
+    vol_oi = _leg_mean(chain.vol_oi, rows, found)
+    L = (
+        0.6 * _clamp(oi_pct)
+        + 0.25 * _clamp(vol_oi / 1.5)
+        + 0.15 * _clamp(1 - (avg_spread / 0.20))
+    )
+
+    # Pricing
+    theo = col(contexts, "theo", 0)
+    mid = col(contexts, "mid", 0)
+    is_credit = np.array([bool(c.get("is_credit", False)) for c in contexts])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        edge = np.where(is_credit, (mid - theo) / mid, (theo - mid) / theo)
+    edge = np.where((mid <= 0) | (theo <= 0), 0.0, edge)
+    s_edge = _clamp(0.5 + edge * 3)
+    s_iv = _clamp(0.5 + (-col(contexts, "iv_rank_z", 0)) * 0.25)
+    P = _clamp(0.6 * s_edge + 0.4 * s_iv)
+
+    # Structure (default dte_lo=20, dte_hi=60)
+    target = np.array(
+        [TARGET_DELTA.get(p.get("strategyId", ""), 0.0) for p in payloads]
+    )
+    dte = col(payloads, "dte", 30)
+    be_pct = np.array([p.get("be_pct") or 0 for p in payloads], dtype=float)
+    d_delta = _clamp(1 - np.abs((col(contexts, "delta", 0) - target)) / 0.25)
+    d_dte = _clamp(1 - np.abs(((dte - (20 + 60) / 2) / ((60 - 20) / 2))))
+    d_be = _clamp(1 - np.abs(be_pct) / 0.25)
+    S = _clamp(0.5 * d_delta + 0.3 * d_dte + 0.2 * d_be)
+
+    # Risk
+    rr = _clamp(
+        col(contexts, "max_gain", 300) / (col(contexts, "max_loss", 1000) + 1e-9) / 3.0
+    )
+    asg = _clamp(1 - col(contexts, "assignment_risk", 0.15))
+    R = _clamp(0.7 * rr + 0.3 * asg)
+
+    # Stability
+    g = _clamp(1 - np.abs(col(contexts, "gamma", 0)) * 50)
+    v = _clamp(1 - np.abs(col(contexts, "vega", 0)) * 0.1 / 1_000)
+    T = _clamp(0.5 * g + 0.5 * v)
+
+    raw = 100 * (0.30 * L + 0.20 * P + 0.20 * S + 0.20 * R + 0.10 * T)
+    wide = avg_spread > 0.10
+    short_dte = dte < 7
+    earnings = [bool(c.get("earnings_soon")) for c in contexts]
+
+    # Python round() on the scalars keeps rounding identical to compute_quality
+    results = []
+    for i, (x, liq, p, s, r, t) in enumerate(
+        zip(raw.tolist(), L.tolist(), P.tolist(), S.tolist(), R.tolist(), T.tolist())
+    ):
+        flags = []
+        if wide[i]:
+            flags.append("Wide spread >10%")
+        if short_dte[i]:
+            flags.append("DTE under 7")
+        if earnings[i]:
+            flags.append("Earnings <7d")
+        results.append(
+            {
+                "score": max(0, min(100, round(x))),
+                "buckets": {
+                    "liquidity": round(liq, 2),
+                    "pricing": round(p, 2),
+                    "structure": round(s, 2),
+                    "risk": round(r, 2),
+                    "stability": round(t, 2),
+                },
+                "flags": flags,
+            }
+        )
+    return results
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    rng = random.Random(3)
+    strikes = [float(k) for k in range(300, 501, 5)]
+    chain = {
+        str(k): {
+            "bid": round(rng.uniform(0.5, 20), 2),
+            "ask": round(rng.uniform(0.6, 22), 2),
+            "oi": rng.randint(0, 20000),
+            "volume": rng.randint(0, 5000),
+            "oi_pct": rng.random(),
+        }
+        for k in strikes
+    }
+    payloads, contexts = [], []
+    for _ in range(1000):
+        payloads.append(
+            {
+                "legs": [
+                    {"strike": rng.choice(strikes)} for _ in range(rng.randint(1, 4))
+                ],
+                "dte": rng.randint(1, 90),
+                "strategyId": rng.choice(list(TARGET_DELTA)),
+                "be_pct": rng.uniform(-0.1, 0.1),
+            }
+        )
+        contexts.append(
+            {
+                "theo": rng.uniform(0.5, 10),
+                "mid": rng.uniform(0.5, 10),
+                "is_credit": rng.random() < 0.5,
+                "iv_rank_z": rng.gauss(0, 1),
+                "delta": rng.uniform(-0.6, 0.6),
+                "gamma": rng.uniform(0, 0.02),
+                "vega": rng.uniform(0, 50),
+                "max_loss": rng.uniform(100, 2000),
+                "max_gain": rng.uniform(50, 3000),
+                "assignment_risk": rng.random() * 0.5,
+                "earnings_soon": rng.random() < 0.1,
+            }
+        )
+
+    runs = 20
+    start = time.perf_counter()
+    for _ in range(runs):
+        scalar = [compute_quality(p, chain, c) for p, c in zip(payloads, contexts)]
+    t_scalar = (time.perf_counter() - start) / runs
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        batch = compute_quality_batch(payloads, IndexedChain(chain), contexts)
+    t_batch = (time.perf_counter() - start) / runs
+
+    assert batch == scalar
+    print(f"{len(payloads)} candidates, {len(chain)} strikes")
+    print(
+        f"  compute_quality loop:  {t_scalar * 1000:6.2f}ms ({len(payloads) / t_scalar:,.0f}/s)"
+    )
+    print(
+        f"  compute_quality_batch: {t_batch * 1000:6.2f}ms ({len(payloads) / t_batch:,.0f}/s)"
+    )
@@ -0,0 +1,443 @@
+"""
+Quote Gateway for FlowMind
+
+Coalesces concurrent single-symbol quote requests into multi-symbol
+TradeStation calls:
+- Requests arriving within a short window (default 5ms) share one batch
+- Results are fanned back to every waiter
+- Short-TTL last-quote cache absorbs repeated lookups
+- Falls back to the `marks` table through one long-lived sqlite connection
+
+Works for async callers (scanner agents, warmup) and for sync callers running
+in FastAPI's threadpool (TSProvider.get_spot).
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+QUOTE_BATCH_WINDOW_MS = float(os.getenv("QUOTE_BATCH_WINDOW_MS", "5"))
+QUOTE_BATCH_MAX_SYMBOLS = int(os.getenv("QUOTE_BATCH_MAX_SYMBOLS", "100"))
+QUOTE_CACHE_TTL_SEC = float(os.getenv("QUOTE_CACHE_TTL_SEC", "2"))
+
+QuoteFetcher = Callable[
+    [List[str]],
+    Union[Dict[str, Dict[str, Any]], Awaitable[Dict[str, Dict[str, Any]]]],
+]
+
+
+def ts_fetch_quotes(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch quotes for several symbols in one TradeStation request
+
+    Args:
+        symbols: Upper-case ticker symbols
+
+    Returns:
+        Dict mapping symbol to raw TradeStation quote dict
+    """
+    # Import here to avoid circular imports
+    from services.ts_oauth import authorized_get
+
+    base = os.getenv("TS_BASE_URL", "https://api.tradestation.com")
+    r = authorized_get(None, f"{base}/v3/marketdata/quotes/{','.join(symbols)}")
+    r.raise_for_status()
+    j = r.json()
+
+    out: Dict[str, Dict[str, Any]] = {}
+    for q in j.get("Quotes", j.get("quotes", [])):
+        sym = (q.get("Symbol") or q.get("symbol") or "").upper()
+        if sym:
+            out[sym] = q
+    return out
+
+
+def quote_last(quote: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Extract last price from a TradeStation-style quote dict"""
+    if not quote:
+        return None
+    last = quote.get("Last") or quote.get("last")
+    try:
+        return float(last) if last else None
+    except (TypeError, ValueError):
+        return None
+
+
+class _SyncBatch:
+    """Batch shared by threads that asked for quotes in the same window"""
+
+    __slots__ = ("symbols", "closed", "done", "results", "error")
+
+    def __init__(self):
+        self.symbols: set = set()
+        self.closed = False
+        self.done = threading.Event()
+        self.results: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.error: Optional[BaseException] = None
+
+
+class QuoteGateway:
+    """
+    Micro-batching quote gateway
+
+    Usage:
+        gateway = get_quote_gateway()
+        quote = await gateway.get_quote("TSLA")          # async callers
+        spot = gateway.get_spot("TSLA")                  # sync callers
+
+    Args:
+        fetcher: Callable taking a list of symbols and returning
+                 {symbol: quote_dict}; sync or async (default: ts_fetch_quotes)
+        window_ms: Collection window before a batch is sent
+        max_batch: Max symbols per upstream request
+        ttl: Last-quote cache TTL in seconds
+        db_path: sqlite database holding the `marks` fallback table
+    """
+
+    def __init__(
+        self,
+        fetcher: Optional[QuoteFetcher] = None,
+        window_ms: float = QUOTE_BATCH_WINDOW_MS,
+        max_batch: int = QUOTE_BATCH_MAX_SYMBOLS,
+        ttl: float = QUOTE_CACHE_TTL_SEC,
+        db_path: Optional[str] = None,
+    ):
+        self.fetcher = fetcher or ts_fetch_quotes
+        self.window = max(window_ms, 0.0) / 1000.0
+        self.max_batch = max(int(max_batch), 1)
+        self.ttl = ttl
+        self.db_path = db_path or os.getenv(
+            "SQLITE_DB_PATH", "/app/data/flowmind.db"
+        )
+
+        # Last-quote cache: symbol -> (stored_at, quote)
+        self._cache: Dict[str, tuple] = {}
+
+        # Async batching state (bound to one event loop)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        # Sync batching state
+        self._lock = threading.Lock()
+        self._sync_batch: Optional[_SyncBatch] = None
+
+        # Long-lived marks connection
+        self._marks_conn: Optional[sqlite3.Connection] = None
+        self._marks_lock = threading.Lock()
+
+        self.stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "upstream_calls": 0,
+            "upstream_symbols": 0,
+            "upstream_errors": 0,
+            "marks_fallbacks": 0,
+        }
+
+    # === CACHE ===
+
+    def _cache_get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(symbol)
+        if entry is None:
+            return None
+        stored_at, quote = entry
+        if time.monotonic() - stored_at > self.ttl:
+            self._cache.pop(symbol, None)
+            return None
+        return quote
+
+    def _cache_put(self, quotes: Dict[str, Dict[str, Any]]):
+        now = time.monotonic()
+        for sym, quote in quotes.items():
+            self._cache[sym] = (now, quote)
+
+    def _split_cached(
+        self, symbols: Iterable[str]
+    ) -> tuple[Dict[str, Optional[Dict[str, Any]]], List[str]]:
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        missing: List[str] = []
+        seen = set()
+        for raw in symbols:
+            sym = raw.upper().strip()
+            if not sym or sym in seen:
+                continue
+            seen.add(sym)
+            self.stats["requests"] += 1
+            quote = self._cache_get(sym)
+            if quote is not None:
+                self.stats["cache_hits"] += 1
+                found[sym] = quote
+            else:
+                missing.append(sym)
+        return found, missing
+
+    def clear_cache(self):
+        """Drop all cached quotes"""
+        self._cache.clear()
+
+    # === MARKS FALLBACK ===
+
+    def _marks_connection(self) -> Optional[sqlite3.Connection]:
+        if self._marks_conn is None:
+            if not os.path.exists(self.db_path):
+                return None
+            conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            self._marks_conn = conn
+        return self._marks_conn
+
+    def _marks_lookup(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Read last known marks for symbols in one query"""
+        if not symbols:
+            return {}
+        try:
+            with self._marks_lock:
+                conn = self._marks_connection()
+                if conn is None:
+                    return {}
+                placeholders = ",".join("?" for _ in symbols)
+                rows = conn.execute(
+                    f"SELECT symbol, last, today_open, updated_at FROM marks "
+                    f"WHERE symbol IN ({placeholders})",
+                    symbols,
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Marks fallback failed: {e}")
+            return {}
+
+        out = {}
+        for row in rows:
+            if row["last"]:
+                out[row["symbol"]] = {
+                    "Symbol": row["symbol"],
+                    "Last": float(row["last"]),
+                    "Open": row["today_open"],
+                    "TimeStamp": row["updated_at"],
+                    "source": "marks",
+                }
+        if out:
+            self.stats["marks_fallbacks"] += len(out)
+        return out
+
+    def close(self):
+        """Close the long-lived marks connection"""
+        with self._marks_lock:
+            if self._marks_conn is not None:
+                self._marks_conn.close()
+                self._marks_conn = None
+
+    # === UPSTREAM ===
+
+    def _chunks(self, symbols: List[str]) -> List[List[str]]:
+        return [
+            symbols[i : i + self.max_batch]
+            for i in range(0, len(symbols), self.max_batch)
+        ]
+
+    def _resolve(
+        self, symbols: List[str], fetched: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Cache live quotes and fill gaps from marks"""
+        live = {s: q for s, q in fetched.items() if s in symbols}
+        self._cache_put(live)
+        results: Dict[str, Optional[Dict[str, Any]]] = dict(live)
+        missing = [s for s in symbols if s not in live]
+        marks = self._marks_lookup(missing)
+        for sym in missing:
+            results[sym] = marks.get(sym)
+        return results
+
+    def _fetch_sync(self, symbols: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        fetched: Dict[str, Dict[str, Any]] = {}
+        for chunk in self._chunks(symbols):
+            self.stats["upstream_calls"] += 1
+            self.stats["upstream_symbols"] += len(chunk)
+            try:
+                with span("upstream", provider="quotes", symbols=len(chunk)):
+                    result = self.fetcher(chunk)
+                    if inspect.isawaitable(result):
+                        result = asyncio.run(result)
+                fetched.update(result or {})
+            except Exception as e:
+                self.stats["upstream_errors"] += 1
+                logger.warning(f"Quote batch failed for {len(chunk)} symbols: {e}")
+        return self._resolve(symbols, fetched)
+
+    async def _fetch_async(
+        self, symbols: List[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        fetched: Dict[str, Dict[str, Any]] = {}
+        for chunk in self._chunks(symbols):
+            self.stats["upstream_calls"] += 1
+            self.stats["upstream_symbols"] += len(chunk)
+            try:
+                with span("upstream", provider="quotes", symbols=len(chunk)):
+                    if inspect.iscoroutinefunction(self.fetcher):
+                        result = await self.fetcher(chunk)
+                    else:
+                        result = await asyncio.to_thread(self.fetcher, chunk)
+                fetched.update(result or {})
+            except Exception as e:
+                self.stats["upstream_errors"] += 1
+                logger.warning(f"Quote batch failed for {len(chunk)} symbols: {e}")
+        return await asyncio.to_thread(self._resolve, symbols, fetched)
+
+    # === ASYNC API ===
+
+    def _bind_loop(self, loop: asyncio.AbstractEventLoop):
+        if self._loop is not loop:
+            # New event loop (e.g. tests calling asyncio.run repeatedly)
+            self._loop = loop
+            self._pending = {}
+            self._flush_handle = None
+
+    def _flush(self):
+        self._flush_handle = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        asyncio.ensure_future(self._run_batch(pending))
+
+    async def _run_batch(self, pending: Dict[str, asyncio.Future]):
+        try:
+            results = await self._fetch_async(list(pending))
+        except Exception as e:
+            logger.error(f"Quote batch error: {e}")
+            results = {}
+        for sym, fut in pending.items():
+            if not fut.done():
+                fut.set_result(results.get(sym))
+
+    async def get_quotes(
+        self, symbols: Iterable[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get quotes for symbols, coalescing with concurrent callers
+
+        Returns:
+            Dict mapping symbol to quote dict (None when unavailable)
+        """
+        found, missing = self._split_cached(symbols)
+        if not missing:
+            return found
+
+        loop = asyncio.get_running_loop()
+        self._bind_loop(loop)
+
+        waiters = {}
+        for sym in missing:
+            fut = self._pending.get(sym)
+            if fut is None:
+                fut = loop.create_future()
+                self._pending[sym] = fut
+            waiters[sym] = fut
+
+        if len(self._pending) >= self.max_batch:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+
+        for sym, fut in waiters.items():
+            found[sym] = await asyncio.shield(fut)
+        return found
+
+    async def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get a single quote (batched with concurrent callers)"""
+        sym = symbol.upper().strip()
+        return (await self.get_quotes([sym])).get(sym)
+
+    # === SYNC API ===
+
+    def get_quotes_sync(
+        self, symbols: Iterable[str], timeout: float = 20.0
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Blocking variant of get_quotes for threadpool callers
+
+        The first thread to arrive becomes the batch leader, waits one window
+        for other threads to join, then fetches for everyone.
+        """
+        found, missing = self._split_cached(symbols)
+        if not missing:
+            return found
+
+        with self._lock:
+            batch = self._sync_batch
+            leader = batch is None or batch.closed
+            if leader:
+                batch = _SyncBatch()
+                self._sync_batch = batch
+            batch.symbols.update(missing)
+
+        if leader:
+            if self.window:
+                time.sleep(self.window)
+            with self._lock:
+                batch.closed = True
+                if self._sync_batch is batch:
+                    self._sync_batch = None
+            try:
+                batch.results = self._fetch_sync(sorted(batch.symbols))
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        elif not batch.done.wait(timeout):
+            raise TimeoutError("Timed out waiting for quote batch")
+
+        if batch.error is not None:
+            raise batch.error
+        for sym in missing:
+            found[sym] = batch.results.get(sym)
+        return found
+
+    def get_spot(self, symbol: str) -> float:
+        """
+        Get last price for symbol (sync)
+
+        Raises:
+            ValueError: No live quote or mark available
+        """
+        sym = symbol.upper().strip()
+        last = quote_last(self.get_quotes_sync([sym]).get(sym))
+        if last is None:
+            raise ValueError(f"No spot price available for {sym}")
+        return last
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gateway counters (for metrics/debug endpoints)"""
+        stats = dict(self.stats)
+        calls = stats["upstream_calls"]
+        stats["avg_batch_size"] = (
+            round(stats["upstream_symbols"] / calls, 2) if calls else 0.0
+        )
+        stats["cached_symbols"] = len(self._cache)
+        return stats
+
+
+_gateway: Optional[QuoteGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_quote_gateway() -> QuoteGateway:
+    """Get process-wide quote gateway"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = QuoteGateway()
+    return _gateway
@@ -0,0 +1,717 @@
+"""
+Strategy Parameter Optimizer for FlowMind
+
+Scores ExpertOptionsSystem parameter sets with a vectorized options backtest:
+- A whole population is priced in one numpy pass (candidates x entries x days)
+- Entries are opened on a fixed schedule over cached price/IV history,
+  marked to market daily with Black-Scholes and closed at the profit
+  target, the loss limit or expiry
+- A genetic algorithm evolves the population; independent islands run in a
+  process pool and the best result wins
+- Candidate scores and whole runs are memoized by parameter hash
+
+Benchmark (fixed synthetic dataset):
+    python -m services.strategy_optimizer
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.special import ndtr, ndtri
+
+logger = logging.getLogger(__name__)
+
+RF_RATE = float(os.getenv("RF_RATE", "0.045"))
+OPTIMIZER_ISLANDS = int(os.getenv("OPTIMIZER_ISLANDS", "4"))
+OPTIMIZER_PROCESSES = int(os.getenv("OPTIMIZER_PROCESSES", "0"))  # 0 = cpu count
+OPTIMIZER_HISTORY_DAYS = int(os.getenv("OPTIMIZER_HISTORY_DAYS", "730"))
+OPTIMIZER_HISTORY_TTL = int(os.getenv("OPTIMIZER_HISTORY_TTL", "3600"))
+
+ENTRY_STEP_DAYS = 5  # open a new trade every N sessions
+BACKTEST_BLOCK = 16  # candidates priced per array pass
+IV_WARMUP_DAYS = 21  # realized-vol window used as IV proxy
+
+# Search space per strategy: param -> (min, max, is_integer)
+PARAM_RANGES: Dict[str, Dict[str, Tuple[float, float, bool]]] = {
+    "wheel": {
+        "put_delta_target": (0.15, 0.40, False),
+        "profit_target_pct": (25, 75, False),
+        "max_dte": (21, 60, True),
+    },
+    "iron_condor": {
+        "target_delta": (0.10, 0.25, False),
+        "profit_target_pct": (15, 40, False),
+        "wing_width": (5, 20, True),
+    },
+    "volatility_play": {
+        "profit_target_pct": (50, 150, False),
+        "loss_limit_pct": (25, 75, False),
+        "max_dte": (7, 21, True),
+    },
+}
+
+DEFAULT_WEIGHTS = {"win_rate": 0.5, "profit_factor": 0.3, "sharpe_ratio": 0.2}
+
+
+# ============================================================================
+# PRICE / IV HISTORY
+# ============================================================================
+
+
+@dataclass(eq=False)
+class PriceIVHistory:
+    """Daily closes and annualized implied vol (decimal), aligned"""
+
+    symbol: str
+    close: np.ndarray
+    iv: np.ndarray
+
+    def __post_init__(self):
+        self.close = np.asarray(self.close, dtype=np.float64)
+        self.iv = np.asarray(self.iv, dtype=np.float64)
+        if self.close.shape != self.iv.shape:
+            raise ValueError("close and iv must have the same length")
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.close.tobytes())
+        digest.update(self.iv.tobytes())
+        self.fingerprint = digest.hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+def synthetic_history(
+    days: int = 750, seed: int = 7, spot: float = 100.0, base_iv: float = 0.30
+) -> PriceIVHistory:
+    """
+    Deterministic GBM path with mean-reverting IV
+
+    Realized vol runs below implied (variance risk premium), like most
+    liquid underlyings.
+    """
+    rng = np.random.default_rng(seed)
+    iv = np.empty(days)
+    iv[0] = base_iv
+    for t in range(1, days):
+        iv[t] = iv[t - 1] + 0.05 * (base_iv - iv[t - 1]) + 0.02 * rng.standard_normal()
+    iv = np.clip(iv, 0.08, 1.5)
+    realized = iv * 0.85 / np.sqrt(252)
+    returns = realized * rng.standard_normal(days) - 0.5 * realized**2
+    close = spot * np.exp(np.cumsum(returns))
+    return PriceIVHistory("SYNTH", close, iv)
+
+
+def iv_proxy_from_closes(close: np.ndarray, window: int = IV_WARMUP_DAYS) -> np.ndarray:
+    """Rolling realized vol (annualized) scaled by a typical IV premium"""
+    log_ret = np.diff(np.log(close), prepend=np.log(close[0]))
+    out = np.full(len(close), np.nan)
+    if len(close) > window:
+        windows = np.lib.stride_tricks.sliding_window_view(log_ret[1:], window)
+        out[window:] = windows.std(axis=1) * np.sqrt(252) * 1.15
+    first = out[window] if len(close) > window else 0.3
+    out[: window + 1] = first
+    return np.clip(out, 0.05, 3.0)
+
+
+_history_cache: Dict[str, Tuple[float, PriceIVHistory]] = {}
+
+
+def fetch_daily_bars(symbol: str, days: int) -> List[Dict[str, Any]]:
+    """
+    Daily closes from Yahoo Finance (the technical analyzer's bar source)
+
+    Returns:
+        [{"date": "YYYY-MM-DD", "close": float}, ...] oldest first
+    """
+    import yfinance as yf
+
+    end = datetime.now()
+    df = yf.Ticker(symbol).history(
+        start=(end - timedelta(days=days)).strftime("%Y-%m-%d"),
+        end=end.strftime("%Y-%m-%d"),
+        interval="1d",
+    )
+    return [
+        {"date": ts.strftime("%Y-%m-%d"), "close": float(c)}
+        for ts, c in df["Close"].items()
+    ]
+
+
+def load_history(
+    symbol: str,
+    days: int = OPTIMIZER_HISTORY_DAYS,
+    fetch: Optional[Callable[[str, int], List[Dict[str, Any]]]] = None,
+) -> Optional[PriceIVHistory]:
+    """
+    Daily price/IV history for the optimizer (cached with TTL)
+
+    Rows may carry an "iv" field; otherwise IV is proxied from realized vol.
+
+    Args:
+        symbol: Underlying symbol
+        days: Calendar days of history
+        fetch: Bar source (symbol, days) -> rows; defaults to fetch_daily_bars
+
+    Returns:
+        PriceIVHistory, or None if the source has too little usable history
+        (the reason is logged)
+    """
+    key = f"{symbol.upper()}:{days}"
+    cached = _history_cache.get(key)
+    if cached and time.time() - cached[0] < OPTIMIZER_HISTORY_TTL:
+        return cached[1]
+
+    try:
+        rows = (fetch or fetch_daily_bars)(symbol.upper(), days)
+        rows = [r for r in rows or [] if float(r.get("close") or 0) > 0]
+        if len(rows) < IV_WARMUP_DAYS + 90:
+            logger.warning(
+                f"Price history for {symbol} too short to optimize: "
+                f"{len(rows)} bars, need {IV_WARMUP_DAYS + 90}"
+            )
+            return None
+
+        close = np.array([float(r["close"]) for r in rows])
+        if all(r.get("iv") for r in rows):
+            iv = np.array([float(r["iv"]) for r in rows])
+            iv = np.where(iv > 3, iv / 100.0, iv)  # accept percent or decimal
+        else:
+            iv = iv_proxy_from_closes(close)
+
+        history = PriceIVHistory(symbol.upper(), close, iv)
+        _history_cache[key] = (time.time(), history)
+        return history
+
+    except ImportError as e:
+        logger.error(f"Price history source unavailable, cannot optimize: {e}")
+        return None
+    except Exception as e:
+        logger.warning(f"No price history for {symbol}: {e}")
+        return None
+
+
+# ============================================================================
+# VECTORIZED BACKTEST
+# ============================================================================
+
+
+def _bs_price(S, K, tau, sigma, is_call: bool, r: float = RF_RATE):
+    """Black-Scholes over broadcast arrays; intrinsic value where tau == 0"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol = sigma * np.sqrt(tau)
+        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * tau) / vol
+        d2 = d1 - vol
+        disc = np.exp(-r * tau)
+        if is_call:
+            price = S * ndtr(d1) - K * disc * ndtr(d2)
+            intrinsic = np.maximum(S - K, 0.0)
+        else:
+            price = K * disc * ndtr(-d2) - S * ndtr(-d1)
+            intrinsic = np.maximum(K - S, 0.0)
+    return np.where(tau > 0, price, intrinsic)
+
+
+def _strike_for_delta(S0, sigma, T, delta, is_call: bool, r: float = RF_RATE):
+    """Strike whose Black-Scholes |delta| equals delta"""
+    d1 = ndtri(delta) if is_call else ndtri(1.0 - delta)
+    return S0 * np.exp(-d1 * sigma * np.sqrt(T) + (r + 0.5 * sigma**2) * T)
+
+
+def _column(params: List[Dict[str, Any]], name: str, default: float) -> np.ndarray:
+    return np.array([float(p.get(name, default)) for p in params])
+
+
+def backtest_population(
+    strategy: str, history: PriceIVHistory, params: List[Dict[str, Any]]
+) -> np.ndarray:
+    """
+    Per-trade returns for every candidate in one array pass
+
+    Args:
+        strategy: "wheel", "iron_condor" or "volatility_play"
+        history: Price/IV history
+        params: One full parameter dict per candidate
+
+    Returns:
+        Array (candidates, entries) of trade P&L / capital at risk
+    """
+    if strategy not in PARAM_RANGES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    dte = _dte_column(strategy, params)
+    horizon = int(max(dte.max(), PARAM_RANGES[strategy].get("max_dte", (0, 0))[1]))
+
+    # Candidates are priced in blocks of similar DTE so the (block, entries,
+    # days) temporaries stay cache-sized and stop at the block's longest DTE;
+    # every block shares the same entry schedule
+    order = np.argsort(dte, kind="stable")
+    returns = None
+    for i in range(0, len(params), BACKTEST_BLOCK):
+        idx = order[i : i + BACKTEST_BLOCK]
+        block = _backtest_block(strategy, history, [params[j] for j in idx], horizon)
+        if returns is None:
+            returns = np.empty((len(params), block.shape[1]))
+        returns[idx] = block
+    return returns
+
+
+def _dte_column(strategy: str, params: List[Dict[str, Any]]) -> np.ndarray:
+    dte_default = {"wheel": 45, "iron_condor": 30, "volatility_play": 14}[strategy]
+    return np.maximum(np.rint(_column(params, "max_dte", dte_default)), 1).astype(int)
+
+
+def _backtest_block(
+    strategy: str, history: PriceIVHistory, params: List[Dict[str, Any]], horizon: int
+) -> np.ndarray:
+    n = len(params)
+    dte = _dte_column(strategy, params)
+    close, iv = history.close, history.iv
+    entries = np.arange(IV_WARMUP_DAYS, len(close) - horizon - 1, ENTRY_STEP_DAYS)
+    if len(entries) == 0:
+        raise ValueError(f"History too short for horizon {horizon}")
+
+    days = np.arange(1, dte.max() + 1)
+    S0 = close[entries][None, :]  # (1, E)
+    iv0 = iv[entries][None, :]
+    S_path = close[entries[:, None] + days[None, :]][None, :, :]  # (1, E, K)
+    iv_path = iv[entries[:, None] + days[None, :]][None, :, :]
+    T0 = (dte / 365.0)[:, None]  # (C, 1)
+    tau = (np.maximum(dte[:, None] - days[None, :], 0) / 365.0)[:, None, :]
+
+    # Legs: (is_call, sign, strike (C, E)); sign +1 long, -1 short
+    if strategy == "wheel":
+        delta = _column(params, "put_delta_target", 0.30)[:, None]
+        k_put = _strike_for_delta(S0, iv0, T0, delta, is_call=False)
+        legs = [(False, -1.0, k_put)]
+    elif strategy == "iron_condor":
+        delta = _column(params, "target_delta", 0.16)[:, None]
+        wing = _column(params, "wing_width", 10)[:, None]
+        k_sc = _strike_for_delta(S0, iv0, T0, delta, is_call=True)
+        k_sp = _strike_for_delta(S0, iv0, T0, delta, is_call=False)
+        legs = [
+            (True, -1.0, k_sc),
+            (True, 1.0, k_sc + wing),
+            (False, -1.0, k_sp),
+            (False, 1.0, np.maximum(k_sp - wing, 0.01)),
+        ]
+    elif strategy == "volatility_play":
+        delta = _column(params, "strangle_delta", 0.25)[:, None]
+        legs = [
+            (True, 1.0, _strike_for_delta(S0, iv0, T0, delta, is_call=True)),
+            (False, 1.0, _strike_for_delta(S0, iv0, T0, delta, is_call=False)),
+        ]
+    else:
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    shape = (n, len(entries))
+    value0 = np.zeros(shape)
+    value = np.zeros(shape + (len(days),))
+    for is_call, sign, strike in legs:
+        value0 += sign * _bs_price(S0, strike, T0, iv0, is_call)
+        value += sign * _bs_price(S_path, strike[:, :, None], tau, iv_path, is_call)
+
+    pnl = value - value0[:, :, None]
+    size = np.abs(value0)[:, :, None]
+    target = (_column(params, "profit_target_pct", 50) / 100.0)[:, None, None]
+    limit = (_column(params, "loss_limit_pct", np.inf) / 100.0)[:, None, None]
+    if strategy == "wheel":
+        limit = np.full_like(limit, np.inf)  # CSPs are held, not stopped out
+
+    live = days[None, None, :] <= dte[:, None, None]
+    expiry = days[None, None, :] == dte[:, None, None]
+    exit_now = ((pnl >= target * size) | (pnl <= -limit * size)) & live | expiry
+    exit_idx = np.argmax(exit_now, axis=2)[:, :, None]
+    trade_pnl = np.take_along_axis(pnl, exit_idx, axis=2)[:, :, 0]
+
+    if strategy == "wheel":
+        capital = legs[0][2]
+    elif strategy == "iron_condor":
+        credit = -value0
+        capital = np.maximum(wing - credit, 0.01 * S0)
+    else:
+        capital = value0
+    return trade_pnl / np.maximum(capital, 1e-9)
+
+
+def score_returns(
+    returns: np.ndarray,
+    weights: Optional[Dict[str, float]] = None,
+    entry_iv: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Weighted fitness per candidate from per-trade returns (candidates, trades)
+
+    Metrics are the ones named in learning_weights, each scaled to [0, 1]:
+    win_rate, profit_factor (capped at 2), sharpe_ratio / risk_adjusted_return
+    (clipped to [0, 1]), max_drawdown, consistency, volatility_timing.
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1)
+    wins = np.where(returns > 0, returns, 0).sum(axis=1)
+    losses = -np.where(returns <= 0, returns, 0).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, mean / std, 0.0)
+        profit_factor = np.where(losses > 0, wins / losses, np.where(wins > 0, 2, 0))
+        cv = np.where(mean != 0, std / np.abs(mean), np.inf)
+
+    equity = np.cumsum(returns, axis=1)
+    drawdown = (np.maximum.accumulate(equity, axis=1) - equity).max(axis=1)
+
+    metrics = {
+        "win_rate": (returns > 0).mean(axis=1),
+        "profit_factor": np.minimum(profit_factor / 2, 1),
+        "sharpe_ratio": np.clip(sharpe, 0, 1),
+        "risk_adjusted_return": np.clip(sharpe, 0, 1),
+        "max_drawdown": 1.0 / (1.0 + drawdown),
+        "consistency": np.where(mean > 0, 1.0 / (1.0 + cv), 0.0),
+    }
+    if "volatility_timing" in weights:
+        timing = np.zeros(len(returns))
+        if entry_iv is not None and entry_iv.std() > 0:
+            iv_z = (entry_iv - entry_iv.mean()) / entry_iv.std()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                corr = ((returns - mean[:, None]) * iv_z).mean(axis=1) / std
+            timing = np.clip((np.nan_to_num(corr) + 1) / 2, 0, 1)
+        metrics["volatility_timing"] = timing
+
+    score = np.zeros(len(returns))
+    for name, weight in weights.items():
+        if name in metrics:
+            score += weight * metrics[name]
+    return score
+
+
+# ============================================================================
+# MEMOIZED POPULATION SCORING
+# ============================================================================
+
+_score_cache: Dict[Tuple, float] = {}
+_SCORE_CACHE_MAX = 200_000
+_run_cache: Dict[Tuple, "OptimizationResult"] = {}
+
+
+def _param_key(params: Dict[str, Any], names: Tuple[str, ...]) -> Tuple:
+    return tuple(round(float(params[n]), 6) for n in names)
+
+
+def _context_key(
+    strategy: str, history: PriceIVHistory, weights: Dict[str, float], base: Dict
+) -> str:
+    fixed = {
+        k: v
+        for k, v in sorted(base.items())
+        if isinstance(v, (int, float)) and k not in PARAM_RANGES[strategy]
+    }
+    raw = repr((strategy, history.fingerprint, sorted(weights.items()), fixed))
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def evaluate_population(
+    strategy: str,
+    history: PriceIVHistory,
+    params: List[Dict[str, Any]],
+    weights: Optional[Dict[str, float]] = None,
+) -> np.ndarray:
+    """
+    Fitness for each parameter set; cached candidates are not re-backtested
+
+    Returns:
+        Array of scores, one per entry in params
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    if not params:
+        return np.zeros(0)
+    names = tuple(sorted(PARAM_RANGES[strategy]))
+    context = _context_key(strategy, history, weights, params[0])
+    keys = [(context,) + _param_key(p, names) for p in params]
+
+    scores = np.empty(len(params))
+    missing = []
+    for i, key in enumerate(keys):
+        cached = _score_cache.get(key)
+        if cached is None:
+            missing.append(i)
+        else:
+            scores[i] = cached
+
+    if missing:
+        batch = [params[i] for i in missing]
+        returns = backtest_population(strategy, history, batch)
+        entry_iv = history.iv[IV_WARMUP_DAYS::ENTRY_STEP_DAYS][: returns.shape[1]]
+        fresh = score_returns(returns, weights, entry_iv)
+        if len(_score_cache) + len(missing) > _SCORE_CACHE_MAX:
+            _score_cache.clear()
+        for i, s in zip(missing, fresh):
+            scores[i] = s
+            _score_cache[keys[i]] = float(s)
+    return scores
+
+
+# ============================================================================
+# GENETIC ALGORITHM
+# ============================================================================
+
+
+@dataclass
+class OptimizationResult:
+    strategy: str
+    best_params: Dict[str, float]
+    best_score: float
+    baseline_score: float
+    convergence: List[float] = field(default_factory=list)  # best per generation
+    evaluated: int = 0
+    elapsed_sec: float = 0.0
+    islands: int = 1
+    cached: bool = False
+
+    @property
+    def candidates_per_sec(self) -> float:
+        return self.evaluated / self.elapsed_sec if self.elapsed_sec > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "best_params": self.best_params,
+            "best_score": round(self.best_score, 4),
+            "baseline_score": round(self.baseline_score, 4),
+            "convergence": [round(s, 4) for s in self.convergence],
+            "evaluated": self.evaluated,
+            "elapsed_sec": round(self.elapsed_sec, 3),
+            "candidates_per_sec": round(self.candidates_per_sec, 1),
+            "islands": self.islands,
+            "cached": self.cached,
+        }
+
+
+def _run_island(
+    strategy: str,
+    history: PriceIVHistory,
+    base_params: Dict[str, Any],
+    weights: Dict[str, float],
+    population: int,
+    generations: int,
+    seed: int,
+) -> Tuple[Dict[str, float], float, List[float], int]:
+    """One GA island: returns (best params, best score, convergence, evaluated)"""
+    ranges = PARAM_RANGES[strategy]
+    names = sorted(ranges)
+    lo = np.array([ranges[n][0] for n in names], dtype=float)
+    hi = np.array([ranges[n][1] for n in names], dtype=float)
+    is_int = np.array([ranges[n][2] for n in names])
+    rng = np.random.default_rng(seed)
+
+    def clip(pop):
+        pop = np.clip(pop, lo, hi)
+        pop[:, is_int] = np.rint(pop[:, is_int])
+        return pop
+
+    def as_params(pop):
+        return [{**base_params, **dict(zip(names, row))} for row in pop]
+
+    # Seed the population with the current parameters
+    current = np.array(
+        [float(base_params.get(n, (a + b) / 2)) for n, a, b in zip(names, lo, hi)]
+    )
+    pop = clip(rng.uniform(lo, hi, size=(population, len(names))))
+    pop[0] = clip(current[None, :])[0]
+
+    elite = max(2, population // 8)
+    best_row, best_score = pop[0], -np.inf
+    convergence: List[float] = []
+    evaluated = 0
+
+    for _ in range(generations):
+        scores = evaluate_population(strategy, history, as_params(pop), weights)
+        evaluated += len(pop)
+        order = np.argsort(-scores)
+        if scores[order[0]] > best_score:
+            best_score, best_row = float(scores[order[0]]), pop[order[0]].copy()
+        convergence.append(best_score)
+
+        # Tournament selection, uniform crossover, gaussian mutation
+        a = rng.integers(0, population, size=(population - elite, 2))
+        b = rng.integers(0, population, size=(population - elite, 2))
+        pa = np.where(scores[a[:, 0]] >= scores[a[:, 1]], a[:, 0], a[:, 1])
+        pb = np.where(scores[b[:, 0]] >= scores[b[:, 1]], b[:, 0], b[:, 1])
+        mask = rng.random((population - elite, len(names))) < 0.5
+        children = np.where(mask, pop[pa], pop[pb])
+        children += rng.normal(0, 0.1, children.shape) * (hi - lo)
+        pop = clip(np.vstack([pop[order[:elite]], children]))
+
+    return dict(zip(names, best_row.tolist())), best_score, convergence, evaluated
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:  # optimize_strategy runs in worker threads
+        if _pool is None:
+            import multiprocessing
+
+            # spawn: never fork a process that is running an event loop and threads
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, OPTIMIZER_PROCESSES or os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def optimize_strategy(
+    strategy: str,
+    history: PriceIVHistory,
+    base_params: Dict[str, Any],
+    weights: Optional[Dict[str, float]] = None,
+    population: int = 48,
+    generations: int = 12,
+    islands: int = OPTIMIZER_ISLANDS,
+    processes: int = OPTIMIZER_PROCESSES,
+    seed: int = 0,
+) -> OptimizationResult:
+    """
+    Optimize strategy parameters over price/IV history
+
+    Args:
+        strategy: StrategyType value ("wheel", "iron_condor", "volatility_play")
+        history: Price/IV history to backtest on
+        base_params: Current parameters (seed candidate + fixed values)
+        weights: Metric weights (learning_weights); defaults to DEFAULT_WEIGHTS
+        population: Candidates per generation per island
+        generations: Generations per island
+        islands: Independent GA runs; run in the shared process pool when > 1
+        processes: 1 runs islands in-process; otherwise the shared pool
+            (OPTIMIZER_PROCESSES workers, 0 = cpu count) is used
+        seed: Base RNG seed (island i uses seed + i)
+
+    Returns:
+        OptimizationResult; identical calls are served from memory
+    """
+    weights = weights or base_params.get("learning_weights") or DEFAULT_WEIGHTS
+    numeric_base = {k: v for k, v in base_params.items() if isinstance(v, (int, float))}
+    run_key = (
+        _context_key(strategy, history, weights, numeric_base),
+        _param_key(numeric_base, tuple(sorted(PARAM_RANGES[strategy]))),
+        population,
+        generations,
+        islands,
+        seed,
+    )
+    if run_key in _run_cache:
+        cached = _run_cache[run_key]
+        return OptimizationResult(**{**cached.__dict__, "cached": True})
+
+    start = time.perf_counter()
+    baseline = float(evaluate_population(strategy, history, [numeric_base], weights)[0])
+    args = [
+        (strategy, history, numeric_base, weights, population, generations, seed + i)
+        for i in range(max(islands, 1))
+    ]
+
+    workers = min(len(args), processes or os.cpu_count() or 1)
+    if workers > 1:
+        results = list(_get_pool().map(_run_island, *zip(*args)))
+    else:
+        results = [_run_island(*a) for a in args]
+
+    best_params, best_score, _, _ = max(results, key=lambda r: r[1])
+    convergence = np.max([r[2] for r in results], axis=0).tolist()
+    result = OptimizationResult(
+        strategy=strategy,
+        best_params=best_params,
+        best_score=best_score,
+        baseline_score=baseline,
+        convergence=convergence,
+        evaluated=sum(r[3] for r in results),
+        elapsed_sec=time.perf_counter() - start,
+        islands=len(args),
+    )
+    _run_cache[run_key] = result
+    return result
+
+
+def clear_caches():
+    _score_cache.clear()
+    _run_cache.clear()
+    _history_cache.clear()
+
+
+# Benchmark: candidates/sec and convergence on a fixed synthetic dataset
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    history = synthetic_history()
+    defaults = {
+        "wheel": {"put_delta_target": 0.30, "profit_target_pct": 50, "max_dte": 45},
+        "iron_condor": {
+            "target_delta": 0.16,
+            "profit_target_pct": 25,
+            "wing_width": 10,
+            "loss_limit_pct": 200,
+            "max_dte": 30,
+        },
+        "volatility_play": {
+            "strangle_delta": 0.25,
+            "profit_target_pct": 100,
+            "loss_limit_pct": 50,
+            "max_dte": 14,
+        },
+    }
+
+    print(f"Dataset: {len(history)} synthetic sessions ({history.fingerprint[:8]})")
+    for strategy, base in defaults.items():
+        pop = [
+            {
+                **base,
+                **{
+                    n: np.random.uniform(lo, hi)
+                    for n, (lo, hi, _) in PARAM_RANGES[strategy].items()
+                },
+            }
+            for _ in range(256)
+        ]
+        backtest_population(strategy, history, pop[:8])  # warm up
+        start = time.perf_counter()
+        backtest_population(strategy, history, pop)
+        vec = time.perf_counter() - start
+        start = time.perf_counter()
+        for p in pop[:32]:
+            backtest_population(strategy, history, [p])
+        loop = (time.perf_counter() - start) / 32 * 256
+
+        for processes in (1, 0):
+            clear_caches()
+            result = optimize_strategy(strategy, history, base, processes=processes)
+            mode = "in-process" if processes == 1 else "process pool"
+            print(
+                f"\n{strategy} ({mode}): {result.candidates_per_sec:,.0f} candidates/s, "
+                f"{result.elapsed_sec:.2f}s"
+            )
+        print(
+            f"  one-pass population: {256 / vec:,.0f}/s vs per-candidate loop {256 / loop:,.0f}/s"
+        )
+        print(f"  baseline {result.baseline_score:.4f} -> best {result.best_score:.4f}")
+        print(f"  convergence: {[round(s, 4) for s in result.convergence]}")
+        print(
+            f"  best params: { {k: round(v, 3) for k, v in result.best_params.items()} }"
+        )
+        start = time.perf_counter()
+        optimize_strategy(strategy, history, base, processes=0)
+        print(f"  memoized repeat: {(time.perf_counter() - start) * 1000:.2f}ms")
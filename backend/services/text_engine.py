@@ -0,0 +1,357 @@
+"""
+Text Processing Engine for FlowMind
+
+Shared by every keyword-sentiment call site (NewsAggregator,
+MarketSentimentAnalyzer, GeopoliticalNewsAgent):
+- PhraseMatcher: Aho-Corasick automaton, one pass per text for all phrases
+- SentimentLexicon: bullish/bearish phrases with weights on top of the matcher
+- NearDuplicateIndex: MinHash-LSH index over headline tokens, kept in a
+  fixed-size ring buffer with time-based eviction
+
+Matching keeps the semantics of the old `keyword in text.lower()` loops:
+each phrase counts at most once per text and may match inside words.
+"""
+
+import hashlib
+import re
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+# ============================================================================
+# Aho-Corasick phrase matcher
+# ============================================================================
+
+
+class PhraseMatcher:
+    """
+    Compiled multi-pattern matcher (Aho-Corasick)
+
+    Usage:
+        matcher = PhraseMatcher(["beat", "strong buy", "loss"])
+        matcher.matched_ids("Analysts say strong buy after earnings beat")
+        # -> {0, 1}
+    """
+
+    def __init__(self, patterns: Iterable[str], case_insensitive: bool = True):
+        self.case_insensitive = case_insensitive
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        outputs: List[List[int]] = [[]]
+        for pattern in patterns:
+            pid = len(self.patterns)
+            self.patterns.append(pattern)
+            if not pattern:
+                continue
+            text = pattern.lower() if case_insensitive else pattern
+            node = 0
+            for ch in text:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                node = nxt
+            outputs[node].append(pid)
+
+        # Breadth-first failure links; outputs are merged along them so a
+        # state reports every pattern ending at that position
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                outputs[nxt].extend(outputs[self._fail[nxt]])
+
+        self._out = [tuple(o) for o in outputs]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end_index, pattern_id) for every occurrence in text"""
+        if not text:
+            return
+        if self.case_insensitive:
+            text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pid in out[node]:
+                yield i, pid
+
+    def matched_ids(self, text: str) -> Set[int]:
+        """Distinct pattern ids occurring in text"""
+        if not text:
+            return set()
+        if self.case_insensitive:
+            text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+# ============================================================================
+# Sentiment lexicon
+# ============================================================================
+
+PhraseSpec = Union[str, Tuple[str, float]]
+
+
+@dataclass
+class SentimentMatch:
+    """Phrases found in one text, in lexicon order"""
+
+    bullish: List[str] = field(default_factory=list)
+    bearish: List[str] = field(default_factory=list)
+    bullish_weight: float = 0.0
+    bearish_weight: float = 0.0
+
+    @property
+    def score(self) -> float:
+        """(bullish - bearish) / total, in [-1, 1]; 0 when nothing matched"""
+        total = self.bullish_weight + self.bearish_weight
+        if total <= 0:
+            return 0.0
+        return (self.bullish_weight - self.bearish_weight) / total
+
+
+class SentimentLexicon:
+    """
+    Weighted bullish/bearish phrase lexicon compiled into one PhraseMatcher
+
+    Phrases are plain strings (weight 1.0) or (phrase, weight) tuples.
+    """
+
+    def __init__(self, bullish: Iterable[PhraseSpec], bearish: Iterable[PhraseSpec]):
+        phrases: List[str] = []
+        self._polarity: List[int] = []
+        self._weights: List[float] = []
+        for polarity, specs in ((1, bullish), (-1, bearish)):
+            for spec in specs:
+                phrase, weight = (spec, 1.0) if isinstance(spec, str) else spec
+                phrases.append(phrase)
+                self._polarity.append(polarity)
+                self._weights.append(float(weight))
+        self.matcher = PhraseMatcher(phrases)
+
+    def match(self, text: str) -> SentimentMatch:
+        result = SentimentMatch()
+        for pid in sorted(self.matcher.matched_ids(text)):
+            phrase = self.matcher.patterns[pid]
+            if self._polarity[pid] > 0:
+                result.bullish.append(phrase)
+                result.bullish_weight += self._weights[pid]
+            else:
+                result.bearish.append(phrase)
+                result.bearish_weight += self._weights[pid]
+        return result
+
+    def score(self, text: str) -> float:
+        return self.match(text).score
+
+
+# ============================================================================
+# Near-duplicate index (MinHash-LSH + ring buffer)
+# ============================================================================
+
+_TOKEN_RE = re.compile(r"[^\w\s]")
+_MINHASH_PRIME = 4294967311  # smallest prime > 2**32
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip punctuation, collapse whitespace"""
+    return " ".join(_TOKEN_RE.sub("", (text or "").lower()).split())
+
+
+class NearDuplicateIndex:
+    """
+    Near-duplicate detector for headlines
+
+    Each headline becomes a MinHash signature over its word tokens. The
+    signature is split into LSH bands; headlines sharing a band are compared
+    by estimated Jaccard similarity. Entries live in a fixed-capacity ring
+    buffer and are evicted when older than max_age_sec or overwritten.
+
+    Args:
+        threshold: Jaccard similarity at or above which headlines are duplicates
+        num_perm: MinHash signature length
+        bands: Number of LSH bands (num_perm must be divisible by it)
+        capacity: Ring buffer size
+        max_age_sec: Entries older than this are evicted
+        clock: Time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        bands: int = 8,
+        capacity: int = 5000,
+        max_age_sec: float = 86400,
+        min_tokens: int = 3,
+        seed: int = 1,
+        clock: Callable[[], float] = time.time,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.capacity = capacity
+        self.max_age_sec = max_age_sec
+        self.min_tokens = min_tokens
+        self.clock = clock
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2**31, size=(num_perm, 1)).astype(np.uint64)
+        self._b = rng.randint(0, 2**31, size=(num_perm, 1)).astype(np.uint64)
+
+        # Ring buffer slots
+        self._sigs = np.zeros((capacity, num_perm), dtype=np.uint64)
+        self._keys: List[Optional[str]] = [None] * capacity
+        self._bands: List[Optional[Tuple[bytes, ...]]] = [None] * capacity
+        self._added: List[float] = [0.0] * capacity
+        self._head = 0  # oldest live slot
+        self._size = 0
+
+        self._exact: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, bytes], Set[int]] = {}
+
+        self.stats = {"checked": 0, "exact": 0, "near": 0, "evicted": 0}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of text's token set (None for short texts)"""
+        tokens = set(normalize_text(text).split())
+        if len(tokens) < self.min_tokens:
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(t.encode()) for t in tokens), dtype=np.uint64, count=len(tokens)
+        )
+        return ((self._a * hashes + self._b) % _MINHASH_PRIME).min(axis=1)
+
+    def _band_keys(self, sig: np.ndarray) -> Tuple[bytes, ...]:
+        r = self.rows
+        return tuple(sig[i * r : (i + 1) * r].tobytes() for i in range(self.bands))
+
+    def _evict_slot(self, slot: int):
+        key = self._keys[slot]
+        if key is not None and self._exact.get(key) == slot:
+            del self._exact[key]
+        bands = self._bands[slot]
+        if bands is not None:
+            for i, band in enumerate(bands):
+                bucket = self._buckets.get((i, band))
+                if bucket is not None:
+                    bucket.discard(slot)
+                    if not bucket:
+                        del self._buckets[(i, band)]
+        self._keys[slot] = None
+        self._bands[slot] = None
+        self._head = (self._head + 1) % self.capacity
+        self._size -= 1
+        self.stats["evicted"] += 1
+
+    def _evict_expired(self, now: float):
+        cutoff = now - self.max_age_sec
+        while self._size and self._added[self._head] < cutoff:
+            self._evict_slot(self._head)
+
+    def _similar(self, sig: np.ndarray, bands: Tuple[bytes, ...]) -> bool:
+        candidates: Set[int] = set()
+        for i, band in enumerate(bands):
+            bucket = self._buckets.get((i, band))
+            if bucket:
+                candidates.update(bucket)
+        for slot in candidates:
+            if float(np.mean(self._sigs[slot] == sig)) >= self.threshold:
+                return True
+        return False
+
+    def check_and_add(self, text: str) -> bool:
+        """
+        Check text against the index and remember it if new
+
+        Returns:
+            True if text is an exact or near duplicate of a live entry
+        """
+        now = self.clock()
+        self._evict_expired(now)
+        self.stats["checked"] += 1
+
+        normalized = normalize_text(text)
+        key = hashlib.md5(normalized.encode()).hexdigest()
+        if key in self._exact:
+            self.stats["exact"] += 1
+            return True
+
+        sig = self.signature(normalized)
+        bands = self._band_keys(sig) if sig is not None else None
+        if bands is not None and self._similar(sig, bands):
+            self.stats["near"] += 1
+            return True
+
+        if self._size == self.capacity:
+            self._evict_slot(self._head)
+        slot = (self._head + self._size) % self.capacity
+        self._size += 1
+        self._keys[slot] = key
+        self._added[slot] = now
+        self._exact[key] = slot
+        if bands is not None:
+            self._sigs[slot] = sig
+            self._bands[slot] = bands
+            for i, band in enumerate(bands):
+                self._buckets.setdefault((i, band), set()).add(slot)
+        return False
+
+    def clear(self):
+        while self._size:
+            self._evict_slot(self._head)
+
+
+def dedupe_texts(texts: Sequence[str], **index_kwargs) -> List[int]:
+    """Indices of texts that are not near-duplicates of an earlier one"""
+    # One batch never needs more slots than it has texts
+    index_kwargs.setdefault("capacity", max(1, len(texts)))
+    index = NearDuplicateIndex(**index_kwargs)
+    return [i for i, t in enumerate(texts) if not index.check_and_add(t)]
@@ -1,11 +1,14 @@
+import hashlib
 import json
 import os
 import secrets
 from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import requests
 
+from utils.cache import TTLCache
 from utils.redis_client import get_redis
 
 BASE = os.getenv("UW_BASE_URL", "https://api.unusualwhales.com").rstrip("/")
@@ -16,6 +19,8 @@ HIST_PATH = os.getenv("UW_FLOW_HIST_PATH", "/v1/options/flow/historical")
 NEWS_PATH = os.getenv("UW_NEWS_PATH", "/v1/news/flow")
 CONG_PATH = os.getenv("UW_CONGRESS_PATH", "/v1/congress/flow")
 INSD_PATH = os.getenv("UW_INSIDERS_PATH", "/v1/insiders/flow")
+FLOW_FILTER_CACHE_SIZE = int(os.getenv("FLOW_FILTER_CACHE_SIZE", "512"))
+FLOW_RESULT_CACHE_SIZE = int(os.getenv("FLOW_RESULT_CACHE_SIZE", "2048"))
 
 
 def _hdr():
@@ -135,6 +140,8 @@ def _generate_mock_data(path: str) -> Dict[str, Any]:
 
 
 def _apply_filters(item: Dict[str, Any], f: Dict[str, Any]):
+    """Per-item reference filter; live/historical flow use compile_filters."""
+
     def inc(key, coll):
         return not coll or (str(item.get(key, "")).upper() in {x.upper() for x in coll})
 
@@ -197,29 +204,300 @@ def _apply_filters(item: Dict[str, Any], f: Dict[str, Any]):
     return True
 
 
+# =============================================================================
+# Compiled filters
+# =============================================================================
+
+_TEXT_FILTERS = (
+    # (filter key, item key, case, empty value passes)
+    ("tickers", "symbol", "upper", False),
+    ("side", "side", "upper", False),
+    ("kinds", "kind", "lower", True),
+    ("opt_types", "type", "upper", False),
+)
+_RANGE_FILTERS = ("price", "chance")
+_EXECUTIONS = ("above_ask", "below_bid")
+
+
+class _Unvectorizable(Exception):
+    """A row the mask cannot decide like the per-item filter (bad number)."""
+
+
+def filter_key(f: Dict[str, Any]) -> str:
+    """Canonical form of a filter spec: equal keys filter identically."""
+    norm: Dict[str, Any] = {}
+    for name, _, case, _ in _TEXT_FILTERS:
+        if f.get(name):
+            norm[name] = sorted({getattr(x, case)() for x in f[name]})
+    for flag in ("otm", "vol_gt_oi", "above_ask_below_bid"):
+        if f.get(flag):
+            norm[flag] = True
+    for name in _RANGE_FILTERS:
+        if f.get(f"{name}_op"):
+            norm[f"{name}_op"] = f[f"{name}_op"]
+            norm[f"{name}_val"] = f.get(f"{name}_val")
+    for name in ("min_dte", "max_dte"):
+        if f.get(name) is not None:
+            norm[name] = f[name]
+    return json.dumps(norm, sort_keys=True, default=repr)
+
+
+class FlowBatch:
+    """Columnar view of flow events; each column is parsed once, on first use.
+
+    Text columns are factorized (codes into the distinct values) so a set
+    filter is decided once per distinct value. Numeric columns hold float64
+    values plus "present" and "bad" (unparseable) masks.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], fingerprint: Optional[str] = None):
+        self.items = items
+        self.fingerprint = fingerprint
+        self._columns: Dict[tuple, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def text(self, key: str, case: str) -> Tuple[List[str], np.ndarray]:
+        col = ("text", key, case)
+        if col not in self._columns:
+            index: Dict[str, int] = {}
+            codes = np.fromiter(
+                (
+                    index.setdefault(getattr(str(x.get(key, "")), case)(), len(index))
+                    for x in self.items
+                ),
+                dtype=np.int64,
+                count=len(self.items),
+            )
+            self._columns[col] = (list(index), codes)
+        return self._columns[col]
+
+    def number(
+        self, key: str, truthy: bool = False, cast=float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(present, values, bad); present is `item.get(key)` truthy or not None"""
+        col = ("number", key, truthy, cast)
+        if col not in self._columns:
+            n = len(self.items)
+            present = np.zeros(n, dtype=bool)
+            values = np.full(n, np.nan)
+            bad = np.zeros(n, dtype=bool)
+            for i, x in enumerate(self.items):
+                v = x.get(key)
+                if v if truthy else v is not None:
+                    present[i] = True
+                    try:
+                        values[i] = cast(v)
+                    except Exception:
+                        bad[i] = True
+            self._columns[col] = (present, values, bad)
+        return self._columns[col]
+
+
+class FlowFilter:
+    """A filter spec compiled once: lookup sets and bounds are prebuilt.
+
+    Call it on one item (same result as _apply_filters), or use apply() on a
+    FlowBatch to evaluate it as a vectorized mask. Rows the mask cannot
+    decide exactly (unparseable numbers) fall back to the per-item path, so
+    errors surface as they always did.
+    """
+
+    def __init__(self, f: Dict[str, Any]):
+        self.key = filter_key(f)
+        self.text = [
+            (key, case, {getattr(x, case)() for x in f[name]}, empty_ok)
+            for name, key, case, empty_ok in _TEXT_FILTERS
+            if f.get(name)
+        ]
+        self.otm = bool(f.get("otm"))
+        self.vol_gt_oi = bool(f.get("vol_gt_oi"))
+        self.above_ask_below_bid = bool(f.get("above_ask_below_bid"))
+        self.ranges = [
+            (name, f[f"{name}_op"], f.get(f"{name}_val"))
+            for name in _RANGE_FILTERS
+            if f.get(f"{name}_op")
+        ]
+        self.vectorizable = all(
+            op not in ("lt", "gt") or isinstance(val, (int, float))
+            for _, op, val in self.ranges
+        )
+        self.dte = []
+        for name in ("min_dte", "max_dte"):
+            bound = f.get(name)
+            if bound is None:
+                self.dte.append(None)
+                continue
+            try:
+                self.dte.append(int(bound))
+            except (TypeError, ValueError):
+                self.dte.append(bound)  # int() raises per row, as before
+                self.vectorizable = False
+        self.is_empty = not (
+            self.text
+            or self.otm
+            or self.vol_gt_oi
+            or self.above_ask_below_bid
+            or self.ranges
+            or any(b is not None for b in self.dte)
+        )
+
+    def __call__(self, item: Dict[str, Any]) -> bool:
+        for key, case, allowed, empty_ok in self.text:
+            value = getattr(str(item.get(key, "")), case)()
+            if value not in allowed and not (empty_ok and not value):
+                return False
+        if self.otm and item.get("moneyness") and float(item["moneyness"]) <= 1.0:
+            return False
+        if (
+            self.vol_gt_oi
+            and item.get("volume")
+            and item.get("oi")
+            and float(item["volume"]) <= float(item["oi"])
+        ):
+            return False
+        if (
+            self.above_ask_below_bid
+            and str(item.get("execution", "")).lower() not in _EXECUTIONS
+        ):
+            return False
+        for name, op, val in self.ranges:
+            if item.get(name) is not None:
+                x = float(item[name])
+                if op == "lt" and not (x < val):
+                    return False
+                if op == "gt" and not (x > val):
+                    return False
+        d = item.get("dte")
+        if d is not None:
+            md, M = self.dte
+            if md is not None and int(d) < int(md):
+                return False
+            if M is not None and int(d) > int(M):
+                return False
+        return True
+
+    def mask(self, batch: FlowBatch) -> np.ndarray:
+        """Boolean mask of matching rows; raises _Unvectorizable on bad rows."""
+        alive = np.ones(len(batch), dtype=bool)
+
+        def reject(applies: np.ndarray, bad: np.ndarray, rejected: np.ndarray):
+            if (applies & bad).any():
+                raise _Unvectorizable()
+            alive[applies & rejected] = False
+
+        for key, case, allowed, empty_ok in self.text:
+            values, codes = batch.text(key, case)
+            ok = np.array(
+                [v in allowed or (empty_ok and not v) for v in values], dtype=bool
+            )
+            alive &= ok[codes]
+        if self.otm:
+            present, values, bad = batch.number("moneyness", truthy=True)
+            reject(alive & present, bad, values <= 1.0)
+        if self.vol_gt_oi:
+            pv, volume, bv = batch.number("volume", truthy=True)
+            po, oi, bo = batch.number("oi", truthy=True)
+            reject(alive & pv & po, bv | bo, volume <= oi)
+        if self.above_ask_below_bid:
+            values, codes = batch.text("execution", "lower")
+            alive &= np.array([v in _EXECUTIONS for v in values], dtype=bool)[codes]
+        for name, op, val in self.ranges:
+            present, values, bad = batch.number(name)
+            if op == "lt":
+                rejected = ~(values < val)
+            elif op == "gt":
+                rejected = ~(values > val)
+            else:
+                rejected = np.zeros(len(batch), dtype=bool)
+            reject(alive & present, bad, rejected)
+        md, M = self.dte
+        if md is not None or M is not None:
+            present, values, bad = batch.number("dte", cast=int)
+            rejected = np.zeros(len(batch), dtype=bool)
+            if md is not None:
+                rejected |= values < md
+            if M is not None:
+                rejected |= values > M
+            reject(alive & present, bad, rejected)
+        return alive
+
+    def apply(self, batch: FlowBatch) -> List[Dict[str, Any]]:
+        """Matching items of a batch, in order."""
+        if self.is_empty:
+            return list(batch.items)
+        if self.vectorizable and len(batch):
+            try:
+                return [batch.items[i] for i in np.flatnonzero(self.mask(batch))]
+            except _Unvectorizable:
+                pass
+        return [x for x in batch.items if self(x)]
+
+    def select(self, batch: FlowBatch) -> List[Dict[str, Any]]:
+        """apply(), with results shared by every client of this spec and batch."""
+        if batch.fingerprint is None:
+            return self.apply(batch)
+        cache_key = (batch.fingerprint, self.key)
+        out = _flow_results.get(cache_key)
+        if out is None:
+            out = self.apply(batch)
+            _flow_results.put(cache_key, out)
+        return out
+
+
+_compiled_filters = TTLCache(maxsize=FLOW_FILTER_CACHE_SIZE, ttl=3600)
+_flow_results = TTLCache(maxsize=FLOW_RESULT_CACHE_SIZE, ttl=TTL)
+_flow_batches = TTLCache(maxsize=16, ttl=TTL)
+
+
+def compile_filters(f: Dict[str, Any] | None) -> FlowFilter:
+    """Compiled filter for a spec; identical specs share one instance."""
+    f = f or {}
+    key = filter_key(f)
+    compiled = _compiled_filters.get(key)
+    if compiled is None:
+        compiled = FlowFilter(f)
+        _compiled_filters.put(key, compiled)
+    return compiled
+
+
+def _flow_items(raw: Any) -> List[Dict[str, Any]]:
+    return raw.get("data") or raw.get("flow") or (raw if isinstance(raw, list) else [])
+
+
+def _live_batch(payload: str | bytes) -> FlowBatch:
+    """Parse a cached live payload once per distinct payload."""
+    data = payload.encode() if isinstance(payload, str) else payload
+    fp = hashlib.blake2b(data, digest_size=16).hexdigest()
+    batch = _flow_batches.get(fp)
+    if batch is None:
+        batch = FlowBatch(_flow_items(json.loads(payload)), fingerprint=fp)
+        _flow_batches.put(fp, batch)
+    return batch
+
+
 def live_flow(filters: Dict[str, Any] | None = None):
-    filters = filters or {}
+    compiled = compile_filters(filters)
     r = get_redis()
     key = "uw:flow:live"
     try:
         c = r.get(key)
-        raw = json.loads(c) if c else _get(LIVE_PATH, {})
         if not c:
-            r.set(key, json.dumps(raw), ex=TTL)
+            c = json.dumps(_get(LIVE_PATH, {}))
+            r.set(key, c, ex=TTL)
+        batch = _live_batch(c)
     except Exception:
-        raw = _get(LIVE_PATH, {})
+        batch = FlowBatch(_flow_items(_get(LIVE_PATH, {})))
 
-    arr = raw.get("data") or raw.get("flow") or (raw if isinstance(raw, list) else [])
-    out = [x for x in arr if _apply_filters(x, filters)]
-    return {"items": out}
+    # copies: cached rows are shared between clients
+    return {"items": [dict(x) for x in compiled.select(batch)]}
 
 
 def historical_flow(params: Dict[str, Any] | None = None):
     params = params or {}
     raw = _get(HIST_PATH, params)
-    arr = raw.get("data") or raw.get("flow") or (raw if isinstance(raw, list) else [])
-    out = [x for x in arr if _apply_filters(x, params)]
-    return {"items": out}
+    return {"items": compile_filters(params).apply(FlowBatch(_flow_items(raw)))}
 
 
 def news_flow(params=None):
@@ -258,3 +536,52 @@ def summary_from_live():
     b1 = sorted(bull.values(), key=lambda z: z["premium"], reverse=True)[:50]
     b2 = sorted(bear.values(), key=lambda z: z["premium"], reverse=True)[:50]
     return {"bullish": b1, "bearish": b2}
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    rng = random.Random(1)
+    events = []
+    while len(events) < 5000:
+        events.extend(_generate_mock_data(LIVE_PATH)["data"])
+    specs = [
+        {
+            "tickers": rng.sample(["TSLA", "AAPL", "NVDA", "SPY", "QQQ", "META"], 2),
+            "side": rng.choice([None, ["buy"]]),
+            "kinds": rng.choice([None, ["sweep", "block"]]),
+            "otm": rng.random() < 0.5,
+            "vol_gt_oi": rng.random() < 0.3,
+            "price_op": rng.choice([None, "gt"]),
+            "price_val": 5.0,
+            "min_dte": rng.choice([None, 7]),
+            "max_dte": 180,
+        }
+        for _ in range(20)
+    ]
+    clients = [specs[i % len(specs)] for i in range(200)]
+    n = len(events) * len(clients)
+
+    start = time.perf_counter()
+    baseline = [[x for x in events if _apply_filters(x, f)] for f in clients]
+    per_item = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = FlowBatch(events)
+    compiled = [compile_filters(f).apply(batch) for f in clients]
+    masked = time.perf_counter() - start
+
+    _flow_results.invalidate()
+    start = time.perf_counter()
+    batch = FlowBatch(events, fingerprint="bench")
+    shared = [compile_filters(f).select(batch) for f in clients]
+    cached = time.perf_counter() - start
+
+    assert baseline == compiled == shared
+    print(
+        f"{len(clients)} clients ({len(specs)} distinct specs) x {len(events)} events"
+    )
+    print(f"  per-item dict filters: {n / per_item:>12,.0f} events/s")
+    print(f"  compiled masks:        {n / masked:>12,.0f} events/s")
+    print(f"  + shared result sets:  {n / cached:>12,.0f} events/s")
@@ -43,8 +43,9 @@ async def warmup_options_chain(symbol: str) -> bool:
 
         logger.debug(f" Warming up options chain for {symbol}...")
 
-        # Fetch chain (will be cached automatically)
-        result = fetch_chain(None, symbol.upper())
+        # Fetch chain (will be cached automatically); fetch_chain is sync,
+        # so run it in a thread to keep startup requests flowing
+        result = await asyncio.to_thread(fetch_chain, None, symbol.upper())
 
         if result and result.get("raw"):
             logger.info(f" Warmed up {symbol} options chain")
@@ -62,6 +63,9 @@ async def warmup_spot_prices(symbols: List[str]) -> int:
     """
     Warm up spot price cache for multiple symbols
 
+    All symbols go through the quote gateway in one call, so they are
+    fetched as a single multi-symbol TradeStation request.
+
     Args:
         symbols: List of ticker symbols
 
@@ -71,24 +75,17 @@ async def warmup_spot_prices(symbols: List[str]) -> int:
     success_count = 0
 
     try:
-        from services.providers import get_provider
-
-        provider = get_provider()
-
-        for symbol in symbols:
-            try:
-                logger.debug(f" Warming up spot price for {symbol}...")
+        from services.quote_gateway import get_quote_gateway
 
-                if hasattr(provider, "get_quote"):
-                    quote = provider.get_quote(symbol.upper())
-                    if quote:
-                        success_count += 1
-                        logger.info(f" Warmed up {symbol} spot price")
-                else:
-                    logger.debug(" Provider doesn't support get_quote")
+        logger.debug(f" Warming up spot prices for {len(symbols)} symbols...")
+        quotes = await get_quote_gateway().get_quotes(symbols)
 
-            except Exception as e:
-                logger.warning(f" Spot price warmup failed for {symbol}: {e}")
+        for symbol, quote in quotes.items():
+            if quote:
+                success_count += 1
+                logger.info(f" Warmed up {symbol} spot price")
+            else:
+                logger.warning(f" Spot price warmup failed for {symbol}")
 
     except Exception as e:
         logger.error(f" Spot price warmup error: {e}")
@@ -127,6 +124,41 @@ async def warmup_flow_data(limit: int = 10) -> bool:
         return False
 
 
+async def warmup_mindfolio_intel() -> int:
+    """
+    Warm up news intelligence for every symbol held in any mindfolio
+
+    Fills the shared per-symbol cache used by mindfolio news digests and
+    /api/geopolitical/ticker.
+
+    Returns:
+        Number of symbols warmed
+    """
+    try:
+        # Import here to avoid circular dependencies
+        from geopolitical_news_agent import GeopoliticalNewsAgent
+        from mindfolio import get_mindfolio_positions, pf_list
+
+        symbols = []
+        for mindfolio in await pf_list():
+            for position in await get_mindfolio_positions(mindfolio.id):
+                if position.qty:
+                    symbols.append(position.symbol.upper())
+        symbols = list(dict.fromkeys(symbols))
+
+        if not symbols:
+            logger.info(" No held symbols to warm news intelligence for")
+            return 0
+
+        warmed = await GeopoliticalNewsAgent().prewarm(symbols)
+        logger.info(f" Warmed up news intelligence for {warmed}/{len(symbols)} held symbols")
+        return warmed
+
+    except Exception as e:
+        logger.warning(f" Mindfolio intel warmup failed: {e}")
+        return 0
+
+
 async def warmup_single_symbol(symbol: str) -> dict:
     """
     Warm up all data for a single symbol
@@ -178,12 +210,20 @@ async def warmup_cache(
     stats = {
         "symbols_processed": 0,
         "chains_warmed": 0,
+        "spots_warmed": 0,
+        "intel_warmed": 0,
         "flow_warmed": False,
         "duration_seconds": 0,
         "errors": [],
     }
 
     try:
+        # Spot prices for all symbols in one batched quote request
+        stats["spots_warmed"] = await warmup_spot_prices(symbols)
+
+        # News intelligence for symbols held in any mindfolio
+        stats["intel_warmed"] = await warmup_mindfolio_intel()
+
         if parallel:
             # Run all warmups in parallel
             tasks = []
@@ -241,6 +281,8 @@ async def warmup_cache(
         logger.info(" Cache warmup completed!")
         logger.info(f" Symbols processed: {stats['symbols_processed']}/{len(symbols)}")
         logger.info(f" Chains warmed: {stats['chains_warmed']}")
+        logger.info(f" Spots warmed: {stats['spots_warmed']}")
+        logger.info(f" Intel warmed: {stats['intel_warmed']}")
         logger.info(f" Flow warmed: {stats['flow_warmed']}")
         logger.info(f" Duration: {stats['duration_seconds']}s")
         if stats["errors"]:
@@ -5,17 +5,63 @@ AI/ML-powered mindfolio rebalancing recommendations with Smart DCA algorithms
 
 import asyncio
 import logging
+import os
 import secrets
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Mindfolio / market inputs shared by all endpoints of the service
+SMART_REBALANCE_DATA_TTL = float(os.getenv("SMART_REBALANCE_DATA_TTL", "30"))
+SMART_REBALANCE_CACHE_SIZE = int(os.getenv("SMART_REBALANCE_CACHE_SIZE", "256"))
+
+# {name: (section coroutine function, names of the sections it takes as args)}
+SectionGraph = Dict[str, Tuple[Callable[..., Awaitable[Any]], Sequence[str]]]
+
+
+async def run_section_graph(sections: SectionGraph) -> Dict[str, Any]:
+    """
+    Run a graph of analysis sections, each as soon as its inputs are ready
+
+    Every section is called once with the results of its dependencies as
+    positional args, so independent sections run concurrently and latency
+    follows the longest dependency chain instead of the sum of all sections.
+    If any section fails the remaining ones are cancelled and the error is
+    raised.
+    """
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run(fn, deps):
+        args = await asyncio.gather(*deps)
+        return await fn(*args)
+
+    def schedule(name: str) -> asyncio.Task:
+        if name not in tasks:
+            fn, deps = sections[name]
+            tasks[name] = asyncio.ensure_future(run(fn, [schedule(d) for d in deps]))
+        return tasks[name]
+
+    for name in sections:
+        schedule(name)
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    return {name: task.result() for name, task in tasks.items()}
+
 
 class SmartRebalancingService:
     def __init__(self):
         self.logger = logger
         self.ml_models_loaded = False
+        self._inputs = TTLCache(
+            maxsize=SMART_REBALANCE_CACHE_SIZE, ttl=SMART_REBALANCE_DATA_TTL
+        )
 
     async def analyze_mindfolio_comprehensive(
         self, mindfolio_id: str
@@ -28,31 +74,35 @@ class SmartRebalancingService:
                 f"Running comprehensive AI analysis for mindfolio {mindfolio_id}"
             )
 
-            # Simulate ML model loading
-            await self._load_ml_models()
-
-            # Get current mindfolio data
-            mindfolio_data = await self._get_mindfolio_data(mindfolio_id)
+            # ML model loading runs alongside the data load and the sections
+            # (none of them reads model state yet)
+            results = await run_section_graph(
+                {
+                    "ml_models": (self._load_ml_models, ()),
+                    "data": (lambda: self._mindfolio_inputs(mindfolio_id), ()),
+                    "mindfolio_health": (self._calculate_mindfolio_health, ("data",)),
+                    "diversification_score": (
+                        self._calculate_diversification_score,
+                        ("data",),
+                    ),
+                    "risk_score": (self._calculate_risk_score, ("data",)),
+                    "leverage_ratio": (self._calculate_leverage_ratio, ("data",)),
+                    "concentration_risk": (
+                        self._assess_concentration_risk,
+                        ("data",),
+                    ),
+                    "sector_allocation": (self._analyze_sector_allocation, ("data",)),
+                    "ai_insights": (self._generate_ai_insights, ("data",)),
+                }
+            )
 
             # Run AI analysis modules
             analysis = {
-                "mindfolio_health": await self._calculate_mindfolio_health(
-                    mindfolio_data
-                ),
-                "diversification_score": await self._calculate_diversification_score(
-                    mindfolio_data
-                ),
-                "risk_score": await self._calculate_risk_score(mindfolio_data),
-                "leverage_ratio": await self._calculate_leverage_ratio(mindfolio_data),
-                "concentration_risk": await self._assess_concentration_risk(
-                    mindfolio_data
-                ),
-                "sector_allocation": await self._analyze_sector_allocation(
-                    mindfolio_data
-                ),
-                "ai_insights": await self._generate_ai_insights(mindfolio_data),
-                "timestamp": datetime.now().isoformat(),
+                name: result
+                for name, result in results.items()
+                if name not in ("ml_models", "data")
             }
+            analysis["timestamp"] = datetime.now().isoformat()
 
             return {
                 "status": "success",
@@ -78,34 +128,34 @@ class SmartRebalancingService:
                 f"Generating rebalancing recommendations for mindfolio {mindfolio_id}"
             )
 
-            # Get mindfolio analysis
-            mindfolio_data = await self._get_mindfolio_data(mindfolio_id)
-            market_conditions = await self._get_market_conditions()
-
-            # Generate different types of recommendations
-            recommendations = []
-
-            # Mindfolio rebalancing recommendations
-            rebalance_recs = await self._generate_rebalance_recommendations(
-                mindfolio_data, market_conditions
+            results = await run_section_graph(
+                {
+                    "data": (lambda: self._mindfolio_inputs(mindfolio_id), ()),
+                    "market": (self._market_inputs, ()),
+                    # Mindfolio rebalancing recommendations
+                    "rebalance": (
+                        self._generate_rebalance_recommendations,
+                        ("data", "market"),
+                    ),
+                    # Options management recommendations
+                    "options": (self._generate_options_recommendations, ("data",)),
+                    # Position sizing recommendations
+                    "sizing": (
+                        self._generate_position_sizing_recommendations,
+                        ("data",),
+                    ),
+                    # Smart DCA recommendations
+                    "dca": (
+                        self._generate_smart_dca_recommendations,
+                        ("data", "market"),
+                    ),
+                }
             )
-            recommendations.extend(rebalance_recs)
 
-            # Options management recommendations
-            options_recs = await self._generate_options_recommendations(mindfolio_data)
-            recommendations.extend(options_recs)
-
-            # Position sizing recommendations
-            sizing_recs = await self._generate_position_sizing_recommendations(
-                mindfolio_data
-            )
-            recommendations.extend(sizing_recs)
-
-            # Smart DCA recommendations
-            dca_recs = await self._generate_smart_dca_recommendations(
-                mindfolio_data, market_conditions
-            )
-            recommendations.extend(dca_recs)
+            # Different types of recommendations, in a fixed order
+            recommendations = []
+            for name in ("rebalance", "options", "sizing", "dca"):
+                recommendations.extend(results[name])
 
             return {
                 "status": "success",
@@ -133,11 +183,23 @@ class SmartRebalancingService:
                 f"Analyzing Smart DCA opportunities for mindfolio {mindfolio_id}"
             )
 
-            # Get market data and conditions
-            market_conditions = await self._get_market_conditions()
-
-            # Run bottom-finding algorithms
-            dca_opportunities = await self._find_dca_opportunities(market_conditions)
+            # Market conditions -> bottom-finding -> DCA strategy details
+            results = await run_section_graph(
+                {
+                    "market": (self._market_inputs, ()),
+                    "opportunities": (self._find_dca_opportunities, ("market",)),
+                    "expected_return": (
+                        self._calculate_expected_dca_return,
+                        ("opportunities",),
+                    ),
+                    "risk_level": (self._assess_dca_risk_level, ("opportunities",)),
+                    "market_timing_score": (
+                        self._calculate_market_timing_score,
+                        ("market",),
+                    ),
+                }
+            )
+            dca_opportunities = results["opportunities"]
 
             # Calculate DCA strategy details
             dca_analysis = {
@@ -145,14 +207,10 @@ class SmartRebalancingService:
                 "total_capital_required": sum(
                     opp.get("capital_required", 0) for opp in dca_opportunities
                 ),
-                "expected_return": await self._calculate_expected_dca_return(
-                    dca_opportunities
-                ),
-                "risk_level": await self._assess_dca_risk_level(dca_opportunities),
+                "expected_return": results["expected_return"],
+                "risk_level": results["risk_level"],
                 "opportunities": dca_opportunities,
-                "market_timing_score": await self._calculate_market_timing_score(
-                    market_conditions
-                ),
+                "market_timing_score": results["market_timing_score"],
             }
 
             return {
@@ -175,26 +233,25 @@ class SmartRebalancingService:
         try:
             self.logger.info(f"Analyzing risk management for mindfolio {mindfolio_id}")
 
-            mindfolio_data = await self._get_mindfolio_data(mindfolio_id)
+            metrics = {
+                "overall_risk": self._calculate_overall_risk,
+                "beta": self._calculate_mindfolio_beta,
+                "var_95": self._calculate_var_95,
+                "max_drawdown": self._calculate_max_drawdown,
+                "correlation_sp500": self._calculate_sp500_correlation,
+                "volatility": self._calculate_mindfolio_volatility,
+                "sharpe_ratio": self._calculate_sharpe_ratio,
+                "risk_factors": self._identify_risk_factors,
+                "risk_mitigation_suggestions": self._generate_risk_mitigation,
+            }
+            graph: SectionGraph = {
+                "data": (lambda: self._mindfolio_inputs(mindfolio_id), ())
+            }
+            graph.update({name: (fn, ("data",)) for name, fn in metrics.items()})
+            results = await run_section_graph(graph)
 
             # Calculate various risk metrics
-            risk_analysis = {
-                "overall_risk": await self._calculate_overall_risk(mindfolio_data),
-                "beta": await self._calculate_mindfolio_beta(mindfolio_data),
-                "var_95": await self._calculate_var_95(mindfolio_data),
-                "max_drawdown": await self._calculate_max_drawdown(mindfolio_data),
-                "correlation_sp500": await self._calculate_sp500_correlation(
-                    mindfolio_data
-                ),
-                "volatility": await self._calculate_mindfolio_volatility(
-                    mindfolio_data
-                ),
-                "sharpe_ratio": await self._calculate_sharpe_ratio(mindfolio_data),
-                "risk_factors": await self._identify_risk_factors(mindfolio_data),
-                "risk_mitigation_suggestions": await self._generate_risk_mitigation(
-                    mindfolio_data
-                ),
-            }
+            risk_analysis = {name: results[name] for name in metrics}
 
             return {
                 "status": "success",
@@ -294,6 +351,18 @@ class SmartRebalancingService:
             await asyncio.sleep(0.1)  # Simulate loading time
             self.ml_models_loaded = True
 
+    async def _mindfolio_inputs(self, mindfolio_id: str) -> Dict[str, Any]:
+        """Mindfolio data, loaded once per TTL and shared by all endpoints"""
+        return await self._inputs.get_or_compute(
+            ("mindfolio", mindfolio_id), lambda: self._get_mindfolio_data(mindfolio_id)
+        )
+
+    async def _market_inputs(self) -> Dict[str, Any]:
+        """Market conditions, loaded once per TTL and shared by all endpoints"""
+        return await self._inputs.get_or_compute(
+            ("market",), self._get_market_conditions
+        )
+
     async def _get_mindfolio_data(self, mindfolio_id: str) -> Dict[str, Any]:
         """Get mindfolio data for analysis"""
         # Mock mindfolio data
@@ -532,11 +601,11 @@ class SmartRebalancingService:
 
     async def _calculate_var_95(self, mindfolio_data: Dict) -> float:
         """Calculate 95% Value at Risk"""
-        return round((-0.05 + secrets.randbelow(int((-0.12 - -0.05) * 1000)) / 1000), 3)
+        return round((-0.05 - secrets.randbelow(int((0.12 - 0.05) * 1000)) / 1000), 3)
 
     async def _calculate_max_drawdown(self, mindfolio_data: Dict) -> float:
         """Calculate maximum drawdown"""
-        return round((-0.10 + secrets.randbelow(int((-0.20 - -0.10) * 1000)) / 1000), 3)
+        return round((-0.10 - secrets.randbelow(int((0.20 - 0.10) * 1000)) / 1000), 3)
 
     async def _calculate_sp500_correlation(self, mindfolio_data: Dict) -> float:
         """Calculate correlation with S&P 500"""
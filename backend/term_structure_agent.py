@@ -15,12 +15,24 @@ Author: FlowMind AI Team
 Date: October 15, 2025
 """
 
+import asyncio
 import logging
+import os
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
+import numpy as np
+
+from utils.cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Scan pipeline settings
+TERM_SCAN_CONCURRENCY = int(os.getenv("TERM_SCAN_CONCURRENCY", "16"))
+TERM_CHAIN_TTL = float(os.getenv("TERM_CHAIN_TTL", "60"))
+TERM_CHAIN_CACHE_SIZE = int(os.getenv("TERM_CHAIN_CACHE_SIZE", "1024"))
+
 
 class TermStructureAgent:
     """
@@ -56,12 +68,23 @@ class TermStructureAgent:
         self.min_dte_back = 25  # Minimum DTE for back month
         self.max_dte_back = 50  # Maximum DTE for back month
 
+        # Scan pipeline
+        self.max_concurrency = TERM_SCAN_CONCURRENCY  # In-flight symbols per stage
+        self._chain_cache = TTLCache(maxsize=TERM_CHAIN_CACHE_SIZE, ttl=TERM_CHAIN_TTL)
+        self.last_scan_stats: Dict = {}
+
         logger.info("TermStructureAgent initialized")
 
     async def scan_earnings_calendar(self, days_ahead: int = 30) -> List[Dict]:
         """
         Scan upcoming earnings and calculate term structure opportunities
 
+        The scan runs as a pipeline: chain snapshots are fetched concurrently
+        (bounded, cached per symbol), front/back ATM IV is computed for all
+        candidates in one vectorized pass, names below the forward vol factor
+        threshold are pruned, and only the survivors go through the IV crush,
+        ML and backtest stages (again concurrently).
+
         Args:
         days_ahead: How many days to look ahead for earnings
 
@@ -69,17 +92,27 @@ class TermStructureAgent:
         List of opportunities ranked by quality score
         """
         logger.info(f"Scanning earnings calendar for next {days_ahead} days")
+        started = time.perf_counter()
 
         # Get earnings calendar (demo data for now)
         earnings_calendar = await self._get_earnings_calendar(days_ahead)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        # Stage 1: one chain snapshot per symbol
+        chains = await asyncio.gather(
+            *(
+                self._bounded(semaphore, self._chain_snapshot(stock["symbol"]))
+                for stock in earnings_calendar
+            ),
+            return_exceptions=True,
+        )
 
-        opportunities = []
-
-        for stock in earnings_calendar:
+        # Stage 2: expirations and ATM strike per candidate
+        candidates = []
+        for stock, chain_data in zip(earnings_calendar, chains):
             try:
-                # Get options chain
-                chain_data = await self._get_options_chain(stock["symbol"])
-
+                if isinstance(chain_data, Exception):
+                    raise chain_data
                 if not chain_data:
                     logger.warning(f"No options chain for {stock['symbol']}")
                     continue
@@ -94,140 +127,198 @@ class TermStructureAgent:
                     continue
 
                 # Calculate ATM strike
-                current_price = stock["current_price"]
-                atm_strike = self._round_to_nearest_strike(current_price)
+                atm_strike = self._round_to_nearest_strike(stock["current_price"])
+                candidates.append((stock, chain_data, front_exp, back_exp, atm_strike))
 
-                # Get IV for front and back month at ATM
-                front_iv = self._get_iv_for_strike(
-                    chain_data, front_exp, atm_strike, "call"
-                )
-                back_iv = self._get_iv_for_strike(
-                    chain_data, back_exp, atm_strike, "call"
-                )
+            except Exception as e:
+                logger.error(f"Error processing {stock['symbol']}: {e}")
+                continue
 
-                if not front_iv or not back_iv or back_iv == 0:
+        # Stage 3: front/back ATM IV and forward vol factor for all candidates
+        survivors = []
+        if candidates:
+            chain_list = [c[1] for c in candidates]
+            strikes = [c[4] for c in candidates]
+            front_ivs = self._get_iv_batch(
+                chain_list, [c[2] for c in candidates], strikes, "call"
+            )
+            back_ivs = self._get_iv_batch(
+                chain_list, [c[3] for c in candidates], strikes, "call"
+            )
+            valid = np.isfinite(front_ivs) & np.isfinite(back_ivs)
+            valid &= (front_ivs > 0) & (back_ivs > 0)
+            factors = np.divide(
+                front_ivs, back_ivs, out=np.zeros(len(candidates)), where=valid
+            )
+
+            for i, candidate in enumerate(candidates):
+                if not valid[i]:
                     continue
-
-                # Calculate forward volatility factor
-                fwd_vol_factor = front_iv / back_iv
-
                 # Skip if factor too low (no mispricing)
-                if fwd_vol_factor < self.min_fwd_vol_factor:
+                if factors[i] < self.min_fwd_vol_factor:
                     logger.debug(
-                        f"{stock['symbol']} factor {fwd_vol_factor:.2f} too low"
+                        f"{candidate[0]['symbol']} factor {factors[i]:.2f} too low"
                     )
                     continue
-
-                # Get historical IV crush data
-                historical_crush = await self._get_historical_iv_crush(stock["symbol"])
-
-                # ML prediction for IV crush
-                ml_predicted_crush = None
-                if self.ml_predictor:
-                    ml_predicted_crush = await self.ml_predictor.predict_iv_crush(
-                        symbol=stock["symbol"],
-                        current_iv=front_iv,
-                        sector=stock.get("sector", "Unknown"),
-                        market_cap=stock.get("market_cap", 0),
+                survivors.append(
+                    (
+                        *candidate,
+                        float(front_ivs[i]),
+                        float(back_ivs[i]),
+                        float(factors[i]),
                     )
-
-                # Calculate calendar spread pricing
-                front_call = self._get_option_price(
-                    chain_data, front_exp, atm_strike, "call"
-                )
-                back_call = self._get_option_price(
-                    chain_data, back_exp, atm_strike, "call"
-                )
-
-                if not front_call or not back_call:
-                    continue
-
-                spread_cost = back_call - front_call  # Net debit
-
-                # Estimate profit potential
-                # After earnings, front month IV should drop by crush %
-                estimated_crush = ml_predicted_crush or historical_crush
-                expected_front_value_post_er = front_call * (1 - estimated_crush)
-                expected_profit = (
-                    front_call - expected_front_value_post_er - (spread_cost * 0.1)
-                )  # 10% slippage
-
-                roi = (expected_profit / spread_cost * 100) if spread_cost > 0 else 0
-
-                # Calculate opportunity score
-                # Factors: fwd_vol_factor, historical_crush, ML confidence, liquidity
-                opportunity_score = self._calculate_opportunity_score(
-                    fwd_vol_factor=fwd_vol_factor,
-                    historical_crush=historical_crush,
-                    ml_predicted_crush=ml_predicted_crush,
-                    volume=stock.get("avg_volume", 0),
-                )
-
-                # Backtest this strategy on historical data
-                backtest_results = await self._backtest_calendar_spread(
-                    symbol=stock["symbol"], lookback_quarters=8
                 )
 
-                opportunity = {
-                    "symbol": stock["symbol"],
-                    "company_name": stock.get("company_name", stock["symbol"]),
-                    "earnings_date": stock["earnings_date"],
-                    "days_to_earnings": stock["days_to_earnings"],
-                    "current_price": current_price,
-                    "sector": stock.get("sector", "Unknown"),
-                    "market_cap": stock.get("market_cap", 0),
-                    "atm_strike": atm_strike,
-                    "front_month": {
-                        "expiration": front_exp,
-                        "dte": self._calculate_dte(front_exp),
-                        "iv": front_iv,
-                        "call_price": front_call,
-                    },
-                    "back_month": {
-                        "expiration": back_exp,
-                        "dte": self._calculate_dte(back_exp),
-                        "iv": back_iv,
-                        "call_price": back_call,
-                    },
-                    "forward_vol_factor": fwd_vol_factor,
-                    "spread_cost": spread_cost,
-                    "expected_profit": expected_profit,
-                    "expected_roi": roi,
-                    "iv_crush": {
-                        "historical_avg": historical_crush,
-                        "ml_predicted": ml_predicted_crush,
-                        "confidence": 0.85 if ml_predicted_crush else 0.60,
-                    },
-                    "backtest": backtest_results,
-                    "opportunity_score": opportunity_score,
-                    "risk_rating": self._calculate_risk_rating(
-                        fwd_vol_factor, backtest_results
-                    ),
-                    "trade_recommendation": {
-                        "action": "BUY_CALENDAR_SPREAD",
-                        "entry_timing": f"{stock['days_to_earnings'] - 7} days before ER",
-                        "exit_timing": "1 day after ER announcement",
-                        "position_size": self._recommend_position_size(
-                            opportunity_score, backtest_results
-                        ),
-                        "max_risk_per_contract": spread_cost,
-                        "target_profit_per_contract": expected_profit,
-                    },
-                }
-
-                opportunities.append(opportunity)
-
-            except Exception as e:
-                logger.error(f"Error processing {stock['symbol']}: {e}")
-                continue
+        # Stage 4: IV crush, ML prediction and backtest for the survivors only
+        results = await asyncio.gather(
+            *(
+                self._bounded(semaphore, self._build_opportunity(*survivor))
+                for survivor in survivors
+            )
+        )
+        opportunities = [opp for opp in results if opp is not None]
 
         # Sort by opportunity score
         opportunities.sort(key=lambda x: x["opportunity_score"], reverse=True)
 
+        self.last_scan_stats = {
+            "names": len(earnings_calendar),
+            "candidates": len(candidates),
+            "pruned": len(candidates) - len(survivors),
+            "opportunities": len(opportunities),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            "chain_cache": self._chain_cache.stats(),
+        }
         logger.info(f"Found {len(opportunities)} term structure opportunities")
 
         return opportunities
 
+    async def _bounded(self, semaphore: asyncio.Semaphore, coro):
+        async with semaphore:
+            return await coro
+
+    async def _chain_snapshot(self, symbol: str) -> Optional[Dict]:
+        """Options chain for symbol, shared by concurrent and repeated scans"""
+        return await self._chain_cache.get_or_compute(
+            symbol, lambda: self._get_options_chain(symbol)
+        )
+
+    async def _build_opportunity(
+        self,
+        stock: Dict,
+        chain_data: Dict,
+        front_exp: str,
+        back_exp: str,
+        atm_strike: float,
+        front_iv: float,
+        back_iv: float,
+        fwd_vol_factor: float,
+    ) -> Optional[Dict]:
+        """Price the calendar spread and run the expensive per-symbol stages"""
+        try:
+            # Calculate calendar spread pricing
+            front_call = self._get_option_price(
+                chain_data, front_exp, atm_strike, "call"
+            )
+            back_call = self._get_option_price(chain_data, back_exp, atm_strike, "call")
+
+            if not front_call or not back_call:
+                return None
+
+            # Historical IV crush, ML prediction and backtest are independent
+            ml_prediction = (
+                self.ml_predictor.predict_iv_crush(
+                    symbol=stock["symbol"],
+                    current_iv=front_iv,
+                    sector=stock.get("sector", "Unknown"),
+                    market_cap=stock.get("market_cap", 0),
+                )
+                if self.ml_predictor
+                else asyncio.sleep(0, result=None)
+            )
+            historical_crush, ml_predicted_crush, backtest_results = (
+                await asyncio.gather(
+                    self._get_historical_iv_crush(stock["symbol"]),
+                    ml_prediction,
+                    self._backtest_calendar_spread(
+                        symbol=stock["symbol"], lookback_quarters=8
+                    ),
+                )
+            )
+
+            current_price = stock["current_price"]
+            spread_cost = back_call - front_call  # Net debit
+
+            # Estimate profit potential
+            # After earnings, front month IV should drop by crush %
+            estimated_crush = ml_predicted_crush or historical_crush
+            expected_front_value_post_er = front_call * (1 - estimated_crush)
+            expected_profit = (
+                front_call - expected_front_value_post_er - (spread_cost * 0.1)
+            )  # 10% slippage
+
+            roi = (expected_profit / spread_cost * 100) if spread_cost > 0 else 0
+
+            # Calculate opportunity score
+            # Factors: fwd_vol_factor, historical_crush, ML confidence, liquidity
+            opportunity_score = self._calculate_opportunity_score(
+                fwd_vol_factor=fwd_vol_factor,
+                historical_crush=historical_crush,
+                ml_predicted_crush=ml_predicted_crush,
+                volume=stock.get("avg_volume", 0),
+            )
+
+            return {
+                "symbol": stock["symbol"],
+                "company_name": stock.get("company_name", stock["symbol"]),
+                "earnings_date": stock["earnings_date"],
+                "days_to_earnings": stock["days_to_earnings"],
+                "current_price": current_price,
+                "sector": stock.get("sector", "Unknown"),
+                "market_cap": stock.get("market_cap", 0),
+                "atm_strike": atm_strike,
+                "front_month": {
+                    "expiration": front_exp,
+                    "dte": self._calculate_dte(front_exp),
+                    "iv": front_iv,
+                    "call_price": front_call,
+                },
+                "back_month": {
+                    "expiration": back_exp,
+                    "dte": self._calculate_dte(back_exp),
+                    "iv": back_iv,
+                    "call_price": back_call,
+                },
+                "forward_vol_factor": fwd_vol_factor,
+                "spread_cost": spread_cost,
+                "expected_profit": expected_profit,
+                "expected_roi": roi,
+                "iv_crush": {
+                    "historical_avg": historical_crush,
+                    "ml_predicted": ml_predicted_crush,
+                    "confidence": 0.85 if ml_predicted_crush else 0.60,
+                },
+                "backtest": backtest_results,
+                "opportunity_score": opportunity_score,
+                "risk_rating": self._calculate_risk_rating(
+                    fwd_vol_factor, backtest_results
+                ),
+                "trade_recommendation": {
+                    "action": "BUY_CALENDAR_SPREAD",
+                    "entry_timing": f"{stock['days_to_earnings'] - 7} days before ER",
+                    "exit_timing": "1 day after ER announcement",
+                    "position_size": self._recommend_position_size(
+                        opportunity_score, backtest_results
+                    ),
+                    "max_risk_per_contract": spread_cost,
+                    "target_profit_per_contract": expected_profit,
+                },
+            }
+
+        except Exception as e:
+            logger.error(f"Error processing {stock['symbol']}: {e}")
+            return None
+
     async def _get_earnings_calendar(self, days_ahead: int) -> List[Dict]:
         """Get earnings calendar (demo data for now)"""
         today = datetime.now()
@@ -357,11 +448,24 @@ class TermStructureAgent:
         self, chain_data: Dict, expiration: str, strike: float, option_type: str
     ) -> Optional[float]:
         """Get IV for specific strike (demo data)"""
+        iv = self._get_iv_batch([chain_data], [expiration], [strike], option_type)[0]
+        return float(iv) if np.isfinite(iv) else None
+
+    def _get_iv_batch(
+        self,
+        chains: List[Dict],
+        expirations: List[str],
+        strikes: List[float],
+        option_type: str,
+    ) -> np.ndarray:
+        """
+        Get IV for many (chain, expiration, strike) rows at once (demo data)
+
+        Returns: float array aligned with the inputs, NaN where IV is unknown
+        """
         # Demo: Front-month has elevated IV (80%), back-month normal (45%)
-        if self._calculate_dte(expiration) < 20:
-            return 0.82  # 82% IV for front month (pre-earnings)
-        else:
-            return 0.45  # 45% IV for back month (post-earnings)
+        dte = self._calculate_dte_batch(expirations)
+        return np.where(dte < 20, 0.82, 0.45)
 
     def _get_option_price(
         self, chain_data: Dict, expiration: str, strike: float, option_type: str
@@ -380,6 +484,11 @@ class TermStructureAgent:
         exp_dt = datetime.strptime(expiration, "%Y-%m-%d")
         return (exp_dt - datetime.now()).days
 
+    def _calculate_dte_batch(self, expirations: List[str]) -> np.ndarray:
+        """Days to expiration for many expirations (same rounding as above)"""
+        exp_dt = np.array(expirations, dtype="datetime64[D]").astype("datetime64[us]")
+        return (exp_dt - np.datetime64(datetime.now(), "us")) // np.timedelta64(1, "D")
+
     async def _get_historical_iv_crush(self, symbol: str) -> float:
         """
         Get historical average IV crush for this symbol
@@ -546,3 +655,60 @@ class TermStructureAgent:
             return 3  # Moderate
         else:
             return 1  # Conservative
+
+
+if __name__ == "__main__":
+    # Benchmark: synthetic 500-name calendar with simulated provider latency
+    import random
+
+    class _SyntheticAgent(TermStructureAgent):
+        latency = 0.01
+
+        async def _get_earnings_calendar(self, days_ahead: int) -> List[Dict]:
+            today = datetime.now()
+            rng = random.Random(1)
+            calendar = []
+            for i in range(500):
+                days = 10 + i % 7
+                calendar.append(
+                    {
+                        "symbol": f"SYM{i:03d}",
+                        "earnings_date": (today + timedelta(days=days)).strftime(
+                            "%Y-%m-%d"
+                        ),
+                        "days_to_earnings": days,
+                        "current_price": round(rng.uniform(10, 500), 2),
+                        "avg_volume": rng.randint(100_000, 50_000_000),
+                    }
+                )
+            return calendar
+
+        async def _get_options_chain(self, symbol: str) -> Optional[Dict]:
+            await asyncio.sleep(self.latency)
+            return await super()._get_options_chain(symbol)
+
+        async def _get_historical_iv_crush(self, symbol: str) -> float:
+            await asyncio.sleep(self.latency)
+            return await super()._get_historical_iv_crush(symbol)
+
+        async def _backtest_calendar_spread(
+            self, symbol: str, lookback_quarters: int = 8
+        ) -> Dict:
+            await asyncio.sleep(self.latency)
+            return await super()._backtest_calendar_spread(symbol, lookback_quarters)
+
+    async def _bench(concurrency: int, label: str):
+        agent = _SyntheticAgent()
+        agent.max_concurrency = concurrency
+        for run in ("cold", "warm"):
+            opportunities = await agent.scan_earnings_calendar()
+            stats = agent.last_scan_stats
+            print(
+                f"{label:<16} {run:<5} {stats['elapsed_ms']:>9.1f} ms  "
+                f"{len(opportunities)} opportunities, "
+                f"chain hit rate {stats['chain_cache']['hit_rate']:.0%}"
+            )
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_bench(1, "sequential"))
+    asyncio.run(_bench(TERM_SCAN_CONCURRENCY, f"concurrency={TERM_SCAN_CONCURRENCY}"))
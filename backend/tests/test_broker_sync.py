@@ -0,0 +1,144 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+import mindfolio
+from redis_fallback import AsyncTTLDict
+from services import broker_sync
+from services.broker_sync import BrokerSyncService, FakeBroker, diff_holdings
+
+ACCOUNT = "SIM123"
+
+
+class CountingKV(AsyncTTLDict):
+    def __init__(self):
+        super().__init__()
+        self.writes = {"set": 0, "mset": 0}
+
+    async def set(self, key, value, **kwargs):
+        self.writes["set"] += 1
+        return await super().set(key, value, **kwargs)
+
+    async def mset(self, mapping):
+        self.writes["mset"] += 1
+        return await super().mset(mapping)
+
+
+@pytest.fixture
+def kv(monkeypatch, tmp_path):
+    store = CountingKV()
+
+    async def get_kv():
+        return store
+
+    monkeypatch.setattr(mindfolio, "get_kv", get_kv)
+    monkeypatch.setattr(broker_sync, "get_kv", get_kv)
+    monkeypatch.setattr(mindfolio, "BACKUP_DIR", tmp_path)
+    return store
+
+
+def make_master():
+    master = mindfolio.Mindfolio(
+        id="master_ts",
+        name="TS Master",
+        account_id=ACCOUNT,
+        cash_balance=0.0,
+        is_master=True,
+        created_at="2025-11-02T00:00:00",
+        updated_at="2025-11-02T00:00:00",
+    )
+    return mindfolio.pf_put(master)
+
+
+def test_diff_covers_buys_adds_sells_and_closes():
+    previous = {"AAPL": (10, 100.0), "MSFT": (5, 300.0), "TSLA": (3, 200.0)}
+    live = {"AAPL": (15, 110.0), "MSFT": (2, 300.0), "NVDA": (4, 500.0)}
+
+    assert diff_holdings(previous, live) == [
+        {"type": "add", "symbol": "AAPL", "quantity": 5, "avg_price": 130.0},
+        {"type": "partial_sell", "symbol": "MSFT", "quantity": 3, "avg_price": 300.0},
+        {"type": "new_buy", "symbol": "NVDA", "quantity": 4, "avg_price": 500.0},
+        {"type": "full_sell", "symbol": "TSLA", "quantity": 3, "avg_price": 200.0},
+    ]
+    assert diff_holdings(live, live) == []
+
+
+def test_snapshot_sync_across_thousands_of_positions(kv):
+    rng = random.Random(3)
+    broker = FakeBroker()
+    broker.set_cash(ACCOUNT, 50_000.0)
+    symbols = [f"S{i:04d}" for i in range(3000)]
+    for s in symbols:
+        broker.set_position(ACCOUNT, s, rng.randint(1, 500), rng.randint(5, 400))
+    service = BrokerSyncService(broker_client=broker)
+
+    async def sync():
+        return await service.sync_master_mindfolio("master_ts", token="")
+
+    async def positions():
+        return {
+            p.symbol: p for p in await mindfolio.get_mindfolio_positions("master_ts")
+        }
+
+    async def run():
+        await make_master()
+
+        first = await sync()
+        assert first["diffs"] == {"new_buy": 3000}
+        assert first["snapshot_version"] == 1
+
+        # nothing changed at the broker: one status write, no transactions
+        kv.writes = {"set": 0, "mset": 0}
+        unchanged = await sync()
+        assert unchanged["status"] == "unchanged"
+        assert kv.writes == {"set": 1, "mset": 0}
+
+        # a transfer out of the master must not be bought back by later syncs
+        await mindfolio.tx_create(
+            mindfolio.Transaction(
+                id="transfer_out",
+                mindfolio_id="master_ts",
+                datetime=datetime.now(timezone.utc).isoformat(),
+                symbol="S0000",
+                side="SELL",
+                qty=broker.accounts[ACCOUNT]["positions"]["S0000"][0],
+                price=1.0,
+                created_at="2025-11-02T00:00:00",
+            )
+        )
+
+        changed = rng.sample(symbols[1:], 300)
+        for s in changed[:100]:  # adds
+            qty, price = broker.accounts[ACCOUNT]["positions"][s]
+            broker.set_position(ACCOUNT, s, qty + 10, price + 1)
+        for s in changed[100:200]:  # partial sells
+            qty, price = broker.accounts[ACCOUNT]["positions"][s]
+            broker.set_position(ACCOUNT, s, qty / 2 if qty > 1 else 0, price)
+        for s in changed[200:]:  # closes
+            broker.set_position(ACCOUNT, s, 0, 0)
+        for i in range(50):
+            broker.set_position(ACCOUNT, f"NEW{i}", 7, 12.5)
+        broker.set_cash(ACCOUNT, 42_000.0)
+
+        kv.writes = {"set": 0, "mset": 0}
+        result = await sync()
+        assert result["snapshot_version"] == 2
+        assert sum(result["diffs"].values()) == result["transactions_created"] == 350
+        assert result["diffs"]["add"] == 100 and result["diffs"]["new_buy"] == 50
+        assert result["cash_balance"] == 42_000.0
+        assert kv.writes["mset"] == 1  # all transactions in one batch
+
+        held = await positions()
+        live = broker.accounts[ACCOUNT]["positions"]
+        assert "S0000" not in held
+        assert set(held) == set(live) - {"S0000"}
+        for s, (qty, price) in live.items():
+            if s != "S0000":
+                assert held[s].qty == round(qty, 2)
+            if s in changed[:100] or s.startswith("NEW"):
+                assert held[s].avg_cost == round(price, 2)
+
+    asyncio.run(run())
+    assert broker.calls == {"positions": 3, "balance": 3}
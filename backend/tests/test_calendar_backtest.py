@@ -0,0 +1,137 @@
+import asyncio
+import csv
+import json
+import random
+import statistics
+import time
+
+import pytest
+
+from services.calendar_backtest import EVENT_FIELDS, CalendarBacktest
+
+
+def synthetic_history(n_symbols, n_quarters, seed=5):
+    rng = random.Random(seed)
+    history = {}
+    for i in range(n_symbols):
+        events = []
+        for q in range(rng.randint(0, n_quarters)):
+            spot = rng.uniform(10, 600)
+            events.append(
+                {
+                    "date": f"{2025 - q // 4}-{(q % 4) * 3 + 1:02d}-15",
+                    "spot_price": spot,
+                    "spot_price_post": spot * rng.uniform(0.85, 1.15),
+                    "iv_pre_earnings": rng.uniform(0.3, 1.2),
+                    "iv_normal": rng.uniform(0.2, 0.6),
+                    "iv_crush": rng.uniform(0.0, 0.7),
+                }
+            )
+        history[f"S{i:04d}"] = events
+    return history
+
+
+def reference_pnl(engine, event, position_size=1):
+    """One trade priced the per-event way (entry 7d before, exit 1d after)."""
+
+    def price(spot, strike, dte, iv):
+        return max(0, spot - strike) + (dte**0.5) * iv * spot * 0.04
+
+    strike = float(engine._round_to_strike(event["spot_price"]))
+    crush = event["iv_crush"]
+    entry = price(event["spot_price"], strike, 37, event["iv_normal"]) - price(
+        event["spot_price"], strike, 5, event["iv_pre_earnings"]
+    )
+    exit_ = price(
+        event["spot_price_post"], strike, 29, event["iv_normal"] * (1 - crush * 0.5)
+    )  # front leg has expired
+    return (exit_ - entry) * position_size * 100, entry * position_size * 100
+
+
+def test_vectorized_metrics_match_per_trade_reference():
+    history = synthetic_history(60, 10)
+    engine = CalendarBacktest()
+    engine.historical_earnings = history
+
+    results = engine.backtest_universe(lookback_quarters=8, position_size=2)
+
+    for symbol, events in history.items():
+        trades = [reference_pnl(engine, e, 2) for e in events[:8]]
+        result = results[symbol]
+        if not trades:
+            assert result == engine._empty_backtest_result()
+            continue
+        pnl = [p for p, _ in trades]
+        returns = [p / cost * 100 if cost > 0 else 0 for p, cost in trades]
+        wins = [p for p in pnl if p > 0]
+        losses = [p for p in pnl if p <= 0]
+        cumulative, peak, drawdown = 0.0, 0.0, 0.0
+        for p in pnl:
+            cumulative += p
+            peak = max(peak, cumulative)
+            drawdown = max(drawdown, peak - cumulative)
+        std = statistics.stdev(returns) if len(returns) > 1 else 0
+
+        assert result["trades"] == len(pnl)
+        assert result["wins"] == len(wins)
+        assert result["total_profit"] == pytest.approx(sum(pnl))
+        assert result["max_drawdown"] == pytest.approx(drawdown)
+        assert result["sharpe_ratio"] == pytest.approx(
+            statistics.mean(returns) / std if std > 0 else 0
+        )
+        assert result["profit_factor"] == pytest.approx(
+            sum(wins) / abs(sum(losses)) if losses and sum(losses) else 0
+        )
+        assert result["best_trade"] == pytest.approx(max(pnl))
+
+
+def test_results_cached_per_symbol_and_parameters():
+    engine = CalendarBacktest()
+
+    first = asyncio.run(engine.backtest_symbol("TSLA", lookback_quarters=8))
+    first["win_rate"] = -1  # callers get copies
+    again = asyncio.run(engine.backtest_symbol("TSLA", lookback_quarters=8))
+    other = asyncio.run(engine.backtest_symbol("TSLA", lookback_quarters=4))
+
+    assert again["win_rate"] >= 0 and again["trades"] == 8
+    assert other["trades"] == 4
+    stats = engine._results.stats()
+    assert (stats["hits"], stats["entries"]) == (1, 2)
+    assert asyncio.run(engine.backtest_symbol("ZZZZ"))["trades"] == 0
+
+
+def test_history_loads_from_local_json_and_csv(tmp_path):
+    history = synthetic_history(5, 6, seed=9)
+    history = {s: e for s, e in history.items() if e}
+
+    json_path = tmp_path / "earnings.json"
+    json_path.write_text(json.dumps(history))
+    csv_path = tmp_path / "earnings.csv"
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=("symbol", "date") + EVENT_FIELDS)
+        writer.writeheader()
+        for symbol, events in history.items():
+            for event in reversed(events):  # any order; newest first after load
+                writer.writerow({"symbol": symbol.lower(), **event})
+
+    from_json = CalendarBacktest(data_file=str(json_path))
+    from_csv = CalendarBacktest(data_file=str(csv_path))
+
+    assert from_json.historical_earnings.keys() == history.keys()
+    a = from_json.backtest_universe(lookback_quarters=4)
+    b = from_csv.backtest_universe(lookback_quarters=4)
+    assert a.keys() == b.keys()
+    for symbol in a:
+        assert a[symbol] == pytest.approx(b[symbol])
+
+
+def test_universe_backtest_is_fast():
+    engine = CalendarBacktest()
+    engine.historical_earnings = synthetic_history(3000, 20)
+
+    start = time.perf_counter()
+    results = engine.backtest_universe(lookback_quarters=20)
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 3000
+    assert elapsed < 2.0
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import tempfile
+import threading
+
+os.environ.setdefault("SQLITE_DB_PATH", os.path.join(tempfile.mkdtemp(), "flowmind.db"))
+
+import pytest
+
+from database import DatabaseManager
+
+
+@pytest.fixture
+def dbm(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "pool.db"), executor_workers=3)
+    yield manager
+    manager.close()
+
+
+def test_connections_are_reused_per_thread(dbm):
+    with dbm.get_connection() as a, dbm.get_connection() as b:
+        assert a is b
+        assert a.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    seen = []
+
+    def worker():
+        with dbm.get_connection() as conn:
+            seen.append(conn)
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    assert seen[0] is not seen[1] and a not in seen
+
+
+def test_batched_writes_and_async_reads_use_bounded_pool(dbm):
+    assert dbm.upsert_marks(
+        [{"symbol": f"S{i}", "last": float(i), "today_open": 1.0} for i in range(200)]
+    )
+    dbm.upsert_marks([{"symbol": "S1", "last": None, "today_open": 2.0}])
+    assert dbm.get_marks("S1")[0]["last"] == 1.0  # COALESCE keeps last
+    assert dbm.get_marks("S1")[0]["today_open"] == 2.0
+
+    mf = dbm.create_mindfolio("pool")
+    acct = dbm.create_account(mf["id"], "main")
+    txs = [
+        {
+            "account_id": acct["id"],
+            "datetime": f"2025-01-{d:02d}",
+            "symbol": "AAPL",
+            "side": "BUY",
+            "qty": 1,
+            "price": 100 + d,
+        }
+        for d in range(1, 29)
+    ]
+    assert dbm.create_transactions(txs) == 28
+
+    async def run():
+        return await asyncio.gather(
+            *(dbm.run_async(dbm.get_marks, f"S{i}") for i in range(200)),
+            dbm.run_async(dbm.get_transactions, {"mindfolio_id": mf["id"]}),
+        )
+
+    results = asyncio.run(run())
+    assert results[150][0]["last"] == 150.0
+    assert len(results[-1]) == 28
+    assert dbm.pool.size() <= 1 + 3  # main thread + executor workers
+
+
+def test_failed_write_rolls_back(dbm):
+    with pytest.raises(Exception):
+        dbm.create_transactions(
+            [
+                {
+                    "account_id": 1,
+                    "datetime": "x",
+                    "symbol": "A",
+                    "side": "BUY",
+                    "qty": 1,
+                    "price": 1,
+                },
+                {
+                    "account_id": 1,
+                    "datetime": "x",
+                    "symbol": "A",
+                    "side": "HOLD",
+                    "qty": 1,
+                    "price": 1,
+                },
+            ]
+        )
+    with dbm.get_connection() as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 0
@@ -0,0 +1,173 @@
+import asyncio
+
+from investment_scoring_agent import InvestmentScoringAgent
+from services.flow_store import FlowEventStore
+
+
+class Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _flow(ticker, option_type, sentiment, premium, ts, sweep=False):
+    return {
+        "ticker": ticker,
+        "option_type": option_type,
+        "sentiment": sentiment,
+        "premium": premium,
+        "timestamp": ts,
+        "has_sweep": sweep,
+    }
+
+
+def test_aggregates_match_list_based_scoring():
+    clock = Clock()
+    store = FlowEventStore(partition_sec=60, window_sec=3600, clock=clock)
+    events = [
+        _flow("TSLA", "call", "bullish", 100_000, clock.now - 10, sweep=True),
+        _flow("TSLA", "put", "bullish", 40_000, clock.now - 200),
+        _flow("TSLA", "put", "bearish", 25_000, clock.now - 900),
+        _flow("TSLA", "call", "bearish", 10_000, clock.now - 1800),
+        _flow("AAPL", "call", "bullish", 5_000, clock.now - 5),
+    ]
+    assert store.ingest("flow-alerts", events) == 5
+
+    agent = InvestmentScoringAgent()
+    tsla = [e for e in events if e["ticker"] == "TSLA"]
+    aggs = store.get_aggregates("TSLA")
+
+    assert aggs.flow_count == 4
+    assert aggs.sweep_count == 1
+    assert agent._analyze_options_flow([], aggs) == agent._analyze_options_flow(tsla)
+    assert agent._calculate_put_call_ratio([], aggs) == agent._calculate_put_call_ratio(
+        tsla
+    )
+
+
+def test_window_expiry_and_retention():
+    clock = Clock()
+    store = FlowEventStore(
+        partition_sec=60, window_sec=600, retention_sec=1200, clock=clock
+    )
+    store.ingest(
+        "flow-alerts", [_flow("SPY", "call", "bullish", 1_000, clock.now - 30)]
+    )
+    store.ingest(
+        "flow-alerts", [_flow("SPY", "put", "bullish", 2_000, clock.now - 500)]
+    )
+    assert store.get_aggregates("SPY").flow_count == 2
+
+    clock.now += 300
+    aggs = store.get_aggregates("SPY")
+    assert aggs.flow_count == 1
+    assert aggs.bullish_premium == 1_000
+
+    # Older than retention is rejected outright
+    assert (
+        store.ingest(
+            "flow-alerts", [_flow("SPY", "call", "bullish", 1, clock.now - 5000)]
+        )
+        == 0
+    )
+
+
+def test_darkpool_and_websocket_shapes():
+    clock = Clock()
+    store = FlowEventStore(clock=clock)
+    store.ingest(
+        "flow-alerts",
+        {
+            "ticker_symbol": "NVDA",
+            "put_call": "CALL",
+            "total_premium": "265000",
+            "ask_side_premium": 200000,
+            "bid_side_premium": 65000,
+            "alert_rule": "RepeatedHitsAscendingFill Sweep",
+            "executed_at": int((clock.now - 1) * 1000),
+        },
+    )
+    store.ingest("off_lit_trades", {"ticker": "NVDA", "price": 100.0, "size": 5000})
+    store.ingest("gex:SPY", {"ticker": "SPY", "gamma": 1.0})
+
+    aggs = store.get_aggregates("NVDA")
+    assert aggs.bullish_premium == 265_000
+    assert aggs.sweep_count == 1
+    assert aggs.darkpool_notional == 500_000
+    assert store.get_aggregates("SPY") is None
+
+    rows = store.get_events("NVDA", kind="flow")
+    assert rows[0]["option_type"] == "call" and rows[0]["sentiment"] == "bullish"
+
+
+def test_dark_pool_score_from_print_size_and_premium():
+    clock = Clock()
+    store = FlowEventStore(partition_sec=60, window_sec=3600, clock=clock)
+    prints = [
+        {
+            "ticker": "NVDA",
+            "price": "182.50",
+            "size": 60_000,
+            "premium": "10950000.0",
+            "volume": 98_000_000,
+            "executed_at": "2023-11-14T22:10:00Z",
+        },
+        {
+            "ticker": "NVDA",
+            "price": "182.41",
+            "size": 25_000,
+            "premium": "4560250.0",
+            "volume": 98_000_000,
+            "executed_at": "2023-11-14T22:05:00Z",
+        },
+        {
+            "ticker": "NVDA",
+            "price": "182.38",
+            "size": 12_000,
+            "premium": "2188560.0",
+            "volume": 98_000_000,
+            "executed_at": "2023-11-14T21:50:00Z",
+        },
+    ]
+    assert store.ingest("off_lit_trades", prints) == 3
+
+    agent = InvestmentScoringAgent()
+    aggs = store.get_aggregates("NVDA")
+    from_store = agent._analyze_dark_pool(
+        store.get_events("NVDA", kind="darkpool"), aggs
+    )
+
+    assert aggs.darkpool_volume == 97_000
+    assert from_store > 70
+    assert agent._analyze_dark_pool(prints) == from_store
+
+    small = [{"ticker": "NVDA", "price": "182.50", "size": 100, "premium": "18250"}]
+    assert agent._analyze_dark_pool(small) < 50
+    assert agent._analyze_dark_pool([]) == 50.0
+
+
+def test_scoring_reads_store_when_live(monkeypatch):
+    clock = Clock()
+    store = FlowEventStore(clock=clock)
+    store.ingest("flow-alerts", [_flow("MSFT", "call", "bullish", 50_000, clock.now)])
+
+    import investment_scoring_agent as isa
+
+    monkeypatch.setattr(isa, "get_flow_store", lambda: store)
+    agent = InvestmentScoringAgent()
+
+    async def no_rest(*args, **kwargs):
+        raise AssertionError("REST should not be called for flow data")
+
+    async def insider(symbol):
+        return {"data": []}
+
+    monkeypatch.setattr(agent.uw_service, "get_option_contracts", no_rest)
+    monkeypatch.setattr(agent.uw_service, "get_darkpool_ticker", no_rest)
+    monkeypatch.setattr(agent.uw_service, "get_insider_ticker", insider)
+
+    data = asyncio.run(agent._fetch_uw_data("MSFT"))
+    assert data["flow_aggregates"].flow_count == 1
+    assert len(data["options_flow"]) == 1
@@ -0,0 +1,129 @@
+import random
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import trade_routes
+from gates_engine import (
+    AccountState,
+    Events,
+    Leg,
+    MarketMetrics,
+    MindfolioGreeks,
+    Mode,
+    OptionType,
+    Quote,
+    SessionInfo,
+    Severity,
+    Side,
+    TradeContext,
+    audit_hash,
+    audit_payload,
+    evaluate_gates,
+    evaluate_gates_batch,
+)
+from trade_routes import router as trade_router
+
+
+def random_context(rng, now_ms):
+    legs = []
+    for _ in range(rng.randint(1, 4)):
+        age = rng.choice([500, 2_000, 600_000])  # far from the 30s limit
+        legs.append(
+            Leg(
+                side=rng.choice(list(Side)),
+                type=rng.choice(list(OptionType)),
+                expiry=rng.choice(["2025-11-21", "2025-12-19"]),
+                strike=rng.choice([95, 100.0, 102.5, 110]),
+                qty=rng.randint(1, 3),
+                quote=Quote(
+                    bid=rng.choice([0.0, 1.0, 2.5]),
+                    ask=rng.choice([0.0, 1.1, 3.5]),
+                    tsMs=now_ms - age,
+                ),
+            )
+        )
+    underlying = rng.choice(["TSLA", "AAPL", "SPY"])
+    return TradeContext(
+        mode=rng.choice(list(Mode)),
+        strategy=rng.choice(["BULL_CALL_SPREAD", "CALENDAR", "IRON_CONDOR"]),
+        underlying=underlying,
+        underlyingQuote=Quote(
+            bid=250.0, ask=250.2, tsMs=rng.choice([0, now_ms, now_ms - 600_000])
+        ),
+        legs=legs,
+        mindfolio=MindfolioGreeks(delta=rng.uniform(-1, 1)),
+        account=AccountState(
+            tradeable=rng.random() < 0.85, buyingPower=rng.uniform(0, 200_000)
+        ),
+        market=MarketMetrics(ivRank=rng.uniform(0, 100)),
+        session=SessionInfo(),
+        events=Events(),
+        openPositionsBySymbol={underlying: rng.randint(0, 7)},
+        estMaxLoss=rng.uniform(0, 500_000),
+    )
+
+
+def test_batch_matches_per_candidate_evaluation():
+    rng = random.Random(12)
+    now_ms = int(time.time() * 1000)
+    contexts = [random_context(rng, now_ms) for _ in range(400)]
+
+    batch = evaluate_gates_batch(contexts, frozen_ts=now_ms)
+    single = [evaluate_gates(ctx) for ctx in contexts]
+
+    for got, want in zip(batch.decisions, single):
+        assert got.decision == want.decision
+        if want.decision != "REJECT":
+            assert got.results == want.results
+            continue
+        # rejected: only the gates run before the blocking failure are reported
+        by_name = {r.gateName: r for r in want.results}
+        assert all(by_name[r.gateName] == r for r in got.results)
+        assert len(got.results) <= len(want.results)
+        assert any(r.severity == Severity.BLOCK and not r.passed for r in got.results)
+
+    assert batch.auditHashes == [
+        audit_hash(audit_payload(ctx, now_ms)) for ctx in contexts
+    ]
+
+    stats = batch.stats
+    rejected = sum(d.decision == "REJECT" for d in single)
+    assert stats["tradeability"].evaluated == len(contexts)
+    assert stats["tradeability"].failed == sum(
+        not ctx.account.tradeable for ctx in contexts
+    )
+    assert stats["time.session"].skipped == rejected
+    assert stats["time.session"].evaluated == len(contexts) - rejected
+    assert sum(s.evaluated for s in stats.values()) < sum(
+        len(d.results) for d in single
+    )
+
+
+def test_preview_audit_hash_matches_batch_layout(monkeypatch):
+    app = FastAPI()
+    app.include_router(trade_router)
+    seen = []
+    evaluate = trade_routes.evaluate_gates
+
+    def capture(ctx, config):
+        seen.append(ctx)
+        return evaluate(ctx, config)
+
+    monkeypatch.setattr(trade_routes, "evaluate_gates", capture)
+    leg = {"side": "BUY", "type": "CALL", "expiry": "2025-12-19", "strike": 250}
+    res = TestClient(app).post(
+        "/trade/preview",
+        json={
+            "strategy": "LONG_CALL",
+            "underlying": "TSLA",
+            "legs": [{**leg, "qty": 1}],
+        },
+    )
+
+    body = res.json()
+    assert res.status_code == 200
+    assert body["auditHash"] == audit_hash(audit_payload(seen[0], body["frozenTs"]))
+    batch = evaluate_gates_batch(seen, frozen_ts=body["frozenTs"])
+    assert batch.auditHashes == [body["auditHash"]]
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+from geopolitical_news_agent import GeopoliticalNewsAgent, TickerIntelCache
+
+
+class SlowNewsClient:
+    def __init__(self, delay=0.05, slow=()):
+        self.delay = delay
+        self.slow = set(slow)
+        self.calls = []
+
+    async def get_news(self, symbol):
+        self.calls.append(symbol)
+        await asyncio.sleep(5 if symbol in self.slow else self.delay)
+        return {"items": [{"headline": f"{symbol} shares surge on strong growth"}]}
+
+
+def _positions(symbols):
+    return [{"symbol": s, "quantity": 10} for s in symbols]
+
+
+def test_digest_fans_out_and_shares_cache_across_mindfolios():
+    client = SlowNewsClient(delay=0.05)
+    cache = TickerIntelCache(ttl=60)
+    agent = GeopoliticalNewsAgent(client, intel_cache=cache, digest_concurrency=16)
+    symbols = [f"S{i}" for i in range(30)]
+
+    start = time.perf_counter()
+    digest = asyncio.run(agent.get_mindfolio_news_digest("mf-1", _positions(symbols)))
+    elapsed = time.perf_counter() - start
+
+    assert len(digest["ticker_news"]) == 30
+    assert digest["partial"] is False
+    assert elapsed < 0.5  # sequential would be ~1.5s
+    assert len(digest["opportunities"]) == 30
+
+    other = GeopoliticalNewsAgent(client, intel_cache=cache)
+    overlap = symbols[:10] + ["NEW"]
+    digest2 = asyncio.run(other.get_mindfolio_news_digest("mf-2", _positions(overlap)))
+    assert len(digest2["ticker_news"]) == 11
+    assert len(client.calls) == 31
+    assert cache.get_stats()["hits"] == 10
+
+
+def test_stage_timeouts_return_partial_results_uncached():
+    client = SlowNewsClient(slow={"SLOW"})
+    cache = TickerIntelCache(ttl=60)
+    agent = GeopoliticalNewsAgent(client, intel_cache=cache, news_timeout=0.1)
+
+    async def slow_fis(symbol):
+        await asyncio.sleep(5)
+
+    agent._get_fis_score = slow_fis
+    agent.stage_timeout = 0.1
+
+    start = time.perf_counter()
+    digest = asyncio.run(
+        agent.get_mindfolio_news_digest("mf", _positions(["SLOW", "FAST"]))
+    )
+    assert time.perf_counter() - start < 1.0
+
+    slow = digest["ticker_news"]["SLOW"]
+    assert slow["partial"] is True
+    assert set(slow["timed_out"]) == {"news", "fis"}
+    assert slow["fis_score"] is None
+    assert slow["options_suggestions"]  # options stage still completed
+    assert digest["partial"] is True
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_prewarm_fills_cache():
+    client = SlowNewsClient(delay=0)
+    cache = TickerIntelCache(ttl=60)
+    agent = GeopoliticalNewsAgent(client, intel_cache=cache)
+
+    assert asyncio.run(agent.prewarm(["TSLA", "AAPL", "TSLA"])) == 2
+    asyncio.run(agent.get_ticker_news_with_sentiment("tsla"))
+    assert client.calls == ["TSLA", "AAPL"]
+
+
+def test_clientless_results_are_not_served_to_agents_with_a_client():
+    cache = TickerIntelCache(ttl=60)
+    demo = GeopoliticalNewsAgent(None, intel_cache=cache)
+    asyncio.run(demo.prewarm(["TSLA"]))
+
+    client = SlowNewsClient(delay=0)
+    agent = GeopoliticalNewsAgent(client, intel_cache=cache)
+    intel = asyncio.run(agent.get_ticker_news_with_sentiment("TSLA"))
+
+    assert client.calls == ["TSLA"]
+    assert intel["news_items"] == [{"headline": "TSLA shares surge on strong growth"}]
+    assert cache.get_stats()["entries"] == 2
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from iv_service.batch import batch_calc
+from utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_ttl_expiry():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    clock.now = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert (stats["evictions"], stats["expirations"]) == (1, 1)
+
+
+def test_single_flight_per_key():
+    cache = TTLCache(maxsize=8, ttl=60)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "v"
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_compute("k", load) for _ in range(5))
+        )
+
+    assert asyncio.run(run()) == ["v"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_batch_runs_concurrently_and_keeps_order():
+    cache = TTLCache(maxsize=256, ttl=60)
+    provider_calls = []
+
+    async def summary_fn(sym):
+        async def load():
+            provider_calls.append(sym)
+            await asyncio.sleep(0.02)
+            if sym == "BAD":
+                raise RuntimeError("no quote")
+            return {
+                "symbol": sym,
+                "spot": 100.0,
+                "iv": 0.25,
+                "em_usd": 5.0,
+                "em_pct": 0.05,
+                "front_dte": 7,
+                "back_dte": 45,
+            }
+
+        return await cache.get_or_compute(sym, load)
+
+    symbols = [f"S{i}" for i in range(50)] + ["S0", "BAD"]
+    start = time.perf_counter()
+    res = asyncio.run(batch_calc(symbols, "condor", 0.5, summary_fn, concurrency=16))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5  # sequential would be ~1s
+    assert [r["symbol"] for r in res["rows"]] == symbols
+    assert res["meta"] == {"count": 52, "ok": 51, "fail": 1}
+    assert provider_calls.count("S0") == 1
+    assert "ic_shorts" in res["rows"][0]
@@ -0,0 +1,247 @@
+import asyncio
+import json
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from test_mindfolio_analytics import replay_fifo
+
+import mindfolio
+from redis_fallback import AsyncTTLDict
+from services.lot_ledger import LEDGER_VERSION, LedgerLock, LotLedger, key_ledger
+from services.mindfolio_analytics import compute_analytics, round2
+
+START = datetime(2020, 1, 1)
+
+
+def synthetic(n, seed=11):
+    rng = random.Random(seed)
+    txs = []
+    for i in range(n):
+        txs.append(
+            SimpleNamespace(
+                id=f"t{i}",
+                datetime=(START + timedelta(minutes=i)).isoformat(),
+                symbol=rng.choice(["AAPL", "MSFT", "TSLA", "NVDA", "SPY"]),
+                side="BUY" if rng.random() < 0.55 else "SELL",
+                qty=float(rng.randint(1, 40)),
+                price=round(rng.uniform(50, 150), 2),
+                fee=round(rng.uniform(0, 2), 2),
+            )
+        )
+    return txs
+
+
+def ledger_views(summary):
+    positions = {
+        s: (round2(b["open_qty"]), round2(b["open_cost"]))
+        for s, b in summary.items()
+        if b["open_qty"] > 1e-9
+    }
+    pnl = {
+        s: (round2(b["realized"]), b["trades"])
+        for s, b in summary.items()
+        if b["trades"]
+    }
+    return positions, pnl
+
+
+def test_incremental_ledger_matches_full_replay_on_100k_transactions():
+    txs = synthetic(100_000)
+    rng = random.Random(3)
+
+    # deliver in batches; ~2% of trades arrive late, a few batches after their time
+    held, batches = [], []
+    for start in range(0, len(txs), 2000):
+        batch = []
+        for t in txs[start : start + 2000]:
+            (held if rng.random() < 0.02 else batch).append(t)
+        if held and (start // 2000) % 3 == 2:
+            batches.append(held)
+            held = []
+        batches.append(batch)
+    batches.append(held)
+
+    async def run():
+        kv = AsyncTTLDict()
+        ledger = LotLedger(kv, "mf_big", checkpoint_every=500)
+        for batch in batches:
+            await ledger.append(batch)
+        return ledger, await ledger.summary()
+
+    ledger, summary = asyncio.run(run())
+    positions, pnl = replay_fifo(txs)
+
+    got_positions, got_pnl = ledger_views(summary)
+    assert got_positions.keys() == positions.keys()
+    for sym, (qty, cost) in positions.items():
+        assert got_positions[sym][0] == pytest.approx(qty, abs=0.01)
+        assert got_positions[sym][1] == pytest.approx(cost, abs=0.05)
+    assert got_pnl == pytest.approx(pnl, abs=0.05)
+    assert sum(b["count"] for b in summary.values()) == len(txs)
+
+    # closed-trade stats survive checkpoints and replays
+    full = compute_analytics(txs)
+    for bucket in full.buckets:
+        book = summary[bucket["bucket"]]
+        assert (book["closed"], book["wins"]) == (bucket["closed"], bucket["wins"])
+
+    # back-dated batches replayed from a checkpoint, not from the start
+    assert ledger.stats["replays"] > 0
+    assert ledger.stats["replayed"] < ledger.stats["replays"] * len(txs) / 20
+
+
+@pytest.fixture
+def kv(monkeypatch, tmp_path):
+    store = AsyncTTLDict()
+
+    async def get_kv():
+        return store
+
+    monkeypatch.setattr(mindfolio, "get_kv", get_kv)
+    monkeypatch.setattr(mindfolio, "BACKUP_DIR", tmp_path)
+    return store
+
+
+def test_back_dated_trade_changes_fifo_cost(kv):
+
+    def body(dt, side, qty, price):
+        return mindfolio.TransactionCreate(
+            mindfolio_id="mf_ledger",
+            datetime=dt,
+            symbol="MSFT",
+            side=side,
+            qty=qty,
+            price=price,
+        )
+
+    async def run():
+        await mindfolio.pf_put(
+            mindfolio.Mindfolio(
+                id="mf_ledger",
+                name="ledger",
+                cash_balance=10000.0,
+                created_at="2025-01-01T00:00:00",
+                updated_at="2025-01-01T00:00:00",
+            )
+        )
+        await mindfolio.create_transaction(
+            "mf_ledger", body("2025-02-01T10:00:00", "BUY", 10, 200.0)
+        )
+        await mindfolio.create_transaction(
+            "mf_ledger", body("2025-02-03T10:00:00", "SELL", 5, 210.0)
+        )
+        before = await mindfolio.calculate_realized_pnl("mf_ledger")
+        # an older, cheaper lot is now first in the FIFO queue
+        await mindfolio.create_transaction(
+            "mf_ledger", body("2025-01-15T10:00:00", "BUY", 5, 100.0)
+        )
+        positions = await mindfolio.calculate_positions_fifo("mf_ledger")
+        after = await mindfolio.calculate_realized_pnl("mf_ledger")
+        return before, positions, after
+
+    before, positions, after = asyncio.run(run())
+
+    assert before[0].realized == 50.0
+    assert after[0].realized == 550.0
+    assert (positions[0].qty, positions[0].avg_cost) == (10, 200.0)
+
+
+def test_stale_ledger_catches_up_with_transaction_list(kv):
+    txs = synthetic(300, seed=5)
+    for t in txs:
+        t.mindfolio_id, t.created_at = "mf_drift", t.datetime
+
+    async def write_behind_ledger(batch):
+        # another worker stored the transactions but died before the ledger
+        raw = await kv.get(mindfolio.key_mindfolio_transactions("mf_drift")) or "[]"
+        ids = json.loads(raw) + [t.id for t in batch]
+        for t in batch:
+            await kv.set(mindfolio.key_transaction(t.id), json.dumps(vars(t)))
+        await kv.set(mindfolio.key_mindfolio_transactions("mf_drift"), json.dumps(ids))
+
+    def expected(n):
+        positions, _ = replay_fifo(txs[:n])
+        return {s: qty for s, (qty, _) in positions.items()}
+
+    async def positions():
+        got = await mindfolio.calculate_positions_fifo("mf_drift")
+        return {p.symbol: p.qty for p in got}
+
+    async def run():
+        await mindfolio.tx_create_many(
+            "mf_drift", [mindfolio.Transaction(**vars(t)) for t in txs[:100]]
+        )
+        await write_behind_ledger(txs[100:200])
+        assert await positions() == pytest.approx(expected(200), abs=0.01)
+
+        # ids removed from the list: not a prefix any more, full rebuild
+        await write_behind_ledger(txs[200:])
+        await kv.set(
+            mindfolio.key_mindfolio_transactions("mf_drift"),
+            json.dumps([t.id for t in txs[50:]]),
+        )
+        positions_after = await positions()
+        rebuilt, _ = replay_fifo(txs[50:])
+        assert positions_after == pytest.approx(
+            {s: q for s, (q, _) in rebuilt.items()}, abs=0.01
+        )
+
+    asyncio.run(run())
+
+
+def test_ledger_lock_is_shared_across_workers():
+    kv = AsyncTTLDict()
+    order = []
+
+    def worker_lock(**kwargs):
+        lock = LedgerLock(kv, "mf_lock", **kwargs)
+        lock._local = asyncio.Lock()  # a separate process only shares the kv
+        return lock
+
+    async def hold(name, delay):
+        async with worker_lock():
+            order.append(f"{name}+")
+            await asyncio.sleep(delay)
+            order.append(f"{name}-")
+
+    async def run():
+        first = asyncio.create_task(hold("a", 0.05))
+        await asyncio.sleep(0.01)
+        await hold("b", 0)
+        await first
+
+        # a holder that died leaves an expiring lock behind
+        await kv.set("pf:mf_lock:ledger:lock", "dead", nx=True, px=50)
+        async with worker_lock(wait=1):
+            order.append("c")
+        with pytest.raises(TimeoutError):
+            await kv.set("pf:mf_lock:ledger:lock", "dead", nx=True, px=5000)
+            async with worker_lock(wait=0.05):
+                pass
+
+    asyncio.run(run())
+    assert order == ["a+", "a-", "b+", "b-", "c"]
+
+
+def test_older_ledger_layout_is_rebuilt(kv):
+    txs = synthetic(50, seed=9)
+
+    async def run():
+        ledger = LotLedger(kv, "mf_old")
+        await ledger.append(txs, tx_ids=[t.id for t in txs])
+        doc = json.loads(await kv.get(key_ledger("mf_old")))
+        doc.pop("version")  # written before journal rows carried realized P&L
+        await kv.set(key_ledger("mf_old"), json.dumps(doc))
+        assert await ledger.load() is None
+
+        async def load(ids):
+            return sorted((t for t in txs if t.id in ids), key=lambda t: t.datetime)
+
+        await ledger.reconcile([t.id for t in txs], load)
+        return await ledger.load()
+
+    doc = asyncio.run(run())
+    assert doc["version"] == LEDGER_VERSION
+    assert sum(b["count"] for b in doc["symbols"].values()) == len(txs)
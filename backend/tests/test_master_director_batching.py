@@ -0,0 +1,130 @@
+import asyncio
+import time
+
+from agents.tier1_director.master_director import (
+    DecisionBackend,
+    MasterDirector,
+    StubDecisionBackend,
+)
+
+
+def signal(i, score=80.0):
+    return {
+        "ticker": f"T{i:03d}",
+        "sector": "technology",
+        "total_score": score,
+        "sector_risk_score": 40.0,
+        "validation_confidence": 0.8,
+    }
+
+
+def director(backend, **engine):
+    d = MasterDirector(use_llm=True, llm_backend=backend)
+    for name, value in engine.items():
+        setattr(d.decision_engine, name, value)
+    return d
+
+
+def test_burst_is_micro_batched_into_few_backend_calls():
+    backend = StubDecisionBackend(latency=0.05)
+    d = director(backend, window=0.02, max_batch=16)
+
+    async def run():
+        return await asyncio.gather(*(d.make_decision(signal(i)) for i in range(40)))
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert backend.batch_sizes == [16, 16, 8]
+    assert all(r and r["llm_model"] == "stub" for r in results)
+    assert d.signals_approved == 40
+    assert elapsed < 0.5  # three overlapping round trips, not forty
+    assert d.get_director_stats()["decision_engine"]["avg_batch_size"] == 13.33
+
+
+def test_decisions_are_cached_and_identical_signals_coalesce():
+    backend = StubDecisionBackend()
+    d = director(backend, window=0.01)
+
+    async def run():
+        context = await d._gather_decision_context(signal(1))
+        burst = await asyncio.gather(
+            *(d._llm_decision(signal(1), context) for _ in range(10))
+        )
+        # score noise below the rounding step keeps the same fingerprint
+        again = await d._llm_decision(signal(1, score=80.2), context)
+        return burst, again
+
+    burst, again = asyncio.run(run())
+    stats = d.decision_engine.get_stats()
+
+    assert backend.batch_sizes == [1]
+    assert stats["coalesced"] == 9 and stats["cache_hits"] == 1
+    assert again["cached"] is True
+    assert again["confidence"] == burst[0]["confidence"]
+
+
+def test_latency_budget_and_backend_errors_fall_back_to_rules():
+    class Failing(DecisionBackend):
+        model = "failing"
+
+        async def decide_batch(self, requests):
+            raise RuntimeError("upstream 503")
+
+    slow = StubDecisionBackend(latency=0.3)
+    d = director(slow, window=0.0, budget=0.05)
+
+    async def run():
+        context = await d._gather_decision_context(signal(2))
+        first = await d._llm_decision(signal(2), context)
+        await asyncio.sleep(0.4)  # the batch finishes in the background
+        second = await d._llm_decision(signal(2), context)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["llm_model"] == "fallback"
+    assert first["fallback_reason"] == "latency_budget"
+    assert second["llm_model"] == "stub" and second["cached"] is True
+
+    failing = director(Failing(), window=0.0)
+
+    async def run_failing():
+        context = await failing._gather_decision_context(signal(3))
+        return await failing._llm_decision(signal(3), context)
+
+    decision = asyncio.run(run_failing())
+    assert decision["fallback_reason"] == "backend_error"
+    assert decision["approved"] is True  # score 80 passes the rule-based path
+
+
+def test_short_batch_response_fails_every_signal_and_clears_inflight():
+    class Short(DecisionBackend):
+        model = "short"
+
+        def __init__(self):
+            self.calls = 0
+
+        async def decide_batch(self, requests):
+            self.calls += 1
+            return [{"approved": True, "confidence": 90}]  # one row for many
+
+    backend = Short()
+    d = director(backend, window=0.01, budget=1.0)
+
+    async def run():
+        contexts = [await d._gather_decision_context(signal(i)) for i in range(3)]
+        first = await asyncio.gather(
+            *(d._llm_decision(signal(i), c) for i, c in enumerate(contexts))
+        )
+        assert not d.decision_engine._inflight
+        start = time.perf_counter()
+        again = await d._llm_decision(signal(2), contexts[2])
+        return first, again, time.perf_counter() - start
+
+    first, again, elapsed = asyncio.run(run())
+    assert [r["fallback_reason"] for r in first] == ["backend_error"] * 3
+    # a fresh single-signal batch, not a dead future waiting out the budget
+    assert again["llm_model"] == "short" and "fallback_reason" not in again
+    assert elapsed < 0.5
+    assert backend.calls == 2
@@ -0,0 +1,221 @@
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import mindfolio
+from redis_fallback import AsyncTTLDict
+from services.mindfolio_analytics import analytics_cache, compute_analytics, round2
+
+
+def tx(i, symbol, side, qty, price, fee=0.0, day=None):
+    return SimpleNamespace(
+        id=f"t{i}",
+        datetime=f"2025-01-{(day or i) % 28 + 1:02d}T10:{i % 60:02d}:00",
+        symbol=symbol,
+        side=side,
+        qty=qty,
+        price=price,
+        fee=fee,
+    )
+
+
+def replay_fifo(transactions):
+    """Lot-by-lot FIFO replay (the algorithm the ledger replaces)."""
+    lots, realized, trades = {}, {}, {}
+    for t in transactions:
+        q = lots.setdefault(t.symbol, [])
+        realized.setdefault(t.symbol, 0.0)
+        per_share_fee = t.fee / t.qty if t.qty > 0 else 0
+        if t.side == "BUY":
+            q.append([t.qty, t.price + per_share_fee])
+            continue
+        trades[t.symbol] = trades.get(t.symbol, 0) + 1
+        left = t.qty
+        while left > 0 and q:
+            take = min(q[0][0], left)
+            realized[t.symbol] += (t.price - per_share_fee - q[0][1]) * take
+            q[0][0] -= take
+            left -= take
+            if q[0][0] <= 0:
+                q.pop(0)
+    positions = {}
+    for sym, q in lots.items():
+        qty = sum(lot[0] for lot in q)
+        if qty > 1e-9:
+            positions[sym] = (round2(qty), round2(sum(a * b for a, b in q)))
+    pnl = {s: (round2(realized[s]), n) for s, n in trades.items()}
+    return positions, pnl
+
+
+def test_ledger_analytics_match_lot_replay():
+    rng = random.Random(7)
+    txs = []
+    for i in range(3000):
+        side = "BUY" if rng.random() < 0.55 else "SELL"
+        txs.append(
+            tx(
+                i,
+                rng.choice(["AAPL", "MSFT", "TSLA", "NVDA"]),
+                side,
+                float(rng.randint(1, 40)),  # sells may exceed the open lots
+                round(rng.uniform(50, 150), 2),
+                round(rng.uniform(0, 2), 2),
+            )
+        )
+
+    result = compute_analytics(txs)
+    positions, pnl = replay_fifo(txs)
+
+    assert {
+        p["symbol"]: (p["qty"], p["cost_basis"]) for p in result.positions
+    } == pytest.approx(positions)
+    assert {
+        r["symbol"]: (r["realized"], r["trades"]) for r in result.realized
+    } == pytest.approx(pnl)
+    assert result.summary["total_realized_pnl"] == pytest.approx(
+        sum(v[0] for v in pnl.values()), abs=0.05
+    )
+
+
+def test_drawdown_sharpe_and_win_rate():
+    txs = [
+        tx(1, "AAPL", "BUY", 10, 100, day=1),
+        tx(2, "AAPL", "SELL", 10, 110, day=2),  # +100
+        tx(3, "MSFT", "BUY", 10, 200, day=3),
+        tx(4, "MSFT", "SELL", 10, 170, day=4),  # -300
+        tx(5, "AAPL", "BUY", 5, 100, day=5),
+        tx(6, "AAPL", "SELL", 5, 140, day=6),  # +200
+    ]
+    result = compute_analytics(txs, starting_equity=10000.0)
+    s = result.summary
+
+    assert [p["realized_cum"] for p in result.equity_curve] == [
+        0,
+        100,
+        100,
+        -200,
+        -200,
+        0,
+    ]
+    assert result.equity_curve[-1]["equity"] == 10000.0
+    assert s["win_rate"] == pytest.approx(2 / 3, abs=1e-4)
+    assert s["expectancy"] == 0.0
+    assert s["max_drawdown_usd"] == 300.0
+    assert s["max_drawdown"] == pytest.approx(300 / 10100, abs=1e-4)
+    assert s["sharpe_ratio"] is not None
+    assert s["positions_count"] == 0
+
+    aapl = next(b for b in result.buckets if b["bucket"] == "AAPL")
+    assert (aapl["wins"], aapl["losses"], aapl["realized"]) == (2, 0, 300.0)
+
+
+@pytest.fixture
+def kv(monkeypatch, tmp_path):
+    store = AsyncTTLDict()
+
+    async def get_kv():
+        return store
+
+    monkeypatch.setattr(mindfolio, "get_kv", get_kv)
+    monkeypatch.setattr(mindfolio, "BACKUP_DIR", tmp_path)
+    analytics_cache.invalidate()
+    return store
+
+
+def test_analytics_cached_until_a_transaction_is_added(kv):
+    def body(dt, side, qty, price, symbol="AAPL"):
+        return mindfolio.TransactionCreate(
+            mindfolio_id="mf_analytics",
+            datetime=dt,
+            symbol=symbol,
+            side=side,
+            qty=qty,
+            price=price,
+        )
+
+    async def run():
+        await mindfolio.pf_put(
+            mindfolio.Mindfolio(
+                id="mf_analytics",
+                name="analytics",
+                cash_balance=10000.0,
+                created_at="2025-01-01T00:00:00",
+                updated_at="2025-01-01T00:00:00",
+            )
+        )
+        await mindfolio.create_transaction(
+            "mf_analytics", body("2025-01-02T10:00:00", "BUY", 10, 100.0, "aapl")
+        )
+        await mindfolio.create_transaction(
+            "mf_analytics", body("2025-01-03T10:00:00", "SELL", 4, 120.0)
+        )
+        first = await mindfolio.get_mindfolio_equity_chart("mf_analytics")
+        again = await mindfolio.get_mindfolio_analytics("mf_analytics")
+        positions = await mindfolio.get_positions("mf_analytics")
+        csv = await mindfolio.export_mindfolio_equity_csv("mf_analytics")
+        await mindfolio.create_transaction(
+            "mf_analytics", body("2025-01-04T10:00:00", "SELL", 6, 90.0)
+        )
+        pnl = await mindfolio.get_realized_pnl("mf_analytics")
+        stats = await mindfolio.stats("mf_analytics")
+        return first, again, positions, csv, pnl, stats
+
+    first, again, positions, csv, pnl, stats = asyncio.run(run())
+    summary = first["analytics"]["summary"]
+
+    assert summary["total_realized_pnl"] == 80.0
+    assert summary["win_rate"] == 1.0
+    assert summary["current_equity"] == 10080.0
+    assert again.summary is summary  # served from cache
+    assert positions[0].qty == 6 and positions[0].avg_cost == 100.0
+    assert csv.body.decode().splitlines()[-1].endswith(",AAPL,SELL,80.0")
+    assert analytics_cache.stats()["hits"] >= 3
+
+    # the new sell invalidated the cache; P&L and stats share the ledger
+    assert [(r.symbol, r.realized, r.trades) for r in pnl] == [("AAPL", 20.0, 2)]
+    assert stats["pnl_realized"] == 20.0 and stats["positions_count"] == 0
+    assert stats["win_rate"] == 0.5 and stats["expectancy"] == 10.0
+    assert stats["max_dd"] == pytest.approx(60 / 10080, abs=1e-4)
+
+
+def test_writers_that_skip_the_ledger_are_caught_up_on_read(kv):
+    """Transfers and broker imports only extend the id list."""
+
+    async def run():
+        await mindfolio.tx_create(
+            mindfolio.Transaction(
+                id="t_buy",
+                mindfolio_id="mf_direct",
+                datetime="2025-01-02T10:00:00",
+                symbol="MSFT",
+                side="BUY",
+                qty=10,
+                price=300.0,
+                created_at="2025-01-02T10:00:00",
+            )
+        )
+        before = await mindfolio.calculate_positions_fifo("mf_direct")
+        sell = mindfolio.Transaction(
+            id="t_sell",
+            mindfolio_id="mf_direct",
+            datetime="2025-01-03T10:00:00",
+            symbol="MSFT",
+            side="SELL",
+            qty=4,
+            price=330.0,
+            created_at="2025-01-03T10:00:00",
+        )
+        await kv.set(mindfolio.key_transaction(sell.id), sell.json())
+        await kv.set(
+            mindfolio.key_mindfolio_transactions("mf_direct"),
+            '["t_buy", "t_sell"]',
+        )
+        return before, await mindfolio.get_mindfolio_analytics("mf_direct")
+
+    before, after = asyncio.run(run())
+    assert before[0].qty == 10
+    assert after.positions[0]["qty"] == 6
+    assert after.summary["total_realized_pnl"] == 120.0
+    assert [p["equity"] for p in after.equity_curve] == [10000.0, 10120.0]
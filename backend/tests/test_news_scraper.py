@@ -0,0 +1,171 @@
+import asyncio
+
+from services.news_scraper import BrowserPool, NewsScraperService, _route_filter
+
+
+class FakePage:
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, **kwargs):
+        ctx = FakeContext()
+        self.contexts.append(ctx)
+        return ctx
+
+    async def close(self):
+        pass
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = type("Req", (), {"url": url, "resource_type": resource_type})
+        self.action = None
+
+    async def abort(self):
+        self.action = "abort"
+
+    async def continue_(self):
+        self.action = "continue"
+
+
+def _fake_pool(**kwargs):
+    browser = FakeBrowser()
+    launches = []
+
+    async def launcher(headless):
+        launches.append(headless)
+        return None, browser
+
+    return BrowserPool(launcher=launcher, **kwargs), browser, launches
+
+
+def test_pool_reuses_bounded_contexts():
+    pool, browser, launches = _fake_pool(max_contexts=2)
+    in_use = {"now": 0, "peak": 0}
+
+    async def use():
+        async with pool.page():
+            in_use["now"] += 1
+            in_use["peak"] = max(in_use["peak"], in_use["now"])
+            await asyncio.sleep(0.01)
+            in_use["now"] -= 1
+
+    async def run():
+        await asyncio.gather(*(use() for _ in range(10)))
+        await pool.close()
+
+    asyncio.run(run())
+    assert launches == [True]
+    assert len(browser.contexts) == 2
+    assert in_use["peak"] == 2
+    assert all(ctx.routes for ctx in browser.contexts)
+
+
+def test_route_filter_blocks_images_fonts_and_ads():
+    async def run(url, kind):
+        route = FakeRoute(url, kind)
+        await _route_filter(route)
+        return route.action
+
+    assert asyncio.run(run("https://finance.yahoo.com/a.png", "image")) == "abort"
+    assert asyncio.run(run("https://x.com/f.woff2", "font")) == "abort"
+    assert (
+        asyncio.run(run("https://securepubads.g.doubleclick.net/t.js", "script"))
+        == "abort"
+    )
+    assert (
+        asyncio.run(run("https://finance.yahoo.com/quote/TSLA/news", "document"))
+        == "continue"
+    )
+
+
+def test_concurrent_symbols_and_ttl_cache():
+    pool, _, _ = _fake_pool()
+    scraper = NewsScraperService(pool=pool, cache_ttl=60)
+    calls = []
+    active = {"now": 0, "peak": 0}
+
+    def fake_source(name):
+        async def scrape(symbol, limit):
+            calls.append((name, symbol))
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return [{"title": f"{symbol} {name}", "published_at": None}]
+
+        return scrape
+
+    scraper.sources = {n: fake_source(n) for n in ("yahoo_finance", "benzinga")}
+    symbols = ["tsla", "NVDA", "AAPL", "TSLA"]
+
+    first = scraper.aggregate_news_many(symbols, limit_per_source=5)
+    second = asyncio.run(scraper.aggregate_news_many_async(symbols, limit_per_source=5))
+    scraper.close()
+
+    assert list(first) == ["TSLA", "NVDA", "AAPL"]
+    assert first["TSLA"]["sources"] == {"yahoo_finance": 1, "benzinga": 1}
+    assert len(calls) == 6
+    assert active["peak"] > 1
+    assert second["NVDA"]["total_articles"] == 2
+    assert scraper.stats["cache_hits"] == 6
+
+
+def test_syndicated_headlines_are_merged_across_sources():
+    pool, _, _ = _fake_pool()
+    scraper = NewsScraperService(pool=pool, cache_ttl=60)
+    stories = {
+        "yahoo_finance": [
+            {
+                "title": "Tesla stock surges 5% after earnings beat",
+                "published_at": "2025-11-03T14:05:00",
+            },
+            {
+                "title": "Apple unveils new iPhone lineup at September event",
+                "published_at": "2025-11-03T12:00:00",
+            },
+        ],
+        "benzinga": [
+            {
+                "title": "Tesla Stock Surges 5% After Earnings Beat - Benzinga",
+                "published_at": "2025-11-03T14:10:00",
+            },
+        ],
+    }
+
+    def fake_source(name):
+        async def scrape(symbol, limit):
+            return stories[name]
+
+        return scrape
+
+    scraper.sources = {n: fake_source(n) for n in stories}
+    result = scraper.aggregate_news("TSLA")
+    scraper.close()
+
+    assert result["sources"] == {"yahoo_finance": 2, "benzinga": 1}
+    assert result["total_articles"] == 2
+    assert [a["published_at"] for a in result["news"]] == [
+        "2025-11-03T14:10:00",
+        "2025-11-03T12:00:00",
+    ]
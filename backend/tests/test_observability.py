@@ -0,0 +1,62 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from observability import LAT, REQS, wire
+from utils.tracing import get_trace_buffer, span
+
+
+def _series(metric, route_prefix):
+    return {
+        tuple(sorted(s.labels.items()))
+        for m in metric.collect()
+        for s in m.samples
+        if s.labels.get("path", "").startswith(route_prefix)
+    }
+
+
+def _app():
+    app = FastAPI()
+    wire(app)
+
+    @app.get("/obs-test/mindfolios/{pf_id}")
+    def get_mindfolio(pf_id: str):
+        with span("cache", op="get"):
+            pass
+        with span("compute"):
+            return {"id": pf_id}
+
+    return app
+
+
+def test_series_count_constant_across_distinct_ids():
+    client = TestClient(_app())
+    client.get("/obs-test/mindfolios/warmup")
+    before = (len(_series(REQS, "/obs-test")), len(_series(LAT, "/obs-test")))
+
+    for i in range(2000):
+        assert client.get(f"/obs-test/mindfolios/mf-{i}").status_code == 200
+    for i in range(50):
+        client.get(f"/obs-test/unknown/{i}")
+
+    after_reqs = _series(REQS, "/obs-test")
+    assert len(after_reqs) == before[0]
+    assert len(_series(LAT, "/obs-test")) == before[1]
+    assert any(
+        dict(labels)["path"] == "/obs-test/mindfolios/{pf_id}" for labels in after_reqs
+    )
+    unmatched = _series(REQS, "__unmatched__")
+    assert {dict(labels)["status"] for labels in unmatched} == {"404"}
+
+
+def test_request_spans_land_in_trace_buffer():
+    client = TestClient(_app())
+    get_trace_buffer().clear()
+    client.get("/obs-test/mindfolios/abc", headers={"x-request-id": "rid-1"})
+
+    trace = get_trace_buffer().recent(limit=1)[0]
+    assert trace["rid"] == "rid-1"
+    assert trace["route"] == "/obs-test/mindfolios/{pf_id}"
+    assert [s["name"] for s in trace["spans"]] == ["cache", "compute"]
+
+    res = client.get("/debug/traces", params={"route": "/obs-test/mindfolios/{pf_id}"})
+    assert res.json()["traces"][0]["rid"] == "rid-1"
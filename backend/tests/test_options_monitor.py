@@ -0,0 +1,165 @@
+import asyncio
+
+import pytest
+
+import options_selling_service as oss
+from options_selling_service import (
+    CCInput,
+    ComputeRequest,
+    MonitorStartRequest,
+    MonitorUpdateRequest,
+    PositionIn,
+    _MonitorService,
+    compute_selling,
+)
+
+
+def _position(ticker, delta=0.27, dte=30, price=100.0):
+    return PositionIn(
+        ticker=ticker,
+        price=price,
+        strike=price * 0.9,
+        delta=delta,
+        dte=dte,
+        premium=2.5,
+        iv_rank=50,
+        vix=20,
+    )
+
+
+def _book(n):
+    return [_position(f"T{i:03d}", delta=0.25 + (i % 6) * 0.02) for i in range(n)]
+
+
+class FakeCollection:
+    def __init__(self):
+        self.batches = []
+
+    async def insert_many(self, docs, ordered=True):
+        self.batches.append(list(docs))
+
+
+class FakeDB(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+async def _started(req):
+    svc = _MonitorService()
+    await svc.start(req)
+    svc._task.cancel()  # drive cycles by hand
+    return svc
+
+
+def test_first_cycle_matches_full_compute():
+    positions = _book(20)
+    cc = [
+        CCInput(
+            ticker="T001",
+            shares_owned=300,
+            candidate_call={"strike": 110, "delta": 0.2, "dte": 30, "premium": 1.5},
+        )
+    ]
+    for mode in ("equal", "greedy", "both"):
+        full = asyncio.run(
+            compute_selling(
+                ComputeRequest(positions=positions, mode=mode, cc_inputs=cc)
+            )
+        )
+
+        async def run():
+            svc = await _started(
+                MonitorStartRequest(positions=positions, mode=mode, cc_inputs=cc)
+            )
+            await svc._run_cycle(15)
+            status = (await svc.status())["data"]
+            await svc.stop()
+            return status
+
+        status = asyncio.run(run())
+        expected = full.summary_greedy if mode != "equal" else full.summary_equal
+        summary = dict(status["summary"])
+        assert summary.pop("cc_summary") == full.cc_summary
+        assert summary == pytest.approx(expected)
+        keys = {_MonitorService()._key(s) for s in status["signals_current"]}
+        puts = full.signals_greedy if mode == "greedy" else full.signals_equal
+        assert keys >= {_MonitorService()._key(s) for s in puts + full.cc_signals}
+
+
+def test_only_changed_symbols_recompute_and_persist(monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr(oss, "_db", db)
+
+    async def run():
+        svc = await _started(MonitorStartRequest(positions=_book(500)))
+        svc._log.batch_size = 2
+        first = await svc._run_cycle(15)
+        assert svc._snapshot.recomputed == 500
+        assert len(first.added) > 0
+
+        # Nothing changed: no recompute, nothing buffered
+        await svc.update(MonitorUpdateRequest(positions=[_book(500)[7]]))
+        await svc._run_cycle(15)
+        assert svc._snapshot.recomputed == 0
+        assert svc._log.pending() == 1  # only the first cycle's diff
+
+        # Spot/delta move on one ticker pushes it into ROLL
+        queue = svc.subscribe()
+        moved = _position("T007", delta=0.40, price=105.0)
+        res = await svc.update(MonitorUpdateRequest(positions=[moved]))
+        assert res["changed"] == 1
+        diffs = await svc._run_cycle(15)
+        assert svc._snapshot.recomputed == 1
+        assert {s["ticker"] for s in diffs.added + diffs.removed} == {"T007"}
+        event = queue.get_nowait()
+        assert event["symbols"] == ["T007"]
+
+        # A new chain version alone also triggers a recompute
+        await svc.update(MonitorUpdateRequest(chain_versions={"T008": "v2"}))
+        await svc._run_cycle(15)
+        assert svc._snapshot.recomputed == 1
+
+        status = (await svc.status())["data"]
+        await svc.stop()
+        return status
+
+    status = asyncio.run(run())
+    batches = db["options_monitor_snapshots"].batches
+    assert [len(b) for b in batches] == [2]
+    assert all("signals" not in doc and doc["diffs"] for doc in batches[0])
+    assert batches[0][1]["symbols"] == ["T007"]
+    assert status["diff_log"]["docs_written"] == 2
+    assert any(
+        s["ticker"] == "T007" and s["signal"] == "ROLL"
+        for s in status["signals_current"]
+    )
+
+
+def test_incremental_greedy_matches_full_recompute():
+    positions = _book(30)
+    moved = _position("T004", delta=0.29, price=80.0)
+
+    async def run():
+        svc = await _started(MonitorStartRequest(positions=positions, mode="greedy"))
+        await svc._run_cycle(15)
+        await svc.update(
+            MonitorUpdateRequest(positions=[moved], remove=["T010", "T011"])
+        )
+        await svc._run_cycle(15)
+        status = (await svc.status())["data"]
+        await svc.stop()
+        return status
+
+    status = asyncio.run(run())
+    book = [
+        moved if p.ticker == "T004" else p
+        for p in positions
+        if p.ticker not in ("T010", "T011")
+    ]
+    full = asyncio.run(compute_selling(ComputeRequest(positions=book, mode="greedy")))
+    key = _MonitorService()._key
+    assert sorted(map(key, status["signals_current"])) == sorted(
+        map(key, full.signals_greedy)
+    )
+    assert status["symbols"] == 28
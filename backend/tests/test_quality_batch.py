@@ -0,0 +1,62 @@
+import random
+
+from services.quality import (
+    TARGET_DELTA,
+    IndexedChain,
+    compute_quality,
+    compute_quality_batch,
+)
+
+
+def synthetic_chain(rng, strikes):
+    chain = {}
+    for k in strikes:
+        chain[str(k)] = {
+            "bid": rng.choice([0, round(rng.uniform(0.1, 15), 2)]),
+            "ask": round(rng.uniform(0.2, 16), 2),
+            "oi": rng.choice([0, rng.randint(1, 20000)]),
+            "volume": rng.randint(0, 5000),
+            "oi_pct": rng.uniform(-0.2, 1.2),
+        }
+    chain["999"] = {}  # empty rows are skipped like missing ones
+    return chain
+
+
+def test_batch_scores_match_scalar_compute_quality():
+    rng = random.Random(8)
+    strikes = [float(k) for k in range(80, 121, 5)] + [100, 105]  # "100" != "100.0"
+    chain = synthetic_chain(rng, strikes)
+    payloads, contexts = [], []
+    for _ in range(2000):
+        legs = [
+            {"strike": rng.choice(strikes + [999, 42.0])}
+            for _ in range(rng.randint(0, 4))
+        ]
+        payload = {"legs": legs, "strategyId": rng.choice(list(TARGET_DELTA) + ["x"])}
+        if rng.random() < 0.9:
+            payload["dte"] = rng.randint(0, 120)
+        if rng.random() < 0.8:
+            payload["be_pct"] = rng.choice([None, rng.uniform(-0.4, 0.4)])
+        payloads.append(payload)
+        contexts.append(
+            {
+                "theo": rng.choice([0, rng.uniform(-1, 10)]),
+                "mid": rng.choice([0, rng.uniform(-1, 10)]),
+                "is_credit": rng.choice([True, False, 0, 1]),
+                "iv_rank_z": rng.gauss(0, 2),
+                "delta": rng.uniform(-1, 1),
+                "gamma": rng.uniform(-0.05, 0.05),
+                "vega": rng.uniform(-200, 200),
+                "max_loss": rng.uniform(1, 3000),
+                "max_gain": rng.uniform(0, 5000),
+                "assignment_risk": rng.uniform(-0.2, 1.2),
+                "earnings_soon": rng.random() < 0.2,
+            }
+        )
+    contexts[0] = {}  # all defaults
+
+    expected = [compute_quality(p, chain, c) for p, c in zip(payloads, contexts)]
+
+    assert compute_quality_batch(payloads, IndexedChain(chain), contexts) == expected
+    assert compute_quality_batch(payloads, chain, contexts) == expected
+    assert compute_quality_batch([], chain, []) == []
@@ -0,0 +1,100 @@
+import asyncio
+import sqlite3
+import threading
+
+from services.quote_gateway import QuoteGateway
+
+
+class FakeFetcher:
+    def __init__(self, missing=()):
+        self.calls = []
+        self.missing = set(missing)
+
+    def __call__(self, symbols):
+        self.calls.append(list(symbols))
+        return {
+            s: {"Symbol": s, "Last": 100.0 + i}
+            for i, s in enumerate(symbols)
+            if s not in self.missing
+        }
+
+
+def _marks_db(tmp_path, rows):
+    path = str(tmp_path / "marks.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE marks (symbol TEXT PRIMARY KEY, last REAL, today_open REAL, "
+        "updated_at TEXT NOT NULL DEFAULT (datetime('now')))"
+    )
+    conn.executemany("INSERT INTO marks(symbol, last) VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_concurrent_async_requests_share_one_upstream_call(tmp_path):
+    fetcher = FakeFetcher()
+    gw = QuoteGateway(fetcher=fetcher, window_ms=10, db_path=str(tmp_path / "x.db"))
+    symbols = [f"S{i}" for i in range(50)]
+
+    async def run():
+        return await asyncio.gather(*(gw.get_quote(s) for s in symbols))
+
+    quotes = asyncio.run(run())
+    assert len(fetcher.calls) == 1
+    assert sorted(fetcher.calls[0]) == sorted(symbols)
+    assert [q["Symbol"] for q in quotes] == symbols
+
+
+def test_batches_are_capped_at_max_batch(tmp_path):
+    fetcher = FakeFetcher()
+    gw = QuoteGateway(
+        fetcher=fetcher, window_ms=10, max_batch=20, db_path=str(tmp_path / "x.db")
+    )
+
+    async def run():
+        return await gw.get_quotes([f"S{i}" for i in range(45)])
+
+    quotes = asyncio.run(run())
+    assert len(quotes) == 45
+    assert all(len(c) <= 20 for c in fetcher.calls)
+
+
+def test_ttl_cache_avoids_repeat_upstream_calls(tmp_path):
+    fetcher = FakeFetcher()
+    gw = QuoteGateway(
+        fetcher=fetcher, window_ms=0, ttl=60, db_path=str(tmp_path / "x.db")
+    )
+    assert gw.get_spot("tsla") == 100.0
+    assert gw.get_spot("TSLA") == 100.0
+    assert len(fetcher.calls) == 1
+    assert gw.get_stats()["cache_hits"] == 1
+
+
+def test_falls_back_to_marks_table(tmp_path):
+    path = _marks_db(tmp_path, [("TSLA", 245.6)])
+    fetcher = FakeFetcher(missing={"TSLA"})
+    gw = QuoteGateway(fetcher=fetcher, window_ms=0, db_path=path)
+
+    assert gw.get_spot("TSLA") == 245.6
+    quote = asyncio.run(gw.get_quote("TSLA"))
+    assert quote["source"] == "marks"
+    gw.close()
+
+
+def test_sync_threads_coalesce(tmp_path):
+    fetcher = FakeFetcher()
+    gw = QuoteGateway(fetcher=fetcher, window_ms=50, db_path=str(tmp_path / "x.db"))
+    results = {}
+
+    def worker(sym):
+        results[sym] = gw.get_spot(sym)
+
+    threads = [threading.Thread(target=worker, args=(f"S{i}",)) for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(results) == 10
+    assert len(fetcher.calls) < 10
@@ -0,0 +1,170 @@
+import asyncio
+import bisect
+import random
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+import middleware.rate_limit as rl
+from middleware.rate_limit import LocalTokenBucket, RateLimiter, Rule
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_gcra_bounds_bursts_at_window_edges():
+    clock = FakeClock()
+    bucket = LocalTokenBucket(clock=clock)
+    rule = Rule(limit=10, window=5)
+    assert rule.burst == 5  # default RL_BURST_RATIO 0.5
+
+    burst = [bucket.acquire("k", rule) for _ in range(12)]
+    assert [d.allowed for d in burst] == [True] * 5 + [False] * 7
+    assert burst[0].remaining == 4 and burst[4].remaining == 0
+    assert burst[5].retry_after == 0.5
+
+    # A fixed window would hand out another 10 right after the boundary
+    clock.now += 0.6
+    assert [bucket.acquire("k", rule).allowed for _ in range(3)] == [
+        True,
+        False,
+        False,
+    ]
+
+    # Sustained rate: one request per interval
+    allowed = 0
+    for _ in range(50):
+        clock.now += 0.1
+        allowed += bucket.acquire("k", rule).allowed
+    assert allowed == 10
+
+
+def test_no_window_admits_more_than_limit_plus_burst():
+    clock = FakeClock()
+    bucket = LocalTokenBucket(clock=clock)
+    rule = Rule(limit=20, window=5)
+    rng = random.Random(7)
+
+    admitted = []
+    for _ in range(5000):
+        # bursts of back-to-back requests separated by idle gaps
+        clock.now += rng.choice([0.0, 0.0, 0.01, 0.3, 2.0, 6.0])
+        if bucket.acquire("k", rule).allowed:
+            admitted.append(clock.now)
+
+    worst = max(
+        bisect.bisect_right(admitted, t + rule.window - 1e-9) - i
+        for i, t in enumerate(admitted)
+    )
+    assert worst <= rule.limit + rule.burst
+    assert worst < 2 * rule.limit
+
+
+def test_local_buckets_are_lru_bounded():
+    bucket = LocalTokenBucket(max_keys=3, clock=FakeClock())
+    for i in range(10):
+        bucket.acquire(f"k{i}", Rule(limit=1))
+    assert list(bucket._tat) == ["k7", "k8", "k9"]
+
+
+def test_route_and_key_rules(monkeypatch):
+    monkeypatch.setitem(rl.KEY_RULES, "vip", Rule(limit=1000, window=60))
+    assert rl._limit_for("/api/prices/AAPL") == rl.LIMIT_PRICES
+    assert rl._limit_for("/api/mindfolios/x/ts/sync") == rl.LIMIT_TS
+    assert rl._limit_for("/api/other") == rl.LIMIT_DEFAULT
+    assert rl._rule_for("/api/prices/AAPL", "vip").limit == 1000
+    assert rl._parse_rules("/api/x=5/10,bad")["/api/x"] == Rule(5, 10.0)
+
+
+class BrokenRedis:
+    async def acquire(self, key, rule):
+        raise ConnectionError("redis down")
+
+
+def test_middleware_limits_and_falls_back_when_redis_fails(monkeypatch):
+    limiter = RateLimiter(redis_url="redis://unused")
+    limiter._redis = BrokenRedis()
+    monkeypatch.setattr(rl, "_limiter", limiter)
+    monkeypatch.setitem(rl.ROUTE_RULES, "/api/prices", Rule(limit=3, window=60))
+
+    def request():
+        return Request(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": "/api/prices/AAPL",
+                "headers": [],
+                "client": ("10.0.0.1", 1234),
+                "query_string": b"",
+            }
+        )
+
+    async def call_next(_):
+        return Response("ok")
+
+    async def run():
+        return await asyncio.gather(
+            *(rl.rate_limit(request(), call_next) for _ in range(5))
+        )
+
+    responses = asyncio.run(run())
+    # limit 3 -> burst of 2 at once, the rest is spread over the window
+    assert [r.status_code for r in responses] == [200, 200, 429, 429, 429]
+    assert responses[0].headers["X-RateLimit-Remaining"] == "1"
+    assert int(responses[2].headers["Retry-After"]) >= 1
+    assert limiter.stats["redis_errors"] == 1
+    assert limiter.stats["limited"] == 3
+
+
+def test_unknown_api_keys_fall_back_to_client_ip(monkeypatch):
+    monkeypatch.setitem(rl.KEY_RULES, "vip-secret", Rule(limit=1000, window=60))
+
+    def request(key):
+        return Request(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": "/api/prices/AAPL",
+                "headers": [(rl.KEY_HEADER.lower().encode(), key.encode())],
+                "client": ("10.0.0.9", 1234),
+                "query_string": b"",
+            }
+        )
+
+    # a fresh made-up key per request must not buy a fresh bucket
+    assert rl._client_identity(request("random-1")) == ("10.0.0.9", None)
+    assert rl._client_identity(request("random-2")) == ("10.0.0.9", None)
+
+    ident, key = rl._client_identity(request("vip-secret"))
+    assert key == "vip-secret"
+    assert ident.startswith("k:") and "vip-secret" not in ident
+
+
+class RecordingScript:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        return [1, 0, 0]
+
+
+class ScriptClient:
+    def __init__(self):
+        self.script = RecordingScript()
+
+    def register_script(self, source):
+        return self.script
+
+
+def test_redis_interval_rounds_up():
+    client = ScriptClient()
+    gcra = rl.RedisGCRA(client)
+    asyncio.run(gcra.acquire("k", Rule(limit=4, window=1.5)))  # 375ms, burst 2
+    asyncio.run(gcra.acquire("k", Rule(limit=3, window=1)))  # 333.3ms, burst 2
+    assert [args for _, args in client.script.calls] == [[375, 375], [334, 334]]
@@ -0,0 +1,118 @@
+import asyncio
+
+import agents.tier4_workers.scanner_agent as scanner_module
+from agents.tier4_workers.scan_scheduler import ScanScheduler, StubScanDataProvider
+from agents.tier4_workers.scanner_agent import UniverseScannerAgent
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Worker(UniverseScannerAgent):
+    """Real light scan; deep scan decided by a fixed set (no network)."""
+
+    def __init__(self, agent_id, log, keep_hot=(), delay=0.0):
+        super().__init__(agent_id, [])
+        self.log, self.keep_hot, self.delay = log, set(keep_hot), delay
+        self.active = 0
+
+    async def scan_light(self, ticker, quote=None, technical=None):
+        self.log.append(("light", ticker))
+        await asyncio.sleep(self.delay)
+        return await super().scan_light(ticker, quote=quote, technical=technical)
+
+    async def scan_deep(self, ticker, quote=None, technical=None):
+        self.log.append(("deep", ticker))
+        await asyncio.sleep(self.delay)
+        if ticker in self.keep_hot:
+            return {"ticker": ticker, "confidence": 0.9, "total_score": 90}
+        return None
+
+    async def publish_signal(self, signal):
+        pass
+
+
+def run_with_workers(scheduler, workers, cycles):
+    """Run one scheduler cycle per callback; each checks and then advances."""
+
+    async def run():
+        tasks = [asyncio.create_task(scheduler.run_worker(w)) for w in workers]
+        try:
+            for step in cycles:
+                await scheduler.run_cycle()
+                step()
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    asyncio.run(run())
+
+
+def test_batched_fetches_and_hot_tickers_rescanned_deep_first(monkeypatch):
+    def no_direct_fetch(*args, **kwargs):
+        raise AssertionError("agents must use the scheduler's prefetched data")
+
+    monkeypatch.setattr(
+        scanner_module.enhanced_ticker_manager, "get_real_time_quote", no_direct_fetch
+    )
+    monkeypatch.setattr(
+        scanner_module.technical_analyzer, "analyze_stock_technical", no_direct_fetch
+    )
+
+    universe = [f"T{i:03d}" for i in range(200)]
+    movers = ["T007", "T150", "T199"]
+    provider = StubScanDataProvider(movers=movers)
+    clock = FakeClock()
+    scheduler = ScanScheduler(
+        universe,
+        provider,
+        light_interval=300,
+        deep_interval=60,
+        batch_size=50,
+        clock=clock,
+    )
+    log = []
+    workers = [Worker(f"w{i}", log, keep_hot={"T150"}) for i in range(8)]
+
+    def first_pass():
+        # one full light pass: 4 quote batches, technicals only for the movers
+        assert sorted(t for _, t in log) == universe
+        assert provider.calls == {"quotes": 4, "technicals": 2}  # T150+T199 share
+        assert provider.symbols == {"quotes": 200, "technicals": 3}
+        assert sorted(scheduler.hot_tickers) == movers
+        log.clear()
+        clock.now += 60
+
+    def deep_pass():
+        assert sorted(log) == [("deep", t) for t in movers]
+        assert scheduler.hot_tickers == ["T150"]  # deep misses cool off
+        log.clear()
+        clock.now += 240
+
+    def second_light_pass():
+        # cold tickers come due again; the still-hot one is served first, deep
+        assert log[0] == ("deep", "T150")
+        assert len(log) == 198  # T007/T199 were rescanned at t=60, due at 360
+        assert scheduler.stats["scans"] == 401
+
+    run_with_workers(scheduler, workers, [first_pass, deep_pass, second_light_pass])
+
+
+def test_global_concurrency_budget_caps_scans_in_flight():
+    universe = [f"T{i:03d}" for i in range(120)]
+    provider = StubScanDataProvider()
+    scheduler = ScanScheduler(universe, provider, batch_size=40, concurrency=5)
+    log = []
+    workers = [Worker(f"w{i}", log, delay=0.002) for i in range(30)]
+
+    run_with_workers(scheduler, workers, [lambda: None])
+
+    assert len(log) == 120
+    assert scheduler.stats["peak_in_flight"] == 5
+    assert scheduler.stats["in_flight"] == 0
+    assert provider.calls["quotes"] == 3
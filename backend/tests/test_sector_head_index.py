@@ -0,0 +1,180 @@
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from agents.tier2_validators.sector_head import (
+    SECTORS,
+    TICKER_SECTOR,
+    IndexedPortfolio,
+    RollingCorrelation,
+    SectorHead,
+)
+
+
+def rescan(portfolio):
+    """Aggregates the way the validator used to compute them per signal."""
+    value, count = {}, {}
+    for ticker, v in portfolio.items():
+        sector = next((s for s, c in SECTORS.items() if ticker in c["tickers"]), None)
+        value[sector] = value.get(sector, 0.0) + v
+        count[sector] = count.get(sector, 0) + 1
+    return sum(portfolio.values()), value, count
+
+
+def test_index_tracks_every_kind_of_position_change():
+    rng = random.Random(4)
+    tickers = list(TICKER_SECTOR) + ["UNKNOWN"]
+    portfolio = IndexedPortfolio({"AAPL": 1000.0, "GOOGL": 500.0})
+
+    for _ in range(2000):
+        op = rng.random()
+        ticker = rng.choice(tickers)
+        if op < 0.5:
+            portfolio[ticker] = rng.uniform(100, 5000)
+        elif op < 0.7:
+            portfolio.pop(ticker, None)
+        elif op < 0.8 and ticker in portfolio:
+            del portfolio[ticker]
+        elif op < 0.9:
+            portfolio.update({rng.choice(tickers): 250.0, ticker: 750.0})
+        elif portfolio:
+            portfolio.popitem()
+
+    total, value, count = rescan(portfolio)
+    assert portfolio.total == pytest.approx(total)
+    for sector in set(value) | set(portfolio.sector_value):
+        assert portfolio.sector_value[sector] == pytest.approx(value.get(sector, 0.0))
+        assert portfolio.sector_count[sector] == count.get(sector, 0)
+    assert TICKER_SECTOR["GOOGL"] == "technology"  # first listed sector wins
+
+
+def no_bars(ticker, days):
+    return {}
+
+
+def daily_closes(returns, start=date(2026, 1, 1), skip=()):
+    """{date: close} for consecutive sessions, leaving out the `skip` offsets."""
+    closes, price = {}, 100.0
+    for i, r in enumerate(returns):
+        price *= 1 + r
+        if i not in skip:
+            closes[(start + timedelta(days=i)).isoformat()] = price
+    return closes
+
+
+def test_exposure_and_concentration_use_running_aggregates():
+    head = SectorHead("sector_head_technology", "technology", [], bar_source=no_bars)
+    head.current_portfolio = {"MSFT": 35000, "GOOGL": 30000}
+
+    assert asyncio.run(head._check_exposure_limit("NVDA", "technology")) is False
+    head.update_position("MSFT", 0)
+    head.update_position("JPM", 200000)
+    assert asyncio.run(head._check_exposure_limit("NVDA", "technology")) is True
+
+    head.update_position("AAPL", 1000)
+    head.update_position("ORCL", 1000)
+    assert asyncio.run(head._check_correlation("NVDA", "technology")) is False
+    assert head.rejection_reasons["sector_concentration"] == 1
+
+
+def test_rolling_correlation_rejects_look_alike_positions():
+    rng = random.Random(2)
+    base = [rng.gauss(0, 0.02) for _ in range(80)]
+    series = {
+        "AAPL": daily_closes(base),
+        "MSFT": daily_closes([r + rng.gauss(0, 0.002) for r in base]),
+        "NVDA": daily_closes([rng.gauss(0, 0.02) for _ in range(80)]),
+    }
+    fetched = []
+
+    def bars(ticker, days):
+        fetched.append(ticker)
+        return series.get(ticker, {})
+
+    head = SectorHead("sector_head_technology", "technology", [], bar_source=bars)
+    head.current_portfolio = {"AAPL": 10000}
+
+    assert asyncio.run(head._check_correlation("MSFT", "technology")) is False
+    assert head.rejection_reasons["high_correlation"] == 1
+    assert asyncio.run(head._check_correlation("NVDA", "technology")) is True
+    # no bars: accepted, as before
+    assert asyncio.run(head._check_correlation("ORCL", "technology")) is True
+    # bars are cached per ticker, not refetched per signal
+    assert sorted(fetched) == ["AAPL", "MSFT", "NVDA", "ORCL"]
+
+
+def test_pairs_intersect_on_dates_not_position():
+    rng = random.Random(5)
+    corr = RollingCorrelation(window=60, min_obs=20)
+    base = [rng.gauss(0, 0.02) for _ in range(90)]
+    # MSFT misses sessions AAPL has: a positional zip would misalign them
+    corr.set_closes("AAPL", daily_closes(base))
+    corr.set_closes(
+        "MSFT",
+        daily_closes([r + rng.gauss(0, 0.002) for r in base], skip={10, 30, 50, 70}),
+    )
+    assert corr.correlation("AAPL", "MSFT") > 0.9
+
+    # the same returns shifted by one session are unrelated
+    corr.set_closes("NVDA", daily_closes(base, start=date(2026, 1, 2)))
+    assert abs(corr.correlation("AAPL", "NVDA")) < 0.5
+
+    # correlation over the last `window` shared dates only
+    ra, rb = corr._returns["AAPL"], corr._returns["MSFT"]
+    common = sorted(ra.keys() & rb.keys())[-corr.window :]
+    want = np.corrcoef([ra[d] for d in common], [rb[d] for d in common])[0, 1]
+    assert corr.correlation("AAPL", "MSFT") == pytest.approx(want)
+
+    # too few shared sessions, a flat series and no history give None
+    corr.set_closes("ORCL", daily_closes(base[:10]))
+    assert corr.correlation("AAPL", "ORCL") is None
+    corr.set_closes("FLAT", daily_closes([0.0] * 90))
+    assert corr.correlation("AAPL", "FLAT") is None
+    assert corr.correlation("AAPL", "JPM") is None
+
+    # replacing closes invalidates the cached pair
+    corr.set_closes("MSFT", daily_closes([rng.gauss(0, 0.02) for _ in range(90)]))
+    assert abs(corr.correlation("AAPL", "MSFT")) < 0.5
+
+
+def test_failed_bar_fetch_accepts_the_signal():
+    calls = []
+
+    def bars(ticker, days):
+        calls.append(ticker)
+        raise ConnectionError("no data")
+
+    head = SectorHead("sector_head_technology", "technology", [], bar_source=bars)
+    head.current_portfolio = {"AAPL": 10000, "JPM": 200000}
+
+    async def run():
+        return [
+            await head.validate_signal({"ticker": "MSFT", "total_score": 70})
+            for _ in range(3)
+        ]
+
+    assert all(result is not None for result in asyncio.run(run()))
+    assert sorted(calls) == ["AAPL", "MSFT"]  # the empty result is cached too
+
+
+def test_validation_throughput():
+    rng = random.Random(1)
+    tickers = list(TICKER_SECTOR)
+    head = SectorHead("sector_head_technology", "technology", [], bar_source=no_bars)
+    head.current_portfolio = {t: 2000.0 for t in tickers[::10]}
+    signals = [{"ticker": rng.choice(tickers), "total_score": 70} for _ in range(20000)]
+
+    async def run():
+        for signal in signals:
+            await head.validate_signal(signal)
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert head.signals_processed == 20000
+    assert elapsed < 2.0
@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import pytest
+
+from smart_rebalancing_service import SmartRebalancingService, run_section_graph
+
+SECTION_DELAY = 0.05
+
+
+class SlowService(SmartRebalancingService):
+    """Every input load and analysis section takes SECTION_DELAY seconds."""
+
+    def __init__(self):
+        super().__init__()
+        self.ml_models_loaded = True
+        self.loads = {"mindfolio": 0, "market": 0}
+        for name in (
+            "_calculate_mindfolio_health",
+            "_calculate_risk_score",
+            "_generate_ai_insights",
+            "_generate_rebalance_recommendations",
+            "_generate_options_recommendations",
+            "_calculate_var_95",
+            "_calculate_max_drawdown",
+            "_identify_risk_factors",
+        ):
+            setattr(self, name, self._slow(getattr(self, name)))
+
+    @staticmethod
+    def _slow(fn):
+        async def section(*args):
+            await asyncio.sleep(SECTION_DELAY)
+            return await fn(*args)
+
+        return section
+
+    async def _get_mindfolio_data(self, mindfolio_id):
+        self.loads["mindfolio"] += 1
+        await asyncio.sleep(SECTION_DELAY)
+        return await super()._get_mindfolio_data(mindfolio_id)
+
+    async def _get_market_conditions(self):
+        self.loads["market"] += 1
+        await asyncio.sleep(SECTION_DELAY)
+        return await super()._get_market_conditions()
+
+
+def test_sections_run_concurrently_on_shared_inputs():
+    service = SlowService()
+
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            service.analyze_mindfolio_comprehensive("htech-15t"),
+            service.generate_rebalancing_recommendations("htech-15t"),
+            service.analyze_risk_management("htech-15t"),
+            service.analyze_smart_dca_opportunities("htech-15t"),
+        )
+        return results, time.perf_counter() - start
+
+    (analysis, recs, risk, dca), elapsed = asyncio.run(run())
+
+    assert [r["status"] for r in (analysis, recs, risk, dca)] == ["success"] * 4
+    assert list(analysis["analysis"])[:3] == [
+        "mindfolio_health",
+        "diversification_score",
+        "risk_score",
+    ]
+    assert [r["type"] for r in recs["recommendations"]] == [
+        "REBALANCE",
+        "OPTIONS_ROLL",
+        "POSITION_SIZE",
+        "SMART_DCA",
+    ]
+    assert risk["risk_analysis"]["risk_factors"][0]["factor"] == "Sector Concentration"
+    assert dca["dca_analysis"]["total_capital_required"] == 25000
+
+    # one load per input across all four endpoints; input + one section deep
+    assert service.loads == {"mindfolio": 1, "market": 1}
+    assert elapsed < 4 * SECTION_DELAY
+
+
+def test_failing_section_cancels_the_rest():
+    finished = []
+
+    async def ok():
+        await asyncio.sleep(0.05)
+        finished.append("ok")
+
+    async def boom():
+        raise ValueError("bad section")
+
+    async def run():
+        with pytest.raises(ValueError):
+            await run_section_graph({"ok": (ok, ()), "boom": (boom, ())})
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    assert finished == []
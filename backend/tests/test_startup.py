@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from utils.lazy import LazyObject, LazyRouterRegistry
+from utils.startup_profile import profile_imports
+
+BACKEND = Path(__file__).resolve().parents[1]
+BOOT_BUDGET_SECONDS = float(os.getenv("BOOT_BUDGET_SECONDS", "6"))
+HEAVY_MODULES = [
+    "investment_scoring_agent",
+    "technical_analysis_agent",
+    "mindfolio_charts_service",
+    "smart_rebalancing_service",
+    "routers.core_engine",
+    "routers.term_structure",
+    "routers.geopolitical",
+    "pandas",
+    "matplotlib",
+]
+
+BOOT_SCRIPT = textwrap.dedent("""
+    import json, socket, sys, time
+
+    def no_network(*args, **kwargs):
+        raise OSError("network disabled during boot test")
+
+    socket.socket.connect = no_network
+    socket.create_connection = no_network
+
+    t0 = time.perf_counter()
+    import server
+    elapsed = time.perf_counter() - t0
+    print(json.dumps({
+        "elapsed": elapsed,
+        "loaded": [m for m in %r if m in sys.modules],
+        "pending": sorted(server.lazy_routers.pending()),
+    }))
+    """ % (HEAVY_MODULES,))
+
+
+def test_app_boots_within_budget_without_network():
+    env = {
+        **os.environ,
+        "MONGO_URL": "mongodb://127.0.0.1:1",
+        "DB_NAME": "flowmind_boot_test",
+        "WARMUP_ENABLED": "0",
+        "TEST_MODE": "1",
+        "LAZY_ROUTERS": "1",
+    }
+    out = subprocess.run(
+        [sys.executable, "-c", BOOT_SCRIPT],
+        cwd=BACKEND,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert out.returncode == 0, out.stderr[-2000:]
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    assert result["elapsed"] < BOOT_BUDGET_SECONDS
+    assert result["loaded"] == []
+    assert result["pending"] == [
+        "/api/core-engine",
+        "/api/geopolitical",
+        "/api/term-structure",
+    ]
+
+
+def test_lazy_router_mounts_on_first_request(tmp_path, monkeypatch):
+    (tmp_path / "lazy_demo_router.py").write_text(textwrap.dedent("""
+            from fastapi import APIRouter
+
+            router = APIRouter(prefix="/api/demo")
+
+            @router.get("/ping")
+            def ping():
+                return {"pong": True}
+            """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_demo_router", raising=False)
+
+    app = FastAPI()
+    registry = LazyRouterRegistry(app)
+    app.middleware("http")(registry.middleware)
+    registry.register("/api/demo", "lazy_demo_router:router")
+    registry.register("/api/broken", "lazy_missing_module:router")
+
+    with TestClient(app) as client:
+        assert "lazy_demo_router" not in sys.modules
+        assert client.get("/api/demox").status_code == 404
+        assert "lazy_demo_router" not in sys.modules
+
+        assert client.get("/api/demo/ping").json() == {"pong": True}
+        assert "lazy_demo_router" in sys.modules
+        assert client.get("/api/broken/x").status_code == 404
+
+    status = registry.status()
+    assert status["pending"] == []
+    assert list(status["loaded_ms"]) == ["/api/demo"]
+    assert "/api/broken" in status["errors"]
+
+
+def test_lazy_object_instantiates_once_on_first_use():
+    proxy = LazyObject("collections:Counter")
+    assert not proxy.loaded
+    proxy.update("aab")
+    assert proxy.loaded
+    assert proxy.most_common(1) == [("a", 2)]
+
+
+def test_startup_profile_reports_per_module():
+    sys.modules.pop("json.tool", None)
+    with profile_imports() as prof:
+        import json.tool  # noqa: F401
+
+    row = prof.modules["json.tool"]
+    assert row.cumulative_ms >= row.self_ms >= 0
+    assert row.memory_kb is not None
+    data = prof.to_dict(top=5)
+    assert data["modules_imported"] >= 1
+    assert "json.tool" in prof.report()
+
+
+def test_warmup_runs_sync_chain_fetch_off_the_loop(monkeypatch):
+    import services.options_gex as gex
+    from services.warmup import warmup_options_chain
+
+    seen = {}
+
+    def fake_fetch_chain(_client, symbol):
+        try:
+            asyncio.get_running_loop()
+            seen["in_loop"] = True
+        except RuntimeError:
+            seen["in_loop"] = False
+        return {"raw": [symbol]}
+
+    monkeypatch.setattr(gex, "fetch_chain", fake_fetch_chain)
+    assert asyncio.run(warmup_options_chain("spy")) is True
+    assert seen == {"in_loop": False}
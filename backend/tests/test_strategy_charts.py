@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import options_strategy_charts as charts
+from routers.options import router as options_router
+
+
+def strategy(name="Iron Condor", spot=229.0, **extra):
+    return {
+        "strategy_name": name,
+        "ticker": "AAPL",
+        "entry_logic": {"underlying_price": spot},
+        **extra,
+    }
+
+
+def test_compact_data_keeps_the_payoff_shape():
+    charts.clear_caches()
+    for name in ["Bull Call Spread", "Long Put", "Long Strangle", "Iron Condor"]:
+        spec = charts.payoff_spec(strategy(name))
+        data = charts.payoff_data(strategy(name), max_points=60)
+
+        assert 2 <= len(data["x"]) < len(spec["x"])
+        assert data["x"][0] == round(float(spec["x"][0]), 4)
+        assert data["x"][-1] == round(float(spec["x"][-1]), 4)
+        # piecewise-linear interpolation of the compact arrays is the full curve
+        assert np.allclose(
+            np.interp(spec["x"], data["x"], data["y"]), spec["y"], atol=0.05
+        )
+
+    condor = charts.payoff_data(strategy())
+    assert condor["max_profit"] == 200.0
+    assert len(condor["breakevens"]) == 2 and condor["zones"]
+
+
+def test_outputs_are_cached_by_content_hash():
+    charts.clear_caches()
+    first = charts.chart_generator.generate_strategy_chart(strategy())
+    again = charts.chart_generator.generate_strategy_chart(strategy())
+    assert first == again
+    assert charts.cache_stats()["plotly"]["hits"] == 1
+    assert json.loads(first["plotly_chart"])["data"][0]["name"] == "P&L"
+
+    key = charts.chart_key(strategy())
+    assert key == charts.chart_key(strategy())
+    assert key != charts.chart_key(strategy(spot=230.0))
+    assert key != charts.chart_key(strategy(price_range=[150, 300]))
+    assert key != charts.chart_key(strategy(legs=[{"strike": 230, "type": "C"}]))
+
+
+def test_png_renders_once_in_the_process_pool(monkeypatch):
+    charts.clear_caches()
+    monkeypatch.setattr(charts, "CHART_RENDER_PROCESSES", 1)
+
+    async def run():
+        return await asyncio.gather(
+            *(charts.render_png(strategy(), 400, 200) for _ in range(3))
+        )
+
+    try:
+        images = asyncio.run(run())
+    finally:
+        charts.shutdown_pool()
+
+    assert images[0].startswith(b"\x89PNG") and len(set(images)) == 1
+    stats = charts.cache_stats()["png"]
+    assert (stats["entries"], stats["coalesced"]) == (1, 2)
+
+
+def test_strategy_chart_endpoint_defaults_to_data_with_etag():
+    charts.clear_caches()
+    app = FastAPI()
+    app.include_router(options_router, prefix="/api")
+    client = TestClient(app)
+
+    res = client.post("/api/options/strategy-chart", json=strategy("Long Call"))
+    assert res.status_code == 200
+    body = res.json()
+    assert body["chart_type"] == "directional" and "plotly_chart" not in body
+    etag = res.headers["ETag"]
+
+    cached = client.post(
+        "/api/options/strategy-chart",
+        json=strategy("Long Call"),
+        headers={"If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+
+    plotly = client.post(
+        "/api/options/strategy-chart?format=plotly", json=strategy("Long Call")
+    )
+    assert plotly.json()["breakeven"] == body["breakeven"]
+    assert plotly.headers["ETag"] != etag
+
+
+def test_cached_data_is_a_copy_and_shape_order_is_kept():
+    charts.clear_caches()
+    data = charts.payoff_data(strategy("Long Straddle"))
+    data["x"].clear()
+    data["breakevens"][0]["x"] = 0.0
+    data["max_loss"] = 0.0
+
+    again = charts.payoff_data(strategy("Long Straddle"))
+    assert again["x"] and again["breakevens"][0]["x"] > 0
+    assert again["max_loss"] == 600.0
+
+    # straddle/strangle shade their profit zones after the lines, condors before
+    for name, order in [
+        ("Long Straddle", ["line", "line", "line", "rect", "rect"]),
+        ("Iron Condor", ["rect", "line", "line", "line"]),
+    ]:
+        chart = charts.chart_generator.generate_strategy_chart(strategy(name))
+        shapes = json.loads(chart["plotly_chart"])["layout"]["shapes"]
+        assert [s["type"] for s in shapes] == order
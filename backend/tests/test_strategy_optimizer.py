@@ -0,0 +1,113 @@
+import numpy as np
+
+from expert_options_system import ExpertOptionsSystem, StrategyType
+from services import strategy_optimizer
+from services.strategy_optimizer import (
+    backtest_population,
+    clear_caches,
+    evaluate_population,
+    load_history,
+    optimize_strategy,
+    synthetic_history,
+)
+
+HISTORY = synthetic_history(days=400, seed=3)
+WHEEL = {"put_delta_target": 0.30, "profit_target_pct": 50, "max_dte": 45}
+
+
+def test_population_pass_matches_single_candidate_backtests():
+    rng = np.random.default_rng(0)
+    pop = [
+        {
+            **WHEEL,
+            "put_delta_target": rng.uniform(0.15, 0.40),
+            "max_dte": int(rng.integers(21, 61)),
+        }
+        for _ in range(40)
+    ]
+    batch = backtest_population("wheel", HISTORY, pop)
+    single = np.vstack([backtest_population("wheel", HISTORY, [p]) for p in pop])
+    np.testing.assert_allclose(batch, single)
+
+
+def test_parameters_change_the_score():
+    clear_caches()
+    scores = evaluate_population(
+        "iron_condor",
+        HISTORY,
+        [
+            {"target_delta": 0.10, "profit_target_pct": 15, "wing_width": 5},
+            {"target_delta": 0.25, "profit_target_pct": 40, "wing_width": 20},
+        ],
+    )
+    assert scores[0] != scores[1]
+
+
+def test_optimizer_improves_and_memoizes():
+    clear_caches()
+    kwargs = dict(population=16, generations=5, islands=2, processes=1, seed=1)
+    result = optimize_strategy("wheel", HISTORY, WHEEL, **kwargs)
+
+    assert result.best_score >= result.baseline_score
+    assert result.convergence == sorted(result.convergence)
+    assert result.evaluated == 2 * 16 * 5
+    assert 0.15 <= result.best_params["put_delta_target"] <= 0.40
+    assert float(result.best_params["max_dte"]).is_integer()
+
+    again = optimize_strategy("wheel", HISTORY, WHEEL, **kwargs)
+    assert again.cached and again.best_params == result.best_params
+
+
+def test_expert_system_uses_backtest_scores():
+    clear_caches()
+    system = ExpertOptionsSystem()
+    params = system.learning_parameters[StrategyType.WHEEL]
+    a = system._evaluate_parameters(StrategyType.WHEEL, params, [], history=HISTORY)
+    b = system._evaluate_parameters(
+        StrategyType.WHEEL, {**params, "put_delta_target": 0.15}, [], history=HISTORY
+    )
+    assert a != b
+
+    optimized = system._genetic_algorithm_optimization(
+        StrategyType.WHEEL, [], history=HISTORY
+    )
+    assert isinstance(optimized["max_dte"], int)
+    assert "wheel" in {s["strategy"] for s in system.last_optimization.values()}
+
+
+def test_load_history_reads_daily_bars_from_the_source():
+    calls = []
+
+    def fetch(symbol, days):
+        calls.append((symbol, days))
+        return [{"close": float(c)} for c in HISTORY.close] + [{"close": None}]
+
+    history = load_history("optx", days=400, fetch=fetch)
+    assert history.symbol == "OPTX"
+    assert np.array_equal(history.close, HISTORY.close)
+    assert (history.iv > 0).all()
+    assert load_history("optx", days=400, fetch=fetch) is history  # cached
+    assert calls == [("OPTX", 400)]
+
+    assert load_history("short", days=400, fetch=lambda s, d: fetch(s, d)[:50]) is None
+
+
+def test_islands_share_one_spawn_pool(monkeypatch):
+    monkeypatch.setattr(strategy_optimizer, "OPTIMIZER_PROCESSES", 2)
+    kwargs = dict(population=8, generations=2, islands=2, seed=3)
+    clear_caches()
+    local = optimize_strategy("wheel", HISTORY, WHEEL, processes=1, **kwargs)
+
+    try:
+        clear_caches()
+        pooled = optimize_strategy("wheel", HISTORY, WHEEL, processes=2, **kwargs)
+        pool = strategy_optimizer._pool
+        clear_caches()
+        optimize_strategy("wheel", HISTORY, WHEEL, processes=2, **kwargs)
+        assert strategy_optimizer._pool is pool
+        assert pool._mp_context.get_start_method() == "spawn"
+    finally:
+        strategy_optimizer.shutdown_pool()
+
+    assert pooled.best_params == local.best_params
+    assert pooled.best_score == local.best_score
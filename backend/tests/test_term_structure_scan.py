@@ -0,0 +1,111 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from term_structure_agent import TermStructureAgent
+
+
+class SyntheticAgent(TermStructureAgent):
+    """500-name calendar; every third name has a flat term structure."""
+
+    def __init__(self, n=500, latency=0.02, **kwargs):
+        super().__init__(**kwargs)
+        self.n = n
+        self.latency = latency
+        self.calls = {"chain": 0, "crush": 0, "backtest": 0}
+        self.inflight = self.peak = 0
+
+    async def _slow(self, kind):
+        self.calls[kind] += 1
+        self.inflight += 1
+        self.peak = max(self.peak, self.inflight)
+        await asyncio.sleep(self.latency)
+        self.inflight -= 1
+
+    async def _get_earnings_calendar(self, days_ahead):
+        today = datetime.now()
+        return [
+            {
+                "symbol": f"SYM{i:03d}",
+                "earnings_date": (today + timedelta(days=10 + i % 5)).strftime(
+                    "%Y-%m-%d"
+                ),
+                "days_to_earnings": 10 + i % 5,
+                "current_price": 50.0 + i,
+                "avg_volume": 1_000_000 * (i % 50),
+            }
+            for i in range(self.n)
+        ]
+
+    async def _get_options_chain(self, symbol):
+        await self._slow("chain")
+        chain = await super()._get_options_chain(symbol)
+        chain["flat"] = int(symbol[3:]) % 3 == 0
+        return chain
+
+    def _get_iv_batch(self, chains, expirations, strikes, option_type):
+        iv = super()._get_iv_batch(chains, expirations, strikes, option_type)
+        flat = np.array([c["flat"] for c in chains])
+        return np.where(flat, 0.45, iv)
+
+    async def _get_historical_iv_crush(self, symbol):
+        await self._slow("crush")
+        return await super()._get_historical_iv_crush(symbol)
+
+    async def _backtest_calendar_spread(self, symbol, lookback_quarters=8):
+        await self._slow("backtest")
+        return await super()._backtest_calendar_spread(symbol, lookback_quarters)
+
+
+def test_scan_is_bounded_concurrent_and_prunes_before_backtest():
+    agent = SyntheticAgent()
+    agent.max_concurrency = 16
+
+    start = time.perf_counter()
+    opportunities = asyncio.run(agent.scan_earnings_calendar())
+    elapsed = time.perf_counter() - start
+
+    survivors = 500 - len(range(0, 500, 3))
+    assert len(opportunities) == survivors
+    assert agent.last_scan_stats["pruned"] == 500 - survivors
+    assert agent.calls == {"chain": 500, "crush": survivors, "backtest": survivors}
+    assert agent.peak <= 16 * 3  # three independent calls per in-flight symbol
+    # sequential round trips would take (500 + 2 * 333) * 20ms > 23s
+    assert elapsed < 5
+    assert all(o["forward_vol_factor"] > 1.3 for o in opportunities)
+    scores = [o["opportunity_score"] for o in opportunities]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_chain_snapshots_are_shared_and_results_match_sequential():
+    agent = SyntheticAgent(n=60, latency=0)
+
+    async def run():
+        concurrent = await agent.scan_earnings_calendar()
+        agent.max_concurrency = 1
+        sequential = await agent.scan_earnings_calendar()
+        return concurrent, sequential
+
+    concurrent, sequential = asyncio.run(run())
+
+    assert concurrent == sequential
+    assert agent.calls["chain"] == 60  # second scan served from the snapshot cache
+    assert agent.last_scan_stats["chain_cache"]["hits"] == 60
+
+
+def test_single_strike_iv_matches_batch():
+    agent = TermStructureAgent()
+    today = datetime.now()
+    expirations = [(today + timedelta(days=d)).strftime("%Y-%m-%d") for d in (7, 35)]
+
+    batch = agent._get_iv_batch([{}, {}], expirations, [100.0, 100.0], "call")
+    assert [agent._get_iv_for_strike({}, e, 100.0, "call") for e in expirations] == [
+        0.82,
+        0.45,
+    ]
+    assert batch.tolist() == [0.82, 0.45]
+    assert agent._calculate_dte_batch(expirations).tolist() == [
+        agent._calculate_dte(e) for e in expirations
+    ]
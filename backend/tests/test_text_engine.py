@@ -0,0 +1,86 @@
+import random
+
+from agents.core.news_aggregator import NewsDeduplicator, SentimentClassifier
+from geopolitical_news_agent import HEADLINE_LEXICON
+from services.text_engine import NearDuplicateIndex, PhraseMatcher, SentimentLexicon
+
+
+class Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _naive_classify(text):
+    text_lower = text.lower()
+    bull = sum(1 for w in SentimentClassifier.BULLISH_KEYWORDS if w in text_lower)
+    bear = sum(1 for w in SentimentClassifier.BEARISH_KEYWORDS if w in text_lower)
+    if bull == 0 and bear == 0:
+        return 0.0
+    return round((bull - bear) / (bull + bear), 2)
+
+
+def test_matcher_finds_overlapping_and_embedded_phrases():
+    matcher = PhraseMatcher(["up", "upgrade", "grade", "he", "she", "hers"])
+    found = {matcher.patterns[i] for i in matcher.matched_ids("Ushers UPGRADE")}
+    assert found == {"up", "upgrade", "grade", "he", "she", "hers"}
+    assert matcher.matched_ids("") == set()
+
+
+def test_classifier_matches_substring_counting():
+    rng = random.Random(7)
+    vocab = sorted(
+        SentimentClassifier.BULLISH_KEYWORDS | SentimentClassifier.BEARISH_KEYWORDS
+    )
+    vocab += ["stock", "shares", "Q3", "guidance", "the", "after", "CEO", "outlook"]
+    for _ in range(500):
+        text = " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 12)))
+        text = text.title() if rng.random() < 0.3 else text
+        assert SentimentClassifier.classify(text) == _naive_classify(text)
+
+
+def test_lexicon_weights_and_order():
+    lex = SentimentLexicon([("strong buy", 2.0), "beat"], ["miss"])
+    match = lex.match("Strong buy after earnings beat despite revenue miss")
+    assert match.bullish == ["strong buy", "beat"]
+    assert match.bearish == ["miss"]
+    assert lex.score("strong buy, revenue miss") == (2.0 - 1.0) / 3.0
+
+    m = HEADLINE_LEXICON.match("Shares up on strong growth")
+    assert m.bullish_weight - m.bearish_weight == 3
+
+
+def test_near_duplicates_are_detected():
+    dedup = NewsDeduplicator()
+    assert not dedup.is_duplicate("Tesla stock surges 5% after earnings beat", 0)
+    assert dedup.is_duplicate("TESLA stock surges 5% after earnings beat!", 0)
+    assert dedup.is_duplicate("Tesla stock surges 5% after earnings beat - Reuters", 0)
+    assert not dedup.is_duplicate(
+        "Apple unveils new iPhone lineup at September event", 0
+    )
+
+
+def test_ring_buffer_eviction_by_age_and_capacity():
+    clock = Clock()
+    index = NearDuplicateIndex(capacity=3, max_age_sec=60, clock=clock)
+    headlines = [
+        "Fed holds rates steady as inflation cools",
+        "Oil prices jump on supply cuts",
+        "Chipmakers rally after strong AI demand",
+        "Retail sales slip in October report",
+    ]
+
+    assert not index.check_and_add(headlines[0])
+    assert index.check_and_add(headlines[0])
+
+    clock.now += 120
+    assert not index.check_and_add(headlines[0])  # expired, seen as new
+    assert len(index) == 1
+
+    for h in headlines[1:]:
+        index.check_and_add(h)
+    assert len(index) == 3
+    assert not index.check_and_add(headlines[0])  # overwritten by the ring
+    assert index.stats["evicted"] == 3
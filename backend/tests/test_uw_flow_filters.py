@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from services import uw_flow
+from services.uw_flow import FlowBatch, _apply_filters, compile_filters
+from utils.redis_client import InMemoryRedis
+
+
+def random_event(rng):
+    event = {
+        "symbol": rng.choice(["TSLA", "aapl", "NVDA", "SPY", ""]),
+        "side": rng.choice(["BUY", "sell", "", None]),
+        "kind": rng.choice(["sweep", "BLOCK", "split", ""]),
+        "type": rng.choice(["CALL", "put"]),
+        "execution": rng.choice(["above_ask", "BELOW_BID", "at_mid"]),
+        "moneyness": rng.choice([0, None, 0.95, 1.0, 1.2, "1.05"]),
+        "volume": rng.choice([0, 10, 500, "750"]),
+        "oi": rng.choice([0, None, 100, 600]),
+        "price": rng.choice([None, 0.5, 5, 12.25, "7.5", float("nan")]),
+        "chance": rng.choice([None, 0.1, 0.5, 0.9]),
+        "dte": rng.choice([None, 0, 7, 30, 365, 12.9]),
+    }
+    for key in list(event):
+        if rng.random() < 0.1:
+            del event[key]  # missing field
+    return event
+
+
+def random_spec(rng):
+    return {
+        "tickers": rng.choice([None, [], ["tsla", "AAPL"], ["SPY"]]),
+        "side": rng.choice([None, ["buy"], ["BUY", "SELL"]]),
+        "kinds": rng.choice([None, ["Sweep", "block"]]),
+        "opt_types": rng.choice([None, ["call"]]),
+        "otm": rng.choice([None, False, True]),
+        "vol_gt_oi": rng.choice([None, True]),
+        "above_ask_below_bid": rng.choice([None, True]),
+        "price_op": rng.choice([None, "lt", "gt", "eq"]),
+        "price_val": rng.choice([1.0, 10]),
+        "chance_op": rng.choice([None, "gt"]),
+        "chance_val": 0.3,
+        "min_dte": rng.choice([None, 7, "7"]),
+        "max_dte": rng.choice([None, 60]),
+    }
+
+
+def test_compiled_filters_match_per_item_filter():
+    rng = random.Random(21)
+    events = [random_event(rng) for _ in range(3000)]
+    batch = FlowBatch(events)
+
+    for _ in range(300):
+        spec = random_spec(rng)
+        expected = [x for x in events if _apply_filters(x, spec)]
+        compiled = compile_filters(spec)
+        assert compiled.apply(batch) == expected
+        assert [x for x in events if compiled(x)] == expected
+
+
+def test_unparseable_number_raises_like_the_per_item_filter():
+    events = [
+        {"symbol": "TSLA", "price": 3.0},
+        {"symbol": "AAPL", "price": "n/a"},
+    ]
+    batch = FlowBatch(events)
+
+    # the bad row is filtered out before its price is read
+    spec = {"tickers": ["TSLA"], "price_op": "gt", "price_val": 1.0}
+    assert compile_filters(spec).apply(batch) == events[:1]
+    with pytest.raises(ValueError):
+        compile_filters({"price_op": "gt", "price_val": 1.0}).apply(batch)
+
+
+def test_equivalent_specs_share_compiled_filter_and_results(monkeypatch):
+    fetches = []
+
+    def fake_get(path, params=None):
+        fetches.append(path)
+        return {
+            "data": [
+                {"symbol": "TSLA", "side": "BUY", "dte": 10},
+                {"symbol": "AAPL", "side": "SELL", "dte": 3},
+                {"symbol": "TSLA", "side": "SELL", "dte": 40},
+            ]
+        }
+
+    monkeypatch.setattr(uw_flow, "_get", fake_get)
+    monkeypatch.setattr(uw_flow, "get_redis", lambda: redis)
+    redis = InMemoryRedis()
+    uw_flow._flow_results.invalidate()
+
+    a = {"tickers": ["tsla"], "side": None, "min_dte": 5}
+    b = {"tickers": ["TSLA"], "otm": False, "min_dte": 5}
+    assert compile_filters(a) is compile_filters(b)
+
+    first = uw_flow.live_flow(a)["items"]
+    first[0]["symbol"] = "changed"  # callers get copies
+    second = uw_flow.live_flow(b)["items"]
+
+    assert [x["dte"] for x in second] == [10, 40]
+    assert second[0]["symbol"] == "TSLA"
+    assert fetches == [uw_flow.LIVE_PATH]
+    stats = uw_flow._flow_results.stats()
+    assert (stats["hits"], stats["entries"]) == (1, 1)
@@ -21,6 +21,7 @@ from gates_engine import (
     Side,
     TradeContext,
     audit_hash,
+    audit_payload,
     evaluate_gates,
 )
 
@@ -127,16 +128,9 @@ async def trade_preview(body: PreviewRequest):
     # Evaluate gates
     gate_result = evaluate_gates(ctx, DEFAULT_CONFIG)
 
-    # Create audit payload
-    audit_payload = {
-        "mode": body.mode,
-        "strategy": body.strategy,
-        "underlying": body.underlying,
-        "legs": [leg.dict() for leg in body.legs],
-        "u": {"bid": u.bid, "ask": u.ask, "last": u.last, "tsMs": u.tsMs},
-        "frozenTs": int(time.time() * 1000),
-    }
-    ah = audit_hash(audit_payload)
+    # Create audit payload (same layout the batch evaluator hashes)
+    frozen_ts = int(time.time() * 1000)
+    ah = audit_hash(audit_payload(ctx, frozen_ts))
 
     return JSONResponse(
         status_code=200,
@@ -146,7 +140,7 @@ async def trade_preview(body: PreviewRequest):
             "results": [r.dict() for r in gate_result.results],
             "estMaxLoss": est_max_loss,
             "auditHash": ah,
-            "frozenTs": audit_payload["frozenTs"],
+            "frozenTs": frozen_ts,
         },
     )
 
@@ -210,14 +204,14 @@ async def trade_place(
     decision = "REJECT" if blocks else "ALLOW"
 
     # Create audit hash
-    audit_payload = {
+    place_payload = {
         "mode": mode.value,
         "strategy": body.strategy,
         "underlying": body.underlying,
         "legs": [leg.dict() for leg in body.legs],
         "subset": ["data.freshness", "pricing.sanity", "risk.buyingpower"],
     }
-    ah = audit_hash(audit_payload)
+    ah = audit_hash(place_payload)
 
     if decision == "REJECT":
         resp = {
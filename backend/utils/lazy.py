@@ -0,0 +1,161 @@
+"""
+Lazy loading for heavy routers and services.
+
+``LazyObject("module:attr")`` stands in for a module-level singleton and only
+imports (and, for classes, instantiates) the target on first attribute access.
+
+``LazyRouterRegistry`` maps URL prefixes to ``"module:router"`` targets. The
+router module is imported and mounted the first time a request under its
+prefix arrives (or when the OpenAPI schema is requested), so a worker never
+pays for engines it does not serve.
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LAZY_ROUTERS = os.getenv("LAZY_ROUTERS", "1") == "1"
+
+
+def _resolve(target: str) -> Any:
+    module_name, _, attr = target.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr) if attr else module
+
+
+class LazyObject:
+    """Proxy that resolves ``"module:attr"`` on first use.
+
+    If the resolved attribute is a class it is instantiated with no arguments,
+    mirroring the ``service = Service()`` singletons it replaces.
+    """
+
+    def __init__(self, target: str):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _get(self) -> Any:
+        instance = object.__getattribute__(self, "_instance")
+        if instance is None:
+            with object.__getattribute__(self, "_lock"):
+                instance = object.__getattribute__(self, "_instance")
+                if instance is None:
+                    target = object.__getattribute__(self, "_target")
+                    resolved = _resolve(target)
+                    instance = resolved() if isinstance(resolved, type) else resolved
+                    object.__setattr__(self, "_instance", instance)
+                    logger.debug(f"Lazy object loaded: {target}")
+        return instance
+
+    @property
+    def loaded(self) -> bool:
+        return object.__getattribute__(self, "_instance") is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._get(), name, value)
+
+    def __repr__(self) -> str:
+        target = object.__getattribute__(self, "_target")
+        return f"<LazyObject {target} loaded={self.loaded}>"
+
+
+class LazyRouterRegistry:
+    """Mount routers on the app the first time one of their paths is hit."""
+
+    def __init__(self, app):
+        self.app = app
+        self._pending: Dict[str, Dict[str, str]] = {}
+        self._loaded: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._mount_lock = threading.Lock()
+
+    def register(self, path_prefix: str, target: str, mount_prefix: str = ""):
+        """Register ``target`` ("module:router") to serve ``path_prefix``.
+
+        ``mount_prefix`` is passed to ``include_router`` for routers that do
+        not carry their full prefix themselves. With ``LAZY_ROUTERS=0`` the
+        router is mounted immediately.
+        """
+        entry = {"target": target, "mount_prefix": mount_prefix}
+        if not LAZY_ROUTERS:
+            self._mount(path_prefix, entry)
+            return
+        self._pending[path_prefix] = entry
+
+    def _match(self, path: str) -> Optional[str]:
+        for prefix in self._pending:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return prefix
+        return None
+
+    def _mount(self, path_prefix: str, entry: Dict[str, str]):
+        start = time.perf_counter()
+        router = _resolve(entry["target"])
+        with self._mount_lock:
+            if path_prefix in self._loaded:
+                return
+            self.app.include_router(router, prefix=entry["mount_prefix"])
+            self.app.openapi_schema = None  # rebuild docs with the new routes
+            self._pending.pop(path_prefix, None)
+            self._loaded[path_prefix] = (time.perf_counter() - start) * 1000.0
+        logger.info(
+            f"Mounted lazy router {entry['target']} at {path_prefix} "
+            f"({self._loaded[path_prefix]:.0f} ms)"
+        )
+
+    async def ensure(self, path_prefix: str) -> bool:
+        """Import and mount the router for ``path_prefix`` (once, off the loop)."""
+        if path_prefix in self._loaded:
+            return True
+        lock = self._locks.setdefault(path_prefix, asyncio.Lock())
+        async with lock:
+            entry = self._pending.get(path_prefix)
+            if entry is None:
+                return path_prefix in self._loaded
+            try:
+                # the import is the slow part; keep it off the event loop
+                await asyncio.to_thread(_resolve, entry["target"])
+                self._mount(path_prefix, entry)
+            except Exception as e:
+                self._errors[path_prefix] = str(e)
+                self._pending.pop(path_prefix, None)
+                logger.error(f"Lazy router {entry['target']} failed to load: {e}")
+                return False
+        return True
+
+    async def ensure_all(self):
+        for prefix in list(self._pending):
+            await self.ensure(prefix)
+
+    async def middleware(self, request, call_next):
+        if self._pending:
+            path = request.url.path
+            if path in (self.app.openapi_url, self.app.docs_url, self.app.redoc_url):
+                await self.ensure_all()
+            else:
+                prefix = self._match(path)
+                if prefix is not None:
+                    await self.ensure(prefix)
+        return await call_next(request)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": LAZY_ROUTERS,
+            "pending": sorted(self._pending),
+            "loaded_ms": {k: round(v, 1) for k, v in self._loaded.items()},
+            "errors": dict(self._errors),
+        }
+
+    def pending(self) -> List[str]:
+        return list(self._pending)
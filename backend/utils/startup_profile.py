@@ -0,0 +1,242 @@
+"""
+Startup import profiler.
+
+Records, for every module imported while active, the wall time spent executing
+it (inclusive and exclusive of the modules it imports in turn) and, optionally,
+the Python memory it left allocated. Use it to see what a worker pays for at
+boot:
+
+    python -m utils.startup_profile server --top 30
+
+or from code:
+
+    with profile_imports() as prof:
+        import server
+    print(prof.report())
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+_WRAPPED = "_startup_profile_wrapped"
+
+
+@dataclass
+class ModuleTiming:
+    name: str
+    cumulative_ms: float
+    self_ms: float
+    memory_kb: Optional[float] = None
+    depth: int = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "module": self.name,
+            "cumulative_ms": round(self.cumulative_ms, 3),
+            "self_ms": round(self.self_ms, 3),
+            "memory_kb": (
+                round(self.memory_kb, 1) if self.memory_kb is not None else None
+            ),
+            "depth": self.depth,
+        }
+
+
+class StartupProfile:
+    """Per-module import timings collected by :class:`_ProfilingFinder`."""
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.modules: Dict[str, ModuleTiming] = {}
+        self.total_ms = 0.0
+        self.peak_kb: Optional[float] = None
+        self._stack: List[List[float]] = []
+        self._lock = threading.RLock()
+
+    # -- recording (called from the wrapped loaders) -------------------------
+
+    def _enter(self):
+        self._stack.append([0.0])
+
+    def _exit(self, name: str, elapsed: float, memory: Optional[float]):
+        children = self._stack.pop()[0]
+        if self._stack:
+            self._stack[-1][0] += elapsed
+        self.modules[name] = ModuleTiming(
+            name=name,
+            cumulative_ms=elapsed * 1000.0,
+            self_ms=max(0.0, elapsed - children) * 1000.0,
+            memory_kb=memory,
+            depth=len(self._stack),
+        )
+
+    # -- reporting -----------------------------------------------------------
+
+    def top(self, n: int = 25, by: str = "cumulative_ms") -> List[ModuleTiming]:
+        return sorted(
+            self.modules.values(), key=lambda m: getattr(m, by) or 0.0, reverse=True
+        )[:n]
+
+    def packages(self, n: int = 25) -> List[Dict]:
+        """Self time and memory summed per top-level package."""
+        agg: Dict[str, Dict] = {}
+        for m in self.modules.values():
+            root = m.name.split(".", 1)[0]
+            row = agg.setdefault(
+                root, {"package": root, "self_ms": 0.0, "memory_kb": 0.0, "modules": 0}
+            )
+            row["self_ms"] += m.self_ms
+            row["memory_kb"] += max(0.0, m.memory_kb or 0.0)
+            row["modules"] += 1
+        rows = sorted(agg.values(), key=lambda r: r["self_ms"], reverse=True)[:n]
+        for r in rows:
+            r["self_ms"] = round(r["self_ms"], 3)
+            r["memory_kb"] = round(r["memory_kb"], 1) if self.trace_memory else None
+        return rows
+
+    def to_dict(self, top: int = 25) -> Dict:
+        return {
+            "total_ms": round(self.total_ms, 3),
+            "modules_imported": len(self.modules),
+            "peak_kb": round(self.peak_kb, 1) if self.peak_kb is not None else None,
+            "top_modules": [m.to_dict() for m in self.top(top)],
+            "top_packages": self.packages(top),
+        }
+
+    def report(self, top: int = 25) -> str:
+        lines = [
+            f"imported {len(self.modules)} modules in {self.total_ms:.1f} ms"
+            + (f" (peak {self.peak_kb / 1024:.1f} MiB)" if self.peak_kb else ""),
+            "",
+            f"{'cumulative ms':>14} {'self ms':>10} {'mem KiB':>10}  module",
+        ]
+        for m in self.top(top):
+            mem = f"{m.memory_kb:10.1f}" if m.memory_kb is not None else f"{'-':>10}"
+            lines.append(
+                f"{m.cumulative_ms:14.1f} {m.self_ms:10.1f} {mem}  "
+                f"{'  ' * min(m.depth, 6)}{m.name}"
+            )
+        lines += ["", f"{'self ms':>14} {'mem KiB':>10} {'modules':>8}  package"]
+        for r in self.packages(top):
+            mem = f"{r['memory_kb']:10.1f}" if r["memory_kb"] is not None else "-"
+            lines.append(
+                f"{r['self_ms']:14.1f} {mem:>10} {r['modules']:8d}  {r['package']}"
+            )
+        return "\n".join(lines)
+
+
+class _ProfilingFinder:
+    """meta_path hook that times ``exec_module`` of every loader it sees."""
+
+    def __init__(self, profile: StartupProfile):
+        self.profile = profile
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, "busy", False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    self._wrap(spec.loader)
+                    return spec
+            return None
+        finally:
+            self._local.busy = False
+
+    def _wrap(self, loader):
+        # Class-level loaders (builtin/frozen) are shared; leave them alone.
+        if loader is None or isinstance(loader, type):
+            return
+        exec_module = getattr(loader, "exec_module", None)
+        if exec_module is None or getattr(exec_module, _WRAPPED, False):
+            return
+        profile = self.profile
+
+        def timed_exec_module(module):
+            with profile._lock:
+                profile._enter()
+                mem0 = tracemalloc.get_traced_memory()[0] if profile.trace_memory else 0
+                t0 = time.perf_counter()
+                try:
+                    exec_module(module)
+                finally:
+                    elapsed = time.perf_counter() - t0
+                    memory = (
+                        (tracemalloc.get_traced_memory()[0] - mem0) / 1024.0
+                        if profile.trace_memory
+                        else None
+                    )
+                    profile._exit(module.__name__, elapsed, memory)
+
+        setattr(timed_exec_module, _WRAPPED, True)
+        try:
+            loader.exec_module = timed_exec_module
+        except (AttributeError, TypeError):
+            pass
+
+
+@contextmanager
+def profile_imports(trace_memory: bool = True):
+    """Profile every import executed inside the ``with`` block."""
+    profile = StartupProfile(trace_memory=trace_memory)
+    finder = _ProfilingFinder(profile)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    sys.meta_path.insert(0, finder)
+    t0 = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        profile.total_ms = (time.perf_counter() - t0) * 1000.0
+        sys.meta_path.remove(finder)
+        if trace_memory:
+            profile.peak_kb = tracemalloc.get_traced_memory()[1] / 1024.0
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def profile_module(name: str, trace_memory: bool = True) -> StartupProfile:
+    """Import ``name`` (fresh, if not yet loaded) and return its profile."""
+    with profile_imports(trace_memory=trace_memory) as profile:
+        importlib.import_module(name)
+    return profile
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile module import time/memory")
+    parser.add_argument("module", nargs="?", default="server")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    # server.py needs these at import time; profiling must not reach a real DB
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ.setdefault("DB_NAME", "flowmind_profile")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    profile = profile_module(args.module, trace_memory=not args.no_memory)
+    if args.json:
+        import json
+
+        print(json.dumps(profile.to_dict(args.top), indent=2))
+    else:
+        print(profile.report(args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
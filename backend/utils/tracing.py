@@ -0,0 +1,131 @@
+"""
+In-process request tracing.
+
+A trace is started per HTTP request by the observability middleware; code on
+the request path marks stages with ``span("cache")``, ``span("upstream")`` or
+``span("compute")``. Finished traces land in a bounded ring buffer that can be
+inspected at ``/debug/traces`` without any external collector.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "512"))
+
+_current: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar(
+    "flowmind_trace", default=None
+)
+
+
+class Trace:
+    __slots__ = ("attrs", "started", "spans", "duration")
+
+    def __init__(self, **attrs: Any):
+        self.attrs: Dict[str, Any] = attrs
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.duration: Optional[float] = None
+
+    def add_span(self, name: str, start: float, duration: float, **attrs: Any):
+        self.spans.append(
+            {
+                "name": name,
+                "offset_ms": round((start - self.started) * 1000.0, 3),
+                "duration_ms": round(duration * 1000.0, 3),
+                **attrs,
+            }
+        )
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Seconds spent per stage name (nested spans are counted in each)."""
+        totals: Dict[str, float] = {}
+        for s in self.spans:
+            totals[s["name"]] = totals.get(s["name"], 0.0) + s["duration_ms"] / 1000.0
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.attrs,
+            "duration_ms": (
+                round(self.duration * 1000.0, 3) if self.duration is not None else None
+            ),
+            "spans": list(self.spans),
+        }
+
+
+class TraceBuffer:
+    """Ring buffer of finished traces."""
+
+    def __init__(self, maxlen: int = TRACE_BUFFER_SIZE):
+        self._traces: deque = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def add(self, trace: Trace):
+        with self._lock:
+            self._traces.append(trace)
+
+    def recent(
+        self, limit: int = 50, predicate: Optional[Callable[[Trace], bool]] = None
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            traces = list(self._traces)
+        out = []
+        for trace in reversed(traces):
+            if predicate is None or predicate(trace):
+                out.append(trace.to_dict())
+                if len(out) >= limit:
+                    break
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+
+_buffer = TraceBuffer()
+
+
+def get_trace_buffer() -> TraceBuffer:
+    return _buffer
+
+
+def start_trace(**attrs: Any) -> contextvars.Token:
+    return _current.set(Trace(**attrs))
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def finish_trace(token: contextvars.Token, **attrs: Any) -> Optional[Trace]:
+    """Close the current trace, store it in the buffer and restore the context."""
+    trace = _current.get()
+    _current.reset(token)
+    if trace is None:
+        return None
+    trace.duration = time.perf_counter() - trace.started
+    trace.attrs.update(attrs)
+    _buffer.add(trace)
+    return trace
+
+
+@contextmanager
+def span(name: str, **attrs: Any):
+    """Time a stage of the current request; a no-op outside a trace."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add_span(name, start, time.perf_counter() - start, **attrs)